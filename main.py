@@ -1,49 +1,319 @@
 """Composition Root"""
 
+import sys
+from src.core.constants import DEFAULT_PROFILE_STARTUP_FLAG
+from src.infrastructure.metrics.startup_profiler import StartupProfiler
+
+# Created before the other imports so that they show up in the import breakdown.
+PROFILER = StartupProfiler(enabled=any(flag in sys.argv for flag in DEFAULT_PROFILE_STARTUP_FLAG))
+
+# pylint: disable=wrong-import-position,wrong-import-order
+import signal
 import logging
 import argparse
 import asyncio
-from src.core.constants import DEFAULT_DEBUG_FLAG
+import functools
+import dataclasses
+from logging import Logger
+from multiprocessing.connection import Connection
+from typing import Optional
+from src.core.constants import (
+    DEFAULT_CLUSTERS_FLAG,
+    DEFAULT_CONFIG_SNAPSHOT_PATH,
+    DEFAULT_DEBUG_FLAG,
+    DEFAULT_FORCE_SYNC_FLAG,
+    DEFAULT_SHARDS_FLAG,
+    DEFAULT_SIMULATOR_FLAG,
+    DEFAULT_WATCH_FLAG,
+)
+from src.infrastructure.discord.admission import AdmissionController
+from src.infrastructure.discord.basebot import BaseBot
+from src.infrastructure.discord.responder import AdaptiveResponder
 from src.infrastructure.discord.bot_factory import BotFactory
-from src.infrastructure.discord.extension_loader import ExtensionLoader
+from src.infrastructure.discord.extension_loader import ExtensionLoader, preimport_extensions
+from src.infrastructure.di.service_container import ServiceContainer
 from src.infrastructure.config.config_constructor import ConfigConstructor
+from src.infrastructure.config.config_model import (
+    ConfigModel,
+    LoggingConfiguration,
+    MetricsConfiguration,
+    RateLimitConfiguration,
+)
+from src.infrastructure.config.config_reloader import ConfigReloader
 from src.infrastructure.config.loaders.env_loader import EnvLoader
 from src.infrastructure.config.loaders.toml_loader import TomlLoader
+from src.infrastructure.cluster.ipc import ClusterClient
+from src.infrastructure.logs.log_pipeline import LogPipeline
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.metrics.metrics_server import MetricsServer
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.infrastructure.metrics.runtime_metrics import RuntimeMetrics
+from src.infrastructure.native.libraries import preload_libraries
+from src.infrastructure.simulator.endpoints import use_simulator
+from src.infrastructure.cluster.supervisor import ClusterSpec, ClusterSupervisor
 
+from src.infrastructure.services.image_service import ImageService
 from src.infrastructure.services.random_joke_service import RandomJokeService
-parser = argparse.ArgumentParser()
-parser.add_argument(
-    *DEFAULT_DEBUG_FLAG,
-    action="store_true",
-    help="Enable debug logging"
-)
+from src.infrastructure.services.bot_stats_service import BotStatsService
+from src.infrastructure.services.latency_sampler import LatencySampler
+from src.infrastructure.music.music_service import MusicService
+from src.infrastructure.storage.state_store import StateStore
+from src.infrastructure.termo.termo_service import TermoService
+from src.interface.i18n.translator import Translator
 
-cli_args = parser.parse_args()
+PROFILER.since("imports")
 
-log_level = logging.INFO
-if cli_args.debug:
-    log_level = logging.DEBUG
+def parse_cli_args() -> argparse.Namespace:
+    """Parses the command line flags."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        *DEFAULT_DEBUG_FLAG,
+        action="store_true",
+        help="Enable debug logging"
+    )
+    parser.add_argument(
+        *DEFAULT_WATCH_FLAG,
+        action="store_true",
+        help="Reload changed cogs without restarting"
+    )
+    parser.add_argument(
+        *DEFAULT_FORCE_SYNC_FLAG,
+        action="store_true",
+        help="Sync application commands even if they did not change"
+    )
+    parser.add_argument(
+        *DEFAULT_CLUSTERS_FLAG,
+        type=int,
+        default=0,
+        help="Run N worker processes, each owning a contiguous shard range"
+    )
+    parser.add_argument(
+        *DEFAULT_SHARDS_FLAG,
+        type=int,
+        default=None,
+        help="Total shard count (defaults to one shard per cluster in cluster mode)"
+    )
+    parser.add_argument(
+        *DEFAULT_PROFILE_STARTUP_FLAG,
+        action="store_true",
+        help="Log a per-phase timing and import-time breakdown of the start-up"
+    )
+    parser.add_argument(
+        *DEFAULT_SIMULATOR_FLAG,
+        default=None,
+        metavar="URL",
+        help="Connect to a local Discord simulator instead of Discord (load tests)"
+    )
+    return parser.parse_args()
 
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    force=True,
-)
-logger = logging.getLogger()
-
-discord_http_logger = logging.getLogger("discord.http")
-discord_http_logger.setLevel(logging.WARNING)
-discord_gateway_logger = logging.getLogger("discord.gateway")
-discord_gateway_logger.setLevel(logging.WARNING)
-
-logger.info("Logging configured with level: %s", logging.getLevelName(log_level))
-
-config_model = ConfigConstructor({EnvLoader(logger), TomlLoader(logger)}, logger).construct()
-bot = BotFactory().create_bot(token=config_model.discord.token,
-                              intents=config_model.discord.intents,
-                              commands_prefix=config_model.discord.prefix,
-                              logger=logger)
-services = {RandomJokeService()}
-extension_loader = ExtensionLoader(bot=bot, services=services)
-asyncio.run(extension_loader.load_extensions())
-bot.run_bot(True)
+def configure_logging(debug: bool) -> Logger:
+    """Configures the root logger with a non-blocking pipeline; see ``LogPipeline``."""
+    log_level = logging.INFO
+    if debug:
+        log_level = logging.DEBUG
+
+    LogPipeline(log_level).install()
+    logger = logging.getLogger()
+
+    discord_http_logger = logging.getLogger("discord.http")
+    discord_http_logger.setLevel(logging.WARNING)
+    discord_gateway_logger = logging.getLogger("discord.gateway")
+    discord_gateway_logger.setLevel(logging.WARNING)
+
+    logger.info("Logging configured with level: %s", logging.getLevelName(log_level))
+    return logger
+
+def tune_logging(logging_config: LoggingConfiguration, config_reloader: ConfigReloader) -> None:
+    """Applies the sampling and ring buffer settings, now and on every reload."""
+    pipeline = LogPipeline.installed()
+    if pipeline is None:
+        return
+    pipeline.apply(logging_config)
+    for field in dataclasses.fields(LoggingConfiguration):
+        config_reloader.on_change(f"logging.{field.name}",
+                                  functools.partial(pipeline.update, field.name))
+
+def instrument(bot: BaseBot, metrics_config: MetricsConfiguration, logger: Logger,
+               spec: Optional[ClusterSpec] = None) -> CommandMetrics:
+    """Hooks the command metrics into the bot and serves them when enabled."""
+    registry = MetricsRegistry() if metrics_config.enabled else None
+    command_metrics = CommandMetrics(registry)
+    bot.instrument(command_metrics)
+    if registry is not None:
+        runtime_metrics = RuntimeMetrics(bot, registry, logger=logger,
+                                         lag_interval=metrics_config.loop_lag_interval)
+        # Every cluster listens on its own port, starting from the configured one.
+        metrics_server = MetricsServer(registry, metrics_config.host,
+                                       metrics_config.port + (spec.cluster_id if spec else 0),
+                                       logger)
+        bot.setup_hooks.extend((runtime_metrics.start, metrics_server.start))
+        bot.shutdown_hooks.extend((metrics_server.close, runtime_metrics.close))
+    return command_metrics
+
+def admit(bot: BaseBot, rate_limits: RateLimitConfiguration, config_reloader: ConfigReloader,
+          registry: Optional[MetricsRegistry], logger: Logger) -> AdmissionController:
+    """Puts rate limiting and load shedding in front of every application command."""
+    admission = AdmissionController(rate_limits, translator=Translator(logger=logger),
+                                    registry=registry, logger=logger)
+    bot.admit_with(admission)
+    bot.setup_hooks.append(admission.start)
+    bot.shutdown_hooks.append(admission.close)
+    for field in dataclasses.fields(RateLimitConfiguration):
+        config_reloader.on_change(f"rate_limits.{field.name}",
+                                  functools.partial(admission.update, field.name))
+    return admission
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def build(cli_args: argparse.Namespace, config_constructor: ConfigConstructor,
+          config_model: ConfigModel, logger: Logger, spec: Optional[ClusterSpec] = None,
+          connection: Optional[Connection] = None) -> tuple[BaseBot, ExtensionLoader]:
+    """Builds the bot, its services and the extension loader, without touching the network."""
+    bot = BotFactory().create_bot(token=config_model.discord.token,
+                                  intents=config_model.discord.intents,
+                                  commands_prefix=config_model.discord.prefix,
+                                  logger=logger,
+                                  force_command_sync=cli_args.force_sync,
+                                  shard_ids=list(spec.shard_ids) if spec else None,
+                                  shard_count=spec.shard_count if spec else cli_args.shards,
+                                  cache=config_model.discord.cache)
+    config_reloader = ConfigReloader(config_constructor, config_model, logger)
+    config_reloader.on_change("discord.prefix",
+                              lambda prefix: setattr(bot, "command_prefix", prefix))
+    config_reloader.on_change("discord.cache.chunk_on_demand",
+                              lambda enabled: setattr(bot, "cache_config", dataclasses.replace(
+                                  bot.cache_config, chunk_on_demand=enabled)))
+    bot.setup_hooks.append(config_reloader.start)
+    bot.shutdown_hooks.append(config_reloader.stop)
+    tune_logging(config_model.logging, config_reloader)
+
+    command_metrics = instrument(bot, config_model.metrics, logger, spec)
+    admission = admit(bot, config_model.rate_limits, config_reloader,
+                      command_metrics.registry, logger)
+
+    container = ServiceContainer(logger)
+    container.register_instance(config_reloader)
+    container.register_instance(command_metrics)
+    container.register_instance(admission.translator)
+    container.register_instance(admission)
+    container.register_instance(AdaptiveResponder(command_metrics, logger=logger))
+    container.register_lazy(StateStore, lambda: StateStore(logger=logger))
+    container.register_lazy(RandomJokeService, lambda: RandomJokeService(logger=logger))
+    container.register_lazy(BotStatsService, lambda: BotStatsService(logger))
+    container.register_lazy(LatencySampler, lambda: LatencySampler(bot, logger=logger))
+    container.register_lazy(ImageService, lambda: ImageService(logger=logger))
+    container.register_lazy(TermoService, lambda: TermoService(logger=logger))
+    container.register_lazy(MusicService, lambda: MusicService(registry=command_metrics.registry,
+                                                               logger=logger))
+
+    if spec is not None and connection is not None:
+        def collect(kind: str) -> dict[str, int]:
+            if kind != "stats":
+                raise ValueError(f"Unknown cluster request '{kind}'.")
+            stats = container.resolve(BotStatsService).snapshot()
+            return {"guilds": stats.guilds, "users": stats.unique_users,
+                    "shards": len(spec.shard_ids)}
+
+        cluster_client = ClusterClient(connection, spec.cluster_id, collect, logger=logger)
+        container.register_instance(cluster_client)
+        bot.setup_hooks.append(cluster_client.connect)
+
+    bot.shutdown_hooks.append(container.aclose)
+    extension_loader = ExtensionLoader(bot=bot, services=container)
+    if cli_args.watch:
+        bot.setup_hooks.append(extension_loader.start_watching)
+        bot.shutdown_hooks.append(extension_loader.stop_watching)
+    return bot, extension_loader
+
+def profile(bot: BaseBot, profiler: StartupProfiler, logger: Logger) -> None:
+    """Times every setup hook and logs the report on the first ``on_ready``."""
+    bot.setup_hooks[:] = [profiler.wrap(f"setup {getattr(hook, '__qualname__', hook)}", hook)
+                          for hook in bot.setup_hooks]
+
+    async def on_first_ready() -> None:
+        bot.remove_listener(on_first_ready, "on_ready")
+        profiler.mark("ready")
+        report = profiler.finish()
+        if report is not None:
+            logger.info("%s", report)
+
+    bot.add_listener(on_first_ready, "on_ready")
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+async def start(cli_args: argparse.Namespace, logger: Logger, profiler: StartupProfiler,
+                spec: Optional[ClusterSpec] = None,
+                connection: Optional[Connection] = None) -> None:
+    """Builds and runs the bot on the running loop, overlapping the independent steps.
+
+    The native libraries and the extension modules load in worker threads
+    while the config is read. Once the bot is built, the extensions are
+    added while it logs in (and prefetches the gateway); it connects when
+    both are done.
+    """
+    config_constructor = ConfigConstructor([TomlLoader(logger), EnvLoader(logger)], logger,
+                                           snapshot_path=DEFAULT_CONFIG_SNAPSHOT_PATH)
+    native = asyncio.create_task(
+        profiler.measure("native libraries", asyncio.to_thread(preload_libraries)))
+    imports = asyncio.create_task(
+        profiler.measure("extension imports", preimport_extensions(logger=logger)))
+    try:
+        config_model = await profiler.measure("config",
+                                              asyncio.to_thread(config_constructor.construct))
+        with profiler.phase("build"):
+            bot, extension_loader = build(cli_args, config_constructor, config_model, logger,
+                                          spec, connection)
+        if profiler.enabled:
+            profile(bot, profiler, logger)
+
+        async def report_native() -> None:
+            logger.debug("Native libraries: %s", await native)
+
+        await bot.serve(lambda: imports, report_native,
+                        profiler.wrap("extensions", extension_loader.load_extensions),
+                        profiler=profiler)
+    finally:
+        # When the start-up failed before serving, the preloads are still running or unread.
+        for task in (native, imports):
+            task.cancel()
+        await asyncio.gather(native, imports, return_exceptions=True)
+        # The start-up failed or was interrupted before the first on_ready.
+        report = profiler.finish()
+        if report is not None:
+            logger.info("%s", report)
+
+def run(cli_args: argparse.Namespace, logger: Logger, profiler: StartupProfiler,
+        spec: Optional[ClusterSpec] = None, connection: Optional[Connection] = None) -> None:
+    """Runs ``start`` on a single event loop until the bot closes."""
+    if cli_args.simulator:
+        logger.warning("Connecting to the Discord simulator at %s", cli_args.simulator)
+        use_simulator(cli_args.simulator)
+    try:
+        asyncio.run(start(cli_args, logger, profiler, spec, connection))
+    except KeyboardInterrupt:
+        logger.info("Interrupted, the bot was closed.")
+
+def run_cluster_worker(spec: ClusterSpec, connection: Connection,
+                       cli_args: argparse.Namespace) -> None:
+    """Entry point of a cluster worker process."""
+    logger = configure_logging(cli_args.debug)
+    run(cli_args, logger, PROFILER, spec, connection)
+
+def main() -> None:
+    """Runs a single process, or a supervisor of cluster processes with --clusters."""
+    cli_args = parse_cli_args()
+    logger = configure_logging(cli_args.debug)
+
+    if cli_args.clusters > 0:
+        supervisor = ClusterSupervisor(run_cluster_worker,
+                                       shard_count=cli_args.shards or cli_args.clusters,
+                                       cluster_count=cli_args.clusters,
+                                       args=(cli_args,), logger=logger)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP,
+                          lambda signum, _frame: supervisor.forward_signal(signum))
+        supervisor.run()
+        return
+
+    run(cli_args, logger, PROFILER)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+python -m src.infrastructure.i18n.catalog src/interface/locates .cache/i18n
@@ -0,0 +1 @@
+python -m src.infrastructure.services.joke_corpus data/jokes.txt data/jokes.kjc
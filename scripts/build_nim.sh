@@ -1 +1,3 @@
-nim c --app:lib --out:./lib/ --threads:on --opt:size --cpu:host --passC:-fPIC --path:src/native --path:src/shared src/native/**/*.nim
\ No newline at end of file
+for source in src/native/*.nim; do
+    nim c --app:lib --outdir:./lib/ --threads:on --opt:size --cpu:host --passC:-fPIC --path:src/native --path:src/shared "$source"
+done
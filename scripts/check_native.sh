@@ -0,0 +1 @@
+python -m src.infrastructure.native.harness "$@"
@@ -0,0 +1 @@
+python -m src.infrastructure.simulator.discord_simulator "$@"
\ No newline at end of file
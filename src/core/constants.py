@@ -2,8 +2,33 @@
 
 from pathlib import Path
 
+PROJECT_ROOT: Path = Path(__file__).resolve().parents[2]
 DEFAULT_TOML_CONFIG_PATH: Path = Path("config.toml")
 DEFAULT_ENV_FILE_PATH: Path = Path(".env")
 DEFAULT_COMMAND_PREFIX: str = "!"
 DEFAULT_DEBUG_FLAG = ("-d", "--debug")
+DEFAULT_WATCH_FLAG = ("-w", "--watch")
+DEFAULT_FORCE_SYNC_FLAG = ("--force-sync",)
+DEFAULT_CLUSTERS_FLAG = ("--clusters",)
+DEFAULT_SHARDS_FLAG = ("--shards",)
+DEFAULT_PROFILE_STARTUP_FLAG = ("--profile-startup",)
+DEFAULT_SIMULATOR_FLAG = ("--simulator",)
 DEFAULT_COMMANDS_PATH = Path("src/interface/cogs")
+DEFAULT_JOKE_SOURCE_PATH: Path = Path("data/jokes.txt")
+DEFAULT_JOKE_CORPUS_PATH: Path = Path("data/jokes.kjc")
+DEFAULT_MUSIC_PATH: Path = Path("data/music")
+DEFAULT_CACHE_PATH: Path = Path(".cache")
+DEFAULT_COG_MANIFEST_PATH: Path = DEFAULT_CACHE_PATH / "cog_manifest.json"
+DEFAULT_COMMAND_SYNC_STATE_PATH: Path = DEFAULT_CACHE_PATH / "command_sync.json"
+DEFAULT_CONFIG_SNAPSHOT_PATH: Path = DEFAULT_CACHE_PATH / "config_snapshot.json"
+DEFAULT_METRICS_HOST: str = "127.0.0.1"
+DEFAULT_METRICS_PORT: int = 9108
+DEFAULT_NATIVE_LIB_PATH: Path = PROJECT_ROOT / "lib"
+DEFAULT_IMAGE_CACHE_BYTES: int = 64 * 1024 * 1024
+DEFAULT_TERMO_WORDS_PATH: Path = Path("data/termo_words.txt")
+DEFAULT_I18N_SOURCE_PATH: Path = Path("src/interface/locates")
+DEFAULT_I18N_CATALOG_PATH: Path = DEFAULT_CACHE_PATH / "i18n"
+DEFAULT_LOCALE: str = "en-US"
+DEFAULT_STATE_STORE_PATH: Path = Path("data/state.sqlite3")
+DEFAULT_LOG_FORMAT: str = "%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s"
+DEFAULT_LOG_QUEUE_SIZE: int = 10_000
@@ -0,0 +1,224 @@
+"""Light IPC between the cluster supervisor and its worker processes.
+
+Messages are small dicts sent over ``multiprocessing`` pipes:
+
+- worker -> supervisor ``{"op": "request", "id", "kind"}`` asks for a value
+  aggregated over every cluster; the supervisor answers ``{"op": "response"}``,
+  with ``partial`` set when some clusters did not answer in time.
+- supervisor -> worker ``{"op": "collect", "id", "kind"}`` asks one cluster
+  for its local value; the worker answers ``{"op": "collected"}``.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import itertools
+from logging import Logger
+from multiprocessing.connection import Connection, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+Message = dict[str, Any]
+Collector = Callable[[str], Any]
+
+def aggregate_counts(results: dict[int, Any]) -> dict[str, Any]:
+    """Sums the numeric fields reported by every cluster."""
+    totals: dict[str, Any] = {"clusters": len(results)}
+    for result in results.values():
+        for key, value in (result or {}).items():
+            if isinstance(value, (int, float)):
+                totals[key] = totals.get(key, 0) + value
+    return totals
+
+@dataclass(frozen=True)
+class ClusterResponse():
+    """An aggregated value, and whether some clusters are missing from it."""
+    data: Any
+    partial: bool = False
+
+@dataclass
+class _PendingCollection():
+    requester: int
+    request_id: int
+    waiting: set[int]
+    deadline: float
+    results: dict[int, Any] = field(default_factory=dict)
+
+# pylint: disable=too-many-instance-attributes
+class ClusterRouter():
+    """Supervisor side: fans worker requests out to every cluster and aggregates."""
+
+    def __init__(self, timeout: float = 2.0,
+                 aggregate: Callable[[dict[int, Any]], Any] = aggregate_counts,
+                 logger: Optional[Logger] = None) -> None:
+        self.timeout = timeout
+        self.aggregate = aggregate
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._connections: dict[int, Connection] = {}
+        self._pending: dict[int, _PendingCollection] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, cluster_id: int, connection: Connection) -> None:
+        """Routes messages of a (re)started cluster through this connection."""
+        with self._lock:
+            self._connections[cluster_id] = connection
+
+    def detach(self, cluster_id: int) -> None:
+        """Stops routing to a cluster, e.g. when its process died."""
+        with self._lock:
+            connection = self._connections.pop(cluster_id, None)
+        if connection is not None:
+            connection.close()
+
+    def start(self) -> None:
+        """Starts the routing thread."""
+        self._thread = threading.Thread(target=self._run, name="cluster-router", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the routing thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _send(self, cluster_id: int, message: Message) -> bool:
+        with self._lock:
+            connection = self._connections.get(cluster_id)
+        if connection is None:
+            return False
+        try:
+            connection.send(message)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _handle(self, cluster_id: int, message: Message) -> None:
+        if message.get("op") == "request":
+            with self._lock:
+                targets = list(self._connections)
+            collection_id = next(self._ids)
+            pending = _PendingCollection(requester=cluster_id, request_id=message["id"],
+                                         waiting=set(), deadline=time.monotonic() + self.timeout)
+            self._pending[collection_id] = pending
+            for target in targets:
+                if self._send(target, {"op": "collect", "id": collection_id,
+                                       "kind": message["kind"]}):
+                    pending.waiting.add(target)
+        elif message.get("op") == "collected":
+            pending = self._pending.get(message["id"])
+            if pending is not None:
+                pending.results[cluster_id] = message.get("data")
+                pending.waiting.discard(cluster_id)
+
+    def _flush(self) -> None:
+        now = time.monotonic()
+        for collection_id, pending in list(self._pending.items()):
+            if pending.waiting and now < pending.deadline:
+                continue
+            del self._pending[collection_id]
+            self._send(pending.requester, {"op": "response", "id": pending.request_id,
+                                           "data": self.aggregate(pending.results),
+                                           "partial": bool(pending.waiting)})
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                connections = {connection: cluster_id
+                               for cluster_id, connection in self._connections.items()}
+            ready = wait(list(connections), timeout=0.05) if connections else []
+            if not connections:
+                time.sleep(0.05)
+
+            for connection in ready:
+                cluster_id = connections[connection]
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    self.detach(cluster_id)
+                    continue
+                self._handle(cluster_id, message)
+            self._flush()
+
+class ClusterClient():
+    """Worker side: answers collect requests and asks for cluster-wide values."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, connection: Connection, cluster_id: int, collector: Collector, *,
+                 timeout: float = 5.0, logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            connection: This worker's end of the supervisor pipe.
+            cluster_id: Index of this cluster.
+            collector: Returns this cluster's local value for a request kind.
+            timeout: Seconds to wait for an aggregated answer.
+            logger: Optional logger.
+        """
+        self.connection = connection
+        self.cluster_id = cluster_id
+        self.collector = collector
+        self.timeout = timeout
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._ids = itertools.count(1)
+        self._waiters: dict[int, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts reading the pipe; must be called from the bot loop."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(target=self._read, name="cluster-client", daemon=True)
+        self._thread.start()
+
+    async def connect(self) -> None:
+        """Starts the client; meant to be registered as a bot setup hook."""
+        self.start()
+
+    async def request(self, kind: str) -> ClusterResponse:
+        """Asks the supervisor for a value aggregated over every cluster."""
+        self.start()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[request_id] = future
+        self.connection.send({"op": "request", "id": request_id, "kind": kind})
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._waiters.pop(request_id, None)
+
+    async def request_stats(self) -> ClusterResponse:
+        """Guild, user and shard totals across every cluster that answered."""
+        return await self.request("stats")
+
+    def _dispatch(self, message: Message) -> None:
+        if message.get("op") == "response":
+            future = self._waiters.get(message["id"])
+            if future is not None and not future.done():
+                future.set_result(ClusterResponse(message.get("data"),
+                                                  bool(message.get("partial"))))
+        elif message.get("op") == "collect":
+            try:
+                data = self.collector(message["kind"])
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                self.logger.error("Failed to collect '%s': %s", message["kind"], error)
+                data = None
+            self.connection.send({"op": "collected", "id": message["id"], "data": data})
+
+    def _read(self) -> None:
+        while True:
+            try:
+                message = self.connection.recv()
+            except (EOFError, OSError):
+                self.logger.warning("Cluster %s lost its supervisor pipe.", self.cluster_id)
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._dispatch, message)
+            except RuntimeError:
+                return
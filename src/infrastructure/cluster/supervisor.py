@@ -0,0 +1,175 @@
+"""Supervisor running bot clusters in separate processes."""
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from logging import Logger
+from dataclasses import dataclass
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Optional
+from src.infrastructure.cluster.ipc import ClusterRouter
+
+@dataclass(frozen=True)
+class ClusterSpec():
+    """The contiguous shard range owned by one worker process."""
+    cluster_id: int
+    shard_ids: tuple[int, ...]
+    shard_count: int
+
+WorkerTarget = Callable[..., None]
+
+def shard_ranges(shard_count: int, cluster_count: int) -> list[tuple[int, ...]]:
+    """Splits shards into contiguous, near-equal ranges (first ranges get the remainder)."""
+    if shard_count < 1 or cluster_count < 1:
+        raise ValueError("shard_count and cluster_count must be positive.")
+    cluster_count = min(cluster_count, shard_count)
+    size, remainder = divmod(shard_count, cluster_count)
+
+    ranges = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < remainder else 0)
+        ranges.append(tuple(range(start, end)))
+        start = end
+    return ranges
+
+@dataclass
+class _Cluster():
+    spec: ClusterSpec
+    process: Optional[BaseProcess] = None
+    started_at: float = 0.0
+    restart_delay: float = 0.0
+    restart_at: Optional[float] = None
+    restarts: int = 0
+
+# pylint: disable=too-many-instance-attributes
+class ClusterSupervisor():
+    """Starts one process per shard range and restarts the ones that crash.
+
+    Each worker is called as ``worker_target(spec, connection, *args)`` with
+    its end of an IPC pipe routed through a ``ClusterRouter``. Crashed
+    clusters are restarted with an exponential backoff that resets once a
+    cluster stayed up for ``stable_after`` seconds. Worker targets do not need
+    Discord, so the whole supervisor can be exercised locally.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, worker_target: WorkerTarget, shard_count: int, cluster_count: int, *,
+                 args: tuple[Any, ...] = (), restart_delay: float = 1.0,
+                 max_restart_delay: float = 60.0, stable_after: float = 60.0,
+                 context: str = "spawn", router: Optional[ClusterRouter] = None,
+                 logger: Optional[Logger] = None) -> None:
+        self.worker_target = worker_target
+        self.args = args
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stable_after = stable_after
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.router = router or ClusterRouter(logger=self.logger)
+        self._context = multiprocessing.get_context(context)
+        self._stopping = threading.Event()
+        self.clusters = [
+            _Cluster(spec=ClusterSpec(cluster_id=cluster_id, shard_ids=shard_ids,
+                                      shard_count=shard_count),
+                     restart_delay=restart_delay)
+            for cluster_id, shard_ids in enumerate(shard_ranges(shard_count, cluster_count))
+        ]
+
+    def _spawn(self, cluster: _Cluster) -> None:
+        supervisor_end, worker_end = self._context.Pipe()
+        process = self._context.Process(
+            target=self.worker_target,
+            args=(cluster.spec, worker_end, *self.args),
+            name=f"cluster-{cluster.spec.cluster_id}",
+        )
+        process.start()
+        worker_end.close()
+
+        self.router.attach(cluster.spec.cluster_id, supervisor_end)
+        cluster.process = process
+        cluster.started_at = time.monotonic()
+        cluster.restart_at = None
+        self.logger.info("Started cluster %s (pid %s) with shards %s-%s",
+                         cluster.spec.cluster_id, process.pid,
+                         cluster.spec.shard_ids[0], cluster.spec.shard_ids[-1])
+
+    def start(self) -> None:
+        """Starts the router and every cluster."""
+        self.router.start()
+        for cluster in self.clusters:
+            self._spawn(cluster)
+
+    def poll(self) -> None:
+        """Schedules restarts for crashed clusters and performs due restarts."""
+        now = time.monotonic()
+        for cluster in self.clusters:
+            process = cluster.process
+            if process is not None and not process.is_alive():
+                cluster.process = None
+                self.router.detach(cluster.spec.cluster_id)
+                if process.exitcode == 0 or self._stopping.is_set():
+                    self.logger.info("Cluster %s exited.", cluster.spec.cluster_id)
+                    continue
+
+                if now - cluster.started_at >= self.stable_after:
+                    cluster.restart_delay = self.restart_delay
+                cluster.restart_at = now + cluster.restart_delay
+                self.logger.warning("Cluster %s crashed with exit code %s, restarting in %.1fs",
+                                    cluster.spec.cluster_id, process.exitcode,
+                                    cluster.restart_delay)
+                cluster.restart_delay = min(cluster.restart_delay * 2, self.max_restart_delay)
+
+            if cluster.restart_at is not None and now >= cluster.restart_at:
+                cluster.restarts += 1
+                self._spawn(cluster)
+
+    def alive(self) -> bool:
+        """Whether any cluster is running or waiting to be restarted."""
+        return any(cluster.process is not None or cluster.restart_at is not None
+                   for cluster in self.clusters)
+
+    def forward_signal(self, signum: int) -> None:
+        """Sends a signal (e.g. SIGHUP to reload the config) to every running cluster."""
+        for cluster in self.clusters:
+            if cluster.process is not None and cluster.process.pid is not None:
+                try:
+                    os.kill(cluster.process.pid, signum)
+                except ProcessLookupError:
+                    continue
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        """Starts the clusters and supervises them until stopped or all exit."""
+        self.start()
+        try:
+            while not self._stopping.is_set() and self.alive():
+                self.poll()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.logger.info("Interrupted, stopping clusters.")
+        finally:
+            self.stop()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Terminates every cluster and the router.
+
+        Workers close their bot on SIGTERM, flushing state and logs, so
+        they get ``timeout`` seconds in total to exit before being killed.
+        """
+        self._stopping.set()
+        for cluster in self.clusters:
+            cluster.restart_at = None
+            if cluster.process is not None and cluster.process.is_alive():
+                cluster.process.terminate()
+        deadline = time.monotonic() + timeout
+        for cluster in self.clusters:
+            if cluster.process is not None:
+                cluster.process.join(max(0.0, deadline - time.monotonic()))
+                if cluster.process.is_alive():
+                    self.logger.warning("Cluster %s did not exit in time, killing it.",
+                                        cluster.spec.cluster_id)
+                    cluster.process.kill()
+                cluster.process = None
+            self.router.detach(cluster.spec.cluster_id)
+        self.router.stop()
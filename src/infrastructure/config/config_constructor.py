@@ -1,26 +1,65 @@
 """"Configuration constructor module."""
 
+import os
+import json
 import logging
-from typing import Any, Set
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Iterable, Optional, TypeVar
 from logging import Logger
-from discord import Intents
-from src.infrastructure.config.config_model import ConfigModel, DiscordConfiguration
+from discord import Intents, MemberCacheFlags
+from src.infrastructure.config.config_model import (
+    CacheConfiguration,
+    ConfigModel,
+    DiscordConfiguration,
+    LoggingConfiguration,
+    MetricsConfiguration,
+    RateLimitConfiguration,
+)
 from src.infrastructure.config.loaders.base_loader import BaseLoader
 from src.core.constants import DEFAULT_COMMAND_PREFIX
 
+SNAPSHOT_VERSION = 5
+
+TableT = TypeVar("TableT")
+
+def deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    """Merges two config layers; nested tables are merged instead of replaced.
+
+    Neither input is modified.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict):
+            base_value = merged.get(key)
+            merged[key] = deep_merge(base_value if isinstance(base_value, dict) else {}, value)
+        else:
+            merged[key] = value
+    return merged
+
 # pylint: disable=too-few-public-methods
 class ConfigConstructor():
-    """Construct config model from loaded configuration data."""
+    """Construct config model from loaded configuration data.
+
+    Loaders are applied in ascending ``priority`` (then class name), so the
+    merge order does not depend on how they were passed. When a
+    ``snapshot_path`` is given the compiled model is written there and reused
+    as long as the fingerprints of every source are unchanged.
+    """
 
-    def __init__(self, loaders: Set[BaseLoader], logger: Logger) -> None:
-        self.loaders: Set[BaseLoader] = loaders
+    def __init__(self, loaders: Iterable[BaseLoader], logger: Logger,
+                 snapshot_path: Optional[Path] = None) -> None:
+        self.loaders: list[BaseLoader] = sorted(
+            loaders, key=lambda loader: (loader.priority, type(loader).__name__)
+        )
         self.logger: Logger = logger or logging.getLogger(__name__)
+        self.snapshot_path: Optional[Path] = snapshot_path
 
     def _load_configuration(self) -> dict[str, Any]:
         """Load configuration data from all loaders."""
-        config = {}
+        config: dict[str, Any] = {}
         for loader in self.loaders:
-            config.update(loader.load_config())
+            config = deep_merge(config, loader.load_config())
         return config
 
     def _parser_values(self, raw_config: dict[str, Any]) -> dict[str, Any]:
@@ -31,6 +70,10 @@ class ConfigConstructor():
             parsed_intents = self._parse_intents(intents_config)
             raw_config["discord"]["intents"] = parsed_intents
 
+        cache_config = raw_config.get("discord", {}).get("cache", {})
+        if "member_cache" in cache_config:
+            cache_config["member_cache"] = self._parse_member_cache(cache_config["member_cache"])
+
         return raw_config
 
     def _parse_intents(self, intents_config: dict[str, bool]) -> Intents:
@@ -43,23 +86,102 @@ class ConfigConstructor():
 
             try:
                 setattr(intents, intent_name, True)
-                self.logger.debug(f"Activated intent: {intent_name}")
+                self.logger.debug("Activated intent: %s", intent_name)
             except AttributeError:
-                self.logger.warning(f"'{intent_name}' is not a valid intent. ignoring it")
+                self.logger.warning("'%s' is not a valid intent. ignoring it", intent_name)
 
         return intents
 
+    def _parse_member_cache(self, flags_config: dict[str, bool]) -> MemberCacheFlags:
+        """Parse the member cache flags"""
+
+        flags = MemberCacheFlags.none()
+        for flag_name, enabled in flags_config.items():
+            if flag_name not in MemberCacheFlags.VALID_FLAGS:
+                self.logger.warning("'%s' is not a valid member cache flag. ignoring it",
+                                    flag_name)
+            elif isinstance(enabled, bool):
+                setattr(flags, flag_name, enabled)
+
+        return flags
+
     def _map_config(self, raw_config: dict[str, Any]) -> ConfigModel:
         """Map parsed configuration dictionary to ConfigModel structure."""
         return ConfigModel(discord=DiscordConfiguration(
             token=raw_config.get("TOKEN", ""),
             intents=raw_config.get("discord", {}).get("intents", Intents.default()),
-            prefix=raw_config.get("discord", {}).get("prefix", DEFAULT_COMMAND_PREFIX)
-        ))
+            prefix=raw_config.get("discord", {}).get("prefix", DEFAULT_COMMAND_PREFIX),
+            cache=self._map_table("cache", CacheConfiguration, raw_config.get("discord", {}))
+        ), metrics=self._map_table("metrics", MetricsConfiguration, raw_config),
+           rate_limits=self._map_table("rate_limits", RateLimitConfiguration, raw_config),
+           logging=self._map_table("logging", LoggingConfiguration, raw_config))
+
+    def _map_table(self, name: str, model: type[TableT], raw_config: dict[str, Any]) -> TableT:
+        """Map a flat table like [metrics] onto its dataclass, ignoring unknown keys."""
+        table = raw_config.get(name, {})
+        known = {field.name for field in fields(model)}
+        for key in table.keys() - known:
+            self.logger.warning("'%s.%s' is not a valid %s option. ignoring it", name, key, name)
+        return model(**{key: value for key, value in table.items() if key in known})
+
+    def _fingerprints(self) -> Optional[list[Any]]:
+        """Fingerprints of every source, or None if one cannot be fingerprinted."""
+        fingerprints = []
+        for loader in self.loaders:
+            fingerprint = loader.fingerprint()
+            if fingerprint is None:
+                return None
+            fingerprints.append([type(loader).__name__, fingerprint])
+        return fingerprints
+
+    def _read_snapshot(self, fingerprints: list[Any]) -> Optional[ConfigModel]:
+        """Returns the cached model if it was compiled from the same sources."""
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            self.logger.warning("Ignoring unreadable config snapshot %s: %s",
+                                self.snapshot_path, error)
+            return None
+
+        if data.get("version") != SNAPSHOT_VERSION or data.get("sources") != fingerprints:
+            return None
+        try:
+            return ConfigModel.from_dict(data["config"])
+        except (KeyError, TypeError) as error:
+            self.logger.warning("Ignoring malformed config snapshot %s: %s",
+                                self.snapshot_path, error)
+            return None
+
+    def _write_snapshot(self, fingerprints: list[Any], config_model: ConfigModel) -> None:
+        """Writes the compiled model; readable by the owner only since it holds the token."""
+        payload = json.dumps({"version": SNAPSHOT_VERSION, "sources": fingerprints,
+                              "config": config_model.to_dict()})
+        temp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as snapshot_file:
+                snapshot_file.write(payload)
+            temp_path.replace(self.snapshot_path)
+        except (OSError, TypeError) as error:
+            self.logger.warning("Failed to write config snapshot %s: %s",
+                                self.snapshot_path, error)
 
     def construct(self) -> ConfigModel:
         """Construct the configuration model from loaded data."""
+        fingerprints = self._fingerprints() if self.snapshot_path is not None else None
+        if fingerprints is not None:
+            cached = self._read_snapshot(fingerprints)
+            if cached is not None:
+                self.logger.debug("Using compiled config snapshot %s", self.snapshot_path)
+                return cached
+
         raw_config = self._load_configuration()
         parsed_config = self._parser_values(raw_config)
         config_model = self._map_config(parsed_config)
+
+        if fingerprints is not None:
+            self._write_snapshot(fingerprints, config_model)
         return config_model
@@ -1,7 +1,40 @@
 """Data models for configuration settings."""
 
-from dataclasses import dataclass
-from discord import Intents
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+from discord import Intents, MemberCacheFlags
+from src.core.constants import DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT
+
+@dataclass(frozen=True)
+class CacheConfiguration():
+    """Data model for the discord.py caches.
+
+    The defaults keep memory bounded on large bots: no chunking at startup,
+    no message cache, and member flags derived from the intents unless
+    ``member_cache`` is given. ``chunk_on_demand`` chunks a guild in the
+    background the first time one of its members runs a command.
+    """
+    member_cache: Optional[MemberCacheFlags] = None
+    chunk_guilds_at_startup: bool = False
+    max_messages: int = 0
+    chunk_on_demand: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the configuration to JSON-compatible values."""
+        return {"member_cache": self.member_cache.value if self.member_cache else None,
+                "chunk_guilds_at_startup": self.chunk_guilds_at_startup,
+                "max_messages": self.max_messages, "chunk_on_demand": self.chunk_on_demand}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CacheConfiguration":
+        """Builds the configuration from ``to_dict`` output."""
+        member_cache = None
+        if data["member_cache"] is not None:
+            member_cache = MemberCacheFlags.none()
+            member_cache.value = int(data["member_cache"])
+        return cls(member_cache=member_cache,
+                   chunk_guilds_at_startup=data["chunk_guilds_at_startup"],
+                   max_messages=data["max_messages"], chunk_on_demand=data["chunk_on_demand"])
 
 @dataclass(frozen=True)
 class DiscordConfiguration():
@@ -9,8 +42,105 @@ class DiscordConfiguration():
     token: str
     intents: Intents
     prefix: str
+    cache: CacheConfiguration = CacheConfiguration()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the configuration to JSON-compatible values."""
+        return {"token": self.token, "intents": self.intents.value, "prefix": self.prefix,
+                "cache": self.cache.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DiscordConfiguration":
+        """Builds the configuration from ``to_dict`` output."""
+        intents = Intents.none()
+        intents.value = int(data["intents"])
+        return cls(token=data["token"], intents=intents, prefix=data["prefix"],
+                   cache=CacheConfiguration.from_dict(data["cache"]))
+
+@dataclass(frozen=True)
+class MetricsConfiguration():
+    """Data model for the local metrics endpoint."""
+    enabled: bool = False
+    host: str = DEFAULT_METRICS_HOST
+    port: int = DEFAULT_METRICS_PORT
+    loop_lag_interval: float = 0.5
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the configuration to JSON-compatible values."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MetricsConfiguration":
+        """Builds the configuration from ``to_dict`` output."""
+        return cls(**data)
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class RateLimitConfiguration():
+    """Data model for command rate limits and load shedding.
+
+    Rates are tokens per second; bursts are how many calls may be made at
+    once from a full bucket.
+    """
+    enabled: bool = True
+    user_rate: float = 1.0
+    user_burst: int = 5
+    guild_rate: float = 10.0
+    guild_burst: int = 40
+    command_rate: float = 0.5
+    command_burst: int = 3
+    shed_lag: float = 0.5
+    lag_interval: float = 0.1
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the configuration to JSON-compatible values."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RateLimitConfiguration":
+        """Builds the configuration from ``to_dict`` output."""
+        return cls(**data)
+
+@dataclass(frozen=True)
+class LoggingConfiguration():
+    """Data model for the logging pipeline.
+
+    ``sample_rates`` maps logger names (and their children) to the fraction
+    of their debug records that are written. Records that are not written
+    but are at least ``ring_buffer_level`` are kept, up to
+    ``ring_buffer_size`` of the latest, and written out when an error is
+    logged; a size of 0 (the default) disables the buffer.
+    """
+    sample_rates: dict[str, float] = field(default_factory=dict)
+    ring_buffer_size: int = 0
+    ring_buffer_level: str = "DEBUG"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the configuration to JSON-compatible values."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LoggingConfiguration":
+        """Builds the configuration from ``to_dict`` output."""
+        return cls(**data)
 
 @dataclass(frozen=True)
 class ConfigModel():
     """Data model for configuration settings."""
     discord: DiscordConfiguration
+    metrics: MetricsConfiguration = MetricsConfiguration()
+    rate_limits: RateLimitConfiguration = RateLimitConfiguration()
+    logging: LoggingConfiguration = LoggingConfiguration()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the configuration to JSON-compatible values."""
+        return {"discord": self.discord.to_dict(), "metrics": self.metrics.to_dict(),
+                "rate_limits": self.rate_limits.to_dict(), "logging": self.logging.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ConfigModel":
+        """Builds the configuration from ``to_dict`` output."""
+        return cls(discord=DiscordConfiguration.from_dict(data["discord"]),
+                   metrics=MetricsConfiguration.from_dict(data["metrics"]),
+                   rate_limits=RateLimitConfiguration.from_dict(data["rate_limits"]),
+                   logging=LoggingConfiguration.from_dict(data["logging"]))
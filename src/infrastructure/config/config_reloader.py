@@ -0,0 +1,110 @@
+"""Live reload of the configuration keys that are safe to change at runtime."""
+
+import signal
+import asyncio
+import inspect
+import logging
+import dataclasses
+from logging import Logger
+from typing import Any, Callable, Optional
+from src.infrastructure.config.config_constructor import ConfigConstructor
+from src.infrastructure.config.config_model import ConfigModel
+
+ChangeCallback = Callable[[Any], Any]
+
+def flatten(model: Any, prefix: str = "") -> dict[str, Any]:
+    """Maps the dotted key of every leaf field of a config dataclass to its value."""
+    values = {}
+    for field in dataclasses.fields(model):
+        value = getattr(model, field.name)
+        key = f"{prefix}{field.name}"
+        if dataclasses.is_dataclass(value):
+            values.update(flatten(value, f"{key}."))
+        else:
+            values[key] = value
+    return values
+
+def replace_key(model: Any, key: str, value: Any) -> Any:
+    """Returns a copy of a frozen config dataclass with one dotted key replaced."""
+    name, _, rest = key.partition(".")
+    if rest:
+        value = replace_key(getattr(model, name), rest, value)
+    return dataclasses.replace(model, **{name: value})
+
+class ConfigReloader():
+    """Rebuilds the config on SIGHUP and applies the runtime-safe changes.
+
+    A key is runtime-safe when a callback was registered for it with
+    ``on_change``; the callback receives the new value. Other changed keys
+    (token, intents) are logged as needing a restart and keep their running
+    value in ``current``, so the snapshot always matches what the bot runs.
+    """
+
+    def __init__(self, constructor: ConfigConstructor, current: ConfigModel,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            constructor: Builds a fresh config model from the sources.
+            current: The config the bot was started with.
+            logger: Optional logger.
+        """
+        self.constructor = constructor
+        self.current = current
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._callbacks: dict[str, list[ChangeCallback]] = {}
+        self._lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def on_change(self, key: str, callback: ChangeCallback) -> None:
+        """Marks a dotted key (e.g. ``discord.prefix``) as runtime-safe."""
+        if key not in flatten(self.current):
+            raise KeyError(f"Unknown config key '{key}'.")
+        self._callbacks.setdefault(key, []).append(callback)
+
+    async def reload(self) -> list[str]:
+        """Reloads the sources and applies the runtime-safe changes.
+
+        Returns:
+            list[str]: The keys that were applied.
+        """
+        async with self._lock:
+            try:
+                fresh = await asyncio.to_thread(self.constructor.construct)
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                self.logger.error("Config reload failed, keeping the running config: %s", error)
+                return []
+
+            old_values, new_values = flatten(self.current), flatten(fresh)
+            changed = [key for key, value in new_values.items() if old_values.get(key) != value]
+            applied = []
+            for key in changed:
+                if key not in self._callbacks:
+                    self.logger.warning("Config key '%s' changed but needs a restart to apply.",
+                                        key)
+                    continue
+                for callback in self._callbacks[key]:
+                    result = callback(new_values[key])
+                    if inspect.isawaitable(result):
+                        await result
+                self.current = replace_key(self.current, key, new_values[key])
+                applied.append(key)
+
+            self.logger.info("Config reloaded, applied: %s", applied or "nothing")
+            return applied
+
+    def _on_signal(self) -> None:
+        asyncio.ensure_future(self.reload())
+
+    async def start(self) -> None:
+        """Reloads on SIGHUP; meant to be registered as a bot setup hook."""
+        if not hasattr(signal, "SIGHUP") or self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_signal_handler(signal.SIGHUP, self._on_signal)
+
+    async def stop(self) -> None:
+        """Removes the SIGHUP handler."""
+        if self._loop is not None:
+            self._loop.remove_signal_handler(signal.SIGHUP)
+            self._loop = None
@@ -1,13 +1,20 @@
 """Base class for configuration loaders."""
 
 from abc import abstractmethod
-from typing import Any
+from pathlib import Path
+from typing import Any, Optional
 
 # pylint: disable=too-few-public-methods
 # pylint: disable=unnecessary-ellipsis
 
 class BaseLoader():
-    """Base class for configuration loaders."""
+    """Base class for configuration loaders.
+
+    Loaders are merged in ascending ``priority``: a layer with a higher
+    priority overrides the keys of the layers below it.
+    """
+    priority: int = 0
+
     @abstractmethod
     def load_config(self) -> dict[str, Any]:
         """Load the configuration file.
@@ -16,3 +23,21 @@ class BaseLoader():
             dict: The loaded configuration as a dictionary.
         """
         ...
+
+    def fingerprint(self) -> Optional[dict[str, Any]]:
+        """Cheap fingerprint (mtime and size) of the loaded source.
+
+        Returns:
+            Optional[dict[str, Any]]: None when the source cannot be fingerprinted,
+                which disables the compiled config cache.
+        """
+        config_path = getattr(self, "config_path", None)
+        if not isinstance(config_path, Path):
+            return None
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            return {"path": str(config_path), "missing": True}
+        except OSError:
+            return None
+        return {"path": str(config_path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
@@ -12,6 +12,8 @@ from src.infrastructure.config.loaders.base_loader import BaseLoader
 class EnvLoader(BaseLoader):
     """Class for loading Env configuration files."""
 
+    priority: int = 20
+
     def __init__(self, logger: Optional[Logger] = None,
                 config_path: Path = DEFAULT_ENV_FILE_PATH) -> None:
         self.logger: Logger = logger or logging.getLogger(__name__)
@@ -12,6 +12,8 @@ from src.infrastructure.config.loaders.base_loader import BaseLoader
 class TomlLoader(BaseLoader):
     """Class for loading TOML configuration files."""
 
+    priority: int = 10
+
     def __init__(self, logger: Optional[Logger] = None,
                 config_path: Path = DEFAULT_TOML_CONFIG_PATH) -> None:
         self.logger: Logger = logger or logging.getLogger(__name__)
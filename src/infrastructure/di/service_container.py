@@ -0,0 +1,197 @@
+"""Type-indexed service container used to inject dependencies into cogs."""
+
+import asyncio
+import inspect
+import logging
+from logging import Logger
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+class ServiceNotFoundError(TypeError):
+    """Raised when no registered service satisfies a required dependency."""
+
+@dataclass(frozen=True)
+class Dependency():
+    """A constructor parameter the container has to fill."""
+    name: str
+    annotation: Any
+    optional: bool
+
+# pylint: disable=too-few-public-methods
+class _Provider():
+    """Holds a service instance or the recipe to build it on first use."""
+
+    __slots__ = ("service_type", "factory", "instance", "built")
+
+    def __init__(self, service_type: type, factory: Optional[Callable[[], Any]] = None,
+                 instance: Any = None) -> None:
+        self.service_type = service_type
+        self.factory = factory
+        self.instance = instance
+        self.built = factory is None
+
+    def satisfies(self, annotation: Any) -> bool:
+        """Slow-path check for protocols and ABCs that are not in the MRO."""
+        try:
+            if self.built:
+                return isinstance(self.instance, annotation)
+            return issubclass(self.service_type, annotation)
+        except TypeError:
+            return False
+
+class ServiceContainer():
+    """Resolves services by type, including their base classes and protocols.
+
+    Services are indexed by every class in their MRO when registered, so a
+    lookup is a dict access. Protocol and ABC lookups that are not in any
+    MRO fall back to a scan once and are then cached. Lazy services are built
+    the first time something depends on them; services exposing
+    ``async_init`` / ``aclose`` (or ``close``) get those hooks awaited by
+    ``initialize`` and ``aclose``.
+    """
+
+    def __init__(self, logger: Optional[Logger] = None) -> None:
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._providers: list[_Provider] = []
+        self._index: dict[Any, _Provider] = {}
+        self._plans: dict[Callable[..., Any], tuple[Dependency, ...]] = {}
+        self._built_order: list[Any] = []
+        self._init_tasks: dict[int, asyncio.Task] = {}
+
+    @classmethod
+    def from_instances(cls, services: Iterable[Any],
+                       logger: Optional[Logger] = None) -> "ServiceContainer":
+        """Builds a container holding already constructed services."""
+        container = cls(logger)
+        for service in services:
+            container.register_instance(service)
+        return container
+
+    def register_instance(self, instance: Any) -> None:
+        """Registers an already constructed service."""
+        provider = _Provider(type(instance), instance=instance)
+        self._add(provider)
+        self._built_order.append(instance)
+
+    def register_lazy(self, service_type: type,
+                      factory: Optional[Callable[[], Any]] = None) -> None:
+        """Registers a singleton built on first injection.
+
+        Args:
+            service_type: The type the service is indexed by.
+            factory: Zero-argument callable building the service. Defaults to
+                constructing ``service_type`` with its own dependencies resolved.
+        """
+        self._add(_Provider(service_type,
+                            factory=factory or (lambda: self.instantiate(service_type))))
+
+    def _add(self, provider: _Provider) -> None:
+        self._providers.append(provider)
+        for base in inspect.getmro(provider.service_type)[1:]:
+            if base is not object:
+                self._index.setdefault(base, provider)
+        self._index[provider.service_type] = provider
+
+    def _find(self, annotation: Any) -> Optional[_Provider]:
+        provider = self._index.get(annotation)
+        if provider is None:
+            provider = next((item for item in self._providers if item.satisfies(annotation)), None)
+            if provider is not None:
+                self._index[annotation] = provider
+        return provider
+
+    def _build(self, provider: _Provider) -> Any:
+        if not provider.built:
+            provider.instance = provider.factory()
+            provider.built = True
+            self._built_order.append(provider.instance)
+            self.logger.debug("Built lazy service: %s", provider.service_type.__name__)
+        return provider.instance
+
+    def has(self, annotation: Any) -> bool:
+        """Whether a service satisfying the annotation is registered."""
+        return self._find(annotation) is not None
+
+    def resolve(self, annotation: Any) -> Any:
+        """Returns the service satisfying the annotation, building it if lazy."""
+        provider = self._find(annotation)
+        if provider is None:
+            name = getattr(annotation, "__name__", repr(annotation))
+            raise ServiceNotFoundError(f"Service of type {name} not found.")
+        return self._build(provider)
+
+    def plan_for(self, target: Callable[..., Any]) -> tuple[Dependency, ...]:
+        """Returns the cached constructor parameters of a class or callable."""
+        plan = self._plans.get(target)
+        if plan is None:
+            callable_target = target.__init__ if inspect.isclass(target) else target
+            signature = inspect.signature(callable_target, eval_str=True)
+            plan = tuple(
+                Dependency(name=name, annotation=param.annotation,
+                           optional=param.default is not inspect.Parameter.empty)
+                for name, param in signature.parameters.items()
+                if name != "self" and param.kind not in (inspect.Parameter.VAR_POSITIONAL,
+                                                         inspect.Parameter.VAR_KEYWORD)
+            )
+            self._plans[target] = plan
+        return plan
+
+    def instantiate(self, target: Callable[..., Any], *args: Any, **overrides: Any) -> Any:
+        """Calls a constructor, filling every parameter not given in args or overrides."""
+        name = getattr(target, "__name__", repr(target))
+        dependencies: dict[str, Any] = {}
+
+        for dependency in self.plan_for(target)[len(args):]:
+            if dependency.name in overrides:
+                continue
+
+            if dependency.annotation is inspect.Parameter.empty:
+                if not dependency.optional:
+                    self.logger.warning(
+                        "Parameter '%s' in '%s' has no type hint. Skipping injection.",
+                        dependency.name,
+                        name,
+                    )
+                continue
+
+            provider = self._find(dependency.annotation)
+            if provider is None:
+                if dependency.optional:
+                    continue
+                annotation_name = getattr(dependency.annotation, "__name__",
+                                          repr(dependency.annotation))
+                raise ServiceNotFoundError(
+                    f"Service of type {annotation_name} not found for {name}."
+                )
+
+            dependencies[dependency.name] = self._build(provider)
+
+        return target(*args, **dependencies, **overrides)
+
+    async def initialize(self) -> None:
+        """Awaits ``async_init`` of every built service, once per service."""
+        for service in list(self._built_order):
+            if id(service) in self._init_tasks:
+                continue
+            hook = getattr(service, "async_init", None)
+            if hook is not None:
+                self._init_tasks[id(service)] = asyncio.ensure_future(hook())
+        if self._init_tasks:
+            await asyncio.gather(*self._init_tasks.values())
+
+    async def aclose(self) -> None:
+        """Closes built services in reverse build order."""
+        while self._built_order:
+            service = self._built_order.pop()
+            hook = getattr(service, "aclose", None) or getattr(service, "close", None)
+            if hook is None:
+                continue
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                self.logger.error("Failed to close service %s: %s",
+                                  type(service).__name__, error, exc_info=True)
+        self._init_tasks.clear()
@@ -0,0 +1,219 @@
+"""Admission control for application commands: token buckets and load shedding."""
+
+import time
+import asyncio
+import logging
+import dataclasses
+from collections.abc import Hashable
+from dataclasses import dataclass
+from logging import Logger
+from typing import Any, Callable, Optional, TypeVar
+import discord
+from discord import app_commands
+from src.infrastructure.config.config_model import RateLimitConfiguration
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.interface.i18n.translator import Translator, message_key
+
+RATE_LIMIT_EXTRA = "rate_limit"
+SWEEP_INTERVAL = 60.0
+LAG_SMOOTHING = 0.5
+
+RATE_LIMITED = message_key("admission.rate_limited")
+OVERLOADED = message_key("admission.overloaded")
+
+CommandT = TypeVar("CommandT", app_commands.Command, app_commands.Group)
+
+@dataclass(frozen=True)
+class RateLimit():
+    """Sustained ``rate`` per second with bursts of up to ``burst`` calls."""
+    rate: float
+    burst: int = 1
+
+    @property
+    def interval(self) -> float:
+        """Seconds one token takes to refill."""
+        return 1.0 / self.rate
+
+def rate_limit(rate: float, burst: int = 1) -> Callable[[CommandT], CommandT]:
+    """Gives a command its own per-user limit instead of the configured default.
+
+    Apply it above ``@app_commands.command``::
+
+        @rate_limit(rate=0.1, burst=2)
+        @app_commands.command(name="image")
+    """
+    def decorator(command: CommandT) -> CommandT:
+        command.extras[RATE_LIMIT_EXTRA] = RateLimit(rate, burst)
+        return command
+    return decorator
+
+class TokenBuckets():
+    """Token buckets of one scope, one float per key.
+
+    A bucket is stored as the time at which it will be full again (the GCRA
+    form of a token bucket), so refilling is lazy arithmetic on access and a
+    full bucket is the same as no entry at all. ``sweep`` drops those
+    entries, keeping only keys that were limited recently.
+    """
+
+    __slots__ = ("limit", "_full_at")
+
+    def __init__(self, limit: RateLimit) -> None:
+        self.limit = limit
+        self._full_at: dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._full_at)
+
+    def delay(self, key: Hashable, now: float) -> float:
+        """Seconds until ``key`` has a token; 0 when it has one now."""
+        interval = self.limit.interval
+        full_at = max(self._full_at.get(key, now), now)
+        return max(0.0, full_at + interval - now - self.limit.burst * interval)
+
+    def take(self, key: Hashable, now: float) -> None:
+        """Consumes a token; call only after ``delay`` returned 0."""
+        self._full_at[key] = max(self._full_at.get(key, now), now) + self.limit.interval
+
+    def sweep(self, now: float) -> int:
+        """Drops the buckets that refilled completely; returns how many."""
+        full = [key for key, full_at in self._full_at.items() if full_at <= now]
+        for key in full:
+            del self._full_at[key]
+        return len(full)
+
+# pylint: disable=too-many-instance-attributes
+class AdmissionController():
+    """Decides, before a command defers, whether it may run at all.
+
+    Interactions are refused while the event loop lags more than
+    ``shed_lag`` seconds, then when the user, the guild or the user's calls
+    of that command ran out of tokens. Refusals answer with an ephemeral
+    message right away, so a spammer costs one REST call and no handler
+    work. Loop lag is sampled by a timer callback, without a task, and
+    smoothed so a single slow tick does not start shedding on its own.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, config: RateLimitConfiguration = RateLimitConfiguration(), *,
+                 translator: Optional[Translator] = None,
+                 registry: Optional[MetricsRegistry] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            config: Limits and the load shedding threshold.
+            translator: Localizes the refusal messages.
+            registry: Optional metrics registry for refused interactions.
+            clock: Monotonic clock, replaceable in tests.
+            logger: Optional logger.
+        """
+        self.config = config
+        self.translator = translator or Translator()
+        self.clock = clock
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.loop_lag = 0.0
+        self.users = TokenBuckets(RateLimit(config.user_rate, config.user_burst))
+        self.guilds = TokenBuckets(RateLimit(config.guild_rate, config.guild_burst))
+        self.commands: dict[str, TokenBuckets] = {}
+        self._next_sweep = clock() + SWEEP_INTERVAL
+        self._probe_handle: Optional[asyncio.TimerHandle] = None
+        self._probe_due = 0.0
+        self._rejected = None
+        if registry is not None:
+            self._rejected = registry.counter("kaonim_commands_rejected_total",
+                                              "Interactions refused before running.", ("reason",))
+
+    def update(self, key: str, value: Any) -> None:
+        """Applies one reloaded ``rate_limits`` option."""
+        self.config = dataclasses.replace(self.config, **{key: value})
+        self.users.limit = RateLimit(self.config.user_rate, self.config.user_burst)
+        self.guilds.limit = RateLimit(self.config.guild_rate, self.config.guild_burst)
+        self.commands.clear()
+
+    def _command_buckets(self, command: object) -> Optional[TokenBuckets]:
+        name = getattr(command, "qualified_name", None)
+        if name is None:
+            return None
+        buckets = self.commands.get(name)
+        if buckets is None:
+            limit = getattr(command, "extras", {}).get(RATE_LIMIT_EXTRA) or RateLimit(
+                self.config.command_rate, self.config.command_burst)
+            buckets = self.commands[name] = TokenBuckets(limit)
+        return buckets
+
+    def check(self, interaction: discord.Interaction) -> tuple[Optional[str], float]:
+        """Returns ``(reason, retry_after)``, with no reason when the interaction may run.
+
+        Tokens are only taken when every bucket has one.
+        """
+        if self.loop_lag > self.config.shed_lag:
+            return "overloaded", 0.0
+        if interaction.type is discord.InteractionType.autocomplete:
+            return None, 0.0
+
+        now = self.clock()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        checks = [("user", self.users, interaction.user.id)]
+        if interaction.guild_id is not None:
+            checks.append(("guild", self.guilds, interaction.guild_id))
+        command_buckets = self._command_buckets(interaction.command)
+        if command_buckets is not None:
+            checks.append(("command", command_buckets, interaction.user.id))
+
+        for reason, buckets, key in checks:
+            retry_after = buckets.delay(key, now)
+            if retry_after > 0:
+                return reason, retry_after
+        for _, buckets, key in checks:
+            buckets.take(key, now)
+        return None, 0.0
+
+    def sweep(self, now: float) -> int:
+        """Drops every refilled bucket; returns how many."""
+        self._next_sweep = now + SWEEP_INTERVAL
+        tables = [self.users, self.guilds, *self.commands.values()]
+        return sum(buckets.sweep(now) for buckets in tables)
+
+    async def admit(self, interaction: discord.Interaction) -> bool:
+        """Checks an interaction and answers it ephemerally when it is refused."""
+        if not self.config.enabled:
+            return True
+        reason, retry_after = self.check(interaction)
+        if reason is None:
+            return True
+
+        if self._rejected is not None:
+            self._rejected.labels(reason).inc()
+        if interaction.type is discord.InteractionType.autocomplete:
+            return False
+        messages = self.translator.for_interaction(interaction)
+        message = (messages[OVERLOADED] if reason == "overloaded"
+                   else messages[RATE_LIMITED].format(seconds=max(1, round(retry_after))))
+        try:
+            await interaction.response.send_message(message, ephemeral=True)
+        except discord.HTTPException as error:
+            self.logger.debug("Could not answer a refused interaction: %s", error)
+        return False
+
+    def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        sample = max(0.0, now - self._probe_due)
+        self.loop_lag += LAG_SMOOTHING * (sample - self.loop_lag)
+        self._probe_due = now + self.config.lag_interval
+        self._probe_handle = loop.call_at(self._probe_due, self._probe)
+
+    async def start(self) -> None:
+        """Starts sampling the loop lag; meant to be registered as a bot setup hook."""
+        if self._probe_handle is None:
+            loop = asyncio.get_running_loop()
+            self._probe_due = loop.time() + self.config.lag_interval
+            self._probe_handle = loop.call_at(self._probe_due, self._probe)
+
+    async def close(self) -> None:
+        """Stops sampling the loop lag."""
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
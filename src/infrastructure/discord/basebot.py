@@ -1,24 +1,186 @@
 """Base bot class for the Discord bot implementation."""
 
+import signal
+import asyncio
 import logging
 from logging import Logger
+from typing import Any, Awaitable, Callable, Optional
+import discord
 from discord.ext.commands import AutoShardedBot
 from discord import Intents
+from src.infrastructure.config.config_model import CacheConfiguration
+from src.infrastructure.discord.admission import AdmissionController
+from src.infrastructure.discord.cache_report import estimate_caches, format_estimates
+from src.infrastructure.discord.command_sync import CommandSyncManager
+from src.infrastructure.discord.command_tree import InstrumentedCommandTree
+from src.infrastructure.logs.log_pipeline import is_written
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.metrics.startup_profiler import StartupProfiler
 
+IDENTIFY_INTERVAL = 5.0
+
+CHUNK_CONCURRENCY = 4
+
+# pylint: disable=too-many-instance-attributes
 class BaseBot(AutoShardedBot):
-    """A base class for the Discord bot, extending AutoShardedBot."""
+    """A base class for the Discord bot, extending AutoShardedBot.
+
+    The discord.py caches are sized from ``CacheConfiguration``. With
+    ``chunk_on_demand`` the members of a guild are requested the first time
+    an interaction comes from it, a few guilds at a time, instead of for
+    every guild at startup.
+    """
 
+    # pylint: disable=too-many-arguments
     def __init__(self, token: str, commands_prefix: str, intents: Intents,
-                 logger: Logger, **kwargs) -> None:
+                 logger: Logger, *, force_command_sync: bool = False,
+                 cache: Optional[CacheConfiguration] = None, **kwargs) -> None:
+        kwargs.setdefault("tree_cls", InstrumentedCommandTree)
+        self.cache_config = cache or CacheConfiguration()
+        if self.cache_config.member_cache is not None:
+            kwargs.setdefault("member_cache_flags", self.cache_config.member_cache)
+        kwargs.setdefault("chunk_guilds_at_startup", self.cache_config.chunk_guilds_at_startup)
+        kwargs.setdefault("max_messages", self.cache_config.max_messages or None)
         super().__init__(command_prefix=commands_prefix, intents=intents, **kwargs)
         self.token = token
         self.logger: Logger = logger or logging.getLogger(__name__)
+        self.command_sync = CommandSyncManager(self.tree, logger=self.logger,
+                                               force=force_command_sync)
+        self.setup_hooks: list[Callable[[], Awaitable[None]]] = []
+        self.shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+        self._chunking: dict[int, asyncio.Task] = {}
+        self._chunk_slots: Optional[asyncio.Semaphore] = None
+        self.identify_concurrency = 1
+        self._identify_locks: dict[int, asyncio.Lock] = {}
+        self._identified_at: dict[int, float] = {}
+        self._terminating: Optional[asyncio.Future] = None
+        self.setup_hooks.append(self.prefetch_gateway)
+        self.setup_hooks.append(self.close_on_sigterm)
+
+    def instrument(self, metrics: CommandMetrics) -> None:
+        """Reports command starts, completions and errors to the command metrics."""
+        if not metrics.enabled:
+            return
+        if isinstance(self.tree, InstrumentedCommandTree):
+            self.tree.metrics = metrics
+        self.add_listener(metrics.on_app_command_completion, "on_app_command_completion")
+
+    def admit_with(self, admission: AdmissionController) -> None:
+        """Runs the admission check before every application command."""
+        if isinstance(self.tree, InstrumentedCommandTree):
+            self.tree.admission = admission
+
+    async def setup_hook(self) -> None:
+        """Runs the setup hooks concurrently on the bot loop, before connecting to the gateway."""
+        await asyncio.gather(*(hook() for hook in self.setup_hooks))
+
+    async def prefetch_gateway(self) -> None:
+        """Asks Discord for the recommended shard count while the other setup hooks run.
+
+        Without it ``launch_shards`` makes this request after the login,
+        serially, right before connecting. Discord always returns the default
+        gateway URL, which ``launch_shards`` uses once the count is known.
+        """
+        if self.shard_count is not None:
+            return
+        shard_count, _gateway_url, session_start_limit = await self.http.get_bot_gateway()
+        self.shard_count = shard_count
+        self.identify_concurrency = max(1, session_start_limit.get("max_concurrency", 1))
+        self.logger.debug("Gateway prefetched: %s shards, session start limit %s",
+                          shard_count, session_start_limit)
+
+    async def close_on_sigterm(self) -> None:
+        """Closes the bot, running the shutdown hooks, when the process gets SIGTERM.
+
+        The cluster supervisor stops its workers with SIGTERM, which would
+        otherwise kill the process before the pending state writes and log
+        records are flushed and the gateway is closed.
+        """
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except (NotImplementedError, RuntimeError):
+            # No loop signal handlers on Windows, nor outside the main thread.
+            return
+
+    def _on_sigterm(self) -> None:
+        if self._terminating is None:
+            self.logger.info("Terminated, closing the bot.")
+            self._terminating = asyncio.ensure_future(self.close())
+
+    async def before_identify_hook(self, shard_id: Optional[int], *,
+                                   initial: bool = False) -> None:
+        """Paces identifies per rate limit bucket instead of waiting 5 seconds before each.
+
+        Discord puts a shard in the bucket ``shard_id % max_concurrency`` and
+        lets each bucket identify once every 5 seconds. A shard waits only
+        until its bucket's previous identify is that old, whether it is
+        launching or identifying again after an invalid session, so the
+        first ``max_concurrency`` shards start together.
+        """
+        del initial
+        bucket = (shard_id or 0) % self.identify_concurrency
+        lock = self._identify_locks.get(bucket)
+        if lock is None:
+            lock = self._identify_locks[bucket] = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with lock:
+            previous = self._identified_at.get(bucket)
+            if previous is not None:
+                await asyncio.sleep(max(0.0, previous + IDENTIFY_INTERVAL - loop.time()))
+            self._identified_at[bucket] = loop.time()
 
     async def on_ready(self) -> None:
-        """Event handler called when the bot is ready."""
-        self.logger.info(f"Bot is ready. Logged in as {self.user}")
-        await self.tree.sync()
+        """Event handler called when the bot is ready (also after every reconnect)."""
+        self.logger.info("Bot is ready. Logged in as %s", self.user)
+        if is_written(self.logger, logging.DEBUG):
+            self.logger.debug("Cache estimate: %s", format_estimates(estimate_caches(self)))
+        await self.command_sync.sync()
+
+    async def on_interaction(self, interaction: discord.Interaction) -> None:
+        """Chunks the guild of an interaction when chunking on demand."""
+        self.chunk_on_demand(interaction.guild)
+
+    def chunk_on_demand(self, guild: Optional[discord.Guild]) -> None:
+        """Requests the members of a guild in the background, once, if it is not chunked."""
+        if (guild is None or guild.chunked or not self.cache_config.chunk_on_demand
+                or not self.intents.members or guild.id in self._chunking):
+            return
+        self._chunking[guild.id] = asyncio.create_task(self._chunk(guild))
+
+    async def _chunk(self, guild: discord.Guild) -> None:
+        if self._chunk_slots is None:
+            self._chunk_slots = asyncio.Semaphore(CHUNK_CONCURRENCY)
+        try:
+            async with self._chunk_slots:
+                if not guild.chunked:
+                    await guild.chunk(cache=True)
+        except (discord.ClientException, discord.HTTPException, asyncio.TimeoutError) as error:
+            self.logger.warning("Failed to chunk guild %s: %s", guild.id, error)
+        finally:
+            self._chunking.pop(guild.id, None)
+
+    async def close(self) -> None:
+        """Runs the shutdown hooks (e.g. closing services) before closing the bot."""
+        for hook in self.shutdown_hooks:
+            try:
+                await hook()
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                self.logger.error("Shutdown hook failed: %s", error, exc_info=True)
+        self.shutdown_hooks.clear()
+        await super().close()
+
+    async def serve(self, *steps: Callable[[], Awaitable[Any]], reconnect: bool = True,
+                    profiler: Optional[StartupProfiler] = None) -> None:
+        """Logs in while ``steps`` (e.g. loading the extensions) run, then connects.
 
-    def run_bot(self, reconnect: bool = True) -> None:
-        """Runs the bot"""
-        return super().run(self.token, reconnect=reconnect)
+        Everything runs on the running loop, the one the Cogs were added
+        on; the gateway connection only starts once the login, the setup
+        hooks and every step are done. The steps are called only then, so
+        none is left unawaited when the bot fails to start.
+        """
+        profiler = profiler or StartupProfiler()
+        async with self:
+            await asyncio.gather(profiler.measure("login", self.login(self.token)),
+                                 *(step() for step in steps))
+            await self.connect(reconnect=reconnect)
@@ -1,7 +1,9 @@
 """Factory module for creating Discord bot instances."""
 
 from logging import Logger
+from typing import Optional
 from discord import Intents
+from src.infrastructure.config.config_model import CacheConfiguration
 from src.infrastructure.discord.basebot import BaseBot
 
 class BotFactory():
@@ -9,14 +11,24 @@ class BotFactory():
 
     # pylint: disable=too-few-public-methods
     @staticmethod
-    def create_bot(token: str, commands_prefix: str, intents: Intents, logger: Logger) -> BaseBot:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def create_bot(token: str, commands_prefix: str, intents: Intents, logger: Logger,
+                   force_command_sync: bool = False, shard_ids: Optional[list[int]] = None,
+                   shard_count: Optional[int] = None,
+                   cache: Optional[CacheConfiguration] = None) -> BaseBot:
         """Creates and returns a configured BaseBot instance.
 
         Args:
             commands_prefix (str): The command prefix for the bot.
             logger (Logger): Logger instance for logging.
+            force_command_sync (bool): Sync the command tree even if its hash is unchanged.
+            shard_ids (Optional[list[int]]): Shards run by this process (cluster mode).
+            shard_count (Optional[int]): Total shard count across every process.
+            cache (Optional[CacheConfiguration]): Sizes of the discord.py caches.
         Returns:
             BaseBot: Configured Discord bot instance.
         """
-        bot = BaseBot(token=token, commands_prefix=commands_prefix, intents=intents, logger=logger)
+        bot = BaseBot(token=token, commands_prefix=commands_prefix, intents=intents, logger=logger,
+                      force_command_sync=force_command_sync,
+                      shard_ids=shard_ids, shard_count=shard_count, cache=cache)
         return bot
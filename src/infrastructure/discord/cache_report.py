@@ -0,0 +1,78 @@
+"""Estimates of the memory held by the discord.py caches."""
+
+import sys
+import itertools
+from dataclasses import dataclass
+from typing import Any, Iterable
+import discord
+
+SAMPLE_SIZE = 64
+MAX_DEPTH = 3
+
+@dataclass(frozen=True)
+class CacheEstimate():
+    """Approximate footprint of one cache."""
+    name: str
+    count: int
+    bytes: int
+
+def _attributes(value: Any) -> Iterable[Any]:
+    """Values of the slots of every class in the MRO, then of ``__dict__``."""
+    for cls in type(value).__mro__:
+        names = cls.__dict__.get("__slots__", ())
+        for name in (names,) if isinstance(names, str) else names:
+            if name not in ("__dict__", "__weakref__"):
+                yield getattr(value, name, None)
+    yield from getattr(value, "__dict__", {}).values()
+
+def _shared(value: Any) -> bool:
+    return hasattr(value, "_state")
+
+def deep_size(value: Any, depth: int = 0) -> int:
+    """Size of an object and of the containers and scalars it owns.
+
+    Other discord models (the guild of a member, the members of a guild...)
+    are cached on their own, so only the references to them count.
+    """
+    size = sys.getsizeof(value)
+    if depth >= MAX_DEPTH or isinstance(value, (str, bytes, int, float, bool)):
+        return size
+    if isinstance(value, dict):
+        children: Iterable[Any] = itertools.chain(value.keys(), value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        children = value
+    elif depth == 0:
+        children = _attributes(value)
+    else:
+        return size
+    return size + sum(deep_size(child, depth + 1) for child in children if not _shared(child))
+
+def estimate(name: str, count: int, items: Iterable[Any]) -> CacheEstimate:
+    """Extrapolates the mean size of the first ``SAMPLE_SIZE`` items to ``count``."""
+    sample = list(itertools.islice(items, SAMPLE_SIZE))
+    mean = sum(deep_size(item) for item in sample) / len(sample) if sample else 0
+    return CacheEstimate(name, count, round(mean * count))
+
+def estimate_caches(client: discord.Client) -> list[CacheEstimate]:
+    """Estimates every large cache of a client; cheap enough for a log line."""
+    guilds = client.guilds
+    member_count = sum(len(guild.members) for guild in guilds)
+    channel_count = sum(len(guild.channels) for guild in guilds)
+    role_count = sum(len(guild.roles) for guild in guilds)
+    members = itertools.chain.from_iterable(guild.members for guild in guilds)
+    channels = itertools.chain.from_iterable(guild.channels for guild in guilds)
+    roles = itertools.chain.from_iterable(guild.roles for guild in guilds)
+    return [
+        estimate("guilds", len(guilds), guilds),
+        estimate("members", member_count, members),
+        estimate("users", len(client.users), client.users),
+        estimate("channels", channel_count, channels),
+        estimate("roles", role_count, roles),
+        estimate("emojis", len(client.emojis), client.emojis),
+        estimate("messages", len(client.cached_messages), client.cached_messages),
+    ]
+
+def format_estimates(estimates: Iterable[CacheEstimate]) -> str:
+    """One line, e.g. ``members=1200 (0.4 MiB), messages=0 (0.0 MiB)``."""
+    return ", ".join(f"{item.name}={item.count} ({item.bytes / 2 ** 20:.1f} MiB)"
+                     for item in estimates)
@@ -0,0 +1,100 @@
+"""Persistent cache of which Cog classes each extension module defines."""
+
+import json
+import hashlib
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Any, Optional
+from src.core.constants import DEFAULT_COG_MANIFEST_PATH
+
+MANIFEST_VERSION = 1
+
+def fingerprint_file(file_path: Path) -> dict[str, Any]:
+    """Returns the cheap fingerprint (mtime and size) of a module file."""
+    stat = file_path.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+def hash_file(file_path: Path) -> str:
+    """Returns the sha256 of a module file."""
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+class CogManifest():
+    """Maps module names to the Cog class names they define.
+
+    An entry is trusted while the file mtime and size are unchanged. When
+    they change, the content hash decides whether the module must be scanned
+    again, so a ``touch`` or a checkout does not force a rescan.
+    """
+
+    def __init__(self, manifest_path: Path = DEFAULT_COG_MANIFEST_PATH,
+                 logger: Optional[Logger] = None) -> None:
+        self.manifest_path: Path = manifest_path
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._entries: dict[str, dict[str, Any]] = self._read()
+        self._dirty = False
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            self.logger.warning("Ignoring unreadable cog manifest %s: %s",
+                                self.manifest_path, error)
+            return {}
+
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("modules", {})
+
+    def lookup(self, module_name: str, file_path: Path) -> Optional[list[str]]:
+        """Returns the cached Cog names of a module, or None if it must be scanned."""
+        entry = self._entries.get(module_name)
+        if entry is None:
+            return None
+
+        try:
+            fingerprint = fingerprint_file(file_path)
+        except OSError:
+            return None
+
+        if all(entry.get(key) == value for key, value in fingerprint.items()):
+            return list(entry["cogs"])
+
+        if entry.get("sha256") != hash_file(file_path):
+            return None
+
+        entry.update(fingerprint)
+        self._dirty = True
+        return list(entry["cogs"])
+
+    def store(self, module_name: str, file_path: Path, cog_names: list[str]) -> None:
+        """Records the Cog names found in a freshly scanned module."""
+        self._entries[module_name] = {
+            **fingerprint_file(file_path),
+            "sha256": hash_file(file_path),
+            "cogs": cog_names,
+        }
+        self._dirty = True
+
+    def discard(self, module_name: str) -> None:
+        """Forgets a module, e.g. when it failed to import."""
+        if self._entries.pop(module_name, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Writes the manifest if anything changed."""
+        if not self._dirty:
+            return
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.tmp")
+            temp_path.write_text(
+                json.dumps({"version": MANIFEST_VERSION, "modules": self._entries}, indent=2),
+                encoding="utf-8",
+            )
+            temp_path.replace(self.manifest_path)
+            self._dirty = False
+        except OSError as error:
+            self.logger.warning("Failed to write cog manifest %s: %s", self.manifest_path, error)
@@ -0,0 +1,123 @@
+"""Hash-gated application command sync."""
+
+import json
+import hashlib
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Any, Optional
+import discord
+from discord import app_commands
+from src.core.constants import DEFAULT_COMMAND_SYNC_STATE_PATH
+
+GLOBAL_SCOPE = "global"
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class CommandSyncManager():
+    """Syncs the command tree only when its serialized form changed.
+
+    The hash of every command is stored per scope (global and each guild) in
+    a JSON state file, so reconnects and restarts with an unchanged tree cost
+    no REST call, and the log says exactly which commands changed.
+    """
+
+    def __init__(self, tree: app_commands.CommandTree,
+                 state_path: Path = DEFAULT_COMMAND_SYNC_STATE_PATH,
+                 logger: Optional[Logger] = None, force: bool = False) -> None:
+        """
+        Args:
+            tree: The command tree to sync.
+            state_path: JSON file holding the last synced hashes.
+            logger: Optional logger.
+            force: Sync every scope on the next call regardless of the hashes.
+        """
+        self.tree = tree
+        self.state_path: Path = state_path
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.force = force
+
+    def _read_state(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            self.logger.warning("Ignoring unreadable command sync state %s: %s",
+                                self.state_path, error)
+            return {}
+
+    def _write_state(self, state: dict[str, Any]) -> None:
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(f"{self.state_path.name}.tmp")
+            temp_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+            temp_path.replace(self.state_path)
+        except OSError as error:
+            self.logger.warning("Failed to write command sync state %s: %s",
+                                self.state_path, error)
+
+    def _guild_ids(self) -> set[int]:
+        # pylint: disable=protected-access
+        return set(getattr(self.tree, "_guild_commands", {}).keys())
+
+    def serialize(self, guild: Optional[discord.abc.Snowflake] = None) -> dict[str, str]:
+        """Hashes every command of a scope, keyed by command type and name."""
+        hashes = {}
+        for command in self.tree.get_commands(guild=guild):
+            payload = command.to_dict(self.tree)
+            hashes[f"{payload.get('type', 1)}:{command.name}"] = _digest(payload)
+        return hashes
+
+    def tree_hash(self, guild: Optional[discord.abc.Snowflake] = None) -> str:
+        """Stable hash of a whole scope."""
+        return _digest(self.serialize(guild))
+
+    def _log_changes(self, scope: str, previous: dict[str, str], current: dict[str, str]) -> None:
+        added = sorted(set(current) - set(previous))
+        removed = sorted(set(previous) - set(current))
+        changed = sorted(key for key in set(current) & set(previous)
+                         if current[key] != previous[key])
+        self.logger.info("Syncing %s commands: added=%s removed=%s changed=%s",
+                         scope, added, removed, changed)
+
+    async def sync(self, force: bool = False) -> list[str]:
+        """Syncs every scope whose hash differs from the last synced one.
+
+        Args:
+            force: Sync every scope regardless of the stored hashes.
+        Returns:
+            list[str]: The scopes that were synced.
+        """
+        force = force or self.force
+        state = self._read_state()
+        application_id = str(getattr(self.tree.client, "application_id", None))
+        if state.get("application_id") != application_id:
+            state = {"application_id": application_id, "scopes": {}}
+        scopes: dict[str, dict[str, str]] = state.setdefault("scopes", {})
+
+        targets: dict[str, Optional[discord.Object]] = {GLOBAL_SCOPE: None}
+        for guild_id in self._guild_ids() | {int(key) for key in scopes if key != GLOBAL_SCOPE}:
+            targets[str(guild_id)] = discord.Object(id=guild_id)
+
+        synced = []
+        for scope, guild in targets.items():
+            current = self.serialize(guild)
+            previous = scopes.get(scope, {})
+            if not force and current == previous:
+                continue
+
+            self._log_changes(scope, previous, current)
+            await self.tree.sync(guild=guild)
+            synced.append(scope)
+            if current or scope == GLOBAL_SCOPE:
+                scopes[scope] = current
+            else:
+                scopes.pop(scope, None)
+            self._write_state(state)
+
+        self.force = False
+        if not synced:
+            self.logger.info("Command tree unchanged, skipping sync.")
+        return synced
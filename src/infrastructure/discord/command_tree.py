@@ -0,0 +1,33 @@
+"""Application command tree reporting to the command metrics."""
+
+from typing import Optional
+import discord
+from discord import app_commands
+from src.infrastructure.discord.admission import AdmissionController
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """Command tree admitting interactions and reporting to ``CommandMetrics``.
+
+    The admission check runs before any command code, so refused commands
+    never reach ``defer``. Completions are reported through the
+    ``app_command_completion`` event.
+    """
+
+    def __init__(self, client: discord.Client, **kwargs) -> None:
+        super().__init__(client, **kwargs)
+        self.metrics: Optional[CommandMetrics] = None
+        self.admission: Optional[AdmissionController] = None
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        if self.admission is not None and not await self.admission.admit(interaction):
+            return False
+        if self.metrics is not None:
+            self.metrics.command_started(interaction)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction,
+                       error: app_commands.AppCommandError, /) -> None:
+        if self.metrics is not None:
+            self.metrics.command_failed(interaction, error)
+        await super().on_error(interaction, error)
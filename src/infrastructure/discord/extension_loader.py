@@ -1,48 +1,127 @@
 """Module for loading extensions with DI"""
 
+import sys
+import json
+import time
+import hashlib
+import asyncio
 import inspect
 import pkgutil
 import importlib
 import logging
 from logging import Logger
 from pathlib import Path
+from types import ModuleType
+from dataclasses import dataclass, field
 from typing import Any, Iterable, Optional
 from discord.ext.commands import Bot, AutoShardedBot, Cog
 from src.core.constants import DEFAULT_COMMANDS_PATH
+from src.infrastructure.discord.cog_manifest import CogManifest, fingerprint_file, hash_file
+from src.infrastructure.di.service_container import ServiceContainer
 
-# pylint: disable=too-few-public-methods
+def discover_modules(search_path: Path) -> list[tuple[str, Path]]:
+    """Lists the extension modules under a folder with their source files."""
+    module_prefix = str(search_path).replace("/", ".").replace("\\", ".")
+    modules = []
+    for _, name, is_package in pkgutil.iter_modules([str(search_path)]):
+        file_path = (search_path / name / "__init__.py" if is_package
+                     else search_path / f"{name}.py")
+        modules.append((f"{module_prefix}.{name}", file_path))
+    return sorted(modules)
+
+async def preimport_extensions(search_path: Path = DEFAULT_COMMANDS_PATH,
+                               logger: Optional[Logger] = None) -> int:
+    """Imports the extension modules in worker threads, before there is a bot to add them to.
+
+    The composition root runs this while the config is still loading;
+    ``ExtensionLoader.load_extensions`` then finds the modules in
+    ``sys.modules``. Failures are only logged at debug level here, the
+    loader reports them when it imports the module again.
+
+    Returns:
+        int: The number of modules imported.
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    def import_module(module_name: str) -> bool:
+        try:
+            importlib.import_module(module_name)
+            return True
+        # pylint: disable=broad-exception-caught
+        except Exception as error:
+            logger.debug("Pre-import of '%s' failed: %s", module_name, error)
+            return False
+
+    imported = await asyncio.gather(*(
+        asyncio.to_thread(import_module, module_name)
+        for module_name, _ in discover_modules(search_path)
+    ))
+    return sum(imported)
+
+@dataclass
+class ExtensionTiming():
+    """Import and registration timing of a single extension module."""
+    module: str
+    cached: bool = False
+    import_seconds: float = 0.0
+    register_seconds: float = 0.0
+    cogs: list[str] = field(default_factory=list)
+
+@dataclass
+class LoadedModule():
+    """An extension module currently loaded, with the Cogs it registered."""
+    file_path: Path
+    fingerprint: dict[str, Any]
+    sha256: str
+    cogs: list[Cog] = field(default_factory=list)
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
 class ExtensionLoader():
     """Class to load extensions (cogs) into the bot with dependency injection."""
 
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
     def __init__(
         self,
         bot: Bot | AutoShardedBot,
-        services: Iterable[Any],
+        services: ServiceContainer | Iterable[Any],
         logger: Optional[Logger] = None,
         search_path: Path = DEFAULT_COMMANDS_PATH,
+        manifest: Optional[CogManifest] = None,
     ):
         """
         Args:
             bot: The Discord Bot instance.
             search_path: The folder path (dotted string or relative path) where Cogs are located.
-            services: List of service instances to be injected into Cogs.
+            services: Container (or plain list of instances) resolving the services
+                injected into Cogs.
             logger: Optional logger.
+            manifest: Optional cache of the Cog classes defined by each module.
         """
         self.bot = bot
         self.search_path = search_path
-        self.services = list(services)
         self.logger = logger or logging.getLogger(__name__)
+        self.container = (services if isinstance(services, ServiceContainer)
+                          else ServiceContainer.from_instances(services, self.logger))
+        self.manifest = manifest or CogManifest(logger=self.logger)
+        self.load_report: list[ExtensionTiming] = []
+        self._modules: dict[str, LoadedModule] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def _discover_modules(self) -> list[tuple[str, Path]]:
+        """Lists the extension modules under search_path with their source files."""
+        return discover_modules(self.search_path)
 
     async def load_extensions(self) -> None:
-        """Finds all Cogs in the search_path and loads them with dependency injection."""
+        """Finds all Cogs in the search_path and loads them with dependency injection.
+
+        Modules are imported concurrently in worker threads and the resulting
+        Cogs are added to the bot concurrently.
+        """
         self.logger.info(
             "Starting to load extensions from '%s'...",
             self.search_path,
         )
 
-        module_prefix = str(self.search_path).replace("/", ".").replace("\\", ".")
-
-        loaded_count = 0
         if not self.search_path.exists():
             self.logger.error(
                 "Extensions path '%s' does not exist.",
@@ -50,46 +129,130 @@ class ExtensionLoader():
             )
             return
 
-        for _, name, _ in pkgutil.iter_modules([str(self.search_path)]):
-            full_module_name = f"{module_prefix}.{name}"
-
-            try:
-                module = importlib.import_module(full_module_name)
+        modules = self._discover_modules()
+        imported = await asyncio.gather(*(
+            asyncio.to_thread(self._import_module, module_name, file_path)
+            for module_name, file_path in modules
+        ))
+        self.manifest.save()
 
-                for item_name in dir(module):
-                    item = getattr(module, item_name)
+        loaded = await asyncio.gather(*(
+            asyncio.gather(*(self._load_cog(cog_class, timing) for cog_class in cog_classes))
+            for timing, cog_classes in imported
+        ))
 
-                    if (
-                        inspect.isclass(item)
-                        and issubclass(item, Cog)
-                        and item is not Cog
-                    ):
-                        await self._load_cog(item)
-                        loaded_count += 1
-
-            # pylint: disable=broad-exception-caught
-            except Exception as error:
-                self.logger.error(
-                    "Failed to import module '%s': %s",
-                    name,
-                    error,
-                    exc_info=True,
-                )
+        for (module_name, file_path), cogs in zip(modules, loaded):
+            self._track_module(module_name, file_path,
+                               [cog for cog in cogs if cog is not None])
 
+        self.load_report = [timing for timing, _ in imported]
+        self._log_report()
         self.logger.info(
             "Finished loading %s extensions.",
-            loaded_count,
+            sum(cog is not None for cogs in loaded for cog in cogs),
+        )
+
+    def _track_module(self, module_name: str, file_path: Path, cogs: list[Cog]) -> None:
+        """Remembers a loaded module so the watcher can detect changes to it."""
+        try:
+            self._modules[module_name] = LoadedModule(
+                file_path=file_path,
+                fingerprint=fingerprint_file(file_path),
+                sha256=hash_file(file_path),
+                cogs=cogs,
+            )
+        except OSError as error:
+            self.logger.warning("Cannot watch module '%s': %s", module_name, error)
+
+    def _import_module(self, module_name: str,
+                       file_path: Path) -> tuple[ExtensionTiming, list[type[Cog]]]:
+        """Imports a module and resolves its Cogs, preferring the manifest over a scan."""
+        timing = ExtensionTiming(module=module_name)
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+
+            cog_classes = None
+            cog_names = self.manifest.lookup(module_name, file_path)
+            if cog_names is not None:
+                cog_classes = self._resolve_cached(module, cog_names)
+                timing.cached = cog_classes is not None
+
+            if cog_classes is None:
+                cog_classes = self._scan_module(module)
+                self.manifest.store(module_name, file_path,
+                                    [cog_class.__name__ for cog_class in cog_classes])
+
+        # pylint: disable=broad-exception-caught
+        except Exception as error:
+            self.manifest.discard(module_name)
+            self.logger.error(
+                "Failed to import module '%s': %s",
+                module_name,
+                error,
+                exc_info=True,
+            )
+            cog_classes = []
+
+        timing.import_seconds = time.perf_counter() - started
+        return timing, cog_classes
+
+    @staticmethod
+    def _is_cog_class(item: Any, module: ModuleType) -> bool:
+        """Whether an attribute is a Cog subclass defined in the given module."""
+        return (
+            inspect.isclass(item)
+            and issubclass(item, Cog)
+            and item is not Cog
+            and item.__module__ == module.__name__
         )
 
-    async def _load_cog(self, cog_class: type[Cog]) -> None:
+    def _scan_module(self, module: ModuleType) -> list[type[Cog]]:
+        """Finds the Cog subclasses defined by a module."""
+        return [
+            item
+            for item in (getattr(module, item_name) for item_name in dir(module))
+            if self._is_cog_class(item, module)
+        ]
+
+    def _resolve_cached(self, module: ModuleType,
+                        cog_names: list[str]) -> Optional[list[type[Cog]]]:
+        """Resolves manifest names, or None if the manifest no longer matches the module."""
+        cog_classes = [getattr(module, cog_name, None) for cog_name in cog_names]
+        if not all(self._is_cog_class(item, module) for item in cog_classes):
+            return None
+        return cog_classes
+
+    def _log_report(self) -> None:
+        """Logs the per-module import and registration timings, slowest first."""
+        if not self.load_report:
+            return
+
+        lines = [
+            f"{timing.module:<40} import {timing.import_seconds * 1000:8.2f}ms"
+            f"  register {timing.register_seconds * 1000:8.2f}ms"
+            f"  cogs {len(timing.cogs)}{'  (cached)' if timing.cached else ''}"
+            for timing in sorted(self.load_report,
+                                 key=lambda item: item.import_seconds + item.register_seconds,
+                                 reverse=True)
+        ]
+        self.logger.info("Extension load report:\n%s", "\n".join(lines))
+
+    async def _load_cog(self, cog_class: type[Cog],
+                        timing: Optional[ExtensionTiming] = None) -> Optional[Cog]:
         """Instantiates a single Cog class injecting dependencies and adds to Bot."""
+        started = time.perf_counter()
         try:
             cog_instance = self._inject_dependencies(cog_class)
+            await self.container.initialize()
             await self.bot.add_cog(cog_instance)
             self.logger.debug(
                 "Successfully loaded Cog: %s",
                 cog_class.__name__,
             )
+            if timing is not None:
+                timing.cogs.append(cog_class.__name__)
+            return cog_instance
         # pylint: disable=broad-exception-caught
         except Exception as error:
             self.logger.error(
@@ -98,37 +261,165 @@ class ExtensionLoader():
                 error,
                 exc_info=True,
             )
+            return None
+        finally:
+            if timing is not None:
+                timing.register_seconds += time.perf_counter() - started
 
-    def _inject_dependencies(self, cog_class: type[Cog]) -> Cog:
-        """Inspects __init__, matches types with available services, and returns instance."""
-        signature = inspect.signature(cog_class.__init__)
-        dependencies: dict[str, Any] = {}
+    def _command_digest(self, cogs: Iterable[Cog]) -> str:
+        """Stable hash of the application command definitions of some Cogs."""
+        payloads = sorted(
+            (command.to_dict(self.bot.tree) for cog in cogs for command in cog.get_app_commands()),
+            key=lambda payload: payload["name"],
+        )
+        return hashlib.sha256(json.dumps(payloads, sort_keys=True).encode()).hexdigest()
 
-        for name, param in signature.parameters.items():
-            if name in ("self", "bot"):
-                continue
+    async def _sync_commands(self) -> None:
+        """Pushes the command tree after a reload changed a command definition."""
+        command_sync = getattr(self.bot, "command_sync", None)
+        if command_sync is not None:
+            await command_sync.sync()
+            return
+        await self.bot.tree.sync()
+        self.logger.info("Command tree synced after reload.")
 
-            param_type = param.annotation
+    async def _swap_cogs(self, old_cogs: list[Cog], new_cogs: list[Cog]) -> None:
+        """Replaces Cogs, putting the old ones back if a new one fails to load."""
+        for cog in old_cogs:
+            await self.bot.remove_cog(cog.__cog_name__)
 
-            if param_type is inspect.Parameter.empty:
-                self.logger.warning(
-                    "Parameter '%s' in '%s' has no type hint. Skipping injection.",
-                    name,
-                    cog_class.__name__,
-                )
-                continue
+        added: list[Cog] = []
+        try:
+            for cog in new_cogs:
+                await self.bot.add_cog(cog, override=True)
+                added.append(cog)
+        except Exception:
+            for cog in added:
+                await self.bot.remove_cog(cog.__cog_name__)
+            for cog in old_cogs:
+                await self.bot.add_cog(cog, override=True)
+            raise
 
-            found_service = next(
-                (service for service in self.services if isinstance(service, param_type)),
-                None,
+    async def reload_module(self, module_name: str, file_path: Path) -> bool:
+        """Reloads one extension module and swaps its Cogs.
+
+        The new module is imported and every new Cog is built (with services
+        re-injected from the container) before the old Cogs are touched, so a
+        broken edit leaves the running version in place. The command tree is
+        only synced when an application command definition changed.
+
+        Returns:
+            bool: Whether the new version is now loaded.
+        """
+        previous = self._modules.get(module_name)
+        old_cogs = previous.cogs if previous is not None else []
+
+        try:
+            module = sys.modules.get(module_name)
+            if module is None:
+                module = await asyncio.to_thread(importlib.import_module, module_name)
+            else:
+                module = await asyncio.to_thread(importlib.reload, module)
+            new_cogs = [self._inject_dependencies(cog_class)
+                        for cog_class in self._scan_module(module)]
+            await self.container.initialize()
+            await self._swap_cogs(old_cogs, new_cogs)
+        # pylint: disable=broad-exception-caught
+        except Exception as error:
+            self.logger.error(
+                "Failed to reload module '%s', keeping the previous version: %s",
+                module_name,
+                error,
+                exc_info=True,
             )
+            return False
+
+        self.manifest.store(module_name, file_path, [type(cog).__name__ for cog in new_cogs])
+        self.manifest.save()
+        self._track_module(module_name, file_path, new_cogs)
+        self.logger.info("Reloaded module '%s' (%s cogs).", module_name, len(new_cogs))
+
+        if self._command_digest(old_cogs) != self._command_digest(new_cogs):
+            await self._sync_commands()
+        return True
+
+    async def unload_module(self, module_name: str) -> None:
+        """Removes the Cogs of a module whose file was deleted."""
+        loaded = self._modules.pop(module_name, None)
+        if loaded is None:
+            return
+
+        for cog in loaded.cogs:
+            await self.bot.remove_cog(cog.__cog_name__)
+        sys.modules.pop(module_name, None)
+        self.manifest.discard(module_name)
+        self.manifest.save()
+        self.logger.info("Unloaded module '%s'.", module_name)
 
-            if found_service is None:
-                if param.default is not inspect.Parameter.empty:
+        if self._command_digest(loaded.cogs) != self._command_digest([]):
+            await self._sync_commands()
+
+    async def reload_changed(self) -> list[str]:
+        """Reloads every module whose content changed since it was loaded.
+
+        Returns:
+            list[str]: The names of the modules that were reloaded.
+        """
+        modules = self._discover_modules()
+        reloaded = []
+
+        for module_name, file_path in modules:
+            loaded = self._modules.get(module_name)
+            try:
+                fingerprint = fingerprint_file(file_path)
+                if loaded is not None and loaded.fingerprint == fingerprint:
                     continue
-                # pylint: disable=line-too-long
-                raise TypeError(f"Service of type {param_type.__name__} not found for Cog {cog_class.__name__}.")
+                if loaded is not None and loaded.sha256 == hash_file(file_path):
+                    loaded.fingerprint = fingerprint
+                    continue
+            except OSError:
+                continue
+
+            if await self.reload_module(module_name, file_path):
+                reloaded.append(module_name)
+
+        discovered = {module_name for module_name, _ in modules}
+        for module_name in [name for name in self._modules if name not in discovered]:
+            await self.unload_module(module_name)
+
+        return reloaded
 
-            dependencies[name] = found_service
+    async def watch(self, interval: float = 1.0) -> None:
+        """Polls the extension modules forever, reloading the ones that change."""
+        self.logger.info("Watching '%s' for changes.", self.search_path)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_changed()
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                self.logger.error("Extension watcher failed: %s", error, exc_info=True)
+
+    async def start_watching(self) -> None:
+        """Starts the watcher on the running loop."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self.watch(), name="extension-watcher")
+
+    async def stop_watching(self) -> None:
+        """Stops the watcher."""
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
 
-        return cog_class(self.bot, **dependencies)
+    def _inject_dependencies(self, cog_class: type[Cog]) -> Cog:
+        """Builds a Cog with the bot and the services its __init__ asks for.
+
+        Constructor plans are cached by the container, and lazy services are
+        only built here, the first time a loaded Cog needs them.
+        """
+        return self.container.instantiate(cog_class, self.bot)
@@ -0,0 +1,188 @@
+"""Adaptive responses: answer directly when a command is fast, defer when it is not."""
+
+import asyncio
+import logging
+from logging import Logger
+from typing import Any, Optional
+import discord
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+
+DIRECT_BUDGET = 1.0
+DEFER_AT = 2.0
+LATENCY_GAIN = 0.125
+DEVIATION_GAIN = 0.25
+
+class LatencyEstimate():
+    """Smoothed handler latency of one command, kept like a TCP round-trip estimate."""
+
+    __slots__ = ("mean", "deviation")
+
+    def __init__(self, sample: float) -> None:
+        self.mean = sample
+        self.deviation = sample / 2
+
+    def observe(self, sample: float) -> None:
+        """Folds one handler latency into the estimate."""
+        self.deviation += DEVIATION_GAIN * (abs(sample - self.mean) - self.deviation)
+        self.mean += LATENCY_GAIN * (sample - self.mean)
+
+    @property
+    def expected(self) -> float:
+        """A pessimistic latency: the mean plus four deviations."""
+        return self.mean + 4 * self.deviation
+
+# pylint: disable=too-many-instance-attributes
+class Reply():
+    """The answer to one interaction, sent directly or as a followup.
+
+    Used as an async context manager from ``AdaptiveResponder.respond``.
+    When the handler was predicted fast, a timer still defers the
+    interaction if nothing was sent by ``defer_at``, so a wrong guess costs
+    a late "thinking…" instead of an expired interaction. Time spent waiting
+    for a deferral is not counted as handler latency, or deferring would
+    make a command look slow and keep it deferred.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, responder: "AdaptiveResponder", interaction: discord.Interaction,
+                 command_name: str, ephemeral: bool, path: str) -> None:
+        self.responder = responder
+        self.interaction = interaction
+        self.command_name = command_name
+        self.ephemeral = ephemeral
+        self.path = path
+        self.started_at = 0.0
+        self.deferral_wait = 0.0
+        self._sent = False
+        self._deferring: Optional[asyncio.Future] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def __aenter__(self) -> "Reply":
+        loop = asyncio.get_running_loop()
+        self.started_at = loop.time()
+        if self.path == "deferred":
+            await self.defer()
+        else:
+            delay = self.responder.defer_at - self.responder.age(self.interaction)
+            self._timer = loop.call_later(max(0.0, delay), self._defer_late)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        if not self._sent:
+            self._settle()
+
+    def _settle(self) -> None:
+        self._sent = True
+        elapsed = asyncio.get_running_loop().time() - self.started_at - self.deferral_wait
+        self.responder.observe(self.command_name, elapsed, self.path)
+
+    def _defer_late(self) -> None:
+        self._timer = None
+        if self._deferring is None:
+            self.path = "late"
+            self.responder.logger.debug("Deferring '%s' late", self.command_name)
+            self._deferring = asyncio.ensure_future(self._defer())
+
+    async def _defer(self) -> None:
+        async with self.responder.metrics.phase(self.interaction, "defer"):
+            await self.interaction.response.defer(thinking=True, ephemeral=self.ephemeral)
+
+    async def defer(self) -> None:
+        """Defers right away, e.g. before a call known to be slow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._deferring is None:
+            self._deferring = asyncio.ensure_future(self._defer())
+        loop = asyncio.get_running_loop()
+        waiting_since = loop.time()
+        try:
+            await self._deferring
+        finally:
+            self.deferral_wait += loop.time() - waiting_since
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        """Sends the answer, or a further followup once it was sent."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._sent:
+            self._settle()
+        metrics = self.responder.metrics
+        if self._deferring is None and not self.interaction.response.is_done():
+            async with metrics.phase(self.interaction, "respond"):
+                await self.interaction.response.send_message(content, ephemeral=self.ephemeral,
+                                                              **kwargs)
+            return
+        if self._deferring is not None:
+            await self._deferring
+        async with metrics.phase(self.interaction, "followup"):
+            await self.interaction.followup.send(content, **kwargs)
+
+class AdaptiveResponder():
+    """Picks, per invocation, between a direct response and defer-then-followup.
+
+    Deferring costs a second REST round-trip and a "thinking…" flash, so
+    commands answer with ``response.send_message`` while the interaction's
+    age plus the command's expected handler latency fits in
+    ``direct_budget``. Otherwise they defer first. The path taken is
+    counted in ``kaonim_command_responses_total{command,path}``, with
+    ``late`` for predicted-fast commands the timer had to defer.
+
+    Cogs use it as::
+
+        async with self.responder.respond(interaction, ephemeral=invisible) as reply:
+            await reply.send(await self.slow_call())
+    """
+
+    def __init__(self, metrics: Optional[CommandMetrics] = None,
+                 direct_budget: float = DIRECT_BUDGET, defer_at: float = DEFER_AT,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            metrics: Command metrics timing the Discord round-trips and counting paths.
+            direct_budget: Interaction age, in seconds, a direct answer must arrive within.
+            defer_at: Interaction age at which an unanswered interaction is deferred.
+            logger: Optional logger.
+        """
+        self.metrics = metrics or CommandMetrics()
+        self.direct_budget = direct_budget
+        self.defer_at = defer_at
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.estimates: dict[str, LatencyEstimate] = {}
+        self._paths = None
+        if self.metrics.registry is not None:
+            self._paths = self.metrics.registry.counter(
+                "kaonim_command_responses_total", "Command answers by response path.",
+                ("command", "path"),
+            )
+
+    @staticmethod
+    def age(interaction: discord.Interaction) -> float:
+        """Seconds since Discord created the interaction; 0 with a clock behind Discord's."""
+        return max(0.0, (discord.utils.utcnow() - interaction.created_at).total_seconds())
+
+    def expected(self, command_name: str) -> float:
+        """Expected handler latency of a command; 0 until it ran once."""
+        estimate = self.estimates.get(command_name)
+        return estimate.expected if estimate is not None else 0.0
+
+    def observe(self, command_name: str, latency: float, path: str) -> None:
+        """Records the handler latency and the response path of one invocation."""
+        estimate = self.estimates.get(command_name)
+        if estimate is None:
+            self.estimates[command_name] = LatencyEstimate(latency)
+        else:
+            estimate.observe(latency)
+        if self._paths is not None:
+            self._paths.labels(command_name, path).inc()
+
+    def respond(self, interaction: discord.Interaction, ephemeral: bool = False) -> Reply:
+        """Returns the reply of an interaction, deciding whether to defer it first."""
+        command = interaction.command
+        command_name = command.qualified_name if command is not None else "unknown"
+        direct = self.age(interaction) + self.expected(command_name) <= self.direct_budget
+        return Reply(self, interaction, command_name, ephemeral,
+                     "direct" if direct else "deferred")
@@ -0,0 +1,211 @@
+"""Message catalog compiler and memory-mapped reader.
+
+Catalogs are written by translators as TOML files named after the locale
+(``pt-BR.toml``), with tables flattened into dotted keys::
+
+    [about]
+    title = "📦 Informações do bot"
+
+and compiled ahead of time into one binary file per locale, which is
+memory-mapped on first use.
+
+Binary layout (little-endian)::
+
+    header   magic "KI18", version u32, count u32, reserved u32,
+             key_index_offset u64, text_index_offset u64, text_offset u64, text_size u64
+    indexes  two tables of (count + 1) u32 offsets relative to text_offset,
+             one for the keys (sorted) and one for the messages
+    text     utf-8 keys followed by utf-8 messages
+"""
+
+import os
+import sys
+import mmap
+import struct
+import logging
+import argparse
+import tomllib
+from array import array
+from pathlib import Path
+from logging import Logger
+from typing import Any, Iterator, Optional
+from src.core.constants import DEFAULT_I18N_CATALOG_PATH, DEFAULT_I18N_SOURCE_PATH
+
+CATALOG_MAGIC = b"KI18"
+CATALOG_VERSION = 1
+CATALOG_HEADER = struct.Struct("<4sIII QQQQ")
+CATALOG_SUFFIX = ".kcat"
+SOURCE_SUFFIX = ".toml"
+
+class CatalogError(Exception):
+    """Raised when a catalog source or compiled file is invalid."""
+
+def flatten_messages(table: dict[str, Any], prefix: str = "") -> dict[str, str]:
+    """Flattens nested TOML tables into dotted message keys."""
+    messages: dict[str, str] = {}
+    for name, value in table.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, dict):
+            messages.update(flatten_messages(value, f"{key}."))
+        elif isinstance(value, str):
+            messages[key] = value
+        else:
+            raise CatalogError(f"Message '{key}' must be a string, not {type(value).__name__}.")
+    return messages
+
+def _offsets(chunks: list[bytes], start: int) -> array:
+    offsets = array("I", [start])
+    for chunk in chunks:
+        offsets.append(offsets[-1] + len(chunk))
+    return offsets
+
+class CatalogCompiler():
+    """Compiles TOML message sources into memory-mappable catalogs."""
+
+    def __init__(self, logger: Optional[Logger] = None) -> None:
+        self.logger: Logger = logger or logging.getLogger(__name__)
+
+    @staticmethod
+    def build(messages: dict[str, str]) -> bytes:
+        """Serialize a flat key -> message mapping into a catalog image."""
+        keys = sorted(messages)
+        encoded_keys = [key.encode("utf-8") for key in keys]
+        encoded_messages = [messages[key].encode("utf-8") for key in keys]
+        key_offsets = _offsets(encoded_keys, 0)
+        text_offsets = _offsets(encoded_messages, key_offsets[-1])
+        if text_offsets.itemsize != 4:
+            raise CatalogError("Platform has no 32-bit unsigned array type.")
+        if sys.byteorder != "little":
+            key_offsets.byteswap()
+            text_offsets.byteswap()
+
+        count = len(keys)
+        key_index_offset = CATALOG_HEADER.size
+        text_index_offset = key_index_offset + (count + 1) * 4
+        text_offset = text_index_offset + (count + 1) * 4
+        text = b"".join(encoded_keys) + b"".join(encoded_messages)
+        header = CATALOG_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, count, 0, key_index_offset,
+                                     text_index_offset, text_offset, len(text))
+        return header + key_offsets.tobytes() + text_offsets.tobytes() + text
+
+    def compile_file(self, source_path: Path, output_path: Path) -> int:
+        """Compiles one locale and atomically replaces its catalog.
+
+        Returns:
+            int: The number of messages written.
+        """
+        with source_path.open("rb") as source_file:
+            try:
+                messages = flatten_messages(tomllib.load(source_file))
+            except tomllib.TOMLDecodeError as error:
+                raise CatalogError(f"Invalid catalog source {source_path}: {error}") from error
+        image = self.build(messages)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(f"{output_path.name}.tmp")
+        temp_path.write_bytes(image)
+        os.replace(temp_path, output_path)
+
+        self.logger.debug("Compiled %s messages into %s", len(messages), output_path)
+        return len(messages)
+
+    def compile(self, source_dir: Path = DEFAULT_I18N_SOURCE_PATH,
+                output_dir: Path = DEFAULT_I18N_CATALOG_PATH) -> list[str]:
+        """Compiles every ``<locale>.toml`` of a directory; returns the locales."""
+        locales = []
+        for source_path in sorted(source_dir.glob(f"*{SOURCE_SUFFIX}")):
+            self.compile_file(source_path, output_dir / f"{source_path.stem}{CATALOG_SUFFIX}")
+            locales.append(source_path.stem)
+        self.logger.info("Compiled %s locales into %s", len(locales), output_dir)
+        return locales
+
+class CatalogReader():
+    """Read-only, memory-mapped view over a compiled catalog."""
+
+    def __init__(self, catalog_path: Path) -> None:
+        self.catalog_path: Path = catalog_path
+        with catalog_path.open("rb") as catalog_file:
+            try:
+                self._map = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                raise CatalogError(f"Catalog file {catalog_path} is empty.") from error
+
+        if len(self._map) < CATALOG_HEADER.size:
+            self.close()
+            raise CatalogError(f"Catalog file {catalog_path} is truncated.")
+        (magic, version, self.count, _, key_index_offset, text_index_offset,
+         self._text_offset, text_size) = CATALOG_HEADER.unpack_from(self._map)
+        if magic != CATALOG_MAGIC:
+            self.close()
+            raise CatalogError(f"Catalog file {catalog_path} has an invalid magic.")
+        if version != CATALOG_VERSION:
+            self.close()
+            raise CatalogError(f"Unsupported catalog version {version} in {catalog_path}.")
+        if self._text_offset + text_size > len(self._map):
+            self.close()
+            raise CatalogError(f"Catalog file {catalog_path} is truncated.")
+
+        index_size = (self.count + 1) * 4
+        view = memoryview(self._map)
+        self._key_offsets = view[key_index_offset:key_index_offset + index_size].cast("I")
+        self._text_offsets = view[text_index_offset:text_index_offset + index_size].cast("I")
+        view.release()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _slice(self, offsets: memoryview, index: int) -> str:
+        start = self._text_offset + offsets[index]
+        end = self._text_offset + offsets[index + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def key(self, index: int) -> str:
+        """Return the key at the given index; keys are sorted."""
+        return self._slice(self._key_offsets, index)
+
+    def find(self, key: str) -> Optional[int]:
+        """Binary-searches the sorted keys."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.count and self.key(low) == key else None
+
+    def message(self, index: int) -> str:
+        """Return the message at the given index."""
+        return self._slice(self._text_offsets, index)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the message of a key, if the catalog has it."""
+        index = self.find(key)
+        return self.message(index) if index is not None else None
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        """Yields every key and message in key order."""
+        for index in range(self.count):
+            yield self.key(index), self.message(index)
+
+    def close(self) -> None:
+        """Release the mapping."""
+        for name in ("_key_offsets", "_text_offsets"):
+            offsets = getattr(self, name, None)
+            if offsets is not None:
+                offsets.release()
+                setattr(self, name, None)
+        self._map.close()
+
+def main() -> None:
+    """Command line entry point used by ``scripts/build_i18n.sh``."""
+    parser = argparse.ArgumentParser(description="Compile the i18n catalogs.")
+    parser.add_argument("source", nargs="?", type=Path, default=DEFAULT_I18N_SOURCE_PATH)
+    parser.add_argument("output", nargs="?", type=Path, default=DEFAULT_I18N_CATALOG_PATH)
+    cli_args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    CatalogCompiler().compile(cli_args.source, cli_args.output)
+
+if __name__ == "__main__":
+    main()
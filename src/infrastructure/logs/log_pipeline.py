@@ -0,0 +1,263 @@
+"""Non-blocking logging: a queue to a writer thread, debug sampling and a crash ring buffer.
+
+``LogPipeline`` is the only handler of the root logger once installed. The
+thread that logs never formats a full line nor writes: a record that passes
+the output level and the sampling rate has its message interpolated and is
+put on a bounded queue, and a ``QueueListener`` thread formats and writes
+it. When the queue is full the record is dropped and counted instead of
+blocking the event loop.
+
+Records that are not written (below the output level, or sampled out) go to
+a ring buffer of the most recent ones, if it is enabled. They are
+interpolated and cut to ``MAX_BUFFERED_MESSAGE`` characters first, so the
+buffer never holds on to large arguments. When an error is logged, or an
+exception escapes the main thread or another thread, the buffer is handed
+to the writer thread as a single record and written out first, so the
+error comes with the debug context that led to it.
+"""
+
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+import collections
+import dataclasses
+from logging import LogRecord
+from types import TracebackType
+from typing import Any, Optional, TextIO
+from src.core.constants import DEFAULT_LOG_FORMAT, DEFAULT_LOG_QUEUE_SIZE
+from src.infrastructure.config.config_model import LoggingConfiguration
+
+DUMP_LEVEL = logging.ERROR
+MAX_BUFFERED_MESSAGE = 1000
+
+class DebugSampler():
+    """Keeps one debug record in ``1 / rate`` per call site of the sampled loggers.
+
+    A rate applies to a logger and its children; the most specific name
+    wins. Sampling is counted per call site (file and line), so a noisy
+    event does not hide a rare one from the same logger.
+    """
+
+    def __init__(self, rates: Optional[dict[str, float]] = None) -> None:
+        self.rates: dict[str, float] = {}
+        self.intervals: dict[str, int] = {}
+        self._counts: dict[tuple[str, int], int] = {}
+        self.update(rates or {})
+
+    def update(self, rates: dict[str, float]) -> None:
+        """Replaces the rates; a rate of 0 drops every debug record of a logger."""
+        for name, rate in rates.items():
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"The sample rate of '{name}' must be between 0 and 1.")
+        self.rates = dict(rates)
+        self.intervals = {}
+        self._counts.clear()
+
+    def _interval(self, name: str) -> int:
+        interval = self.intervals.get(name)
+        if interval is None:
+            prefix = name
+            while prefix not in self.rates and prefix:
+                prefix = prefix.rpartition(".")[0]
+            rate = self.rates.get(prefix, 1.0)
+            interval = self.intervals[name] = round(1.0 / rate) if rate > 0 else 0
+        return interval
+
+    def keep(self, record: LogRecord) -> bool:
+        """Whether a record is written; records above debug are always kept."""
+        if record.levelno > logging.DEBUG or not self.rates:
+            return True
+        interval = self._interval(record.name)
+        if interval <= 1:
+            return interval == 1
+        site = (record.pathname, record.lineno)
+        count = self._counts.get(site, 0)
+        self._counts[site] = count + 1
+        return count % interval == 0
+
+class _Writer(logging.StreamHandler):
+    """Writes the queued records, and the buffered ones a crash buffer dump carries."""
+
+    def emit(self, record: LogRecord) -> None:
+        super().emit(record)
+        for buffered in getattr(record, "buffered", ()):
+            super().emit(buffered)
+
+def _level(name: str) -> int:
+    level = logging.getLevelNamesMapping().get(name.upper())
+    if level is None:
+        raise ValueError(f"Unknown log level '{name}'.")
+    return level
+
+# pylint: disable=too-many-instance-attributes
+class LogPipeline(logging.Handler):
+    """Root handler that queues records for a writer thread and keeps a crash ring buffer."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, level: int = logging.INFO,
+                 config: Optional[LoggingConfiguration] = None, *,
+                 stream: Optional[TextIO] = None, log_format: str = DEFAULT_LOG_FORMAT,
+                 queue_size: int = DEFAULT_LOG_QUEUE_SIZE) -> None:
+        """
+        Args:
+            level: Records below it are only kept in the ring buffer.
+            config: Sampling rates and ring buffer settings.
+            stream: Where the writer thread writes; stderr by default.
+            log_format: Format of the written lines.
+            queue_size: Records waiting for the writer before new ones are dropped.
+        """
+        super().__init__(logging.NOTSET)
+        self.output_level = level
+        self.config = config or LoggingConfiguration()
+        self.sampler = DebugSampler(self.config.sample_rates)
+        self.ring: collections.deque[LogRecord] = collections.deque(
+            maxlen=self.config.ring_buffer_size)
+        self.ring_level = _level(self.config.ring_buffer_level)
+        self.dropped = 0
+        self.records: queue.Queue = queue.Queue(queue_size)
+        self.writer = _Writer(stream)
+        self.writer.setFormatter(logging.Formatter(log_format))
+        self.listener = logging.handlers.QueueListener(self.records, self.writer)
+        self._previous: Optional[tuple[list[logging.Handler], int]] = None
+        self._previous_hooks: Optional[tuple[Any, Any]] = None
+
+    @classmethod
+    def installed(cls) -> Optional["LogPipeline"]:
+        """The pipeline of the root logger, if one is installed."""
+        return next((handler for handler in logging.getLogger().handlers
+                     if isinstance(handler, cls)), None)
+
+    def _root_level(self) -> int:
+        if self.ring.maxlen:
+            return min(self.output_level, self.ring_level)
+        return self.output_level
+
+    def install(self) -> "LogPipeline":
+        """Replaces the root handlers, starts the writer and hooks uncaught exceptions."""
+        root = logging.getLogger()
+        self._previous = (list(root.handlers), root.level)
+        for handler in self._previous[0]:
+            root.removeHandler(handler)
+        root.addHandler(self)
+        root.setLevel(self._root_level())
+        self.listener.start()
+        self._previous_hooks = (sys.excepthook, threading.excepthook)
+        sys.excepthook = self._excepthook
+        threading.excepthook = self._thread_excepthook
+        atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        """Writes what is queued and puts the previous handlers back."""
+        if self._previous is None:
+            return
+        atexit.unregister(self.stop)
+        sys.excepthook, threading.excepthook = self._previous_hooks
+        root = logging.getLogger()
+        root.removeHandler(self)
+        for handler in self._previous[0]:
+            root.addHandler(handler)
+        root.setLevel(self._previous[1])
+        self._previous = None
+        self.listener.stop()
+        self.writer.flush()
+
+    def apply(self, config: LoggingConfiguration) -> None:
+        """Applies new sampling rates and ring buffer settings."""
+        ring_level = _level(config.ring_buffer_level)
+        with self.lock:
+            self.sampler.update(config.sample_rates)
+            if config.ring_buffer_size != self.ring.maxlen:
+                self.ring = collections.deque(self.ring, maxlen=config.ring_buffer_size)
+            self.ring_level = ring_level
+            self.config = config
+        if self._previous is not None:
+            logging.getLogger().setLevel(self._root_level())
+
+    def update(self, name: str, value: Any) -> None:
+        """Applies one changed ``LoggingConfiguration`` field, e.g. from the config reloader."""
+        self.apply(dataclasses.replace(self.config, **{name: value}))
+
+    def _put(self, record: LogRecord) -> None:
+        record.msg = record.getMessage()
+        record.args = None
+        if self.dropped:
+            notice = logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"{self.dropped} log records were dropped, the writer fell behind.",
+            })
+            try:
+                self.records.put_nowait(notice)
+                self.dropped = 0
+            except queue.Full:
+                self.dropped += 1
+                return
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _buffer(self, record: LogRecord) -> None:
+        message = record.getMessage()
+        if len(message) > MAX_BUFFERED_MESSAGE:
+            message = (f"{message[:MAX_BUFFERED_MESSAGE]}... "
+                       f"({len(message) - MAX_BUFFERED_MESSAGE} more characters)")
+        record.msg = message
+        record.args = None
+        self.ring.append(record)
+
+    def _dump(self) -> None:
+        if not self.ring:
+            return
+        buffered = list(self.ring)
+        self.ring.clear()
+        self._put(logging.makeLogRecord({
+            "name": __name__, "levelno": logging.INFO, "levelname": "INFO",
+            "msg": f"--- {len(buffered)} earlier records kept by the crash buffer ---",
+            "buffered": buffered,
+        }))
+
+    def emit(self, record: LogRecord) -> None:
+        """Queues or buffers a record; runs under the handler lock."""
+        if record.levelno >= DUMP_LEVEL:
+            self._dump()
+        if record.levelno >= self.output_level and self.sampler.keep(record):
+            self._put(record)
+        elif self.ring.maxlen and record.levelno >= self.ring_level:
+            self._buffer(record)
+
+    def dump(self) -> None:
+        """Writes the ring buffer out now."""
+        with self.lock:
+            self._dump()
+
+    def _excepthook(self, exc_type: type[BaseException], exc: BaseException,
+                    traceback: Optional[TracebackType]) -> None:
+        if issubclass(exc_type, KeyboardInterrupt):
+            self._previous_hooks[0](exc_type, exc, traceback)
+            return
+        logging.getLogger(__name__).critical("Unhandled exception",
+                                             exc_info=(exc_type, exc, traceback))
+        self.stop()
+
+    def _thread_excepthook(self, args: threading.ExceptHookArgs) -> None:
+        if issubclass(args.exc_type, SystemExit):
+            return
+        thread = args.thread.name if args.thread is not None else "unknown"
+        logging.getLogger(__name__).critical(
+            "Unhandled exception in thread %s", thread,
+            exc_info=(args.exc_type, args.exc_value, args.exc_traceback))
+
+def is_written(logger: logging.Logger, level: int) -> bool:
+    """Like ``logger.isEnabledFor``, but false for records that would only be buffered.
+
+    Guards diagnostics that are expensive to compute, which are not worth
+    keeping in the ring buffer.
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    pipeline = LogPipeline.installed()
+    return pipeline is None or level >= pipeline.output_level
@@ -0,0 +1,120 @@
+"""Per-command latency and error instrumentation for application commands."""
+
+import time
+from typing import Any, Optional
+import discord
+from discord import app_commands
+from src.infrastructure.metrics.registry import MetricsRegistry
+
+STARTED_AT_KEY = "metrics.started_at"
+PHASES_KEY = "metrics.phases"
+
+# pylint: disable=too-few-public-methods
+class _NullPhase():
+    """Shared no-op timer used while metrics are disabled."""
+
+    __slots__ = ()
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+_NULL_PHASE = _NullPhase()
+
+class _PhaseTimer():
+    """Times one phase of a command into ``interaction.extras``."""
+
+    __slots__ = ("interaction", "name", "started_at")
+
+    def __init__(self, interaction: discord.Interaction, name: str) -> None:
+        self.interaction = interaction
+        self.name = name
+        self.started_at = 0.0
+
+    async def __aenter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        phases = self.interaction.extras.setdefault(PHASES_KEY, {})
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.started_at
+
+class CommandMetrics():
+    """Records per-command phase latencies and errors.
+
+    The command tree reports when a command starts, completes or fails.
+    Cogs wrap their Discord round-trips with ``phase`` (``defer``,
+    ``followup``). The remaining time is recorded as the ``handler`` phase,
+    and the whole invocation as ``total``. Without a registry every method is
+    a no-op and ``phase`` returns a shared null context.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry
+        if registry is None:
+            return
+        self._latency = registry.histogram(
+            "kaonim_command_phase_seconds", "Application command latency by phase.",
+            ("command", "phase"),
+        )
+        self._calls = registry.counter(
+            "kaonim_commands_total", "Completed application commands.", ("command",),
+        )
+        self._errors = registry.counter(
+            "kaonim_command_errors_total", "Failed application commands.", ("command", "error"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether metrics are recorded."""
+        return self.registry is not None
+
+    def phase(self, interaction: discord.Interaction, name: str):
+        """Async context manager timing one phase of a command."""
+        if self.registry is None:
+            return _NULL_PHASE
+        return _PhaseTimer(interaction, name)
+
+    def command_started(self, interaction: discord.Interaction) -> None:
+        """Marks the start of a command invocation."""
+        if self.registry is not None:
+            interaction.extras[STARTED_AT_KEY] = time.perf_counter()
+
+    def _record(self, interaction: discord.Interaction, command_name: str) -> None:
+        started_at = interaction.extras.get(STARTED_AT_KEY)
+        if started_at is None:
+            return
+        total = time.perf_counter() - started_at
+        phases: dict[str, float] = interaction.extras.get(PHASES_KEY, {})
+        for name, duration in phases.items():
+            self._latency.labels(command_name, name).observe(duration)
+        self._latency.labels(command_name, "handler").observe(
+            max(0.0, total - sum(phases.values()))
+        )
+        self._latency.labels(command_name, "total").observe(total)
+
+    def command_completed(self, interaction: discord.Interaction,
+                          command: app_commands.Command | app_commands.ContextMenu) -> None:
+        """Records the phases of a successful command."""
+        if self.registry is None:
+            return
+        self._calls.labels(command.qualified_name).inc()
+        self._record(interaction, command.qualified_name)
+
+    def command_failed(self, interaction: discord.Interaction,
+                       error: app_commands.AppCommandError) -> None:
+        """Records an error and the phases that ran before it."""
+        if self.registry is None:
+            return
+        command = interaction.command
+        command_name = command.qualified_name if command is not None else "unknown"
+        original = getattr(error, "original", error)
+        self._errors.labels(command_name, type(original).__name__).inc()
+        self._record(interaction, command_name)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction,
+                                        command: app_commands.Command
+                                        | app_commands.ContextMenu) -> None:
+        """Bot listener forwarding the completion event."""
+        self.command_completed(interaction, command)
@@ -0,0 +1,47 @@
+"""Local HTTP listener serving metrics in the Prometheus text format."""
+
+import logging
+from logging import Logger
+from typing import Optional
+from aiohttp import web
+from src.infrastructure.metrics.registry import MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class MetricsServer():
+    """Serves ``GET /metrics`` from the bot event loop."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108,
+                 logger: Optional[Logger] = None) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle_metrics(self, _request: web.Request) -> web.Response:
+        return web.Response(body=self.registry.render().encode("utf-8"),
+                            headers={"Content-Type": CONTENT_TYPE})
+
+    async def start(self) -> None:
+        """Starts listening; meant to be registered as a bot setup hook."""
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as error:
+            await runner.cleanup()
+            self.logger.error("Metrics listener failed on %s:%s: %s", self.host, self.port, error)
+            return
+        self._runner = runner
+        self.logger.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def close(self) -> None:
+        """Stops listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,163 @@
+"""Minimal in-process metrics registry rendered in the Prometheus text format."""
+
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# pylint: disable=too-few-public-methods
+class Counter():
+    """Monotonic counter."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """Increments the counter."""
+        self.value += amount
+
+class Gauge():
+    """Value that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Sets the gauge."""
+        self.value = value
+
+class Histogram():
+    """Cumulative-bucket histogram; ``observe`` is a bisect and two additions."""
+
+    __slots__ = ("bounds", "buckets", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Records a sample."""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """Returns ``(upper bound, samples <= bound)`` pairs, ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.buckets):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+class MetricFamily():
+    """A named metric with one child per combination of label values."""
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, name: str, documentation: str, kind: str,
+                 labelnames: tuple[str, ...], factory: Callable[[], object]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        """Returns the child for these label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+            child = self._children[values] = self._factory()
+        return child
+
+    def render(self) -> Iterable[str]:
+        """Yields the Prometheus text lines of this family."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in sorted(self._children.items()):
+            labels = _format_labels(self.labelnames, values)
+            if isinstance(child, Histogram):
+                for bound, count in child.cumulative():
+                    bucket_labels = _format_labels((*self.labelnames, "le"),
+                                                   (*values, _format_value(bound)))
+                    yield f"{self.name}_bucket{bucket_labels} {count}"
+                yield f"{self.name}_sum{labels} {_format_value(child.total)}"
+                yield f"{self.name}_count{labels} {child.count}"
+            else:
+                yield f"{self.name}{labels} {_format_value(child.value)}"
+
+class MetricsRegistry():
+    """Holds metric families and renders them for a scrape.
+
+    Collectors registered with ``add_collector`` run right before rendering,
+    so values that are cheap to read but costly to track per event (e.g.
+    gateway sequence numbers) are only computed when someone scrapes.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _family(self, name: str, documentation: str, kind: str,
+                labelnames: tuple[str, ...], factory: Callable[[], object]) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = MetricFamily(name, documentation, kind,
+                                                         labelnames, factory)
+        elif family.kind != kind or family.labelnames != labelnames:
+            raise ValueError(f"Metric {name} is already registered differently.")
+        return family
+
+    def counter(self, name: str, documentation: str,
+                labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        """Registers (or returns) a counter family."""
+        return self._family(name, documentation, "counter", labelnames, Counter)
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        """Registers (or returns) a gauge family."""
+        return self._family(name, documentation, "gauge", labelnames, Gauge)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                  buckets: Optional[tuple[float, ...]] = None) -> MetricFamily:
+        """Registers (or returns) a histogram family."""
+        bounds = tuple(sorted(buckets or LATENCY_BUCKETS))
+        return self._family(name, documentation, "histogram", labelnames,
+                            lambda: Histogram(bounds))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Runs a callable before every render."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for family in self._families.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,84 @@
+"""Event-loop lag and per-shard gateway event metrics."""
+
+import time
+import asyncio
+import contextlib
+import logging
+from logging import Logger
+from typing import Optional
+from discord import Client
+from src.infrastructure.metrics.registry import LAG_BUCKETS, MetricsRegistry
+
+LOOP_LAG_METRIC = "kaonim_event_loop_lag_seconds"
+
+class RuntimeMetrics():
+    """Measures event-loop lag and counts gateway events per shard.
+
+    Loop lag is how late a sleep of ``lag_interval`` wakes up. Gateway
+    events are not counted per event: each scrape reads the sequence number
+    of every shard's websocket and adds the delta, so the hot path pays
+    nothing for this metric.
+    """
+
+    def __init__(self, bot: Client, registry: MetricsRegistry, *, lag_interval: float = 0.5,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            bot: The Discord client whose shards are observed.
+            registry: Registry the metrics are added to.
+            lag_interval: Seconds between loop lag probes.
+            logger: Optional logger.
+        """
+        self.bot = bot
+        self.lag_interval = lag_interval
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._lag = registry.histogram(LOOP_LAG_METRIC,
+                                       "Delay of the event loop waking up a timer.",
+                                       buckets=LAG_BUCKETS)
+        self._events = registry.counter("kaonim_gateway_events_total",
+                                        "Gateway dispatch events received per shard.",
+                                        ("shard",))
+        self._last_sequences: dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        registry.add_collector(self.collect_gateway_events)
+
+    def _shard_sequences(self) -> dict[int, int]:
+        sequences = {}
+        for shard_id, shard_info in (getattr(self.bot, "shards", None) or {}).items():
+            # pylint: disable=protected-access
+            websocket = getattr(getattr(shard_info, "_parent", None), "ws", None)
+            sequence = getattr(websocket, "sequence", None)
+            if isinstance(sequence, int):
+                sequences[shard_id] = sequence
+        return sequences
+
+    def collect_gateway_events(self) -> None:
+        """Adds the sequence advance of every shard since the last scrape."""
+        for shard_id, sequence in self._shard_sequences().items():
+            last = self._last_sequences.get(shard_id, 0)
+            # A new session restarts the sequence from zero.
+            delta = sequence - last if sequence >= last else sequence
+            if delta:
+                self._events.labels(str(shard_id)).inc(delta)
+            self._last_sequences[shard_id] = sequence
+
+    async def _run(self) -> None:
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self._lag.labels().observe(
+                max(0.0, time.perf_counter() - started_at - self.lag_interval)
+            )
+
+    async def start(self) -> None:
+        """Starts the loop lag probe; meant to be registered as a bot setup hook."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-probe")
+
+    async def close(self) -> None:
+        """Stops the loop lag probe."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
@@ -0,0 +1,212 @@
+"""Start-up profiling: a timeline of the start-up phases and an import-time breakdown.
+
+Phases may overlap (the composition root runs independent steps
+concurrently), so each one is reported with its start offset and drawn on
+a shared timeline. Imports are timed by an import hook that only exists
+while profiling; it wraps the loader of every module imported after it is
+installed and records the time spent executing the module, with and
+without the modules it imports in turn. This module only depends on the
+standard library so it can be installed before the rest of the bot is
+imported.
+"""
+
+import sys
+import time
+import threading
+import contextlib
+import importlib.abc
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+TIMELINE_WIDTH = 32
+TOP_IMPORTS = 15
+
+ResultT = TypeVar("ResultT")
+
+@dataclass(frozen=True)
+class PhaseTiming():
+    """One start-up phase, in seconds since the profiler was created."""
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def seconds(self) -> float:
+        """Duration of the phase."""
+        return self.finished - self.started
+
+@dataclass(frozen=True)
+class ImportTiming():
+    """Time spent executing a module, without (``own``) and with its own imports."""
+    module: str
+    own_seconds: float
+    cumulative_seconds: float
+
+class _TimedLoader():
+    """Delegates to a loader, timing ``exec_module``."""
+
+    def __init__(self, loader: Any, timer: "ImportTimer") -> None:
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+    def create_module(self, spec: Any) -> Optional[ModuleType]:
+        """Same as the wrapped loader."""
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        """Runs the wrapped loader and records how long it took."""
+        with self._timer.timing(module.__name__):
+            self._loader.exec_module(module)
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that times the modules imported while it is installed."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self._timings: dict[str, ImportTiming] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self) -> None:
+        """Puts the timer in front of the other finders."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        """Removes the timer; modules already imported keep their timings."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname: str, path: Any, target: Optional[ModuleType] = None) -> Any:
+        """Finds the spec with the other finders and wraps its loader."""
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+    @contextlib.contextmanager
+    def timing(self, module: str) -> Iterator[None]:
+        """Times one module; nested imports are subtracted from its own time."""
+        stack: list[float] = self._local.__dict__.setdefault("children", [])
+        stack.append(0.0)
+        started = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - started
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self._timings[module] = ImportTiming(module, elapsed - children, elapsed)
+
+    def timings(self) -> list[ImportTiming]:
+        """Every timed module, slowest own time first."""
+        with self._lock:
+            return sorted(self._timings.values(), key=lambda item: item.own_seconds,
+                          reverse=True)
+
+class StartupProfiler():
+    """Records start-up phases and, when enabled, import times.
+
+    Phases are always recorded, they cost two clock reads; the import timer
+    and the report are only used when profiling was asked for.
+    """
+
+    def __init__(self, enabled: bool = False,
+                 clock: Callable[[], float] = time.perf_counter) -> None:
+        self.enabled = enabled
+        self.clock = clock
+        self.origin = clock()
+        self.phases: list[PhaseTiming] = []
+        self._finished = False
+        self.imports: Optional[ImportTimer] = ImportTimer(clock) if enabled else None
+        if self.imports is not None:
+            self.imports.install()
+
+    def elapsed(self) -> float:
+        """Seconds since the profiler was created."""
+        return self.clock() - self.origin
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the block as a phase; usable around ``await`` too."""
+        started = self.elapsed()
+        try:
+            yield
+        finally:
+            self.phases.append(PhaseTiming(name, started, self.elapsed()))
+
+    async def measure(self, name: str, awaitable: Awaitable[ResultT]) -> ResultT:
+        """Awaits ``awaitable`` as a phase, so concurrent steps each get their own."""
+        with self.phase(name):
+            return await awaitable
+
+    def wrap(self, name: str,
+             function: Callable[[], Awaitable[ResultT]]) -> Callable[[], Awaitable[ResultT]]:
+        """Wraps a hook so every call to it is recorded as a phase."""
+        async def timed() -> ResultT:
+            return await self.measure(name, function())
+        return timed
+
+    def since(self, name: str, started: float = 0.0) -> None:
+        """Records a phase that began ``started`` seconds after the profiler and ends now."""
+        self.phases.append(PhaseTiming(name, started, self.elapsed()))
+
+    def mark(self, name: str) -> None:
+        """Records an instant, e.g. the first ``on_ready``."""
+        now = self.elapsed()
+        self.phases.append(PhaseTiming(name, now, now))
+
+    def finish(self) -> Optional[str]:
+        """Uninstalls the import timer and returns the report, once, when enabled."""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        if self.imports is not None:
+            self.imports.uninstall()
+        return self.report()
+
+    def _timeline(self, phase: PhaseTiming, total: float) -> str:
+        first = int(phase.started / total * TIMELINE_WIDTH) if total else 0
+        last = max(first + 1, round(phase.finished / total * TIMELINE_WIDTH)) if total else 1
+        last = min(last, TIMELINE_WIDTH)
+        first = min(first, last - 1)
+        return " " * first + "#" * (last - first) + " " * (TIMELINE_WIDTH - last)
+
+    def report(self, top: int = TOP_IMPORTS) -> str:
+        """The phases in start order, then the slowest imports."""
+        total = max((phase.finished for phase in self.phases), default=0.0)
+        lines = [f"Start-up profile ({total * 1e3:.1f}ms)",
+                 f"{'phase':<32} {'start':>9} {'duration':>10}  timeline"]
+        lines.extend(
+            f"{phase.name:<32} {phase.started * 1e3:7.1f}ms {phase.seconds * 1e3:8.1f}ms"
+            f"  |{self._timeline(phase, total)}|"
+            for phase in sorted(self.phases, key=lambda item: (item.started, item.finished)))
+
+        if self.imports is not None:
+            timings = self.imports.timings()
+            own_total = sum(item.own_seconds for item in timings)
+            lines.append(f"Imports: {len(timings)} modules, {own_total * 1e3:.1f}ms "
+                         f"(slowest {min(top, len(timings))} by own time)")
+            lines.append(f"{'module':<48} {'own':>9} {'cumulative':>11}")
+            lines.extend(
+                f"{item.module:<48} {item.own_seconds * 1e3:7.1f}ms "
+                f"{item.cumulative_seconds * 1e3:9.1f}ms"
+                for item in timings[:top])
+        return "\n".join(lines)
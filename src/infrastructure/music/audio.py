@@ -0,0 +1,121 @@
+"""Decoders and encoders producing 20 ms voice frames.
+
+Discord voice expects 48 kHz stereo audio in 20 ms frames. Decoders read a
+local file and return raw signed 16-bit little-endian PCM frames; encoders
+turn those into the payload a voice sink sends (Opus for Discord, raw PCM
+for the recording sink used in tests and load simulations).
+"""
+
+import sys
+import wave
+from abc import abstractmethod
+from array import array
+from pathlib import Path
+from typing import Optional
+import discord
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+SAMPLE_WIDTH = 2
+FRAME_DURATION = 0.02
+FRAME_SAMPLES = int(SAMPLE_RATE * FRAME_DURATION)
+FRAME_SIZE = FRAME_SAMPLES * CHANNELS * SAMPLE_WIDTH
+
+class UnsupportedAudioError(Exception):
+    """Raised when a file cannot be decoded into 48 kHz 16-bit PCM."""
+
+class AudioDecoder():
+    """Reads a local file as consecutive 48 kHz stereo s16le frames."""
+
+    @abstractmethod
+    def read_frames(self, count: int) -> list[bytes]:
+        """Returns up to ``count`` full frames; fewer (or none) at the end of the file."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases the file."""
+
+def _pad(chunk: bytes) -> bytes:
+    """Pads the last partial frame of a file with silence."""
+    return chunk + bytes(FRAME_SIZE - len(chunk))
+
+class PcmDecoder(AudioDecoder):
+    """Raw 48 kHz stereo s16le files (``.pcm``)."""
+
+    def __init__(self, path: Path) -> None:
+        self._file = path.open("rb")
+
+    def read_frames(self, count: int) -> list[bytes]:
+        data = self._file.read(FRAME_SIZE * count)
+        frames = [data[start:start + FRAME_SIZE] for start in range(0, len(data), FRAME_SIZE)]
+        if frames and len(frames[-1]) < FRAME_SIZE:
+            frames[-1] = _pad(frames[-1])
+        return frames
+
+    def close(self) -> None:
+        self._file.close()
+
+class WavDecoder(AudioDecoder):
+    """16-bit PCM WAV files at 48 kHz, mono or stereo."""
+
+    def __init__(self, path: Path) -> None:
+        self._wave = wave.open(str(path), "rb")
+        channels = self._wave.getnchannels()
+        if (self._wave.getsampwidth() != SAMPLE_WIDTH or self._wave.getframerate() != SAMPLE_RATE
+                or channels not in (1, 2)):
+            self._wave.close()
+            raise UnsupportedAudioError(
+                f"{path.name} must be 16-bit PCM at {SAMPLE_RATE} Hz, mono or stereo."
+            )
+        self._mono = channels == 1
+
+    def _to_stereo(self, data: bytes) -> bytes:
+        samples = array("h", data)
+        if sys.byteorder != "little":
+            samples.byteswap()
+        stereo = array("h", bytes(len(data) * 2))
+        stereo[0::2] = samples
+        stereo[1::2] = samples
+        if sys.byteorder != "little":
+            stereo.byteswap()
+        return stereo.tobytes()
+
+    def read_frames(self, count: int) -> list[bytes]:
+        data = self._wave.readframes(FRAME_SAMPLES * count)
+        if self._mono:
+            data = self._to_stereo(data)
+        frames = [data[start:start + FRAME_SIZE] for start in range(0, len(data), FRAME_SIZE)]
+        if frames and len(frames[-1]) < FRAME_SIZE:
+            frames[-1] = _pad(frames[-1])
+        return frames
+
+    def close(self) -> None:
+        self._wave.close()
+
+DECODERS: dict[str, type[AudioDecoder]] = {".wav": WavDecoder, ".pcm": PcmDecoder}
+
+def open_decoder(path: Path) -> AudioDecoder:
+    """Opens the decoder matching the file extension."""
+    decoder_class = DECODERS.get(path.suffix.lower())
+    if decoder_class is None:
+        raise UnsupportedAudioError(f"Unsupported audio format '{path.suffix}'.")
+    return decoder_class(path)
+
+# pylint: disable=too-few-public-methods
+class FrameEncoder():
+    """Turns a PCM frame into the payload sent to a voice sink."""
+
+    def encode(self, frame: bytes) -> bytes:
+        """PCM passthrough, used by sinks that take raw audio."""
+        return frame
+
+class OpusFrameEncoder(FrameEncoder):
+    """Opus encoder for Discord voice; one per stream since Opus keeps state."""
+
+    def __init__(self) -> None:
+        self._encoder: Optional[discord.opus.Encoder] = None
+
+    def encode(self, frame: bytes) -> bytes:
+        if self._encoder is None:
+            self._encoder = discord.opus.Encoder()
+        return self._encoder.encode(frame, FRAME_SAMPLES)
@@ -0,0 +1,265 @@
+"""Per-guild queue and pre-buffered frame ring."""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Callable, Optional, Union
+from src.infrastructure.music.audio import (
+    AudioDecoder,
+    FrameEncoder,
+    OpusFrameEncoder,
+    open_decoder,
+)
+from src.infrastructure.music.voice_sink import VoiceSink
+from src.infrastructure.music.worker_pool import AudioWorkerPool
+
+@dataclass(frozen=True)
+class Track():
+    """A local audio file queued for playback."""
+    path: Path
+    title: str
+    requested_by: Optional[int] = None
+
+@dataclass(frozen=True)
+class PlayerStats():
+    """Counters of one guild player."""
+    guild_id: int
+    now_playing: Optional[str]
+    queued: int
+    buffered_frames: int
+    frames_sent: int
+    underruns: int
+
+class TrackStream():
+    """Decoder and encoder state of one track.
+
+    Only one worker job touches a stream at a time; the player never starts
+    a second render of a stream before the first one came back.
+    """
+
+    __slots__ = ("track", "encoder", "decoder", "exhausted")
+
+    def __init__(self, track: Track, encoder: FrameEncoder) -> None:
+        self.track = track
+        self.encoder = encoder
+        self.decoder: Optional[AudioDecoder] = None
+        self.exhausted = False
+
+    def render(self, count: int) -> list[bytes]:
+        """Decodes and encodes up to ``count`` frames; runs on a pool worker."""
+        if self.decoder is None:
+            self.decoder = open_decoder(self.track.path)
+        frames = self.decoder.read_frames(count)
+        if len(frames) < count:
+            self.exhausted = True
+            self.close()
+        return [self.encoder.encode(frame) for frame in frames]
+
+    def close(self) -> None:
+        """Releases the file."""
+        if self.decoder is not None:
+            self.decoder.close()
+            self.decoder = None
+
+RingItem = Union[bytes, Track]
+
+# pylint: disable=too-many-instance-attributes
+class GuildPlayer():
+    """Plays a guild queue from a ring of pre-encoded 20 ms frames.
+
+    Frames are rendered on the shared worker pool in batches: once the ring
+    drops to ``low_watermark`` it is refilled up to ``buffer_frames``. The
+    next track starts rendering as soon as the current one is fully decoded,
+    with a ``Track`` marker in the ring, so transitions have no gap. ``tick``
+    runs on the event loop every 20 ms and only pops from the ring; queue
+    operations never wait for decoding.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, guild_id: int, sink: VoiceSink, pool: AudioWorkerPool, *,
+                 buffer_frames: int = 150, low_watermark: int = 50, prebuffer_frames: int = 10,
+                 batch_frames: int = 25, on_underrun: Optional[Callable[[], None]] = None,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            guild_id: The guild this player belongs to.
+            sink: Where the frames are sent.
+            pool: Shared decode/encode workers.
+            buffer_frames: Frames the ring is refilled up to (150 = 3 s).
+            low_watermark: Ring size that triggers a refill.
+            prebuffer_frames: Frames buffered before playback (re)starts.
+            batch_frames: Frames rendered per worker job.
+            on_underrun: Called every tick the ring is empty while a track plays.
+            logger: Optional logger.
+        """
+        self.guild_id = guild_id
+        self.sink = sink
+        self.pool = pool
+        self.buffer_frames = buffer_frames
+        self.low_watermark = low_watermark
+        self.prebuffer_frames = prebuffer_frames
+        self.batch_frames = batch_frames
+        self.on_underrun = on_underrun
+        self.logger: Logger = logger or logging.getLogger(__name__)
+
+        self.queue: deque[Track] = deque()
+        self.now_playing: Optional[Track] = None
+        self.paused = False
+        self.frames_sent = 0
+        self.underruns = 0
+
+        self._ring: deque[RingItem] = deque()
+        self._buffered = 0
+        self._stream: Optional[TrackStream] = None
+        self._generation = 0
+        self._pending = False
+        self._filling = True
+        self._buffering = True
+        self._speaking = False
+
+    @property
+    def active(self) -> bool:
+        """Whether there is anything left to play."""
+        return bool(self.now_playing or self._ring or self._stream or self.queue)
+
+    def _new_encoder(self) -> FrameEncoder:
+        return OpusFrameEncoder() if self.sink.accepts_opus else FrameEncoder()
+
+    def enqueue(self, track: Track) -> int:
+        """Adds a track and returns its queue position (0 when it is already buffering)."""
+        self.queue.append(track)
+        self._refill()
+        return len(self.queue)
+
+    def pause(self) -> None:
+        """Stops sending frames, keeping the ring."""
+        self.paused = True
+
+    def resume(self) -> None:
+        """Resumes sending frames."""
+        self.paused = False
+
+    def skip(self) -> Optional[Track]:
+        """Drops the rest of the playing track and returns it."""
+        skipped = self.now_playing
+        while self._ring and not isinstance(self._ring[0], Track):
+            self._ring.popleft()
+            self._buffered -= 1
+        if not self._ring:
+            self._cancel_render()
+        self.now_playing = None
+        self._buffering = True
+        self._refill()
+        return skipped
+
+    def stop(self) -> None:
+        """Clears the queue and the ring."""
+        self.queue.clear()
+        self._ring.clear()
+        self._buffered = 0
+        self._cancel_render()
+        self.now_playing = None
+        self._buffering = True
+        self._set_speaking(False)
+
+    def stats(self) -> PlayerStats:
+        """Returns the counters of this player."""
+        return PlayerStats(
+            guild_id=self.guild_id,
+            now_playing=self.now_playing.title if self.now_playing else None,
+            queued=len(self.queue),
+            buffered_frames=self._buffered,
+            frames_sent=self.frames_sent,
+            underruns=self.underruns,
+        )
+
+    def _cancel_render(self) -> None:
+        self._generation += 1
+        stream, self._stream = self._stream, None
+        if stream is not None and not self._pending:
+            stream.close()
+        self._pending = False
+
+    def _refill(self) -> None:
+        """Schedules the next render job if the ring needs frames."""
+        if self._pending:
+            return
+        if self._buffered <= self.low_watermark:
+            self._filling = True
+        elif self._buffered >= self.buffer_frames:
+            self._filling = False
+        if not self._filling:
+            return
+
+        if self._stream is None or self._stream.exhausted:
+            self._stream = None
+            if not self.queue:
+                return
+            track = self.queue.popleft()
+            self._stream = TrackStream(track, self._new_encoder())
+            self._ring.append(track)
+
+        stream, generation = self._stream, self._generation
+        self._pending = True
+        future = self.pool.submit(stream.render, self.batch_frames)
+        future.add_done_callback(lambda done: self._on_rendered(stream, generation, done))
+
+    def _on_rendered(self, stream: TrackStream, generation: int, future: asyncio.Future) -> None:
+        if generation != self._generation:
+            stream.close()
+            return
+        self._pending = False
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            self.logger.error("Failed to render '%s' in guild %s: %s",
+                              stream.track.title, self.guild_id, error)
+            stream.exhausted = True
+            stream.close()
+        else:
+            frames = future.result()
+            self._ring.extend(frames)
+            self._buffered += len(frames)
+        self._refill()
+
+    def _set_speaking(self, speaking: bool) -> None:
+        if speaking != self._speaking:
+            self._speaking = speaking
+            asyncio.ensure_future(self.sink.start() if speaking else self.sink.stop())
+
+    def tick(self) -> Optional[bytes]:
+        """Returns the frame to send for this 20 ms slot, if any."""
+        if self.paused:
+            return None
+        while self._ring and isinstance(self._ring[0], Track):
+            self.now_playing = self._ring.popleft()
+
+        if self._buffering:
+            rendering = self._pending or (self._stream is not None and not self._stream.exhausted)
+            if self._buffered < self.prebuffer_frames and rendering:
+                return None
+            self._buffering = False
+
+        if not self._ring:
+            if self._pending or self._stream is not None:
+                self.underruns += 1
+                self._buffering = True
+                if self.on_underrun is not None:
+                    self.on_underrun()
+                self._refill()
+            else:
+                self.now_playing = None
+                self._set_speaking(False)
+            return None
+
+        frame = self._ring.popleft()
+        self._buffered -= 1
+        self.frames_sent += 1
+        self._set_speaking(True)
+        self._refill()
+        return frame
@@ -0,0 +1,152 @@
+"""Music playback for every guild, driven by one shared 20 ms clock."""
+
+import asyncio
+import contextlib
+import logging
+from logging import Logger
+from typing import Optional
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.infrastructure.music.audio import FRAME_DURATION
+from src.infrastructure.music.guild_player import GuildPlayer, PlayerStats, Track
+from src.infrastructure.music.voice_sink import VoiceSink
+from src.infrastructure.music.worker_pool import AudioWorkerPool
+
+MAX_CATCH_UP = 0.2
+
+# pylint: disable=too-many-instance-attributes
+class MusicService():
+    """Owns the guild players, the shared worker pool and the frame clock.
+
+    A single task ticks every 20 ms and hands one frame per active player to
+    its sink, instead of one timer per guild. When the loop falls behind by
+    less than ``MAX_CATCH_UP`` the missed ticks are sent back to back; beyond
+    that the clock resets so a stall does not turn into a burst. The task
+    stops when no player is active and starts again on the next enqueue.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, pool: Optional[AudioWorkerPool] = None, *, buffer_frames: int = 150,
+                 low_watermark: int = 50, prebuffer_frames: int = 10, batch_frames: int = 25,
+                 registry: Optional[MetricsRegistry] = None,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            pool: Shared decode/encode workers; a default pool is created if omitted.
+            buffer_frames: Frames each guild ring is refilled up to.
+            low_watermark: Ring size that triggers a refill.
+            prebuffer_frames: Frames buffered before playback (re)starts.
+            batch_frames: Frames rendered per worker job.
+            registry: Optional metrics registry for underruns and frames sent.
+            logger: Optional logger.
+        """
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.pool = pool or AudioWorkerPool(logger=self.logger)
+        self.buffer_frames = buffer_frames
+        self.low_watermark = low_watermark
+        self.prebuffer_frames = prebuffer_frames
+        self.batch_frames = batch_frames
+        self.players: dict[int, GuildPlayer] = {}
+        self.underruns = 0
+        self.late_ticks = 0
+        self._task: Optional[asyncio.Task] = None
+
+        self._underrun_counter = self._frames_counter = None
+        if registry is not None:
+            self._underrun_counter = registry.counter(
+                "kaonim_music_buffer_underruns_total",
+                "Ticks where a playing guild had no frame buffered.").labels()
+            self._frames_counter = registry.counter(
+                "kaonim_music_frames_sent_total", "Voice frames sent to sinks.").labels()
+            active = registry.gauge("kaonim_music_active_players", "Guilds playing audio.")
+            registry.add_collector(lambda: active.labels().set(
+                sum(1 for player in self.players.values() if player.active)))
+
+    def _on_underrun(self) -> None:
+        self.underruns += 1
+        if self._underrun_counter is not None:
+            self._underrun_counter.inc()
+
+    def connect(self, guild_id: int, sink: VoiceSink) -> GuildPlayer:
+        """Returns the guild player, creating it or moving it to a new sink."""
+        player = self.players.get(guild_id)
+        if player is None:
+            player = GuildPlayer(guild_id, sink, self.pool, buffer_frames=self.buffer_frames,
+                                 low_watermark=self.low_watermark,
+                                 prebuffer_frames=self.prebuffer_frames,
+                                 batch_frames=self.batch_frames, on_underrun=self._on_underrun,
+                                 logger=self.logger)
+            self.players[guild_id] = player
+        else:
+            player.sink = sink
+        return player
+
+    def player(self, guild_id: int) -> Optional[GuildPlayer]:
+        """Returns the guild player, if connected."""
+        return self.players.get(guild_id)
+
+    def enqueue(self, guild_id: int, track: Track) -> int:
+        """Queues a track on a connected guild and returns its queue position."""
+        player = self.players.get(guild_id)
+        if player is None:
+            raise KeyError(f"Guild {guild_id} is not connected.")
+        position = player.enqueue(track)
+        self.start()
+        return position
+
+    async def disconnect(self, guild_id: int) -> None:
+        """Stops and forgets a guild player."""
+        player = self.players.pop(guild_id, None)
+        if player is not None:
+            player.stop()
+            await player.sink.stop()
+
+    def tick(self) -> bool:
+        """Sends one frame per active player; returns whether any player is active."""
+        any_active = False
+        for player in list(self.players.values()):
+            frame = player.tick()
+            if frame is not None:
+                try:
+                    player.sink.send_frame(frame)
+                # pylint: disable=broad-exception-caught
+                except Exception as error:
+                    self.logger.error("Voice sink of guild %s failed: %s", player.guild_id, error)
+                    player.stop()
+                    continue
+                if self._frames_counter is not None:
+                    self._frames_counter.inc()
+            any_active = any_active or player.active
+        return any_active
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self.tick():
+            next_tick += FRAME_DURATION
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif delay < -MAX_CATCH_UP:
+                self.late_ticks += 1
+                next_tick = loop.time()
+                await asyncio.sleep(0)
+
+    def start(self) -> None:
+        """Starts the frame clock if it is not running; must be called on the loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="music-clock")
+
+    def stats(self) -> list[PlayerStats]:
+        """Returns the counters of every guild player."""
+        return [player.stats() for player in self.players.values()]
+
+    async def aclose(self) -> None:
+        """Stops the clock, every player and the worker pool."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for guild_id in list(self.players):
+            await self.disconnect(guild_id)
+        await asyncio.to_thread(self.pool.close)
@@ -0,0 +1,54 @@
+"""Destinations of encoded voice frames."""
+
+from abc import abstractmethod
+import discord
+
+class VoiceSink():
+    """Receives one encoded 20 ms frame per tick from a guild player."""
+
+    accepts_opus: bool = True
+
+    @abstractmethod
+    def send_frame(self, frame: bytes) -> None:
+        """Sends a frame; must not block."""
+
+    async def start(self) -> None:
+        """Called when playback starts."""
+
+    async def stop(self) -> None:
+        """Called when playback stops or the queue runs out."""
+
+class DiscordVoiceSink(VoiceSink):
+    """Sends pre-encoded Opus frames through a connected voice client."""
+
+    def __init__(self, voice_client: discord.VoiceClient) -> None:
+        self.voice_client = voice_client
+
+    def send_frame(self, frame: bytes) -> None:
+        if self.voice_client.is_connected():
+            self.voice_client.send_audio_packet(frame, encode=False)
+
+    async def start(self) -> None:
+        await self.voice_client.ws.speak(discord.SpeakingState.voice)
+
+    async def stop(self) -> None:
+        if self.voice_client.is_connected():
+            await self.voice_client.ws.speak(discord.SpeakingState.none)
+
+class RecordingVoiceSink(VoiceSink):
+    """Keeps raw PCM frames in memory; for tests and local load runs."""
+
+    accepts_opus = False
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+        self.playing = False
+
+    def send_frame(self, frame: bytes) -> None:
+        self.frames.append(frame)
+
+    async def start(self) -> None:
+        self.playing = True
+
+    async def stop(self) -> None:
+        self.playing = False
@@ -0,0 +1,46 @@
+"""Bounded pool shared by every guild player for decoding and encoding."""
+
+import os
+import time
+import asyncio
+import logging
+from logging import Logger
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+class AudioWorkerPool():
+    """Runs decode/encode jobs for every guild on a fixed number of threads.
+
+    Threads rather than processes: libopus is called through ctypes, which
+    releases the GIL, and WAV decoding is file reads and slicing, so a few
+    threads keep up with many guilds without shipping decoder state and
+    every frame across process boundaries. Jobs are small batches of
+    frames, so one guild can never hold a worker for long.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 logger: Optional[Logger] = None) -> None:
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="audio-worker")
+        self.jobs = 0
+        self.job_seconds_total = 0.0
+        self.job_seconds_max = 0.0
+
+    def _timed(self, func: Callable[..., Any], *args: Any) -> Any:
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.jobs += 1
+            self.job_seconds_total += elapsed
+            self.job_seconds_max = max(self.job_seconds_max, elapsed)
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """Schedules a job; must be called from the event loop."""
+        return asyncio.get_running_loop().run_in_executor(self._executor, self._timed, func, *args)
+
+    def close(self) -> None:
+        """Stops the workers once the running jobs are done."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
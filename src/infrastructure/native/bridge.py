@@ -0,0 +1,161 @@
+"""Loading of the Nim libraries: lookup, ABI check, typed signatures and fallbacks.
+
+Every library built from ``src/native`` exports ``kaonimAbiVersion``, a
+``cint`` bumped whenever an exported signature changes. A library is looked
+up once per process, by file name, in ``KAONIM_NATIVE_PATH`` and then in the
+project's ``lib`` directory, so nothing depends on the working directory.
+Its signatures are declared once, in a ``NativeLibrary`` spec, and applied
+when it is loaded. Callers that have a pure Python implementation use
+``load_or_fallback`` and keep running when the library is missing, stale or
+broken.
+"""
+
+import os
+import sys
+import ctypes
+import logging
+import functools
+import threading
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, TypeVar
+from src.core.constants import DEFAULT_NATIVE_LIB_PATH
+
+ABI_SYMBOL = "kaonimAbiVersion"
+SEARCH_PATH_ENV = "KAONIM_NATIVE_PATH"
+
+ImplementationT = TypeVar("ImplementationT")
+
+class NativeLibraryError(OSError):
+    """Raised when a library is missing, has another ABI or lacks a symbol."""
+
+@dataclass(frozen=True)
+class NativeFunction():
+    """Signature of one exported function."""
+    name: str
+    argtypes: tuple[Any, ...] = ()
+    restype: Any = None
+
+@dataclass(frozen=True)
+class NativeLibrary():
+    """A library built from ``src/native/<name>.nim`` and the functions it exports."""
+    name: str
+    abi_version: int
+    functions: tuple[NativeFunction, ...]
+
+    @property
+    def filename(self) -> str:
+        """Platform file name written by ``scripts/build_nim.sh``."""
+        if sys.platform == "win32":
+            return f"{self.name}.dll"
+        suffix = ".dylib" if sys.platform == "darwin" else ".so"
+        return f"lib{self.name}{suffix}"
+
+def default_search_paths() -> list[Path]:
+    """``KAONIM_NATIVE_PATH`` entries, then the project's ``lib`` directory."""
+    paths = [Path(entry) for entry in os.environ.get(SEARCH_PATH_ENV, "").split(os.pathsep)
+             if entry]
+    return paths + [DEFAULT_NATIVE_LIB_PATH]
+
+class NativeBridge():
+    """Loads each library at most once and remembers why one is unavailable."""
+
+    def __init__(self, search_paths: Optional[Iterable[Path]] = None,
+                 loader: Callable[[str], Any] = ctypes.CDLL,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            search_paths: Directories searched in order; see ``default_search_paths``.
+            loader: Opens a library file; ``ctypes.CDLL``, replaceable in tests.
+            logger: Optional logger.
+        """
+        self.search_paths = list(search_paths) if search_paths is not None \
+            else default_search_paths()
+        self.loader = loader
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._libraries: dict[str, Any] = {}
+        self._errors: dict[str, NativeLibraryError] = {}
+        self._lock = threading.Lock()
+
+    def locate(self, spec: NativeLibrary) -> Optional[Path]:
+        """Returns the first file of the library in the search paths."""
+        for directory in self.search_paths:
+            path = directory / spec.filename
+            if path.is_file():
+                return path
+        return None
+
+    def _open(self, spec: NativeLibrary) -> Any:
+        path = self.locate(spec)
+        if path is None:
+            searched = ", ".join(str(directory) for directory in self.search_paths)
+            raise NativeLibraryError(f"{spec.filename} not found in {searched} "
+                                     "(run scripts/build_nim.sh).")
+        library = self.loader(str(path.absolute()))
+        try:
+            abi_version = getattr(library, ABI_SYMBOL)
+        except AttributeError as error:
+            raise NativeLibraryError(f"{path} does not export {ABI_SYMBOL}; "
+                                     "rebuild it with scripts/build_nim.sh.") from error
+        abi_version.argtypes = []
+        abi_version.restype = ctypes.c_int
+        found = abi_version()
+        if found != spec.abi_version:
+            raise NativeLibraryError(f"{path} has ABI version {found}, expected "
+                                     f"{spec.abi_version}; rebuild it with scripts/build_nim.sh.")
+        for function in spec.functions:
+            try:
+                symbol = getattr(library, function.name)
+            except AttributeError as error:
+                raise NativeLibraryError(f"{path} does not export {function.name}.") from error
+            symbol.argtypes = list(function.argtypes)
+            symbol.restype = function.restype
+        self.logger.debug("Loaded native library %s (ABI %s)", path, found)
+        return library
+
+    def load(self, spec: NativeLibrary) -> Any:
+        """Returns the loaded library, with its signatures applied.
+
+        Raises:
+            NativeLibraryError: When it cannot be used; the error is cached too.
+        """
+        with self._lock:
+            library = self._libraries.get(spec.name)
+            if library is not None:
+                return library
+            error = self._errors.get(spec.name)
+            if error is not None:
+                raise error
+            try:
+                library = self._libraries[spec.name] = self._open(spec)
+            except OSError as os_error:
+                error = os_error if isinstance(os_error, NativeLibraryError) \
+                    else NativeLibraryError(f"Failed to load {spec.filename}: {os_error}")
+                self._errors[spec.name] = error
+                raise error from os_error
+            return library
+
+    def status(self) -> dict[str, str]:
+        """``loaded`` or the error of every library requested so far."""
+        with self._lock:
+            report = {name: "loaded" for name in self._libraries}
+            report.update((name, str(error)) for name, error in self._errors.items())
+            return report
+
+@functools.cache
+def native_bridge() -> NativeBridge:
+    """The process-wide bridge, created on first use."""
+    return NativeBridge()
+
+def load_or_fallback(spec: NativeLibrary, native: Callable[[Any], ImplementationT],
+                     fallback: Callable[[], ImplementationT], *,
+                     bridge: Optional[NativeBridge] = None,
+                     logger: Optional[Logger] = None) -> ImplementationT:
+    """Builds the native implementation, or the Python one when the library is unusable."""
+    try:
+        return native((bridge or native_bridge()).load(spec))
+    except NativeLibraryError as error:
+        (logger or logging.getLogger(__name__)).warning(
+            "Native %s unavailable (%s); using the Python implementation.", spec.name, error)
+        return fallback()
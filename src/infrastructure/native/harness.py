@@ -0,0 +1,160 @@
+"""Parity and speed harness for the native libraries and their Python fallbacks.
+
+Every case builds the native and the Python implementation of one module,
+runs the same workload on both, compares the outputs and times them, so a
+native module that drifts from its reference, or stops paying for itself,
+shows up in one table::
+
+    python -m src.infrastructure.native.harness
+"""
+
+import sys
+import timeit
+import logging
+import argparse
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+from src.core.constants import DEFAULT_TERMO_WORDS_PATH
+from src.infrastructure.native.bridge import (
+    NativeBridge,
+    NativeLibrary,
+    NativeLibraryError,
+    native_bridge,
+)
+from src.infrastructure.native.libraries import IMAGE_ENGINE, RANDOM_JOKE, TERMO_SCORER
+from src.infrastructure.services.image_service import (
+    PATTERNS,
+    NativeRasterizer,
+    PythonRasterizer,
+    RenderParams,
+)
+from src.infrastructure.services.joke_corpus import JokeCorpusCompiler
+from src.infrastructure.services.joke_engine import NativeJokeEngine, PythonJokeEngine
+from src.infrastructure.termo.scorer import NativeTermoScorer, PythonTermoScorer
+from src.infrastructure.termo.word_list import WordList
+
+IMAGE_SIZE = 48
+IMAGE_TOLERANCE = 0.001
+JOKE_COUNT = 2_000
+TERMO_GUESSES = 20
+
+Compare = Callable[[Any, Any], Optional[str]]
+
+def compare_equal(native: Any, python: Any) -> Optional[str]:
+    """Exact comparison."""
+    return None if native == python else "outputs differ"
+
+def compare_pixels(native: bytes, python: bytes) -> Optional[str]:
+    """Allows off-by-one channels on a few pixels, from float rounding in libm."""
+    if len(native) != len(python):
+        return f"sizes differ: {len(native)} != {len(python)}"
+    off = sum(1 for left, right in zip(native, python) if abs(left - right) > 1)
+    if off > len(native) * IMAGE_TOLERANCE:
+        return f"{off} of {len(native)} bytes differ by more than 1"
+    return None
+
+@dataclass(frozen=True)
+class ParityCase():
+    """One workload run on both implementations of a library."""
+    name: str
+    library: NativeLibrary
+    native: Callable[[Any], Any]
+    python: Callable[[], Any]
+    run: Callable[[Any], Any]
+    compare: Compare = compare_equal
+
+@dataclass(frozen=True)
+class ParityResult():
+    """Outcome of one case; timings are the best of the repeats, in seconds."""
+    name: str
+    mismatch: Optional[str]
+    python_seconds: float
+    native_seconds: Optional[float] = None
+    unavailable: Optional[str] = None
+
+    @property
+    def speedup(self) -> Optional[float]:
+        """How many times faster the native implementation is."""
+        if self.native_seconds is None or self.native_seconds <= 0:
+            return None
+        return self.python_seconds / self.native_seconds
+
+def _render(params: RenderParams) -> Callable[[Any], bytes]:
+    def run(rasterizer: Any) -> bytes:
+        buffer = bytearray(params.scanline_bytes)
+        rasterizer.render_into(buffer, params)
+        return bytes(buffer)
+    return run
+
+def _opened(engine: Any, corpus_path: Path) -> Any:
+    engine.open(corpus_path)
+    return engine
+
+def default_cases(workdir: Path) -> list[ParityCase]:
+    """The cases of every shipped library; ``workdir`` holds their fixtures."""
+    words = WordList.from_file(DEFAULT_TERMO_WORDS_PATH)
+    corpus_path = workdir / "jokes.kjc"
+    corpus_path.write_bytes(JokeCorpusCompiler.build(
+        f"joke {index}: " + "ha" * (index % 30) for index in range(JOKE_COUNT)))
+
+    cases = [ParityCase(
+        "termo.score_many", TERMO_SCORER, NativeTermoScorer, PythonTermoScorer,
+        lambda scorer: [scorer.score_many(words.codes, guess)
+                        for guess in words.codes[:TERMO_GUESSES]],
+    ), ParityCase(
+        # A full cycle of a bag holds every joke once, whatever the permutation.
+        "jokes.fill_batch", RANDOM_JOKE,
+        lambda nim_lib: _opened(NativeJokeEngine(nim_lib), corpus_path),
+        lambda: _opened(PythonJokeEngine(), corpus_path),
+        lambda engine: sorted(engine.fill_batch(1, 1, JOKE_COUNT)),
+    )]
+    cases.extend(ParityCase(f"image.{pattern}", IMAGE_ENGINE, NativeRasterizer, PythonRasterizer,
+                            _render(RenderParams(pattern, IMAGE_SIZE, IMAGE_SIZE, 7)),
+                            compare_pixels)
+                 for pattern in PATTERNS)
+    return cases
+
+def _best(run: Callable[[Any], Any], implementation: Any, repeat: int) -> float:
+    return min(timeit.repeat(lambda: run(implementation), number=1, repeat=repeat))
+
+def run_case(case: ParityCase, bridge: Optional[NativeBridge] = None,
+             repeat: int = 3) -> ParityResult:
+    """Runs a case; without the library only the Python side is timed."""
+    python = case.python()
+    python_seconds = _best(case.run, python, repeat)
+    try:
+        native = case.native((bridge or native_bridge()).load(case.library))
+    except NativeLibraryError as error:
+        return ParityResult(case.name, None, python_seconds, unavailable=str(error))
+
+    mismatch = case.compare(case.run(native), case.run(python))
+    return ParityResult(case.name, mismatch, python_seconds, _best(case.run, native, repeat))
+
+def format_result(result: ParityResult) -> str:
+    """One table row."""
+    python_ms = f"{result.python_seconds * 1e3:9.2f}ms"
+    if result.native_seconds is None:
+        return f"{result.name:<20} {'-':>11} {python_ms}  {'-':>8}  native unavailable"
+    parity = "ok" if result.mismatch is None else f"MISMATCH: {result.mismatch}"
+    return (f"{result.name:<20} {result.native_seconds * 1e3:9.2f}ms {python_ms}  "
+            f"{result.speedup:7.1f}x  {parity}")
+
+def main() -> None:
+    """Prints the table; exits with 1 when a native library disagrees with Python."""
+    parser = argparse.ArgumentParser(description="Compare the native libraries with Python.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per implementation.")
+    cli_args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [run_case(case, repeat=cli_args.repeat)
+                   for case in default_cases(Path(workdir))]
+    print(f"{'case':<20} {'native':>11} {'python':>11}  {'speedup':>8}  parity")
+    for result in results:
+        print(format_result(result))
+    sys.exit(1 if any(result.mismatch is not None for result in results) else 0)
+
+if __name__ == "__main__":
+    main()
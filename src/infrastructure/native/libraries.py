@@ -0,0 +1,63 @@
+"""Signatures of every library built from ``src/native``, declared in one place.
+
+Bump a library's ``abi_version`` here and in its ``.nim`` file together
+whenever an exported signature, or the files it reads, change; a stale
+build then fails the check and the Python fallback is used instead.
+"""
+
+import ctypes
+from typing import Optional
+from src.infrastructure.native.bridge import (
+    NativeBridge,
+    NativeFunction,
+    NativeLibrary,
+    NativeLibraryError,
+    native_bridge,
+)
+
+RANDOM_JOKE = NativeLibrary("random_joke", abi_version=2, functions=(
+    NativeFunction("jokeCorpusOpen", (ctypes.c_char_p,), ctypes.c_int),
+    NativeFunction("jokeCorpusClose"),
+    NativeFunction("jokeCorpusCount", (), ctypes.c_uint32),
+    NativeFunction("jokeCorpusGet", (ctypes.c_uint32,), ctypes.c_char_p),
+    NativeFunction("jokeCorpusNext", (ctypes.c_uint64, ctypes.c_uint64), ctypes.c_int64),
+    NativeFunction("jokeCorpusFillBatch", (
+        ctypes.c_uint64, ctypes.c_uint64,
+        ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint32), ctypes.c_int,
+    ), ctypes.c_int),
+    NativeFunction("jokeCorpusForget", (ctypes.c_uint64, ctypes.c_uint64)),
+    NativeFunction("getRandomJoke", (), ctypes.c_char_p),
+))
+
+IMAGE_ENGINE = NativeLibrary("image_engine", abi_version=1, functions=(
+    NativeFunction("imageRender", (
+        ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        ctypes.c_uint64,
+    ), ctypes.c_int),
+))
+
+TERMO_SCORER = NativeLibrary("termo_scorer", abi_version=1, functions=(
+    NativeFunction("termoScore", (ctypes.c_uint32, ctypes.c_uint32), ctypes.c_int),
+    NativeFunction("termoScoreMany", (
+        ctypes.c_void_p, ctypes.c_int, ctypes.c_uint32, ctypes.c_void_p,
+    ), ctypes.c_int),
+))
+
+LIBRARIES: tuple[NativeLibrary, ...] = (RANDOM_JOKE, IMAGE_ENGINE, TERMO_SCORER)
+
+def preload_libraries(bridge: Optional[NativeBridge] = None) -> dict[str, str]:
+    """Loads every library up front, e.g. in a thread during start-up.
+
+    The services that use them are built lazily; with the libraries already
+    loaded (or known to be unavailable) building them costs no file I/O.
+
+    Returns:
+        dict[str, str]: ``NativeBridge.status`` after the attempt.
+    """
+    bridge = bridge or native_bridge()
+    for spec in LIBRARIES:
+        try:
+            bridge.load(spec)
+        except NativeLibraryError:
+            pass
+    return bridge.status()
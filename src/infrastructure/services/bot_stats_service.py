@@ -0,0 +1,125 @@
+"""Service keeping guild, user and shard counts up to date incrementally."""
+
+import logging
+from array import array
+from bisect import bisect_left
+from logging import Logger
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+@dataclass(frozen=True)
+class ShardStats():
+    """Counts for a single shard."""
+    guilds: int
+    members: int
+
+@dataclass(frozen=True)
+class BotStatsSnapshot():
+    """Immutable view of the counters at a point in time."""
+    guilds: int
+    unique_users: int
+    shards: Mapping[int, ShardStats] = field(default_factory=dict)
+
+class BotStatsService():
+    """Tracks unique users, guilds and per-shard counts from gateway events.
+
+    Every guild keeps its member IDs in a sorted ``array('Q')`` (8 bytes per
+    member) and a refcount per user counts in how many guilds the user is
+    seen, so the unique user count is always known without walking the
+    member cache. Joins and leaves find their position by binary search, but
+    the insert or removal shifts the tail of the array, so they are O(n) in
+    the guild's size; that is a ``memmove`` of at most 8 bytes per member.
+    """
+
+    def __init__(self, logger: Optional[Logger] = None) -> None:
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self._guild_members: dict[int, array] = {}
+        self._guild_shards: dict[int, int] = {}
+        self._user_refs: dict[int, int] = {}
+        self._shard_guilds: dict[int, int] = {}
+        self._shard_members: dict[int, int] = {}
+        self._snapshot: Optional[BotStatsSnapshot] = None
+
+    def sync_guild(self, guild_id: int, shard_id: int, member_ids: Iterable[int]) -> None:
+        """Adds a guild or replaces its tracked members, e.g. after chunking."""
+        self.remove_guild(guild_id)
+
+        members = array("Q", sorted(set(member_ids)))
+        self._guild_members[guild_id] = members
+        self._guild_shards[guild_id] = shard_id
+        self._shard_guilds[shard_id] = self._shard_guilds.get(shard_id, 0) + 1
+        self._shard_members[shard_id] = self._shard_members.get(shard_id, 0) + len(members)
+        for user_id in members:
+            self._user_refs[user_id] = self._user_refs.get(user_id, 0) + 1
+        self._snapshot = None
+
+    def remove_guild(self, guild_id: int) -> None:
+        """Stops tracking a guild and releases its members."""
+        members = self._guild_members.pop(guild_id, None)
+        if members is None:
+            return
+
+        shard_id = self._guild_shards.pop(guild_id)
+        self._shard_guilds[shard_id] -= 1
+        self._shard_members[shard_id] -= len(members)
+        for user_id in members:
+            self._release_user(user_id)
+        self._snapshot = None
+
+    def add_member(self, guild_id: int, user_id: int) -> None:
+        """Records a member joining a tracked guild."""
+        members = self._guild_members.get(guild_id)
+        if members is None:
+            return
+
+        position = bisect_left(members, user_id)
+        if position < len(members) and members[position] == user_id:
+            return
+
+        members.insert(position, user_id)
+        self._shard_members[self._guild_shards[guild_id]] += 1
+        self._user_refs[user_id] = self._user_refs.get(user_id, 0) + 1
+        self._snapshot = None
+
+    def remove_member(self, guild_id: int, user_id: int) -> None:
+        """Records a member leaving a tracked guild."""
+        members = self._guild_members.get(guild_id)
+        if members is None:
+            return
+
+        position = bisect_left(members, user_id)
+        if position >= len(members) or members[position] != user_id:
+            return
+
+        members.pop(position)
+        self._shard_members[self._guild_shards[guild_id]] -= 1
+        self._release_user(user_id)
+        self._snapshot = None
+
+    def tracked_member_count(self, guild_id: int) -> int:
+        """Number of members tracked for a guild, used to detect stale guilds."""
+        members = self._guild_members.get(guild_id)
+        return len(members) if members is not None else 0
+
+    def snapshot(self) -> BotStatsSnapshot:
+        """Returns the current counts; cached until the next change."""
+        if self._snapshot is None:
+            shards = {
+                shard_id: ShardStats(guilds=guilds, members=self._shard_members.get(shard_id, 0))
+                for shard_id, guilds in self._shard_guilds.items()
+                if guilds > 0
+            }
+            self._snapshot = BotStatsSnapshot(
+                guilds=len(self._guild_members),
+                unique_users=len(self._user_refs),
+                shards=MappingProxyType(shards),
+            )
+        return self._snapshot
+
+    def _release_user(self, user_id: int) -> None:
+        refs = self._user_refs.get(user_id, 0) - 1
+        if refs > 0:
+            self._user_refs[user_id] = refs
+        else:
+            self._user_refs.pop(user_id, None)
@@ -0,0 +1,274 @@
+"""Service generating procedural (non-AI) images with the native rasterizer."""
+
+import math
+import asyncio
+import ctypes
+import dataclasses
+import logging
+import struct
+import zlib
+from dataclasses import dataclass
+from logging import Logger
+from typing import Any, Optional, Protocol, Union
+from src.core.constants import DEFAULT_IMAGE_CACHE_BYTES
+from src.infrastructure.native.bridge import NativeBridge, load_or_fallback
+from src.infrastructure.native.libraries import IMAGE_ENGINE
+from src.infrastructure.services.render_cache import RenderCache, RenderCacheStats
+
+PATTERNS: tuple[str, ...] = ("gradient", "plasma", "mandelbrot", "noise")
+MIN_SIZE = 16
+MAX_SIZE = 1024
+# Longest side rendered by the Python rasterizer, which holds the GIL for the whole render.
+MAX_PYTHON_SIZE = 256
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+MASK64 = (1 << 64) - 1
+MAX_ITERATIONS = 128
+NOISE_OCTAVES = 5
+MANDELBROT_CENTERS = ((-0.743643887, 0.131825904), (-0.101096, 0.956286),
+                      (-1.250660, 0.020120), (-0.5, 0.0))
+
+WritableBuffer = Union[bytearray, memoryview]
+
+class ImageRenderError(Exception):
+    """Raised when the rasterizer rejects a render."""
+
+@dataclass(frozen=True)
+class RenderParams():
+    """Everything that determines a render; also its cache key."""
+    pattern: str
+    width: int
+    height: int
+    seed: int
+
+    def __post_init__(self) -> None:
+        if self.pattern not in PATTERNS:
+            raise ValueError(f"Unknown pattern '{self.pattern}'.")
+        for side in (self.width, self.height):
+            if not MIN_SIZE <= side <= MAX_SIZE:
+                raise ValueError(f"Image sides must be between {MIN_SIZE} and {MAX_SIZE}.")
+        if not 0 <= self.seed < 2 ** 64:
+            raise ValueError("The seed must fit in 64 unsigned bits.")
+
+    @property
+    def scanline_bytes(self) -> int:
+        """Size of the PNG scanlines: one filter byte plus RGB pixels per row."""
+        return self.height * (self.width * 3 + 1)
+
+# pylint: disable=too-few-public-methods
+class Rasterizer(Protocol):
+    """Renders PNG scanlines into a caller-owned buffer."""
+
+    def render_into(self, buffer: WritableBuffer, params: RenderParams) -> None:
+        """Fills ``buffer`` (at least ``params.scanline_bytes`` long) in place."""
+
+# pylint: disable=too-few-public-methods
+class NativeRasterizer():
+    """Rasterizer backed by ``src/native/image_engine.nim``.
+
+    The Nim side receives a pointer into the Python buffer itself
+    (``from_buffer`` does not copy) and writes the scanlines in place. ctypes
+    releases the GIL for the call, so renders on worker threads run in
+    parallel with the event loop.
+    """
+
+    _STATUS_MESSAGES = {-1: "buffer too small", -2: "unknown pattern"}
+
+    def __init__(self, nim_lib: Any) -> None:
+        self.nim_lib = nim_lib
+
+    def render_into(self, buffer: WritableBuffer, params: RenderParams) -> None:
+        """Fills ``buffer`` in place through the native library."""
+        view = (ctypes.c_uint8 * len(buffer)).from_buffer(buffer)
+        status = self.nim_lib.imageRender(view, len(buffer), params.width, params.height,
+                                          PATTERNS.index(params.pattern), params.seed)
+        if status != 0:
+            reason = self._STATUS_MESSAGES.get(status, f"status {status}")
+            raise ImageRenderError(f"Native render of {params} failed: {reason}.")
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer, as in ``image_engine.nim``."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+def _unit(value: int) -> float:
+    return (value >> 11) / float(1 << 53)
+
+def _channel(value: float) -> int:
+    return int(min(max(value, 0.0), 1.0) * 255.0)
+
+def _lattice(ix: int, iy: int, seed: int) -> float:
+    return _unit(_mix(seed ^ (((ix & MASK64) * 0x8DA6B343) & MASK64)
+                      ^ (((iy & MASK64) * 0xD8163841) & MASK64)))
+
+def _value_noise(x: float, y: float, seed: int) -> float:
+    ix, iy = math.floor(x), math.floor(y)
+    fx, fy = x - ix, y - iy
+    sx = fx * fx * (3.0 - 2.0 * fx)
+    sy = fy * fy * (3.0 - 2.0 * fy)
+    top = _lattice(ix, iy, seed) + sx * (_lattice(ix + 1, iy, seed) - _lattice(ix, iy, seed))
+    bottom = _lattice(ix, iy + 1, seed) + sx * (_lattice(ix + 1, iy + 1, seed)
+                                                - _lattice(ix, iy + 1, seed))
+    return top + sy * (bottom - top)
+
+def _mandelbrot(x: float, y: float, seed: int) -> float:
+    center_x, center_y = MANDELBROT_CENTERS[seed % len(MANDELBROT_CENTERS)]
+    scale = 3.0 * math.pow(0.5, float((seed >> 8) % 6))
+    cx, cy = center_x + x * scale, center_y + y * scale
+    zx = zy = 0.0
+    for iteration in range(MAX_ITERATIONS):
+        zx2, zy2 = zx * zx, zy * zy
+        if zx2 + zy2 > 16.0:
+            smooth = iteration + 1.0 - math.log(math.log(math.sqrt(zx2 + zy2))) / math.log(2.0)
+            return smooth / MAX_ITERATIONS
+        zy = 2.0 * zx * zy + cy
+        zx = zx2 - zy2 + cx
+    return 0.0
+
+def _sample(pattern: int, x: float, y: float, seed: int) -> float:
+    if pattern == 0:
+        angle = _unit(seed) * math.tau
+        return x * math.cos(angle) + y * math.sin(angle)
+    if pattern == 1:
+        f1 = 4.0 + 8.0 * _unit(seed)
+        f2 = 4.0 + 8.0 * _unit(seed >> 16)
+        f3 = 2.0 + 6.0 * _unit(seed >> 32)
+        return (math.sin(x * f1) + math.sin(y * f2) + math.sin((x + y) * f3)
+                + math.sin(math.sqrt(x * x + y * y) * f1 * 2.0)) / 8.0
+    if pattern == 2:
+        return _mandelbrot(x, y, seed)
+    total, amplitude, frequency = 0.0, 0.5, 6.0
+    for octave in range(NOISE_OCTAVES):
+        total += amplitude * _value_noise(x * frequency, y * frequency,
+                                          (seed + octave) & MASK64)
+        amplitude *= 0.5
+        frequency *= 2.0
+    return total
+
+def _shade(pixels: bytearray, offset: int, t: float) -> None:
+    pixels[offset] = _channel(0.5 + 0.5 * math.cos(math.tau * t))
+    pixels[offset + 1] = _channel(0.5 + 0.5 * math.cos(math.tau * (t + 0.33)))
+    pixels[offset + 2] = _channel(0.5 + 0.5 * math.cos(math.tau * (t + 0.67)))
+
+# pylint: disable=too-few-public-methods
+class PythonRasterizer():
+    """Line-by-line port of the Nim rasterizer, used when the library is not built.
+
+    It produces the same images, but is two orders of magnitude slower and
+    holds the GIL while rendering; the parity harness compares the two.
+    """
+
+    def render_into(self, buffer: WritableBuffer, params: RenderParams) -> None:
+        """Fills ``buffer`` in place, one row at a time."""
+        width = params.width
+        if len(buffer) < params.scanline_bytes:
+            raise ImageRenderError(f"Python render of {params} failed: buffer too small.")
+        pattern = PATTERNS.index(params.pattern)
+        stride = width * 3 + 1
+        longest = float(max(width, params.height))
+        bits = _mix(params.seed)
+        phase = _unit(_mix(bits))
+        columns = [(column - width / 2.0) / longest for column in range(width)]
+        row_pixels = bytearray(stride)
+        for row in range(params.height):
+            y = (row - params.height / 2.0) / longest
+            for column, x in enumerate(columns):
+                _shade(row_pixels, 1 + column * 3, _sample(pattern, x, y, bits) + phase)
+            buffer[row * stride:(row + 1) * stride] = row_pixels
+
+def load_rasterizer(bridge: Optional[NativeBridge] = None,
+                    logger: Optional[Logger] = None) -> Rasterizer:
+    """Returns the native rasterizer, or the Python one when the library cannot be loaded."""
+    return load_or_fallback(IMAGE_ENGINE, NativeRasterizer, PythonRasterizer,
+                            bridge=bridge, logger=logger)
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+def encode_png(scanlines: WritableBuffer, width: int, height: int, level: int = 6) -> bytes:
+    """Wraps filtered RGB scanlines into a PNG file.
+
+    The scanlines already carry their filter bytes, so they are compressed
+    as they are, without building an intermediate pixel array.
+    """
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"".join((
+        PNG_SIGNATURE,
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(scanlines, level)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+class ImageService():
+    """Renders images off the event loop and caches the encoded PNGs.
+
+    Repeated requests are answered from a byte-bounded LRU cache, and
+    identical renders requested while one is already running wait for that
+    render instead of starting another. Without the native library, images
+    are scaled down to ``MAX_PYTHON_SIZE``, so a render does not starve the
+    event loop of the GIL for seconds.
+    """
+
+    def __init__(self, rasterizer: Optional[Rasterizer] = None, *,
+                 cache_bytes: int = DEFAULT_IMAGE_CACHE_BYTES, compression: int = 6,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            rasterizer: Renders the scanlines; the Nim one when available if omitted.
+            cache_bytes: Total size of the PNGs kept in the cache.
+            compression: zlib level used for the PNGs.
+            logger: Optional logger.
+        """
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.rasterizer: Rasterizer = rasterizer or load_rasterizer(logger=self.logger)
+        self.max_size = (MAX_PYTHON_SIZE if isinstance(self.rasterizer, PythonRasterizer)
+                         else MAX_SIZE)
+        self.cache = RenderCache(cache_bytes)
+        self.compression = compression
+        self._inflight: dict[RenderParams, asyncio.Task] = {}
+
+    def fit(self, params: RenderParams) -> RenderParams:
+        """Scales ``params`` down to the largest size this rasterizer renders, keeping the ratio."""
+        longest = max(params.width, params.height)
+        if longest <= self.max_size:
+            return params
+        scale = self.max_size / longest
+        return dataclasses.replace(params, width=max(MIN_SIZE, round(params.width * scale)),
+                                   height=max(MIN_SIZE, round(params.height * scale)))
+
+    def render_png(self, params: RenderParams) -> bytes:
+        """Renders and encodes an image, bypassing the cache. Blocking."""
+        scanlines = bytearray(params.scanline_bytes)
+        self.rasterizer.render_into(scanlines, params)
+        return encode_png(scanlines, params.width, params.height, self.compression)
+
+    async def render(self, params: RenderParams) -> bytes:
+        """Returns the PNG for ``params`` (scaled down by ``fit``), from the cache when possible."""
+        params = self.fit(params)
+        cached = self.cache.get(params)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(params)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                asyncio.to_thread(self.render_png, params))
+            self._inflight[params] = task
+            task.add_done_callback(lambda done: self._on_rendered(params, done))
+        return await asyncio.shield(task)
+
+    def _on_rendered(self, params: RenderParams, task: asyncio.Task) -> None:
+        del self._inflight[params]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.logger.error("Failed to render %s: %s", params, task.exception())
+            return
+        self.cache.put(params, task.result())
+
+    def cache_stats(self) -> RenderCacheStats:
+        """Returns the render cache counters."""
+        return self.cache.stats()
@@ -0,0 +1,271 @@
+"""Joke corpus compiler, reader and shuffle bag.
+
+The corpus is compiled from a fortune-style text file (jokes separated by a
+line holding a single ``%``) into a binary file that can be memory-mapped by
+the native library and by every worker process at the same time. A
+separator may name a category, ``% programming``, which applies to the
+jokes after it until the next one that names a category.
+
+Binary layout (little-endian)::
+
+    header   magic "KJKC", version u32, count u32, reserved u32,
+             index_offset u64, text_offset u64, text_size u64
+    index    (count + 1) u32 offsets relative to text_offset
+    text     utf-8 jokes, each one followed by a NUL byte
+    search   (version 2) padding to 4 bytes, then the index of ``joke_index``
+
+The NUL terminator lets the native side hand out pointers into the mapping
+without copying, and the extra index entry gives every joke length in O(1).
+The search index is only read on the Python side; version 1 corpora have
+none and cannot be searched.
+"""
+
+import os
+import re
+import sys
+import mmap
+import random
+import struct
+import logging
+import argparse
+from array import array
+from pathlib import Path
+from logging import Logger
+from typing import Iterable, Optional
+from src.core.constants import DEFAULT_JOKE_CORPUS_PATH, DEFAULT_JOKE_SOURCE_PATH
+from src.infrastructure.services.joke_index import JokeIndex, build_index
+
+CORPUS_MAGIC = b"KJKC"
+CORPUS_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+CORPUS_HEADER = struct.Struct("<4sIII QQQ")
+CORPUS_SEPARATOR = re.compile(r"%(?:\s+([\w-]+))?")
+MAX_TEXT_SIZE = 0xFFFFFFFF
+
+_default_rng = random.Random()
+
+class JokeCorpusError(Exception):
+    """Raised when a corpus file is missing, truncated or has an unknown format."""
+
+def parse_entries(text: str) -> list[tuple[str, str]]:
+    """Split a fortune-style source into (category, joke) pairs, dropping empty entries.
+
+    Jokes before the first separator naming a category have the category "".
+    """
+    entries: list[tuple[str, str]] = []
+    category = ""
+    current: list[str] = []
+    for line in text.splitlines():
+        separator = CORPUS_SEPARATOR.fullmatch(line.strip())
+        if separator is None:
+            current.append(line)
+            continue
+        entries.append((category, "\n".join(current).strip()))
+        current = []
+        if separator.group(1):
+            category = separator.group(1).casefold()
+    entries.append((category, "\n".join(current).strip()))
+    return [(category, joke) for category, joke in entries if joke]
+
+def parse_source(text: str) -> list[str]:
+    """Split a fortune-style source into jokes, dropping empty entries."""
+    return [joke for _category, joke in parse_entries(text)]
+
+class JokeCorpusCompiler():
+    """Compiles joke sources into the memory-mappable corpus format."""
+
+    def __init__(self, logger: Optional[Logger] = None) -> None:
+        self.logger: Logger = logger or logging.getLogger(__name__)
+
+    @staticmethod
+    def build(jokes: Iterable[str], categories: Optional[Iterable[str]] = None) -> bytes:
+        """Serialize jokes, and the search index of their words and categories, into a corpus image.
+
+        Args:
+            jokes: The jokes, in index order.
+            categories: The category of each joke, "" for none; all uncategorised when omitted.
+        Returns:
+            bytes: The full corpus file contents.
+        """
+        jokes = list(jokes)
+        categories = list(categories) if categories is not None else [""] * len(jokes)
+        if len(categories) != len(jokes):
+            raise JokeCorpusError("Every joke needs a category entry.")
+        offsets = array("I", [0])
+        text = bytearray()
+        for joke in jokes:
+            encoded = joke.encode("utf-8")
+            if b"\0" in encoded:
+                raise JokeCorpusError("Jokes must not contain NUL bytes.")
+            text += encoded
+            text += b"\0"
+            if len(text) > MAX_TEXT_SIZE:
+                raise JokeCorpusError("Corpus text exceeds the 4 GiB offset limit.")
+            offsets.append(len(text))
+
+        if offsets.itemsize != 4:
+            raise JokeCorpusError("Platform has no 32-bit unsigned array type.")
+        if sys.byteorder != "little":
+            offsets.byteswap()
+
+        count = len(offsets) - 1
+        index_offset = CORPUS_HEADER.size
+        text_offset = index_offset + len(offsets) * 4
+        header = CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, count, 0,
+                                    index_offset, text_offset, len(text))
+        padding = bytes(-(text_offset + len(text)) % 4)
+        return (header + offsets.tobytes() + bytes(text) + padding
+                + build_index(jokes, categories))
+
+    def compile(self, source_path: Path = DEFAULT_JOKE_SOURCE_PATH,
+                output_path: Path = DEFAULT_JOKE_CORPUS_PATH) -> int:
+        """Compile a source file and atomically replace the corpus file.
+
+        The file is written next to the target and renamed over it, so processes
+        that already mapped the old corpus keep a valid view until they reopen.
+
+        Returns:
+            int: The number of jokes written.
+        """
+        entries = parse_entries(source_path.read_text(encoding="utf-8"))
+        jokes = [joke for _category, joke in entries]
+        image = self.build(jokes, [category for category, _joke in entries])
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(f"{output_path.name}.tmp")
+        temp_path.write_bytes(image)
+        os.replace(temp_path, output_path)
+
+        self.logger.info("Compiled %s jokes into %s (%s bytes)",
+                         len(jokes), output_path, len(image))
+        return len(jokes)
+
+class JokeCorpusReader():
+    """Read-only, memory-mapped view over a compiled corpus."""
+
+    def __init__(self, corpus_path: Path = DEFAULT_JOKE_CORPUS_PATH) -> None:
+        self.corpus_path: Path = corpus_path
+        with corpus_path.open("rb") as corpus_file:
+            try:
+                self._map = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                raise JokeCorpusError(f"Corpus file {corpus_path} is empty.") from error
+
+        if len(self._map) < CORPUS_HEADER.size:
+            self.close()
+            raise JokeCorpusError(f"Corpus file {corpus_path} is truncated.")
+
+        (magic, version, self.count, _,
+         index_offset, self._text_offset, text_size) = CORPUS_HEADER.unpack_from(self._map)
+        if magic != CORPUS_MAGIC:
+            self.close()
+            raise JokeCorpusError(f"Corpus file {corpus_path} has an invalid magic.")
+        if version not in SUPPORTED_VERSIONS:
+            self.close()
+            raise JokeCorpusError(f"Unsupported corpus version {version} in {corpus_path}.")
+        if self._text_offset + text_size > len(self._map):
+            self.close()
+            raise JokeCorpusError(f"Corpus file {corpus_path} is truncated.")
+
+        index_view = memoryview(self._map)[index_offset:index_offset + (self.count + 1) * 4]
+        self._offsets = index_view.cast("I")
+        index_view.release()
+
+        self.index: Optional[JokeIndex] = None
+        if version >= 2:
+            search_offset = self._text_offset + text_size
+            search_offset += -search_offset % 4
+            search_view = memoryview(self._map)[search_offset:]
+            try:
+                self.index = JokeIndex(search_view)
+            except ValueError as error:
+                search_view.release()
+                self.close()
+                raise JokeCorpusError(f"Corpus file {corpus_path}: {error}") from error
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get(self, index: int) -> str:
+        """Return the joke at the given index."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"Joke index {index} out of range.")
+        start = self._text_offset + self._offsets[index]
+        end = self._text_offset + self._offsets[index + 1] - 1
+        return self._map[start:end].decode("utf-8")
+
+    def close(self) -> None:
+        """Release the mapping."""
+        index = getattr(self, "index", None)
+        if index is not None:
+            index.release()
+            self.index = None
+        offsets = getattr(self, "_offsets", None)
+        if offsets is not None:
+            offsets.release()
+            self._offsets = None
+        self._map.close()
+
+# pylint: disable=too-few-public-methods
+class ShuffleBag():
+    """Constant-size permutation walker that never repeats within a cycle.
+
+    Instead of storing a shuffled list of indices, the bag walks a full-period
+    LCG over the next power of two and scrambles it with a bijective mixer,
+    skipping values past ``count``. Each bag costs a few integers no matter
+    how large the corpus is. ``src/native/random_joke.nim`` implements the
+    same walk.
+    """
+
+    __slots__ = ("count", "mask", "shift", "state", "multiplier", "increment", "remaining")
+
+    def __init__(self, count: int, rng: Optional[random.Random] = None) -> None:
+        self.count = count
+        bits = max(1, (count - 1).bit_length())
+        self.mask = (1 << bits) - 1
+        self.shift = (bits + 1) // 2
+        self.state = 0
+        self.multiplier = 1
+        self.increment = 1
+        self.remaining = 0
+        self._reseed(rng or _default_rng)
+
+    def _reseed(self, rng: random.Random) -> None:
+        """Start a new cycle with a fresh permutation."""
+        self.state = rng.getrandbits(64) & self.mask
+        self.multiplier = ((rng.getrandbits(62) << 2) | 1) & self.mask
+        self.increment = (rng.getrandbits(63) | 1) & self.mask
+        self.remaining = self.count
+
+    def _scramble(self, value: int) -> int:
+        value ^= value >> self.shift
+        value = (value * 0x9E3779B1) & self.mask
+        value ^= value >> self.shift
+        return value
+
+    def next(self, rng: Optional[random.Random] = None) -> int:
+        """Return the next index of the current cycle, starting a new one when empty."""
+        if self.count <= 0:
+            raise IndexError("Cannot draw from an empty corpus.")
+        if self.remaining <= 0:
+            self._reseed(rng or _default_rng)
+
+        while True:
+            self.state = (self.multiplier * self.state + self.increment) & self.mask
+            value = self._scramble(self.state)
+            if value < self.count:
+                self.remaining -= 1
+                return value
+
+def main() -> None:
+    """Command line entry point used by ``scripts/build_joke_corpus.sh``."""
+    parser = argparse.ArgumentParser(description="Compile the joke corpus.")
+    parser.add_argument("source", nargs="?", type=Path, default=DEFAULT_JOKE_SOURCE_PATH)
+    parser.add_argument("output", nargs="?", type=Path, default=DEFAULT_JOKE_CORPUS_PATH)
+    cli_args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    JokeCorpusCompiler().compile(cli_args.source, cli_args.output)
+
+if __name__ == "__main__":
+    main()
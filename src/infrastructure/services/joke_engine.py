@@ -0,0 +1,128 @@
+"""Joke corpus engines: the Nim shuffle bags and their pure Python equivalent."""
+
+import ctypes
+import threading
+from logging import Logger
+from pathlib import Path
+from typing import Any, Optional, Protocol
+from src.infrastructure.native.bridge import NativeBridge, load_or_fallback
+from src.infrastructure.native.libraries import RANDOM_JOKE
+from src.infrastructure.services.joke_corpus import JokeCorpusError, JokeCorpusReader, ShuffleBag
+
+class JokeEngine(Protocol):
+    """Maps a compiled corpus and draws jokes from per guild/channel shuffle bags."""
+
+    def open(self, corpus_path: Path) -> None:
+        """Maps a corpus, replacing the current one and its bags."""
+
+    def count(self) -> int:
+        """Number of jokes in the mapped corpus."""
+
+    def next(self, guild_id: int, channel_id: int) -> int:
+        """Next index of a bag, or -1 when the corpus is empty."""
+
+    def get(self, index: int) -> str:
+        """Joke at an index."""
+
+    def fill_batch(self, guild_id: int, channel_id: int, count: int) -> list[str]:
+        """Draws and decodes up to ``count`` jokes from a bag."""
+
+    def forget(self, guild_id: int, channel_id: int) -> None:
+        """Drops a bag."""
+
+class NativeJokeEngine():
+    """Engine backed by ``src/native/random_joke.nim``; batches cost one call."""
+
+    def __init__(self, nim_lib: Any) -> None:
+        self.nim_lib = nim_lib
+
+    def open(self, corpus_path: Path) -> None:
+        """Maps a corpus, replacing the current one and its bags."""
+        status = self.nim_lib.jokeCorpusOpen(str(corpus_path).encode("utf-8"))
+        if status != 0:
+            raise JokeCorpusError(f"Failed to open joke corpus {corpus_path} (status {status}).")
+
+    def count(self) -> int:
+        """Number of jokes in the mapped corpus."""
+        return self.nim_lib.jokeCorpusCount()
+
+    def next(self, guild_id: int, channel_id: int) -> int:
+        """Next index of a bag, or -1 when the corpus is empty."""
+        return self.nim_lib.jokeCorpusNext(guild_id, channel_id)
+
+    def get(self, index: int) -> str:
+        """Joke at an index."""
+        return self.nim_lib.jokeCorpusGet(index).decode("utf-8")
+
+    def fill_batch(self, guild_id: int, channel_id: int, count: int) -> list[str]:
+        """Draws up to ``count`` jokes with a single native call."""
+        pointers = (ctypes.c_void_p * count)()
+        lengths = (ctypes.c_uint32 * count)()
+        filled = self.nim_lib.jokeCorpusFillBatch(guild_id, channel_id, pointers, lengths, count)
+        return [
+            ctypes.string_at(pointers[slot], lengths[slot]).decode("utf-8")
+            for slot in range(filled)
+        ]
+
+    def forget(self, guild_id: int, channel_id: int) -> None:
+        """Drops a bag."""
+        self.nim_lib.jokeCorpusForget(guild_id, channel_id)
+
+class PythonJokeEngine():
+    """Same bags over ``JokeCorpusReader``; used when the library is not built."""
+
+    def __init__(self) -> None:
+        self.reader: Optional[JokeCorpusReader] = None
+        self.bags: dict[tuple[int, int], ShuffleBag] = {}
+        self._lock = threading.Lock()
+
+    def open(self, corpus_path: Path) -> None:
+        """Maps a corpus, replacing the current one and its bags."""
+        try:
+            reader = JokeCorpusReader(corpus_path)
+        except OSError as error:
+            raise JokeCorpusError(f"Failed to open joke corpus {corpus_path}: {error}") from error
+        with self._lock:
+            if self.reader is not None:
+                self.reader.close()
+            self.reader = reader
+            self.bags.clear()
+
+    def count(self) -> int:
+        """Number of jokes in the mapped corpus."""
+        return len(self.reader) if self.reader is not None else 0
+
+    def _draw(self, key: tuple[int, int]) -> int:
+        bag = self.bags.get(key)
+        if bag is None:
+            bag = self.bags[key] = ShuffleBag(len(self.reader))
+        return bag.next()
+
+    def next(self, guild_id: int, channel_id: int) -> int:
+        """Next index of a bag, or -1 when the corpus is empty."""
+        with self._lock:
+            if not self.count():
+                return -1
+            return self._draw((guild_id, channel_id))
+
+    def get(self, index: int) -> str:
+        """Joke at an index."""
+        return self.reader.get(index)
+
+    def fill_batch(self, guild_id: int, channel_id: int, count: int) -> list[str]:
+        """Draws and decodes up to ``count`` jokes under one lock."""
+        with self._lock:
+            if not self.count():
+                return []
+            return [self.reader.get(self._draw((guild_id, channel_id))) for _ in range(count)]
+
+    def forget(self, guild_id: int, channel_id: int) -> None:
+        """Drops a bag."""
+        with self._lock:
+            self.bags.pop((guild_id, channel_id), None)
+
+def load_joke_engine(bridge: Optional[NativeBridge] = None,
+                     logger: Optional[Logger] = None) -> JokeEngine:
+    """Returns the native engine, or the Python one when the library cannot be loaded."""
+    return load_or_fallback(RANDOM_JOKE, NativeJokeEngine, PythonJokeEngine,
+                            bridge=bridge, logger=logger)
@@ -0,0 +1,269 @@
+"""Search index of the joke corpus: categories, words and word trigrams.
+
+The index is built by ``JokeCorpusCompiler`` and stored after the text of
+a version 2 corpus, so it is mapped with the jokes and never parsed at
+start-up. It holds one sorted posting list of joke ids per category and
+per word, and one posting list of word ids per byte trigram of the
+vocabulary: a keyword matches every word that contains it, found by
+intersecting the posting lists of its trigrams (keywords shorter than a
+trigram match by prefix instead).
+
+Layout (little-endian u32 words)::
+
+    header      category_count, term_count, trigram_count, postings_size, names_size
+    categories  category_count x (name_start, name_end, postings_start, postings_end)
+    terms       term_count x (name_start, name_end, postings_start, postings_end)
+    trigrams    trigram_count x (trigram, 0, postings_start, postings_end)
+    postings    postings_size ids, sorted within each list
+    names       utf-8 category names and words, padded to 4 bytes
+
+Categories and words are casefolded and sorted by their utf-8 bytes, so
+they are looked up by binary search over the mapping.
+"""
+
+import re
+import sys
+import bisect
+import random
+from array import array
+from typing import Iterable, Optional, Sequence
+
+WORD = re.compile(r"\w+")
+MIN_TERM_LENGTH = 2
+TRIGRAM = 3
+ENTRY = 4
+HEADER_WORDS = 5
+# Words a keyword may expand to, and random draws tried before intersecting the lists.
+MAX_EXPANSIONS = 64
+SAMPLE_ATTEMPTS = 16
+
+_default_rng = random.Random()
+
+Postings = Sequence[int]
+
+def tokenize(text: str) -> list[str]:
+    """Casefolded words of ``text``, skipping the ones too short to search for."""
+    return [word for word in WORD.findall(text.casefold()) if len(word) >= MIN_TERM_LENGTH]
+
+def trigrams(term: bytes) -> set[int]:
+    """The byte trigrams of a word, each packed into an integer."""
+    return {int.from_bytes(term[start:start + TRIGRAM], "little")
+            for start in range(len(term) - TRIGRAM + 1)}
+
+def _table(entries: Iterable[tuple[bytes | int, list[int]]], table: array,
+           postings: array, names: bytearray) -> None:
+    for key, ids in entries:
+        if isinstance(key, bytes):
+            table.extend((len(names), len(names) + len(key)))
+            names += key
+        else:
+            table.extend((key, 0))
+        table.extend((len(postings), len(postings) + len(ids)))
+        postings.extend(ids)
+
+def _posting_lists(jokes: Sequence[str],
+                   categories: Sequence[str]) -> tuple[dict[bytes, list[int]],
+                                                        dict[bytes, list[int]]]:
+    by_category: dict[bytes, list[int]] = {}
+    by_term: dict[bytes, list[int]] = {}
+    for joke_id, (joke, category) in enumerate(zip(jokes, categories)):
+        if category:
+            by_category.setdefault(category.casefold().encode("utf-8"), []).append(joke_id)
+        for term in dict.fromkeys(tokenize(joke)):
+            by_term.setdefault(term.encode("utf-8"), []).append(joke_id)
+    return by_category, by_term
+
+def _trigram_lists(terms: Sequence[bytes]) -> dict[int, list[int]]:
+    by_trigram: dict[int, list[int]] = {}
+    for term_id, term in enumerate(terms):
+        for trigram in trigrams(term):
+            by_trigram.setdefault(trigram, []).append(term_id)
+    return by_trigram
+
+def build_index(jokes: Sequence[str], categories: Sequence[str]) -> bytes:
+    """Serialize the search index of a corpus; ``categories[i]`` is "" when uncategorised."""
+    by_category, by_term = _posting_lists(jokes, categories)
+    terms = sorted(by_term)
+    by_trigram = _trigram_lists(terms)
+
+    tables, postings, names = [], array("I"), bytearray()
+    for entries in (((name, by_category[name]) for name in sorted(by_category)),
+                    ((term, by_term[term]) for term in terms),
+                    ((trigram, by_trigram[trigram]) for trigram in sorted(by_trigram))):
+        tables.append(array("I"))
+        _table(entries, tables[-1], postings, names)
+    names_size = len(names)
+    names += bytes(-len(names) % 4)
+
+    words = array("I", (len(by_category), len(terms), len(by_trigram), len(postings),
+                        names_size))
+    for part in (*tables, postings):
+        words.extend(part)
+    if sys.byteorder != "little":
+        words.byteswap()
+    return words.tobytes() + bytes(names)
+
+def _contains(postings: Postings, joke_id: int) -> bool:
+    position = bisect.bisect_left(postings, joke_id)
+    return position < len(postings) and postings[position] == joke_id
+
+# pylint: disable=too-many-instance-attributes
+class JokeIndex():
+    """Read-only view of a search index inside a mapped corpus."""
+
+    def __init__(self, buffer: memoryview) -> None:
+        """
+        Args:
+            buffer: The index section, from its header to the end of the corpus.
+        Raises:
+            ValueError: The section is truncated.
+        """
+        if len(buffer) < HEADER_WORDS * 4 or len(buffer) % 4:
+            raise ValueError("The search index is truncated.")
+        self._words = buffer.cast("I")
+        (self.category_count, self.term_count, trigram_count,
+         postings_size, names_size) = self._words[:HEADER_WORDS]
+        tables_end = HEADER_WORDS + (self.category_count + self.term_count + trigram_count) * ENTRY
+        if (tables_end + postings_size) * 4 + names_size > len(buffer):
+            self._words.release()
+            raise ValueError("The search index is truncated.")
+        self._categories = self._words[HEADER_WORDS:HEADER_WORDS + self.category_count * ENTRY]
+        self._terms = self._words[HEADER_WORDS + self.category_count * ENTRY:
+                                  tables_end - trigram_count * ENTRY]
+        self._trigrams = self._words[tables_end - trigram_count * ENTRY:tables_end]
+        self._trigram_keys = self._trigrams[::ENTRY]
+        self._postings = self._words[tables_end:tables_end + postings_size]
+        names_start = (tables_end + postings_size) * 4
+        self._names = buffer[names_start:names_start + names_size]
+
+    def release(self) -> None:
+        """Releases the views, so the mapping can be closed."""
+        for view in (self._categories, self._terms, self._trigrams, self._trigram_keys,
+                     self._postings, self._names, self._words):
+            view.release()
+
+    def _name(self, table: memoryview, entry: int) -> bytes:
+        return bytes(self._names[table[entry * ENTRY]:table[entry * ENTRY + 1]])
+
+    def _posting_list(self, table: memoryview, entry: int) -> memoryview:
+        return self._postings[table[entry * ENTRY + 2]:table[entry * ENTRY + 3]]
+
+    def _lower_bound(self, table: memoryview, count: int, name: bytes) -> int:
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(table, middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def categories(self) -> list[str]:
+        """Every category, sorted."""
+        return [self._name(self._categories, entry).decode("utf-8")
+                for entry in range(self.category_count)]
+
+    def category(self, name: str) -> Optional[memoryview]:
+        """The jokes of a category, or None when there is no such category."""
+        key = name.strip().casefold().encode("utf-8")
+        entry = self._lower_bound(self._categories, self.category_count, key)
+        if entry < self.category_count and self._name(self._categories, entry) == key:
+            return self._posting_list(self._categories, entry)
+        return None
+
+    def _trigram_terms(self, trigram: int) -> Optional[memoryview]:
+        entry = bisect.bisect_left(self._trigram_keys, trigram)
+        if entry < len(self._trigram_keys) and self._trigram_keys[entry] == trigram:
+            return self._posting_list(self._trigrams, entry)
+        return None
+
+    def _matching_terms(self, keyword: bytes) -> list[int]:
+        if len(keyword) < TRIGRAM:
+            entry = self._lower_bound(self._terms, self.term_count, keyword)
+            found = []
+            while (entry < self.term_count and len(found) < MAX_EXPANSIONS
+                   and self._name(self._terms, entry).startswith(keyword)):
+                found.append(entry)
+                entry += 1
+            return found
+        lists = []
+        for trigram in trigrams(keyword):
+            terms = self._trigram_terms(trigram)
+            if terms is None:
+                return []
+            lists.append(terms)
+        lists.sort(key=len)
+        found = []
+        for term_id in lists[0]:
+            if (all(_contains(terms, term_id) for terms in lists[1:])
+                    and keyword in self._name(self._terms, term_id)):
+                found.append(term_id)
+                if len(found) == MAX_EXPANSIONS:
+                    break
+        return found
+
+    def keyword(self, keyword: str) -> list[memoryview]:
+        """The posting lists of every word containing ``keyword`` (its prefixes when short)."""
+        return [self._posting_list(self._terms, term_id)
+                for term_id in self._matching_terms(keyword.casefold().encode("utf-8"))]
+
+    def _filters(self, category: Optional[str], keywords: str) -> Optional[list[list[Postings]]]:
+        """One group of alternative posting lists per filter; None when one matches nothing."""
+        filters: list[list[Postings]] = []
+        if category:
+            jokes = self.category(category)
+            if jokes is None:
+                return None
+            filters.append([jokes])
+        for keyword in dict.fromkeys(tokenize(keywords)):
+            alternatives = self.keyword(keyword)
+            if not alternatives:
+                return None
+            filters.append(alternatives)
+        return filters
+
+    @staticmethod
+    def _draw(alternatives: list[Postings], rng: random.Random) -> Optional[int]:
+        """A uniformly random joke of the union of the lists, or None to draw again."""
+        pick = rng.randrange(sum(len(postings) for postings in alternatives))
+        for postings in alternatives:
+            if pick < len(postings):
+                joke_id = postings[pick]
+                break
+            pick -= len(postings)
+        # A joke in several lists would be drawn more often; keep it once per list it is in.
+        copies = sum(_contains(postings, joke_id) for postings in alternatives)
+        return joke_id if copies == 1 or rng.randrange(copies) == 0 else None
+
+    def find_all(self, category: Optional[str] = None, keywords: str = "") -> list[int]:
+        """Every matching joke id, sorted; empty without filters."""
+        filters = self._filters(category, keywords)
+        if not filters:
+            return []
+        filters.sort(key=lambda alternatives: sum(map(len, alternatives)))
+        candidates = sorted(set().union(*filters[0]))
+        return [joke_id for joke_id in candidates
+                if all(any(_contains(postings, joke_id) for postings in alternatives)
+                       for alternatives in filters[1:])]
+
+    def search(self, category: Optional[str] = None, keywords: str = "",
+               rng: Optional[random.Random] = None) -> int:
+        """A random joke of ``category`` containing every keyword, or -1.
+
+        Draws from the smallest filter and checks the others by binary
+        search, so a query costs a few lookups whatever the corpus size;
+        only when those draws miss are the lists intersected.
+        """
+        rng = rng or _default_rng
+        filters = self._filters(category, keywords)
+        if not filters:
+            return -1
+        filters.sort(key=lambda alternatives: sum(map(len, alternatives)))
+        for _ in range(SAMPLE_ATTEMPTS):
+            joke_id = self._draw(filters[0], rng)
+            if joke_id is not None and all(
+                    any(_contains(postings, joke_id) for postings in alternatives)
+                    for alternatives in filters[1:]):
+                return joke_id
+        matches = self.find_all(category, keywords)
+        return rng.choice(matches) if matches else -1
@@ -0,0 +1,193 @@
+"""Prefetch buffer that keeps decoded jokes ready for the event loop."""
+
+import time
+import queue
+import asyncio
+import logging
+import threading
+from logging import Logger
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+BagKey = tuple[int, int]
+BatchFetcher = Callable[[int, int, int], list[str]]
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class JokePrefetchStats():
+    """Snapshot of the prefetch counters, used to size the buffers."""
+    hits: int
+    misses: int
+    refills: int
+    prefetched: int
+    buffered_keys: int
+    buffered_jokes: int
+    get_seconds_avg: float
+    get_seconds_max: float
+    refill_seconds_avg: float
+    refill_seconds_max: float
+
+class JokePrefetcher():
+    """Keeps a small ring of decoded jokes per shuffle bag.
+
+    A daemon thread refills any ring that drops to ``low_watermark`` with one
+    batched native call, so the event loop only pops from a deque. A cold ring
+    is filled through ``asyncio.to_thread`` and never on the loop itself.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, fetch_batch: BatchFetcher, *, capacity: int = 32,
+                 low_watermark: int = 8, max_keys: int = 4096,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            fetch_batch: Callable returning up to ``count`` jokes for a guild/channel pair.
+            capacity: Maximum jokes buffered per guild/channel pair.
+            low_watermark: Ring size at which a background refill is scheduled.
+            max_keys: Maximum number of rings kept; the least recently used is dropped.
+            logger: Optional logger.
+        """
+        self.fetch_batch = fetch_batch
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+        self.max_keys = max_keys
+        self.logger: Logger = logger or logging.getLogger(__name__)
+
+        self._buffers: OrderedDict[BagKey, deque[str]] = OrderedDict()
+        self._pending: set[BagKey] = set()
+        self._lock = threading.Lock()
+        self._requests: queue.SimpleQueue[Optional[BagKey]] = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._get_seconds_total = 0.0
+        self._get_seconds_max = 0.0
+        self._refills = 0
+        self._prefetched = 0
+        self._refill_seconds_total = 0.0
+        self._refill_seconds_max = 0.0
+
+    def start(self, prefill: tuple[BagKey, ...] = ((0, 0),)) -> None:
+        """Starts the refill thread and schedules the given rings to be filled."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._refill_worker,
+                                        name="joke-prefetcher", daemon=True)
+        self._thread.start()
+        for key in prefill:
+            self._buffer_for(key)
+            self._schedule(key)
+
+    def close(self) -> None:
+        """Stops the refill thread and drops every buffered joke."""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Drops every buffered joke, e.g. after the corpus was replaced."""
+        with self._lock:
+            self._buffers.clear()
+
+    async def get(self, guild_id: Optional[int] = None, channel_id: Optional[int] = None) -> str:
+        """Pops the next joke for a guild/channel pair.
+
+        Returns:
+            str: The joke, or an empty string when the corpus is empty.
+        """
+        started = time.perf_counter()
+        self.start()
+        key = (guild_id or 0, channel_id or 0)
+        buffer = self._buffer_for(key)
+
+        try:
+            joke = buffer.popleft()
+            self._hits += 1
+        except IndexError:
+            self._misses += 1
+            jokes = await asyncio.to_thread(self._fetch, key, self.low_watermark + 1)
+            joke = jokes[0] if jokes else ""
+            buffer.extend(jokes[1:])
+
+        if len(buffer) <= self.low_watermark:
+            self._schedule(key)
+
+        elapsed = time.perf_counter() - started
+        self._get_seconds_total += elapsed
+        self._get_seconds_max = max(self._get_seconds_max, elapsed)
+        return joke
+
+    def stats(self) -> JokePrefetchStats:
+        """Returns a snapshot of the hit, miss and refill counters."""
+        with self._lock:
+            buffered_keys = len(self._buffers)
+            buffered_jokes = sum(len(buffer) for buffer in self._buffers.values())
+        gets = self._hits + self._misses
+        return JokePrefetchStats(
+            hits=self._hits,
+            misses=self._misses,
+            refills=self._refills,
+            prefetched=self._prefetched,
+            buffered_keys=buffered_keys,
+            buffered_jokes=buffered_jokes,
+            get_seconds_avg=self._get_seconds_total / gets if gets else 0.0,
+            get_seconds_max=self._get_seconds_max,
+            refill_seconds_avg=self._refill_seconds_total / self._refills if self._refills else 0.0,
+            refill_seconds_max=self._refill_seconds_max,
+        )
+
+    def _buffer_for(self, key: BagKey) -> deque[str]:
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = deque(maxlen=self.capacity)
+                self._buffers[key] = buffer
+                if len(self._buffers) > self.max_keys:
+                    self._buffers.popitem(last=False)
+            else:
+                self._buffers.move_to_end(key)
+            return buffer
+
+    def _schedule(self, key: BagKey) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._requests.put(key)
+
+    def _fetch(self, key: BagKey, count: int) -> list[str]:
+        started = time.perf_counter()
+        jokes = self.fetch_batch(key[0], key[1], count)
+        elapsed = time.perf_counter() - started
+
+        self._refills += 1
+        self._prefetched += len(jokes)
+        self._refill_seconds_total += elapsed
+        self._refill_seconds_max = max(self._refill_seconds_max, elapsed)
+        return jokes
+
+    def _refill_worker(self) -> None:
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+
+            with self._lock:
+                self._pending.discard(key)
+                buffer = self._buffers.get(key)
+            if buffer is None:
+                continue
+
+            missing = self.capacity - len(buffer)
+            if missing <= 0:
+                continue
+
+            try:
+                buffer.extend(self._fetch(key, missing))
+            # pylint: disable=broad-exception-caught
+            except Exception as error:
+                self.logger.error("Failed to prefetch jokes for %s: %s", key, error, exc_info=True)
@@ -0,0 +1,162 @@
+"""Background sampler for gateway and REST latency."""
+
+import math
+import time
+import asyncio
+import logging
+from array import array
+from logging import Logger
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
+from discord import Client
+from discord.http import Route
+
+@dataclass(frozen=True)
+class LatencySummary():
+    """Percentiles of a rolling window, in seconds."""
+    count: int = 0
+    last: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+
+@dataclass(frozen=True)
+class LatencySnapshot():
+    """Cached latency summaries for every shard and for REST."""
+    gateway: Mapping[int, LatencySummary] = field(default_factory=dict)
+    rest: LatencySummary = LatencySummary()
+
+class RollingHistogram():
+    """Fixed-size ring of samples with percentiles computed once per sample."""
+
+    def __init__(self, size: int = 256) -> None:
+        self.size = size
+        self._samples = array("d")
+        self._cursor = 0
+        self._summary = LatencySummary()
+
+    def add(self, value: float) -> None:
+        """Records a sample, overwriting the oldest one once the ring is full."""
+        if len(self._samples) < self.size:
+            self._samples.append(value)
+        else:
+            self._samples[self._cursor] = value
+        self._cursor = (self._cursor + 1) % self.size
+
+        ordered = sorted(self._samples)
+        self._summary = LatencySummary(
+            count=len(ordered),
+            last=value,
+            p50=self._percentile(ordered, 0.50),
+            p95=self._percentile(ordered, 0.95),
+            p99=self._percentile(ordered, 0.99),
+        )
+
+    def summary(self) -> LatencySummary:
+        """Returns the percentiles computed on the last sample."""
+        return self._summary
+
+    @staticmethod
+    def _percentile(ordered: list[float], quantile: float) -> float:
+        index = max(0, math.ceil(quantile * len(ordered)) - 1)
+        return ordered[index]
+
+# pylint: disable=too-many-instance-attributes
+class LatencySampler():
+    """Samples heartbeat latency per shard and REST round-trips in the background.
+
+    Commands read the cached snapshot instead of probing Discord, so a busy
+    ``/about_bot`` costs no REST request and no ratelimit slot.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, bot: Client, *, interval: float = 15.0, rest_interval: float = 60.0,
+                 window: int = 256, logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            bot: The Discord client to sample.
+            interval: Seconds between heartbeat latency samples.
+            rest_interval: Seconds between REST probes.
+            window: Number of samples kept per histogram.
+            logger: Optional logger.
+        """
+        self.bot = bot
+        self.interval = interval
+        self.rest_interval = rest_interval
+        self.window = window
+        self.logger: Logger = logger or logging.getLogger(__name__)
+
+        self._gateway: dict[int, RollingHistogram] = {}
+        self._rest = RollingHistogram(window)
+        self._last_heartbeat: dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot = LatencySnapshot()
+
+    def start(self) -> None:
+        """Starts sampling on the running loop; does nothing if already started."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="latency-sampler")
+
+    async def close(self) -> None:
+        """Stops sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def snapshot(self) -> LatencySnapshot:
+        """Returns the cached latency summaries."""
+        return self._snapshot
+
+    def sample_gateway(self) -> None:
+        """Records the latest heartbeat latency of every shard."""
+        for shard_id, latency in self._shard_latencies():
+            if not math.isfinite(latency) or self._last_heartbeat.get(shard_id) == latency:
+                continue
+            self._last_heartbeat[shard_id] = latency
+            histogram = self._gateway.setdefault(shard_id, RollingHistogram(self.window))
+            histogram.add(latency)
+        self._publish()
+
+    async def sample_rest(self) -> None:
+        """Times a single ``GET /gateway`` round-trip."""
+        started = time.perf_counter()
+        await self.bot.http.request(Route("GET", "/gateway"))
+        self._rest.add(time.perf_counter() - started)
+        self._publish()
+
+    def _shard_latencies(self) -> list[tuple[int, float]]:
+        latencies = getattr(self.bot, "latencies", None)
+        if latencies is not None:
+            return list(latencies)
+        return [(self.bot.shard_id or 0, self.bot.latency)]
+
+    def _publish(self) -> None:
+        self._snapshot = LatencySnapshot(
+            gateway=MappingProxyType({
+                shard_id: histogram.summary() for shard_id, histogram in self._gateway.items()
+            }),
+            rest=self._rest.summary(),
+        )
+
+    async def _run(self) -> None:
+        next_rest_probe = 0.0
+        while True:
+            self.sample_gateway()
+
+            now = time.monotonic()
+            if now >= next_rest_probe:
+                next_rest_probe = now + self.rest_interval
+                try:
+                    await self.sample_rest()
+                # pylint: disable=broad-exception-caught
+                except Exception as error:
+                    self.logger.warning("REST latency probe failed: %s", error)
+
+            await asyncio.sleep(self.interval)
@@ -1,16 +1,123 @@
 """"Service to fetch random jokes"""
 
-import ctypes
+import asyncio
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+from src.core.constants import DEFAULT_JOKE_CORPUS_PATH
+from src.infrastructure.services.joke_corpus import JokeCorpusError, JokeCorpusReader
+from src.infrastructure.services.joke_engine import JokeEngine, load_joke_engine
+from src.infrastructure.services.joke_index import tokenize
+from src.infrastructure.services.joke_prefetcher import JokePrefetcher, JokePrefetchStats
 
 # pylint: disable=too-few-public-methods
 class RandomJokeService():
-    """Service to fetch random jokes."""
+    """Service to fetch random jokes from the memory-mapped corpus."""
 
-    def __init__(self) -> None:
-        self.nim_lib = ctypes.CDLL('./lib/librandom_joke.so')
-        self.nim_lib.getRandomJoke.restype = ctypes.c_char_p
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, corpus_path: Path = DEFAULT_JOKE_CORPUS_PATH,
+                 prefetch_capacity: int = 32, prefetch_low_watermark: int = 8,
+                 engine: Optional[JokeEngine] = None,
+                 logger: Optional[Logger] = None) -> None:
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.engine: JokeEngine = engine or load_joke_engine(logger=self.logger)
+        self.corpus_path = corpus_path
+        self.search_reader: Optional[JokeCorpusReader] = None
+        self.prefetcher = JokePrefetcher(self.fetch_batch, capacity=prefetch_capacity,
+                                         low_watermark=prefetch_low_watermark)
+        self.open_corpus(corpus_path)
 
-    def get_random_joke(self) -> str:
-        """Fetches a random joke from the native Nim library."""
-        joke = self.nim_lib.getRandomJoke()
-        return joke.decode('utf-8')
+    def open_corpus(self, corpus_path: Path) -> None:
+        """Maps a compiled corpus, replacing the current one, its shuffle bags and its index."""
+        self.engine.open(corpus_path)
+        try:
+            search_reader = JokeCorpusReader(corpus_path)
+        except OSError as error:
+            raise JokeCorpusError(f"Failed to open joke corpus {corpus_path}: {error}") from error
+        if search_reader.index is None:
+            self.logger.warning("Joke corpus %s has no search index, rebuild it with "
+                                "scripts/build_joke_corpus.sh", corpus_path)
+        if self.search_reader is not None:
+            self.search_reader.close()
+        self.search_reader = search_reader
+        self.corpus_path = corpus_path
+        self.prefetcher.clear()
+
+    @property
+    def joke_count(self) -> int:
+        """Number of jokes in the mapped corpus."""
+        return self.engine.count()
+
+    def get_random_joke(self, guild_id: Optional[int] = None,
+                        channel_id: Optional[int] = None) -> str:
+        """Fetches a joke that does not repeat in the guild/channel until its bag is used up.
+
+        Args:
+            guild_id: Guild the joke is for, or None for direct messages.
+            channel_id: Channel the joke is for, or None for a guild-wide bag.
+        Returns:
+            str: The joke, or an empty string when the corpus is empty.
+        """
+        index = self.engine.next(guild_id or 0, channel_id or 0)
+        if index < 0:
+            return ""
+        return self.engine.get(index)
+
+    def fetch_batch(self, guild_id: int, channel_id: int, count: int) -> list[str]:
+        """Draws and decodes up to ``count`` jokes, in a single call on the native engine.
+
+        Blocking; meant for the prefetch thread, not the event loop.
+        """
+        return self.engine.fill_batch(guild_id, channel_id, count)
+
+    def categories(self) -> list[str]:
+        """The categories of the mapped corpus."""
+        index = self.search_reader.index if self.search_reader is not None else None
+        return index.categories() if index is not None else []
+
+    def find_joke(self, category: Optional[str] = None, keywords: str = "") -> str:
+        """Searches the index and decodes a matching joke, or returns "".
+
+        Blocking: the native engine shares its lock with the prefetch thread.
+        """
+        index = self.search_reader.index if self.search_reader is not None else None
+        joke_id = index.search(category, keywords) if index is not None else -1
+        return self.engine.get(joke_id) if joke_id >= 0 else ""
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    async def search_joke(self, category: Optional[str] = None, keywords: str = "",
+                          guild_id: Optional[int] = None,
+                          channel_id: Optional[int] = None) -> str:
+        """Fetches a random joke of a category and/or matching every keyword.
+
+        A keyword matches the jokes with a word that contains it, so "prog"
+        finds "programmers". Without a category nor a searchable keyword
+        this is a joke of the guild/channel bag, from the prefetch buffer.
+
+        Returns:
+            str: The joke, or an empty string when nothing matches.
+        """
+        if not category and not tokenize(keywords):
+            return await self.prefetcher.get(guild_id, channel_id)
+        return await asyncio.to_thread(self.find_joke, category, keywords)
+
+    async def get_joke(self, guild_id: Optional[int] = None,
+                       channel_id: Optional[int] = None) -> str:
+        """Async variant of get_random_joke served from the prefetch buffer."""
+        return await self.prefetcher.get(guild_id, channel_id)
+
+    def prefetch_stats(self) -> JokePrefetchStats:
+        """Hit, miss, latency and refill counters of the prefetch buffer."""
+        return self.prefetcher.stats()
+
+    def close(self) -> None:
+        """Stops the prefetch thread and unmaps the search index."""
+        self.prefetcher.close()
+        if self.search_reader is not None:
+            self.search_reader.close()
+            self.search_reader = None
+
+    def forget(self, guild_id: int, channel_id: Optional[int] = None) -> None:
+        """Drops the shuffle bag of a guild/channel pair."""
+        self.engine.forget(guild_id, channel_id or 0)
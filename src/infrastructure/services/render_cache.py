@@ -0,0 +1,80 @@
+"""LRU cache of rendered images bounded by their total size in bytes."""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class RenderCacheStats():
+    """Snapshot of the cache counters."""
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+class RenderCache():
+    """Keeps the most recently used renders until ``max_bytes`` is reached.
+
+    Entries are evicted oldest first by their byte size, not their count,
+    because a 1024x1024 render weighs as much as hundreds of thumbnails.
+    A value larger than the whole budget is not stored at all. Only touched
+    from the event loop, so there is no locking.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Returns a cached value and marks it as recently used."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        """Stores a value, evicting the least recently used ones to fit it."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        if len(value) > self.max_bytes:
+            return
+
+        while self._entries and self.size_bytes + len(value) > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+        self._entries[key] = value
+        self.size_bytes += len(value)
+
+    def clear(self) -> None:
+        """Drops every entry, keeping the counters."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> RenderCacheStats:
+        """Returns the current counters."""
+        return RenderCacheStats(
+            entries=len(self._entries),
+            size_bytes=self.size_bytes,
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
@@ -0,0 +1,562 @@
+"""Local Discord gateway and REST simulator for end-to-end load tests.
+
+The simulator serves the parts of the Discord API the bot uses: the
+gateway websocket (HELLO, IDENTIFY, READY, GUILD_CREATE and heartbeats,
+with JSON text frames) and the REST routes of the login, the command sync,
+interaction callbacks and webhook followups. A bot pointed at it with
+``use_simulator`` (``main.py --simulator URL``) runs unchanged, every shard
+connecting to the same local server.
+
+Once every shard is ready, ``replay`` sends ``INTERACTION_CREATE`` events
+at a fixed rate, each from a random user in a random guild of the shard
+that owns it, and times them until the bot's answer arrives: the
+interaction callback, or the followup or edit after a deferral. The
+report has the throughput, latency percentiles per command, the loop lag
+of the simulator (a lagging simulator understates the bot's latency) and,
+when the bot serves metrics, the bot's own event-loop lag over the run.
+
+Run it with ``python -m src.infrastructure.simulator.discord_simulator``
+and start the bot with ``python main.py --simulator http://127.0.0.1:8765``.
+"""
+
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import logging
+import contextlib
+from logging import Logger
+from dataclasses import dataclass, field
+from typing import Any, Optional
+import aiohttp
+from aiohttp import WSMsgType, web
+from src.infrastructure.metrics.runtime_metrics import LOOP_LAG_METRIC
+from src.infrastructure.simulator import payloads
+from src.infrastructure.simulator.endpoints import API_PATH, GATEWAY_PATH, gateway_url
+
+HEARTBEAT_INTERVAL_MS = 41_250
+TICK = 0.005
+LAG_INTERVAL = 0.05
+# Callback types that answer an interaction, and the ones that defer the answer.
+ANSWERED = frozenset((4, 7, 9))
+DEFERRED = frozenset((5, 6))
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class LoadProfile():
+    """What the simulated Discord looks like and how hard it pushes the bot."""
+    shards: int = 4
+    rate: float = 1000.0
+    duration: float = 10.0
+    commands: tuple[str, ...] = ("joke", "about_bot")
+    guilds: int = 1000
+    users: int = 50_000
+    max_concurrency: int = 16
+    warmup: float = 3.0
+    timeout: float = 10.0
+
+@dataclass(frozen=True)
+class LatencyStats():
+    """Percentiles of a set of samples, in seconds."""
+    count: int = 0
+    p50: float = 0.0
+    p90: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+
+    @classmethod
+    def of(cls, samples: list[float]) -> "LatencyStats":
+        """Summarises the samples."""
+        if not samples:
+            return cls()
+        ordered = sorted(samples)
+
+        def percentile(quantile: float) -> float:
+            return ordered[max(0, math.ceil(quantile * len(ordered)) - 1)]
+
+        return cls(len(ordered), percentile(0.50), percentile(0.90), percentile(0.99),
+                   ordered[-1])
+
+@dataclass(frozen=True)
+class LagHistogram():
+    """A scrape of the bot's event-loop lag histogram."""
+    total: float = 0.0
+    count: int = 0
+    buckets: tuple[tuple[float, int], ...] = ()
+
+    @classmethod
+    def parse(cls, text: str, name: str = LOOP_LAG_METRIC) -> Optional["LagHistogram"]:
+        """Reads the histogram from the Prometheus text format."""
+        total, count, buckets = None, None, []
+        for line in text.splitlines():
+            metric, _, value = line.rpartition(" ")
+            if metric.startswith(f"{name}_bucket"):
+                bound = metric.partition('le="')[2].partition('"')[0]
+                buckets.append((float(bound), int(float(value))))
+            elif metric == f"{name}_sum":
+                total = float(value)
+            elif metric == f"{name}_count":
+                count = int(float(value))
+        if total is None or count is None:
+            return None
+        return cls(total, count, tuple(buckets))
+
+    def since(self, earlier: "LagHistogram") -> "LagHistogram":
+        """The samples observed after ``earlier``."""
+        previous = dict(earlier.buckets)
+        return LagHistogram(self.total - earlier.total, self.count - earlier.count,
+                            tuple((bound, count - previous.get(bound, 0))
+                                  for bound, count in self.buckets))
+
+    @property
+    def mean(self) -> float:
+        """Mean lag, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def upper_bound(self, quantile: float) -> float:
+        """The smallest bucket bound the quantile is under; ``inf`` past the last one."""
+        wanted = quantile * self.count
+        return next((bound for bound, count in self.buckets if count >= wanted), math.inf)
+
+@dataclass(frozen=True)
+class SimulationReport():
+    """End-to-end results of one replay."""
+    profile: LoadProfile
+    sent: int
+    completed: int
+    deferred: int
+    seconds: float
+    latency: LatencyStats
+    commands: dict[str, LatencyStats]
+    simulator_lag: LatencyStats
+    bot_lag: Optional[LagHistogram] = None
+    unexpected: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def lost(self) -> int:
+        """Interactions the bot never answered."""
+        return self.sent - self.completed
+
+    @property
+    def throughput(self) -> float:
+        """Answered interactions per second."""
+        return self.completed / self.seconds if self.seconds > 0 else 0.0
+
+    def format(self) -> str:
+        """A human-readable summary."""
+        profile = self.profile
+        lines = [
+            f"Simulated load: {profile.shards} shards, {profile.guilds} guilds, "
+            f"{profile.users} users, {'/'.join(profile.commands)} at {profile.rate:g}/s "
+            f"for {profile.duration:g}s",
+            f"sent {self.sent}, completed {self.completed} ({self.deferred} deferred), "
+            f"lost {self.lost}, throughput {self.throughput:.1f}/s",
+            f"{'latency':<16} {'count':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}",
+        ]
+        rows = [("all", self.latency), *sorted(self.commands.items()),
+                ("simulator lag", self.simulator_lag)]
+        lines.extend(
+            f"{name:<16} {stats.count:>7} {stats.p50 * 1e3:7.1f}ms {stats.p90 * 1e3:7.1f}ms "
+            f"{stats.p99 * 1e3:7.1f}ms {stats.max * 1e3:7.1f}ms" for name, stats in rows)
+        if self.bot_lag is not None:
+            lines.append(f"bot loop lag: {self.bot_lag.count} probes, mean "
+                         f"{self.bot_lag.mean * 1e3:.1f}ms, p99 under "
+                         f"{self.bot_lag.upper_bound(0.99) * 1e3:.1f}ms")
+        else:
+            lines.append("bot loop lag: unknown, enable [metrics] and pass --metrics-url")
+        lines.extend(f"unexpected route: {route} ({count})"
+                     for route, count in sorted(self.unexpected.items()))
+        return "\n".join(lines)
+
+def _json(data: Any, status: int = 200) -> web.Response:
+    # discord.py only decodes a body whose content type is exactly this, without a charset.
+    return web.Response(body=json.dumps(data).encode("utf-8"), status=status,
+                        headers={"Content-Type": "application/json"})
+
+@dataclass
+class _Pending():
+    command: str
+    sent_at: float
+    deferred: bool = False
+
+class _Session():
+    """One shard's gateway connection."""
+
+    def __init__(self, websocket: web.WebSocketResponse) -> None:
+        self.websocket = websocket
+        self.sequence = 0
+        self.shard_id = 0
+        self.shard_count = 1
+
+    async def send(self, op: int, data: Any = None) -> None:
+        """Sends a non-dispatch payload."""
+        await self.websocket.send_str(json.dumps({"op": op, "d": data, "s": None, "t": None}))
+
+    async def dispatch(self, event: str, data: Any) -> None:
+        """Sends an event."""
+        self.sequence += 1
+        await self.websocket.send_str(json.dumps({"op": 0, "t": event, "s": self.sequence,
+                                                  "d": data}))
+
+class DiscordSimulator():
+    """Fake Discord gateway and REST API replaying interactions at a fixed rate."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, profile: Optional[LoadProfile] = None, *, host: str = "127.0.0.1",
+                 port: int = 8765, metrics_url: Optional[str] = None,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            profile: Shards, guilds, users, rate and duration of the load.
+            host: Interface to listen on.
+            port: Port to listen on; 0 picks a free one.
+            metrics_url: The bot's ``/metrics`` URL, to report its loop lag.
+            logger: Optional logger.
+        """
+        self.profile = profile or LoadProfile()
+        self.host = host
+        self.port = port
+        self.metrics_url = metrics_url
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.bot_user = payloads.user(0, bot=True)
+        self.application_id: str = self.bot_user["id"]
+        self.sessions: dict[int, _Session] = {}
+        self._connections: set[web.WebSocketResponse] = set()
+        self.ready = asyncio.Event()
+        self.unexpected: dict[str, int] = {}
+        self._pending: dict[str, _Pending] = {}
+        self._latencies: dict[str, list[float]] = {}
+        self._deferred = 0
+        self._last_answer = 0.0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        """The URL to give ``use_simulator``."""
+        return f"http://{self.host}:{self.port}"
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(f"/{GATEWAY_PATH}", self._gateway)
+        api = f"/{API_PATH}"
+        app.router.add_get(f"{api}/users/@me", self._bot_user)
+        app.router.add_get(f"{api}/gateway", self._gateway_url)
+        app.router.add_get(f"{api}/gateway/bot", self._gateway_bot)
+        app.router.add_get(f"{api}/oauth2/applications/@me", self._application)
+        app.router.add_get(f"{api}/applications/{{app}}/commands", self._no_commands)
+        app.router.add_put(f"{api}/applications/{{app}}/commands", self._sync_commands)
+        app.router.add_get(f"{api}/applications/{{app}}/guilds/{{guild}}/commands",
+                           self._no_commands)
+        app.router.add_put(f"{api}/applications/{{app}}/guilds/{{guild}}/commands",
+                           self._sync_commands)
+        app.router.add_post(f"{api}/interactions/{{id}}/{{token}}/callback", self._callback)
+        app.router.add_post(f"{api}/webhooks/{{app}}/{{token}}", self._followup)
+        app.router.add_route("*", f"{api}/webhooks/{{app}}/{{token}}/messages/{{message}}",
+                             self._webhook_message)
+        app.router.add_route("*", "/{tail:.*}", self._unexpected)
+        # Runs once the socket is closed, so the shards cannot reconnect.
+        app.on_shutdown.append(self._disconnect)
+        return app
+
+    async def start(self) -> None:
+        """Starts listening; with port 0, ``port`` is the one picked."""
+        if self._runner is not None:
+            return
+        runner = web.AppRunner(self._app(), access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        self.port = runner.addresses[0][1]
+        self.logger.info("Discord simulator listening on %s", self.base_url)
+
+    async def close(self) -> None:
+        """Stops listening, then closes the shard connections."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "DiscordSimulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info: Any) -> None:
+        await self.close()
+
+    # Gateway
+
+    async def _disconnect(self, _app: web.Application) -> None:
+        for websocket in list(self._connections):
+            await websocket.close()
+
+    async def _gateway(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse(max_msg_size=0)
+        await websocket.prepare(request)
+        self._connections.add(websocket)
+        session = _Session(websocket)
+        await session.send(10, {"heartbeat_interval": HEARTBEAT_INTERVAL_MS})
+        try:
+            async for frame in websocket:
+                if frame.type != WSMsgType.TEXT:
+                    continue
+                payload = json.loads(frame.data)
+                await self._receive(session, payload["op"], payload.get("d"))
+        finally:
+            self._connections.discard(websocket)
+            if self.sessions.get(session.shard_id) is session:
+                del self.sessions[session.shard_id]
+        return websocket
+
+    async def _receive(self, session: _Session, op: int, data: Any) -> None:
+        if op == 1:
+            await session.send(11)
+        elif op == 2:
+            await self._identify(session, data)
+        elif op == 6:
+            # Sessions are not kept, the shard identifies again.
+            await session.send(9, False)
+        elif op == 8:
+            await session.dispatch("GUILD_MEMBERS_CHUNK", {
+                "guild_id": data["guild_id"], "members": [], "chunk_index": 0,
+                "chunk_count": 1, "nonce": data.get("nonce")})
+
+    def _guild_indexes(self, shard_id: int, shard_count: int) -> list[int]:
+        return [index for index in range(self.profile.guilds)
+                if payloads.shard_of(payloads.snowflake(payloads.GUILD, index),
+                                     shard_count) == shard_id]
+
+    async def _identify(self, session: _Session, data: dict[str, Any]) -> None:
+        session.shard_id, session.shard_count = data.get("shard") or (0, 1)
+        guilds = self._guild_indexes(session.shard_id, session.shard_count)
+        await session.dispatch("READY", {
+            "v": 10,
+            "user": self.bot_user,
+            "guilds": [{"id": str(payloads.snowflake(payloads.GUILD, index)),
+                        "unavailable": True} for index in guilds],
+            "session_id": uuid.uuid4().hex,
+            "resume_gateway_url": str(gateway_url(self.base_url)),
+            "shard": [session.shard_id, session.shard_count],
+            "application": {"id": self.application_id, "flags": 0},
+            "private_channels": [],
+        })
+        for index in guilds:
+            await session.dispatch("GUILD_CREATE", payloads.guild(index, self.application_id))
+        self.sessions[session.shard_id] = session
+        self.logger.debug("Shard %s/%s ready with %s guilds", session.shard_id,
+                          session.shard_count, len(guilds))
+        if len(self.sessions) >= session.shard_count:
+            self.ready.set()
+
+    # REST
+
+    @staticmethod
+    async def _body(request: web.Request) -> Any:
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            return json.loads(str(form.get("payload_json") or "{}"))
+        if not request.can_read_body:
+            return {}
+        return await request.json()
+
+    async def _bot_user(self, _request: web.Request) -> web.Response:
+        return _json(self.bot_user)
+
+    async def _gateway_url(self, _request: web.Request) -> web.Response:
+        return _json({"url": str(gateway_url(self.base_url))})
+
+    async def _gateway_bot(self, _request: web.Request) -> web.Response:
+        return _json({
+            "url": str(gateway_url(self.base_url)),
+            "shards": self.profile.shards,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0,
+                                    "max_concurrency": self.profile.max_concurrency},
+        })
+
+    async def _application(self, _request: web.Request) -> web.Response:
+        return _json(payloads.application(self.bot_user))
+
+    async def _no_commands(self, _request: web.Request) -> web.Response:
+        return _json([])
+
+    async def _sync_commands(self, request: web.Request) -> web.Response:
+        return _json(payloads.commands(self.application_id, await self._body(request),
+                                                   request.match_info.get("guild")))
+
+    def _answer(self, token: str) -> None:
+        pending = self._pending.pop(token, None)
+        if pending is None:
+            return
+        self._last_answer = time.perf_counter()
+        self._latencies.setdefault(pending.command, []).append(self._last_answer
+                                                                - pending.sent_at)
+
+    async def _callback(self, request: web.Request) -> web.Response:
+        body = await self._body(request)
+        token, kind = request.match_info["token"], body.get("type")
+        pending = self._pending.get(token)
+        if kind in DEFERRED and pending is not None and not pending.deferred:
+            pending.deferred = True
+            self._deferred += 1
+        elif kind in ANSWERED:
+            self._answer(token)
+        flags = (body.get("data") or {}).get("flags") or 0
+        return _json({"interaction": {
+            "id": request.match_info["id"], "type": 2,
+            "response_message_loading": kind == 5,
+            "response_message_ephemeral": bool(flags & 64),
+        }})
+
+    async def _followup(self, request: web.Request) -> web.Response:
+        body = await self._body(request)
+        self._answer(request.match_info["token"])
+        return _json(payloads.message(body, self.bot_user))
+
+    async def _webhook_message(self, request: web.Request) -> web.Response:
+        if request.method == "DELETE":
+            return web.Response(status=204)
+        body = await self._body(request) if request.method == "PATCH" else {}
+        if request.method == "PATCH":
+            self._answer(request.match_info["token"])
+        return _json(payloads.message(body, self.bot_user))
+
+    async def _unexpected(self, request: web.Request) -> web.Response:
+        route = f"{request.method} {request.path}"
+        self.unexpected[route] = self.unexpected.get(route, 0) + 1
+        self.logger.warning("Unexpected request: %s", route)
+        return _json({"message": "404: Not Found", "code": 0}, status=404)
+
+    # Load
+
+    async def _send_interaction(self, guilds: list[int], shard_count: int) -> None:
+        index = random.choice(guilds)
+        session = self.sessions.get(payloads.shard_of(payloads.snowflake(payloads.GUILD, index),
+                                                      shard_count))
+        if session is None:
+            return
+        command = random.choice(self.profile.commands)
+        interaction_id = payloads.now_snowflake()
+        self._pending[f"sim-{interaction_id}"] = _Pending(command, time.perf_counter())
+        await session.dispatch("INTERACTION_CREATE", payloads.interaction(
+            interaction_id, self.application_id, command, index,
+            random.randrange(self.profile.users)))
+
+    async def _probe_lag(self, samples: list[float]) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            samples.append(max(0.0, time.perf_counter() - started - LAG_INTERVAL))
+
+    async def _scrape_lag(self) -> Optional[LagHistogram]:
+        if self.metrics_url is None:
+            return None
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(self.metrics_url) as response:
+                    return LagHistogram.parse(await response.text())
+        except aiohttp.ClientError as error:
+            self.logger.warning("Could not scrape %s: %s", self.metrics_url, error)
+            return None
+
+    async def replay(self) -> SimulationReport:
+        """Waits for every shard, sends the load and waits for the answers.
+
+        Raises:
+            TimeoutError: The bot did not connect every shard within the timeout.
+        """
+        profile = self.profile
+        await asyncio.wait_for(self.ready.wait(), profile.timeout)
+        await asyncio.sleep(profile.warmup)
+        shard_count = next(iter(self.sessions.values())).shard_count
+        guilds = [index for shard_id in self.sessions
+                  for index in self._guild_indexes(shard_id, shard_count)]
+        if not guilds:
+            raise ValueError("No simulated guild belongs to a connected shard.")
+        lag_before = await self._scrape_lag()
+        lag_samples: list[float] = []
+        probe = asyncio.create_task(self._probe_lag(lag_samples), name="simulator-lag-probe")
+
+        total = int(profile.rate * profile.duration)
+        sent = 0
+        started = time.perf_counter()
+        while sent < total:
+            due = min(total, int((time.perf_counter() - started) * profile.rate) + 1)
+            for _ in range(due - sent):
+                await self._send_interaction(guilds, shard_count)
+            sent = due
+            await asyncio.sleep(TICK)
+        deadline = time.perf_counter() + profile.timeout
+        while self._pending and time.perf_counter() < deadline:
+            await asyncio.sleep(TICK)
+
+        probe.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await probe
+        lag_after = await self._scrape_lag()
+        latencies = [latency for samples in self._latencies.values() for latency in samples]
+        return SimulationReport(
+            profile=profile,
+            sent=total,
+            completed=len(latencies),
+            deferred=self._deferred,
+            seconds=max(0.0, self._last_answer - started),
+            latency=LatencyStats.of(latencies),
+            commands={name: LatencyStats.of(samples) for name, samples in self._latencies.items()},
+            simulator_lag=LatencyStats.of(lag_samples),
+            bot_lag=(lag_after.since(lag_before)
+                     if lag_before is not None and lag_after is not None else None),
+            unexpected=dict(self.unexpected),
+        )
+
+def parse_cli_args() -> argparse.Namespace:
+    """Parses the load profile from the command line."""
+    defaults = LoadProfile()
+    parser = argparse.ArgumentParser(description="Replay synthetic interactions against the bot.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--shards", type=int, default=defaults.shards,
+                        help="Shard count recommended to the bot.")
+    parser.add_argument("--rate", type=float, default=defaults.rate,
+                        help="Interactions per second.")
+    parser.add_argument("--duration", type=float, default=defaults.duration,
+                        help="Seconds of load.")
+    parser.add_argument("--commands", nargs="+", default=list(defaults.commands),
+                        help="Slash commands to invoke, picked at random.")
+    parser.add_argument("--guilds", type=int, default=defaults.guilds,
+                        help="Guilds spread over the shards.")
+    parser.add_argument("--users", type=int, default=defaults.users,
+                        help="Distinct users invoking the commands.")
+    parser.add_argument("--timeout", type=float, default=600.0,
+                        help="Seconds to wait for the bot to connect, and for the last answers.")
+    parser.add_argument("--metrics-url", default=None,
+                        help="The bot's metrics endpoint, e.g. http://127.0.0.1:9108/metrics.")
+    return parser.parse_args()
+
+async def simulate(cli_args: argparse.Namespace) -> SimulationReport:
+    """Serves the simulator until the bot connects, then replays the load."""
+    profile = LoadProfile(shards=cli_args.shards, rate=cli_args.rate,
+                          duration=cli_args.duration, commands=tuple(cli_args.commands),
+                          guilds=cli_args.guilds, users=cli_args.users,
+                          timeout=cli_args.timeout)
+    async with DiscordSimulator(profile, host=cli_args.host, port=cli_args.port,
+                                metrics_url=cli_args.metrics_url) as simulator:
+        print(f"Waiting for the bot: python main.py --simulator {simulator.base_url}",
+              flush=True)
+        return await simulator.replay()
+
+def main() -> None:
+    """Prints the report; exits with 1 when interactions were left unanswered."""
+    cli_args = parse_cli_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - %(message)s")
+    report = asyncio.run(simulate(cli_args))
+    print(report.format(), flush=True)
+    sys.exit(1 if report.lost else 0)
+
+if __name__ == "__main__":
+    main()
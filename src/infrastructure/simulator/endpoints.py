@@ -0,0 +1,27 @@
+"""Points discord.py at a local Discord simulator instead of discord.com."""
+
+import yarl
+from discord import http
+from discord.gateway import DiscordWebSocket
+
+API_PATH = "api/v10"
+GATEWAY_PATH = "gateway"
+
+def api_url(base_url: str) -> str:
+    """REST base of a simulator, e.g. ``http://127.0.0.1:8765/api/v10``."""
+    return str(yarl.URL(base_url) / API_PATH)
+
+def gateway_url(base_url: str) -> yarl.URL:
+    """Websocket URL of a simulator's gateway."""
+    base = yarl.URL(base_url)
+    return base.with_scheme("wss" if base.scheme in ("https", "wss") else "ws") / GATEWAY_PATH
+
+def use_simulator(base_url: str) -> None:
+    """Sends every REST call, interaction response and gateway connection to ``base_url``.
+
+    discord.py keeps these URLs in class attributes (interaction responses
+    and followups use the same ``Route``), so this applies to every client
+    of the process; call it before the bot logs in.
+    """
+    http.Route.BASE = api_url(base_url)
+    DiscordWebSocket.DEFAULT_GATEWAY = gateway_url(base_url)
@@ -0,0 +1,156 @@
+"""Synthetic Discord payloads: snowflakes, guilds, users, interactions and messages.
+
+Ids are deterministic so a guild always lands on the same shard: the
+index of an object is in the timestamp bits of its snowflake (which
+Discord shards guilds by) and its kind in the worker bits, so ids of
+different kinds never collide. Interaction ids are real timestamps,
+since the bot measures how old an interaction is from its id.
+"""
+
+import itertools
+import datetime
+from typing import Any, Optional
+import discord
+
+GUILD, CHANNEL, USER, APPLICATION, COMMAND = range(1, 6)
+TIMESTAMP = "2024-01-01T00:00:00+00:00"
+# Sent to the bot as the application permissions, everything a text channel allows.
+APP_PERMISSIONS = str(discord.Permissions.text().value | discord.Permissions.general().value)
+ATTACHMENT_SIZE_LIMIT = 25 * 1024 * 1024
+
+_SEQUENCE = itertools.count()
+
+def snowflake(kind: int, index: int) -> int:
+    """Id of the ``index``-th object of a kind."""
+    return ((index + 1) << 22) | (kind << 17)
+
+def shard_of(guild_id: int, shard_count: int) -> int:
+    """The shard Discord sends a guild's events to."""
+    return (guild_id >> 22) % shard_count
+
+def now_snowflake() -> int:
+    """A unique id created now, for interactions and messages."""
+    return discord.utils.time_snowflake(discord.utils.utcnow()) | (next(_SEQUENCE) & 0x3FFFFF)
+
+def user(index: int, *, bot: bool = False) -> dict[str, Any]:
+    """A user; the bot is the user of the application."""
+    return {
+        "id": str(snowflake(APPLICATION if bot else USER, index)),
+        "username": "simulated-bot" if bot else f"user{index}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+    }
+
+def application(owner: dict[str, Any]) -> dict[str, Any]:
+    """``GET /oauth2/applications/@me``."""
+    return {
+        "id": owner["id"],
+        "name": owner["username"],
+        "description": "",
+        "icon": None,
+        "bot_public": True,
+        "bot_require_code_grant": False,
+        "owner": owner,
+        "verify_key": "0" * 64,
+        "flags": 0,
+    }
+
+def guild(index: int, owner_id: str) -> dict[str, Any]:
+    """A ``GUILD_CREATE`` with one text channel and no members."""
+    guild_id = str(snowflake(GUILD, index))
+    return {
+        "id": guild_id,
+        "name": f"guild{index}",
+        "icon": None,
+        "owner_id": owner_id,
+        "unavailable": False,
+        "large": False,
+        "member_count": 1,
+        "joined_at": TIMESTAMP,
+        "features": [],
+        "preferred_locale": "en-US",
+        "premium_tier": 0,
+        "verification_level": 0,
+        "default_message_notifications": 0,
+        "explicit_content_filter": 0,
+        "mfa_level": 0,
+        "nsfw_level": 0,
+        "system_channel_flags": 0,
+        "roles": [{"id": guild_id, "name": "@everyone", "permissions": "0", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False,
+                   "flags": 0}],
+        "channels": [channel(index)],
+        "members": [],
+        "emojis": [],
+        "stickers": [],
+        "threads": [],
+        "voice_states": [],
+        "presences": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+    }
+
+def channel(guild_index: int) -> dict[str, Any]:
+    """The text channel of a guild."""
+    return {"id": str(snowflake(CHANNEL, guild_index)), "type": 0, "name": "general",
+            "position": 0, "permission_overwrites": [], "nsfw": False,
+            "guild_id": str(snowflake(GUILD, guild_index))}
+
+def interaction(interaction_id: int, application_id: str, command: str,
+                guild_index: int, user_index: int) -> dict[str, Any]:
+    """An ``INTERACTION_CREATE`` of a slash command without options."""
+    return {
+        "id": str(interaction_id),
+        "type": 2,
+        "token": f"sim-{interaction_id}",
+        "version": 1,
+        "application_id": application_id,
+        "guild_id": str(snowflake(GUILD, guild_index)),
+        "channel_id": str(snowflake(CHANNEL, guild_index)),
+        "channel": channel(guild_index),
+        "member": {"user": user(user_index), "roles": [], "joined_at": TIMESTAMP,
+                   "deaf": False, "mute": False, "flags": 0, "permissions": APP_PERMISSIONS},
+        "data": {"id": str(snowflake(COMMAND, 0)), "name": command, "type": 1, "options": []},
+        "locale": "en-US",
+        "guild_locale": "en-US",
+        "app_permissions": APP_PERMISSIONS,
+        "attachment_size_limit": ATTACHMENT_SIZE_LIMIT,
+        "entitlements": [],
+        "authorizing_integration_owners": {},
+        "context": 0,
+    }
+
+def message(body: dict[str, Any], author: dict[str, Any],
+            channel_id: Optional[str] = None) -> dict[str, Any]:
+    """The message a followup or an edit created, echoing what the bot sent."""
+    return {
+        "id": str(now_snowflake()),
+        "channel_id": channel_id or str(snowflake(CHANNEL, 0)),
+        "author": author,
+        "content": body.get("content") or "",
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": body.get("embeds") or [],
+        "components": body.get("components") or [],
+        "pinned": False,
+        "type": 20,
+        "flags": body.get("flags") or 0,
+    }
+
+def commands(application_id: str, body: list[dict[str, Any]],
+             guild_id: Optional[str] = None) -> list[dict[str, Any]]:
+    """What Discord returns from a bulk command overwrite: the commands with ids."""
+    synced = []
+    for index, command in enumerate(body):
+        synced.append({**command, "id": str(snowflake(COMMAND, index)),
+                       "application_id": application_id, "version": "1",
+                       "default_member_permissions": command.get("default_member_permissions"),
+                       **({"guild_id": guild_id} if guild_id else {})})
+    return synced
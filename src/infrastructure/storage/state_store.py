@@ -0,0 +1,317 @@
+"""Durable key-value state on SQLite with a read-through cache and write-behind batches.
+
+State is grouped in named tables (``termo_scores``, ``guild_locales``...),
+all stored in one SQLite table keyed by ``(table, key)``. Values are
+JSON-encoded when they are set. The database runs in WAL mode on a dedicated thread, so the
+event loop never waits on the disk: reads that miss the cache and batched
+writes are the only work handed to that thread.
+"""
+
+import json
+import asyncio
+import logging
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+from src.core.constants import DEFAULT_STATE_STORE_PATH
+
+ResultT = TypeVar("ResultT")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+_DELETED = object()
+_UNKNOWN = object()
+
+class StateStoreError(Exception):
+    """Raised when the store is used after it was closed."""
+
+@dataclass(frozen=True)
+class StateStoreStats():
+    """Snapshot of the store counters."""
+    cached: int
+    pending: int
+    hits: int
+    misses: int
+    flushes: int
+    rows_written: int
+
+class StateTable():
+    """One named table of a ``StateStore``; a thin view that only prefixes keys."""
+
+    __slots__ = ("store", "name")
+
+    def __init__(self, store: "StateStore", name: str) -> None:
+        self.store = store
+        self.name = name
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Returns the value of a key, from the cache when possible."""
+        return await self.store.get(self.name, key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores a value; it is written to disk with the next batch."""
+        self.store.set(self.name, key, value)
+
+    def delete(self, key: str) -> None:
+        """Removes a key; the removal is written with the next batch."""
+        self.store.delete(self.name, key)
+
+    async def items(self) -> list[tuple[str, Any]]:
+        """Returns every key and value of the table, pending writes included."""
+        return await self.store.items(self.name)
+
+# pylint: disable=too-many-instance-attributes
+class StateStore():
+    """Async key-value store backed by SQLite in WAL mode.
+
+    Writes go to the cache and to a pending batch right away and return
+    without waiting. A batch is flushed in one transaction when it holds
+    ``batch_size`` writes or ``flush_interval`` seconds after its first
+    write, whichever comes first; later writes to a pending key replace the
+    earlier ones, so a hot key costs one row per batch. Reads check the
+    pending batch and the LRU cache before going to the database thread.
+    Cached values are shared, so callers treat them as immutable and set a
+    new value instead of changing one in place. ``aclose`` flushes what is
+    left, which the service container awaits at shutdown.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, path: Path = DEFAULT_STATE_STORE_PATH, *,
+                 cache_entries: int = 50_000, batch_size: int = 512,
+                 flush_interval: float = 1.0, logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            path: SQLite database file, created if missing.
+            cache_entries: Values kept in memory at most; pending writes are not counted.
+            batch_size: Pending writes that trigger a flush.
+            flush_interval: Seconds a write may stay pending at most.
+            logger: Optional logger.
+        """
+        self.path = path
+        self.cache_entries = cache_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self._cache: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._pending: dict[tuple[str, str], Any] = {}  # encoded values, or _DELETED
+        self._writing: dict[tuple[str, str], Any] = {}  # the batch being flushed
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._flushing: Optional[asyncio.Future] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="state-store")
+
+    def table(self, name: str) -> StateTable:
+        """Returns a view over one named table."""
+        return StateTable(self, name)
+
+    def stats(self) -> StateStoreStats:
+        """Returns the current counters."""
+        return StateStoreStats(cached=len(self._cache), pending=len(self._pending),
+                               hits=self.hits, misses=self.misses, flushes=self.flushes,
+                               rows_written=self.rows_written)
+
+    # Database thread
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _read(self, namespace: str, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM state WHERE namespace = ? AND key = ?",
+                                      (namespace, key)).fetchone()
+        return row[0] if row is not None else None
+
+    def _read_table(self, namespace: str) -> list[tuple[str, str]]:
+        return self._connect().execute("SELECT key, value FROM state WHERE namespace = ?",
+                                       (namespace,)).fetchall()
+
+    def _write(self, upserts: list[tuple[str, str, str]],
+               deletes: list[tuple[str, str]]) -> None:
+        connection = self._connect()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value", upserts)
+            connection.executemany("DELETE FROM state WHERE namespace = ? AND key = ?", deletes)
+
+    def _disconnect(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def _run(self, func: Callable[..., ResultT], *args: Any) -> ResultT:
+        if self._executor is None:
+            raise StateStoreError("The state store is closed.")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # Event loop
+
+    def _remember(self, cache_key: tuple[str, str], value: Any) -> None:
+        self._cache[cache_key] = value
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _decode(encoded: Any) -> Any:
+        return encoded if encoded is _DELETED else json.loads(encoded)
+
+    def _latest(self, cache_key: tuple[str, str]) -> Any:
+        """The newest value of a key held in memory: cached, pending or being written."""
+        # The cache holds the latest value of a key, pending or not, while it is in it.
+        value = self._cache.get(cache_key, _UNKNOWN)
+        if value is not _UNKNOWN:
+            self._cache.move_to_end(cache_key)
+            return value
+        for batch in (self._pending, self._writing):
+            if cache_key in batch:
+                value = self._decode(batch[cache_key])
+                self._remember(cache_key, value)
+                return value
+        return _UNKNOWN
+
+    async def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Returns the value of a key in a table."""
+        cache_key = (namespace, key)
+        value = self._latest(cache_key)
+        if value is not _UNKNOWN:
+            self.hits += 1
+            return default if value is _DELETED else value
+
+        self.misses += 1
+        encoded = await self._run(self._read, namespace, key)
+        # A write made during the read, even one flushed since, is newer than the row read.
+        value = self._latest(cache_key)
+        if value is _UNKNOWN:
+            # Missing keys are cached too, so absent state is not read again.
+            value = json.loads(encoded) if encoded is not None else _DELETED
+            self._remember(cache_key, value)
+        return default if value is _DELETED else value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Stores a value in a table.
+
+        Raises:
+            TypeError: The value is not JSON-serializable.
+            ValueError: The value is circular or holds a NaN or an infinity.
+        """
+        if self._executor is None:
+            raise StateStoreError("The state store is closed.")
+        # Encoded now, so a bad value fails its caller instead of every later flush.
+        encoded = json.dumps(value, separators=(",", ":"), allow_nan=False)
+        cache_key = (namespace, key)
+        self._pending[cache_key] = encoded
+        self._remember(cache_key, value)
+        self._schedule_flush()
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Removes a key from a table."""
+        if self._executor is None:
+            raise StateStoreError("The state store is closed.")
+        cache_key = (namespace, key)
+        self._pending[cache_key] = _DELETED
+        self._remember(cache_key, _DELETED)
+        self._schedule_flush()
+
+    async def items(self, namespace: str) -> list[tuple[str, Any]]:
+        """Returns every key and value of a table, pending writes included."""
+        rows = {key: json.loads(value)
+                for key, value in await self._run(self._read_table, namespace)}
+        # The batch being written may have been taken from the pending writes during the read.
+        for (pending_namespace, key), encoded in {**self._writing, **self._pending}.items():
+            if pending_namespace != namespace:
+                continue
+            if encoded is _DELETED:
+                rows.pop(key, None)
+            else:
+                rows[key] = json.loads(encoded)
+        return sorted(rows.items())
+
+    def _schedule_flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        if len(self._pending) >= self.batch_size:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush_handle = loop.call_soon(self._start_flush)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.ensure_future(self.flush())
+
+    @staticmethod
+    def _rows(batch: dict[tuple[str, str], Any]
+              ) -> tuple[list[tuple[str, str, str]], list[tuple[str, str]]]:
+        upserts, deletes = [], []
+        for (namespace, key), encoded in batch.items():
+            if encoded is _DELETED:
+                deletes.append((namespace, key))
+            else:
+                upserts.append((namespace, key, encoded))
+        return upserts, deletes
+
+    async def flush(self) -> int:
+        """Writes the pending batches, one transaction each; returns the rows written.
+
+        A batch that fails to write is put back under the writes made since,
+        and retried with the next flush.
+        """
+        written = 0
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            self._writing = batch
+            try:
+                await self._run(self._write, *self._rows(batch))
+            except sqlite3.Error as error:
+                self.logger.error("Failed to write %s state rows: %s", len(batch), error)
+                self._pending = {**batch, **self._pending}
+                break
+            finally:
+                self._writing = {}
+            self.flushes += 1
+            written += len(batch)
+        self.rows_written += written
+        return written
+
+    async def aclose(self) -> None:
+        """Flushes the pending writes and closes the database."""
+        if self._executor is None:
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flushing is not None and not self._flushing.done():
+            await self._flushing
+        try:
+            await self.flush()
+            if self._pending:
+                self.logger.error("Dropped %s unwritten state rows.", len(self._pending))
+        finally:
+            await self._run(self._disconnect)
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,112 @@
+"""Compact per-channel Termo games and their idle-evicting store."""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional
+from src.infrastructure.termo.scorer import PATTERN_WIN
+
+MAX_ATTEMPTS = 6
+GUESS_BITS = 25
+PATTERN_BITS = 8
+
+class TermoGame():
+    """State of one channel's game in five slots.
+
+    The guesses and their patterns are packed into two ints (25 and 8 bits
+    per attempt) instead of lists, so a game costs the same couple hundred
+    bytes from the first guess to the last.
+    """
+
+    __slots__ = ("secret", "guesses", "patterns", "attempts", "last_active")
+
+    def __init__(self, secret: int, now: float) -> None:
+        self.secret = secret
+        self.guesses = 0
+        self.patterns = 0
+        self.attempts = 0
+        self.last_active = now
+
+    @property
+    def won(self) -> bool:
+        """Whether the last guess was the secret."""
+        return self.attempts > 0 and self.pattern(self.attempts - 1) == PATTERN_WIN
+
+    @property
+    def finished(self) -> bool:
+        """Whether no more guesses are accepted."""
+        return self.won or self.attempts >= MAX_ATTEMPTS
+
+    def guess(self, attempt: int) -> int:
+        """Packed word of an attempt."""
+        return (self.guesses >> (GUESS_BITS * attempt)) & ((1 << GUESS_BITS) - 1)
+
+    def pattern(self, attempt: int) -> int:
+        """Pattern of an attempt."""
+        return (self.patterns >> (PATTERN_BITS * attempt)) & ((1 << PATTERN_BITS) - 1)
+
+    def record(self, guess: int, pattern: int) -> None:
+        """Appends a scored guess."""
+        self.guesses |= guess << (GUESS_BITS * self.attempts)
+        self.patterns |= pattern << (PATTERN_BITS * self.attempts)
+        self.attempts += 1
+
+    def history(self) -> Iterator[tuple[int, int]]:
+        """Yields ``(guess, pattern)`` for every attempt so far."""
+        for attempt in range(self.attempts):
+            yield self.guess(attempt), self.pattern(attempt)
+
+class TermoGameStore():
+    """Games by channel id, evicting the ones idle for longer than ``ttl``.
+
+    The games are kept in last-used order, so expired ones are always at the
+    front: each access pops from the front until it finds a live game,
+    which keeps eviction O(1) amortized without a background task.
+    ``max_games`` caps the store by dropping the least recently used game.
+    """
+
+    def __init__(self, ttl: float = 900.0, max_games: int = 100_000,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_games = max_games
+        self.clock = clock
+        self.evicted = 0
+        self._games: OrderedDict[int, TermoGame] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def evict_idle(self) -> int:
+        """Drops the games idle for longer than the TTL; returns how many."""
+        deadline = self.clock() - self.ttl
+        evicted = 0
+        while self._games:
+            game = next(iter(self._games.values()))
+            if game.last_active > deadline:
+                break
+            self._games.popitem(last=False)
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def get(self, channel_id: int) -> Optional[TermoGame]:
+        """Returns the channel's game and marks it as used."""
+        self.evict_idle()
+        game = self._games.get(channel_id)
+        if game is not None:
+            game.last_active = self.clock()
+            self._games.move_to_end(channel_id)
+        return game
+
+    def create(self, channel_id: int, secret: int) -> TermoGame:
+        """Starts a game in a channel, replacing any previous one."""
+        self.evict_idle()
+        self._games.pop(channel_id, None)
+        while len(self._games) >= self.max_games:
+            self._games.popitem(last=False)
+            self.evicted += 1
+        game = self._games[channel_id] = TermoGame(secret, self.clock())
+        return game
+
+    def remove(self, channel_id: int) -> Optional[TermoGame]:
+        """Ends a channel's game."""
+        return self._games.pop(channel_id, None)
@@ -0,0 +1,84 @@
+"""Termo guess scoring, native with a pure Python equivalent."""
+
+import ctypes
+from array import array
+from logging import Logger
+from typing import Any, Optional, Protocol
+from src.infrastructure.native.bridge import NativeBridge, load_or_fallback
+from src.infrastructure.native.libraries import TERMO_SCORER
+from src.infrastructure.termo.word_list import LETTER_BITS, LETTER_MASK, WORD_LENGTH
+
+ABSENT, ELSEWHERE, CORRECT = 0, 1, 2
+POWERS = tuple(3 ** position for position in range(WORD_LENGTH))
+PATTERN_WIN = sum(CORRECT * power for power in POWERS)
+SHIFTS = tuple(LETTER_BITS * position for position in range(WORD_LENGTH))
+
+def pattern_digits(pattern: int) -> tuple[int, ...]:
+    """Splits a pattern into one ABSENT/ELSEWHERE/CORRECT digit per position."""
+    return tuple(pattern // power % 3 for power in POWERS)
+
+class TermoScorer(Protocol):
+    """Scores packed guesses against packed secrets."""
+
+    def score(self, secret: int, guess: int) -> int:
+        """Returns the pattern of one guess."""
+
+    def score_many(self, secrets: array, guess: int) -> bytearray:
+        """Returns the pattern of one guess against every secret."""
+
+class PythonTermoScorer():
+    """Reference scorer; used when the native library is not built."""
+
+    def score(self, secret: int, guess: int) -> int:
+        """Returns the pattern of one guess."""
+        if secret == guess:
+            return PATTERN_WIN
+        pattern = 0
+        unmatched = []
+        pending = []
+        for position, shift in enumerate(SHIFTS):
+            secret_letter = (secret >> shift) & LETTER_MASK
+            guess_letter = (guess >> shift) & LETTER_MASK
+            if secret_letter == guess_letter:
+                pattern += CORRECT * POWERS[position]
+            else:
+                unmatched.append(secret_letter)
+                pending.append((position, guess_letter))
+        for position, guess_letter in pending:
+            if guess_letter in unmatched:
+                unmatched.remove(guess_letter)
+                pattern += POWERS[position]
+        return pattern
+
+    def score_many(self, secrets: array, guess: int) -> bytearray:
+        """Returns the pattern of one guess against every secret."""
+        return bytearray(self.score(secret, guess) for secret in secrets)
+
+class NativeTermoScorer():
+    """Scorer backed by ``src/native/termo_scorer.nim``.
+
+    ``score_many`` hands the ``array`` buffer of packed words and an output
+    ``bytearray`` to Nim directly, scoring a whole word list in one call.
+    """
+
+    def __init__(self, nim_lib: Any) -> None:
+        self.nim_lib = nim_lib
+
+    def score(self, secret: int, guess: int) -> int:
+        """Returns the pattern of one guess."""
+        return self.nim_lib.termoScore(secret, guess)
+
+    def score_many(self, secrets: array, guess: int) -> bytearray:
+        """Returns the pattern of one guess against every secret."""
+        patterns = bytearray(len(secrets))
+        if secrets:
+            secrets_pointer, _ = secrets.buffer_info()
+            output = (ctypes.c_uint8 * len(patterns)).from_buffer(patterns)
+            self.nim_lib.termoScoreMany(secrets_pointer, len(secrets), guess, output)
+        return patterns
+
+def load_scorer(bridge: Optional[NativeBridge] = None,
+                logger: Optional[Logger] = None) -> TermoScorer:
+    """Returns the native scorer, or the Python one when the library cannot be loaded."""
+    return load_or_fallback(TERMO_SCORER, NativeTermoScorer, PythonTermoScorer,
+                            bridge=bridge, logger=logger)
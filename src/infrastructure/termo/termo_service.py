@@ -0,0 +1,102 @@
+"""Service running Termo games in many channels at once."""
+
+import logging
+import random
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Optional
+from src.core.constants import DEFAULT_TERMO_WORDS_PATH
+from src.infrastructure.termo.game import MAX_ATTEMPTS, TermoGame, TermoGameStore
+from src.infrastructure.termo.scorer import TermoScorer, load_scorer, pattern_digits
+from src.infrastructure.termo.word_list import WordList, decode
+
+class TermoError(Exception):
+    """Raised for guesses the game cannot accept."""
+
+@dataclass(frozen=True)
+class TermoRow():
+    """One attempt as shown to the players."""
+    word: str
+    digits: tuple[int, ...]
+
+@dataclass(frozen=True)
+class TermoBoard():
+    """Public view of a game after a move."""
+    rows: tuple[TermoRow, ...]
+    attempts_left: int
+    won: bool
+    finished: bool
+    secret: Optional[str]
+    candidates: int
+
+class TermoService():
+    """Starts games, scores guesses and keeps per-channel state.
+
+    All games share one ``WordList``; a game only holds its secret and its
+    packed attempts, so memory grows by a few hundred bytes per running game.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, words: Optional[WordList] = None,
+                 scorer: Optional[TermoScorer] = None, *,
+                 words_path: Path = DEFAULT_TERMO_WORDS_PATH, ttl: float = 900.0,
+                 max_games: int = 100_000, rng: Optional[random.Random] = None,
+                 logger: Optional[Logger] = None) -> None:
+        """
+        Args:
+            words: The playable words; read from ``words_path`` if omitted.
+            scorer: Guess scorer; the native one when available if omitted.
+            words_path: Word list file, one word per line.
+            ttl: Seconds a game may stay idle before it is dropped.
+            max_games: Games kept at most; the least recently used go first.
+            rng: Random source for the secrets.
+            logger: Optional logger.
+        """
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.words = words or WordList.from_file(words_path)
+        self.scorer = scorer or load_scorer(logger=self.logger)
+        self.games = TermoGameStore(ttl=ttl, max_games=max_games)
+        self.rng = rng or random.Random()
+
+    def start(self, channel_id: int) -> TermoBoard:
+        """Starts a new game in a channel, replacing the running one."""
+        secret = self.words.codes[self.rng.randrange(len(self.words))]
+        return self._board(self.games.create(channel_id, secret))
+
+    def board(self, channel_id: int) -> Optional[TermoBoard]:
+        """Returns the running game of a channel, if any."""
+        game = self.games.get(channel_id)
+        return self._board(game) if game is not None else None
+
+    def guess(self, channel_id: int, word: str) -> TermoBoard:
+        """Scores a guess in a channel's game."""
+        game = self.games.get(channel_id)
+        if game is None:
+            raise TermoError("There is no game running here, start one with /termo start.")
+        code = self.words.code_of(word)
+        if code is None:
+            raise TermoError(f"'{word}' is not in the word list.")
+
+        game.record(code, self.scorer.score(game.secret, code))
+        board = self._board(game)
+        if game.finished:
+            self.games.remove(channel_id)
+        return board
+
+    def give_up(self, channel_id: int) -> Optional[str]:
+        """Ends a channel's game and returns its secret."""
+        game = self.games.remove(channel_id)
+        return decode(game.secret) if game is not None else None
+
+    def _board(self, game: TermoGame) -> TermoBoard:
+        rows = tuple(TermoRow(decode(guess), pattern_digits(pattern))
+                     for guess, pattern in game.history())
+        return TermoBoard(
+            rows=rows,
+            attempts_left=MAX_ATTEMPTS - game.attempts,
+            won=game.won,
+            finished=game.finished,
+            secret=decode(game.secret) if game.finished else None,
+            candidates=self.words.candidates(game.history()).bit_count(),
+        )
@@ -0,0 +1,112 @@
+"""Bit-packed Termo word list with letter and position indexes."""
+
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Iterable, Optional
+
+WORD_LENGTH = 5
+LETTER_BITS = 5
+LETTER_MASK = (1 << LETTER_BITS) - 1
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+def normalize(word: str) -> str:
+    """Lower-cases a word and strips its accents ("Ação" -> "acao")."""
+    decomposed = unicodedata.normalize("NFKD", word.strip().lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def encode(word: str) -> int:
+    """Packs a normalized word into 25 bits, position 0 in the low bits."""
+    if len(word) != WORD_LENGTH or not all(char in ALPHABET for char in word):
+        raise ValueError(f"'{word}' is not a {WORD_LENGTH}-letter word.")
+    code = 0
+    for position, char in enumerate(word):
+        code |= (ord(char) - 97) << (LETTER_BITS * position)
+    return code
+
+def decode(code: int) -> str:
+    """Unpacks a word packed by ``encode``."""
+    return "".join(chr(97 + ((code >> (LETTER_BITS * position)) & LETTER_MASK))
+                   for position in range(WORD_LENGTH))
+
+class WordList():
+    """The playable words, stored as packed 32-bit codes.
+
+    Besides the codes, two indexes map letters to the set of words
+    containing them, overall and at each position. The sets are Python
+    ints used as bitsets over word ids, so narrowing down the words that
+    still fit a game's feedback is a handful of big-int ``&`` operations
+    instead of a scan. ``letter_index`` holds the letter bitmasks of every
+    word transposed (one mask of words per letter rather than one mask of
+    letters per word), which is the form those operations read.
+    """
+
+    def __init__(self, words: Iterable[str]) -> None:
+        self.codes = array("I")
+        self._ids: dict[int, int] = {}
+        for word in words:
+            code = encode(normalize(word))
+            if code in self._ids:
+                continue
+            self._ids[code] = len(self.codes)
+            self.codes.append(code)
+
+        self.all_words = (1 << len(self.codes)) - 1
+        self.letter_index = [0] * len(ALPHABET)
+        self.position_index = [[0] * len(ALPHABET) for _ in range(WORD_LENGTH)]
+        for word_id, code in enumerate(self.codes):
+            bit = 1 << word_id
+            for position in range(WORD_LENGTH):
+                letter = (code >> (LETTER_BITS * position)) & LETTER_MASK
+                self.letter_index[letter] |= bit
+                self.position_index[position][letter] |= bit
+
+    @classmethod
+    def from_file(cls, path: Path) -> "WordList":
+        """Reads one word per line, skipping blanks and ``#`` comments."""
+        lines = path.read_text(encoding="utf-8").splitlines()
+        return cls(line for line in lines if line.strip() and not line.startswith("#"))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, word: str) -> bool:
+        return self.code_of(word) is not None
+
+    def code_of(self, word: str) -> Optional[int]:
+        """Returns the packed code of a playable word, or None."""
+        try:
+            code = encode(normalize(word))
+        except ValueError:
+            return None
+        return code if code in self._ids else None
+
+    def word(self, word_id: int) -> str:
+        """Returns the word with the given id."""
+        return decode(self.codes[word_id])
+
+    def candidates(self, history: Iterable[tuple[int, int]]) -> int:
+        """Bitset of the words consistent with every ``(guess, pattern)`` so far.
+
+        Letter counts are only bounded from below, so with repeated letters
+        the set can be a little larger than the exact answer.
+        """
+        remaining = self.all_words
+        for guess, pattern in history:
+            found = 0
+            for position in range(WORD_LENGTH):
+                if pattern // 3 ** position % 3:
+                    found |= 1 << ((guess >> (LETTER_BITS * position)) & LETTER_MASK)
+            for position in range(WORD_LENGTH):
+                letter = (guess >> (LETTER_BITS * position)) & LETTER_MASK
+                at_position = self.position_index[position][letter]
+                digit = pattern // 3 ** position % 3
+                if digit == 2:
+                    remaining &= at_position
+                elif digit == 1:
+                    remaining &= self.letter_index[letter] & ~at_position
+                elif found >> letter & 1:
+                    remaining &= ~at_position
+                else:
+                    remaining &= ~self.letter_index[letter]
+        return remaining
@@ -2,17 +2,50 @@
 
 import time
 import platform
+from typing import Optional
 import discord
 from discord.ext import commands
 from discord import app_commands
-from discord.http import Route
+from src.infrastructure.services.bot_stats_service import BotStatsService
+from src.infrastructure.services.latency_sampler import LatencySampler, LatencySummary
+from src.infrastructure.cluster.ipc import ClusterClient
+from src.infrastructure.discord.responder import AdaptiveResponder
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.interface.i18n.translator import Translator, message_key
 
+TITLE = message_key("about.title")
+NAME = message_key("about.name")
+SERVERS = message_key("about.servers")
+USERS = message_key("about.users")
+SHARDS = message_key("about.shards")
+SHARD_ID = message_key("about.shard_id")
+UPTIME = message_key("about.uptime")
+SYSTEM = message_key("about.system")
+PYTHON = message_key("about.python")
+GATEWAY_PING = message_key("about.gateway_ping")
+REST_PING = message_key("about.rest_ping")
+UNKNOWN = message_key("about.unknown")
+PARTIAL = message_key("about.partial")
+LOCAL_ONLY = message_key("about.local_only")
 
+# pylint: disable=too-many-instance-attributes
 class AboutBotCog(commands.Cog):
     """Cog for about command"""
 
-    def __init__(self, bot: commands.Bot) -> None:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, bot: commands.Bot, stats_service: BotStatsService,
+                 latency_sampler: LatencySampler,
+                 cluster_client: Optional[ClusterClient] = None,
+                 metrics: Optional[CommandMetrics] = None,
+                 translator: Optional[Translator] = None,
+                 responder: Optional[AdaptiveResponder] = None) -> None:
         self.bot = bot
+        self.stats_service = stats_service
+        self.latency_sampler = latency_sampler
+        self.cluster_client = cluster_client
+        self.metrics = metrics or CommandMetrics()
+        self.translator = translator or Translator()
+        self.responder = responder or AdaptiveResponder(self.metrics)
         self.start_time = time.time()
 
     @staticmethod
@@ -22,19 +55,43 @@ class AboutBotCog(commands.Cog):
         right_text = f"{right[0]}: {right[1]}"
         return f"{left_text}    {right_text}"
 
+    @staticmethod
+    def _format_latency(summary: Optional[LatencySummary]) -> str:
+        """Formats p50/p95/p99 of a latency summary in milliseconds"""
+        if summary is None or summary.count == 0:
+            return "n/a"
+        return (f"{round(summary.p50 * 1000)}/{round(summary.p95 * 1000)}/"
+                f"{round(summary.p99 * 1000)}ms")
+
     # pylint: disable=too-many-locals
     @app_commands.command(name="about_bot", description="get info about bot")
     async def about_bot(self, interaction: discord.Interaction, invisible: bool = False) -> None:
         """Gets info about bot"""
-        await interaction.response.defer(thinking=True, ephemeral=invisible)
+        async with self.responder.respond(interaction, ephemeral=invisible) as reply:
+            await reply.send(await self._render(interaction))
 
-        gw_ping = round(self.bot.latency * 1000)
+    async def _render(self, interaction: discord.Interaction) -> str:
+        """Builds the about message"""
+        latency = self.latency_sampler.snapshot()
+        shard_id = interaction.guild.shard_id if interaction.guild else 0
+        gw_ping = self._format_latency(latency.gateway.get(shard_id))
+        rest_ping = self._format_latency(latency.rest)
 
-        start = time.monotonic()
-        await self.bot.http.request(Route("GET", "/gateway"))
-        rest_ping = round((time.monotonic() - start) * 1000)
-
-        bot_name = self.bot.user.name if self.bot.user else "Unknown"
+        messages = self.translator.for_interaction(interaction)
+        bot_name = self.bot.user.name if self.bot.user else messages[UNKNOWN]
+        stats = self.stats_service.snapshot()
+        guilds, users = stats.guilds, stats.unique_users
+        if self.cluster_client is not None:
+            try:
+                response = await self.cluster_client.request_stats()
+                totals = response.data or {}
+                guilds, users = totals.get("guilds", guilds), totals.get("users", users)
+                label = messages[PARTIAL] if response.partial else None
+            except (TimeoutError, OSError, EOFError):
+                # The supervisor is slow or gone; answer with this cluster's counts.
+                label = messages[LOCAL_ONLY]
+            if label is not None:
+                guilds, users = f"{guilds} ({label})", f"{users} ({label})"
 
         uptime = time.time() - self.start_time
         uptime_days = int(uptime // 86400)
@@ -42,25 +99,25 @@ class AboutBotCog(commands.Cog):
         uptime_minutes = int((uptime % 3600) // 60)
 
         rows = [
-            (("Name", bot_name), ("Servers", len(self.bot.guilds))),
+            ((messages[NAME], bot_name), (messages[SERVERS], guilds)),
             (
-                ("Users", len(set(self.bot.get_all_members()))),
-                ("Shards", self.bot.shard_count),
+                (messages[USERS], users),
+                (messages[SHARDS], self.bot.shard_count),
             ),
             (
-                ("Shard ID", self.bot.shard_id),
+                (messages[SHARD_ID], self.bot.shard_id),
                 (
-                    "Uptime",
+                    messages[UPTIME],
                     f"{uptime_days}d {uptime_hours}h {uptime_minutes}m",
                 ),
             ),
             (
-                ("System", platform.system()),
-                ("Python", platform.python_version()),
+                (messages[SYSTEM], platform.system()),
+                (messages[PYTHON], platform.python_version()),
             ),
             (
-                ("GW Ping", f"{gw_ping}ms"),
-                ("REST Ping", f"{rest_ping}ms"),
+                (messages[GATEWAY_PING], gw_ping),
+                (messages[REST_PING], rest_ping),
             ),
         ]
 
@@ -75,6 +132,4 @@ class AboutBotCog(commands.Cog):
             for left, right in rows
         ]
 
-        message = "📦 Bot info\n\n" + "\n".join(message_lines)
-
-        await interaction.followup.send(message)
+        return messages[TITLE] + "\n\n" + "\n".join(message_lines)
@@ -0,0 +1,53 @@
+"""Image generation command module"""
+
+import io
+import random
+from typing import Literal, Optional
+import discord
+from discord.ext import commands
+from discord import app_commands
+from src.infrastructure.discord.admission import rate_limit
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.services.image_service import (
+    ImageRenderError,
+    ImageService,
+    RenderParams,
+)
+
+class ImageCog(commands.Cog):
+    """Cog for the procedural (non-AI) image command"""
+
+    def __init__(self, bot: commands.Bot, image_service: ImageService,
+                 metrics: Optional[CommandMetrics] = None) -> None:
+        self.bot = bot
+        self.image_service = image_service
+        self.metrics = metrics or CommandMetrics()
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    @rate_limit(rate=0.1, burst=2)
+    @app_commands.command(name="image", description="generate a procedural image (not ai)")
+    @app_commands.describe(seed="same seed, same image")
+    async def image_command(self, interaction: discord.Interaction,
+                            pattern: Literal["gradient", "plasma", "mandelbrot", "noise"],
+                            width: app_commands.Range[int, 64, 1024] = 512,
+                            height: app_commands.Range[int, 64, 1024] = 512,
+                            seed: Optional[app_commands.Range[int, 0, 2 ** 31]] = None) -> None:
+        """Renders an image and sends it as a PNG"""
+        async with self.metrics.phase(interaction, "defer"):
+            await interaction.response.defer(thinking=True)
+
+        params = self.image_service.fit(RenderParams(
+            pattern, width, height, random.randrange(2 ** 31) if seed is None else seed))
+        try:
+            png = await self.image_service.render(params)
+        except ImageRenderError:
+            async with self.metrics.phase(interaction, "followup"):
+                await interaction.followup.send("Could not render this image.")
+            return
+
+        caption = f"🎨 {pattern} · seed {params.seed}"
+        if (params.width, params.height) != (width, height):
+            caption += f" · reduced to {params.width}×{params.height}"
+        file = discord.File(io.BytesIO(png), filename=f"{pattern}-{params.seed}.png")
+        async with self.metrics.phase(interaction, "followup"):
+            await interaction.followup.send(caption, file=file)
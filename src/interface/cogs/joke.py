@@ -1,22 +1,56 @@
 """About bot command module"""
 
+from typing import Optional
 import discord
 from discord.ext import commands
 from discord import app_commands
+from src.infrastructure.discord.responder import AdaptiveResponder
+from src.infrastructure.metrics.command_metrics import CommandMetrics
 from src.infrastructure.services.random_joke_service import RandomJokeService
+from src.interface.i18n.translator import Translator, message_key
+
+EMPTY = message_key("joke.empty")
+NO_MATCH = message_key("joke.no_match")
 
 class JokeCog(commands.Cog):
     """Cog for joke command who's show a random joke"""
 
-    def __init__(self, bot: commands.Bot, joke_service: RandomJokeService) -> None:
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(self, bot: commands.Bot, joke_service: RandomJokeService,
+                 metrics: Optional[CommandMetrics] = None,
+                 translator: Optional[Translator] = None,
+                 responder: Optional[AdaptiveResponder] = None) -> None:
         self.bot = bot
         self.joke_service = joke_service
+        self.metrics = metrics or CommandMetrics()
+        self.translator = translator or Translator()
+        self.responder = responder or AdaptiveResponder(self.metrics)
 
-    # pylint: disable=too-many-locals
     @app_commands.command(name="joke", description="get a random joke")
-    async def joke_command(self, interaction: discord.Interaction, invisible: bool = False) -> None:
-        """Gets info about bot"""
-        await interaction.response.defer(thinking=True, ephemeral=invisible)
+    @app_commands.describe(category="only jokes of this category",
+                           query="only jokes with these words (or words containing them)")
+    async def joke_command(self, interaction: discord.Interaction, invisible: bool = False,
+                           category: Optional[str] = None,
+                           query: Optional[str] = None) -> None:
+        """Gets a random joke, searched in the corpus index when filtered"""
+        async with self.responder.respond(interaction, ephemeral=invisible) as reply:
+            if category or query:
+                message = await self.joke_service.search_joke(category, query or "",
+                                                              interaction.guild_id,
+                                                              interaction.channel_id)
+                missing = NO_MATCH
+            else:
+                message = await self.joke_service.get_joke(interaction.guild_id,
+                                                           interaction.channel_id)
+                missing = EMPTY
+            if not message:
+                message = self.translator.for_interaction(interaction)[missing]
+            await reply.send(message)
 
-        message = self.joke_service.get_random_joke()
-        await interaction.followup.send(message)
+    @joke_command.autocomplete("category")
+    async def category_autocomplete(self, _interaction: discord.Interaction,
+                                    current: str) -> list[app_commands.Choice[str]]:
+        """Suggests the corpus categories matching the typed text"""
+        current = current.casefold()
+        return [app_commands.Choice(name=name, value=name)
+                for name in self.joke_service.categories() if current in name][:25]
@@ -0,0 +1,136 @@
+"""Music player commands module"""
+
+from pathlib import Path
+from typing import Optional
+import discord
+from discord.ext import commands
+from discord import app_commands
+from src.core.constants import DEFAULT_MUSIC_PATH
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.music.audio import DECODERS
+from src.infrastructure.music.guild_player import Track
+from src.infrastructure.music.music_service import MusicService
+from src.infrastructure.music.voice_sink import DiscordVoiceSink
+
+class MusicCog(commands.Cog):
+    """Cog playing local audio files in voice channels"""
+
+    def __init__(self, bot: commands.Bot, music_service: MusicService,
+                 metrics: Optional[CommandMetrics] = None) -> None:
+        self.bot = bot
+        self.music_service = music_service
+        self.metrics = metrics or CommandMetrics()
+        self.library_path: Path = DEFAULT_MUSIC_PATH
+        self._library: list[str] = []
+        self._library_mtime = 0
+
+    async def cog_unload(self) -> None:
+        """Stops every player."""
+        for guild_id in list(self.music_service.players):
+            await self.music_service.disconnect(guild_id)
+
+    def _library_files(self) -> list[str]:
+        """Lists the playable files, cached until the folder changes."""
+        try:
+            mtime = self.library_path.stat().st_mtime_ns
+        except OSError:
+            return []
+        if mtime != self._library_mtime:
+            self._library = sorted(path.name for path in self.library_path.iterdir()
+                                   if path.suffix.lower() in DECODERS)
+            self._library_mtime = mtime
+        return self._library
+
+    async def _reply(self, interaction: discord.Interaction, message: str) -> None:
+        async with self.metrics.phase(interaction, "followup"):
+            await interaction.followup.send(message)
+
+    async def _voice_client(self,
+                            interaction: discord.Interaction) -> Optional[discord.VoiceClient]:
+        """Returns the guild voice client, joining the caller's channel if needed."""
+        voice_client = interaction.guild.voice_client
+        if isinstance(voice_client, discord.VoiceClient) and voice_client.is_connected():
+            return voice_client
+
+        voice_state = getattr(interaction.user, "voice", None)
+        if voice_state is None or voice_state.channel is None:
+            await self._reply(interaction, "Join a voice channel first.")
+            return None
+        try:
+            return await voice_state.channel.connect(self_deaf=True)
+        except (discord.ClientException, RuntimeError, TimeoutError) as error:
+            await self._reply(interaction, f"Could not join the voice channel: {error}")
+            return None
+
+    @app_commands.command(name="play", description="play a song from the music library")
+    @app_commands.guild_only()
+    async def play(self, interaction: discord.Interaction, song: str) -> None:
+        """Queues a song from the local library"""
+        async with self.metrics.phase(interaction, "defer"):
+            await interaction.response.defer(thinking=True)
+
+        if song not in self._library_files():
+            await self._reply(interaction, f"'{song}' is not in the music library.")
+            return
+        if not discord.opus.is_loaded() and not discord.opus._load_default():  # pylint: disable=protected-access
+            await self._reply(interaction, "Voice is not available: libopus is not installed.")
+            return
+
+        voice_client = await self._voice_client(interaction)
+        if voice_client is None:
+            return
+
+        self.music_service.connect(interaction.guild_id, DiscordVoiceSink(voice_client))
+        track = Track(path=self.library_path / song, title=Path(song).stem,
+                      requested_by=interaction.user.id)
+        position = self.music_service.enqueue(interaction.guild_id, track)
+        if position == 0:
+            await self._reply(interaction, f"🎵 Playing **{track.title}**")
+        else:
+            await self._reply(interaction, f"🎵 Queued **{track.title}** (#{position})")
+
+    @play.autocomplete("song")
+    async def play_autocomplete(self, _interaction: discord.Interaction,
+                                current: str) -> list[app_commands.Choice[str]]:
+        """Suggests library files matching the typed text"""
+        current = current.lower()
+        return [app_commands.Choice(name=name, value=name)
+                for name in self._library_files() if current in name.lower()][:25]
+
+    @app_commands.command(name="skip", description="skip the current song")
+    @app_commands.guild_only()
+    async def skip(self, interaction: discord.Interaction) -> None:
+        """Skips the playing song"""
+        player = self.music_service.player(interaction.guild_id)
+        skipped = player.skip() if player is not None else None
+        message = f"⏭️ Skipped **{skipped.title}**" if skipped else "Nothing is playing."
+        await interaction.response.send_message(message)
+
+    @app_commands.command(name="stop", description="stop the music and leave the channel")
+    @app_commands.guild_only()
+    async def stop(self, interaction: discord.Interaction) -> None:
+        """Stops playback and disconnects"""
+        await self.music_service.disconnect(interaction.guild_id)
+        if interaction.guild.voice_client is not None:
+            await interaction.guild.voice_client.disconnect(force=False)
+        await interaction.response.send_message("⏹️ Stopped.")
+
+    @app_commands.command(name="queue", description="show the music queue")
+    @app_commands.guild_only()
+    async def queue(self, interaction: discord.Interaction) -> None:
+        """Shows the playing song and the queue"""
+        player = self.music_service.player(interaction.guild_id)
+        if player is None or not player.active:
+            await interaction.response.send_message("The queue is empty.")
+            return
+
+        lines = [f"▶️ {player.now_playing.title}" if player.now_playing else "▶️ (buffering)"]
+        lines.extend(f"{index}. {track.title}" for index, track in enumerate(player.queue, 1))
+        await interaction.response.send_message("\n".join(lines[:20]))
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, _before: discord.VoiceState,
+                                    after: discord.VoiceState) -> None:
+        """Drops the player when the bot leaves or is kicked from voice."""
+        if self.bot.user is not None and member.id == self.bot.user.id and after.channel is None:
+            await self.music_service.disconnect(member.guild.id)
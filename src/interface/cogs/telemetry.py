@@ -0,0 +1,79 @@
+"""Listeners that feed gateway events into the stats services"""
+
+import asyncio
+from typing import Optional
+import discord
+from discord.ext import commands
+from src.infrastructure.services.bot_stats_service import BotStatsService
+from src.infrastructure.services.latency_sampler import LatencySampler
+
+CHUNK_RECONCILE_DELAY = 2.0
+
+class TelemetryCog(commands.Cog):
+    """Cog keeping the stats services in sync with the gateway"""
+
+    def __init__(self, bot: commands.Bot, stats_service: BotStatsService,
+                 latency_sampler: LatencySampler) -> None:
+        self.bot = bot
+        self.stats_service = stats_service
+        self.latency_sampler = latency_sampler
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    async def cog_unload(self) -> None:
+        """Stops the latency sampler."""
+        await self.latency_sampler.close()
+
+    def _sync_guild(self, guild: discord.Guild) -> None:
+        self.stats_service.sync_guild(guild.id, guild.shard_id,
+                                      (member.id for member in guild.members))
+
+    async def _reconcile_after_chunks(self) -> None:
+        """Resyncs guilds whose chunking completed since they were tracked.
+
+        ``chunked`` and ``member_count`` are O(1), unlike ``len(guild.members)``
+        which copies the member cache, so a pass only walks the members of
+        the guilds it resyncs.
+        """
+        await asyncio.sleep(CHUNK_RECONCILE_DELAY)
+        for guild in self.bot.guilds:
+            if (guild.chunked
+                    and guild.member_count != self.stats_service.tracked_member_count(guild.id)):
+                self._sync_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """Starts the latency sampler on the bot loop."""
+        self.latency_sampler.start()
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        """Tracks a guild once it is available (and chunked at startup)."""
+        self._sync_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """Tracks a newly joined guild."""
+        self._sync_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        """Releases a guild the bot left or was removed from."""
+        self.stats_service.remove_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        """Counts a member joining a guild."""
+        self.stats_service.add_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent) -> None:
+        """Releases a member leaving a guild, cached or not."""
+        self.stats_service.remove_member(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_socket_event_type(self, event_type: str) -> None:
+        """Schedules a debounced reconcile when member chunks arrive."""
+        if event_type != "GUILD_MEMBERS_CHUNK":
+            return
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = asyncio.create_task(self._reconcile_after_chunks())
@@ -0,0 +1,64 @@
+"""Termo (Wordle) game commands module"""
+
+from typing import Optional
+import discord
+from discord.ext import commands
+from discord import app_commands
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.termo.termo_service import TermoBoard, TermoError, TermoService
+
+SQUARES = ("⬛", "🟨", "🟩")
+
+class TermoCog(commands.GroupCog, group_name="termo", group_description="play termo"):
+    """Cog for the Termo game, one game per channel"""
+
+    def __init__(self, bot: commands.Bot, termo_service: TermoService,
+                 metrics: Optional[CommandMetrics] = None) -> None:
+        self.bot = bot
+        self.termo_service = termo_service
+        self.metrics = metrics or CommandMetrics()
+        super().__init__()
+
+    @staticmethod
+    def render(board: TermoBoard) -> str:
+        """Draws the board as emoji squares followed by the guessed words."""
+        lines = [f"{''.join(SQUARES[digit] for digit in row.digits)} `{row.word.upper()}`"
+                 for row in board.rows]
+        if board.won:
+            lines.append(f"🎉 Found in {len(board.rows)}!")
+        elif board.finished:
+            lines.append(f"The word was **{board.secret.upper()}**.")
+        else:
+            lines.append(f"{board.attempts_left} attempts left · "
+                         f"{board.candidates} possible words")
+        return "\n".join(lines)
+
+    async def _send(self, interaction: discord.Interaction, message: str,
+                    ephemeral: bool = False) -> None:
+        async with self.metrics.phase(interaction, "followup"):
+            await interaction.response.send_message(message, ephemeral=ephemeral)
+
+    @app_commands.command(name="start", description="start a termo game in this channel")
+    async def start(self, interaction: discord.Interaction) -> None:
+        """Starts a new game"""
+        board = self.termo_service.start(interaction.channel_id)
+        await self._send(interaction, "New game! Guess the 5-letter word with /termo guess.\n"
+                         + self.render(board))
+
+    @app_commands.command(name="guess", description="guess the word of this channel's game")
+    async def guess(self, interaction: discord.Interaction,
+                    word: app_commands.Range[str, 5, 5]) -> None:
+        """Scores a guess"""
+        try:
+            board = self.termo_service.guess(interaction.channel_id, word)
+        except TermoError as error:
+            await self._send(interaction, str(error), ephemeral=True)
+            return
+        await self._send(interaction, self.render(board))
+
+    @app_commands.command(name="giveup", description="end this channel's game")
+    async def give_up(self, interaction: discord.Interaction) -> None:
+        """Reveals the word and ends the game"""
+        secret = self.termo_service.give_up(interaction.channel_id)
+        message = f"The word was **{secret.upper()}**." if secret else "There is no game here."
+        await self._send(interaction, message)
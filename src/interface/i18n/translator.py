@@ -0,0 +1,161 @@
+"""i18n abstraction for commands: interned message keys and per-locale tables.
+
+Cogs intern their keys once, at import time::
+
+    TITLE = message_key("about.title")
+
+and read messages with a plain list index on the table resolved for the
+interaction::
+
+    messages = self.translator.for_interaction(interaction)
+    await interaction.followup.send(messages[TITLE])
+
+Each table is built the first time its locale is used, from the
+memory-mapped catalog, with every interned key already decoded, so the hot
+path never touches a dict, the catalog or the decoder.
+"""
+
+import logging
+from logging import Logger
+from pathlib import Path
+from typing import Optional, Union
+import discord
+from src.core.constants import (
+    DEFAULT_I18N_CATALOG_PATH,
+    DEFAULT_I18N_SOURCE_PATH,
+    DEFAULT_LOCALE,
+)
+from src.infrastructure.i18n.catalog import (
+    CATALOG_SUFFIX,
+    SOURCE_SUFFIX,
+    CatalogCompiler,
+    CatalogError,
+    CatalogReader,
+)
+
+_key_ids: dict[str, int] = {}
+_key_names: list[str] = []
+
+def message_key(name: str) -> int:
+    """Interns a dotted message key and returns its id, stable for the process."""
+    key_id = _key_ids.get(name)
+    if key_id is None:
+        key_id = _key_ids[name] = len(_key_names)
+        _key_names.append(name)
+    return key_id
+
+def key_name(key_id: int) -> str:
+    """Returns the dotted name of an interned key."""
+    return _key_names[key_id]
+
+LocaleLike = Union[discord.Locale, str, None]
+
+# pylint: disable=too-many-instance-attributes
+class Translator():
+    """Resolves locales to message tables and keeps the catalogs mapped.
+
+    A table is a list of messages indexed by key id. Missing messages fall
+    back to the default locale, then to the key name itself, when the table
+    is built. The result of resolving a user/guild locale pair is cached,
+    so repeated interactions from the same locales cost one dict lookup.
+    Catalogs whose source is newer than the compiled file are recompiled
+    when first loaded, so a fresh checkout works without a build step.
+    """
+
+    def __init__(self, catalog_dir: Path = DEFAULT_I18N_CATALOG_PATH,
+                 source_dir: Optional[Path] = DEFAULT_I18N_SOURCE_PATH,
+                 default_locale: str = DEFAULT_LOCALE,
+                 logger: Optional[Logger] = None) -> None:
+        self.catalog_dir = catalog_dir
+        self.source_dir = source_dir
+        self.default_locale = default_locale
+        self.logger: Logger = logger or logging.getLogger(__name__)
+        self.compiler = CatalogCompiler(self.logger)
+        self._readers: dict[str, Optional[CatalogReader]] = {}
+        self._tables: dict[str, list[str]] = {}
+        self._resolved: dict[tuple[str, str], tuple[str, list[str]]] = {}
+        self.available = self._discover()
+
+    def _discover(self) -> frozenset[str]:
+        locales = {path.stem for path in self.catalog_dir.glob(f"*{CATALOG_SUFFIX}")}
+        if self.source_dir is not None:
+            locales.update(path.stem for path in self.source_dir.glob(f"*{SOURCE_SUFFIX}"))
+        return frozenset(locales)
+
+    def _reader(self, locale: str) -> Optional[CatalogReader]:
+        if locale in self._readers:
+            return self._readers[locale]
+
+        reader = None
+        catalog_path = self.catalog_dir / f"{locale}{CATALOG_SUFFIX}"
+        try:
+            if self.source_dir is not None:
+                source_path = self.source_dir / f"{locale}{SOURCE_SUFFIX}"
+                if source_path.exists() and (not catalog_path.exists() or
+                                             catalog_path.stat().st_mtime_ns
+                                             < source_path.stat().st_mtime_ns):
+                    self.compiler.compile_file(source_path, catalog_path)
+            if catalog_path.exists():
+                reader = CatalogReader(catalog_path)
+        except (OSError, CatalogError) as error:
+            self.logger.error("Failed to load the '%s' catalog: %s", locale, error)
+        self._readers[locale] = reader
+        return reader
+
+    def table(self, locale: str) -> list[str]:
+        """Returns the message table of an available locale, building it on first use."""
+        table = self._tables.get(locale)
+        if table is None:
+            table = self._tables[locale] = []
+        if len(table) < len(_key_names):
+            self._extend(locale, table)
+        return table
+
+    def _extend(self, locale: str, table: list[str]) -> None:
+        """Decodes the messages of the keys interned since the table was built."""
+        reader = self._reader(locale)
+        fallback = self.table(self.default_locale) if locale != self.default_locale else None
+        for key_id in range(len(table), len(_key_names)):
+            message = reader.get(_key_names[key_id]) if reader is not None else None
+            if message is None:
+                message = fallback[key_id] if fallback is not None else _key_names[key_id]
+            table.append(message)
+
+    def _match(self, locale: LocaleLike) -> Optional[str]:
+        if locale is None:
+            return None
+        name = locale.value if isinstance(locale, discord.Locale) else str(locale)
+        if name in self.available:
+            return name
+        language = name.split("-", 1)[0]
+        return next((candidate for candidate in sorted(self.available)
+                     if candidate.split("-", 1)[0] == language), None)
+
+    def resolve(self, locale: LocaleLike, guild_locale: LocaleLike = None) -> list[str]:
+        """Returns the table for a user locale, falling back to the guild's, then the default."""
+        cache_key = (str(locale), str(guild_locale))
+        resolved = self._resolved.get(cache_key)
+        if resolved is None:
+            name = self._match(locale) or self._match(guild_locale) or self.default_locale
+            resolved = self._resolved[cache_key] = (name, self.table(name))
+        name, table = resolved
+        if len(table) < len(_key_names):
+            self._extend(name, table)
+        return table
+
+    def for_interaction(self, interaction: discord.Interaction,
+                        prefer_guild: bool = False) -> list[str]:
+        """Returns the table for an interaction, by user locale or by the guild's first."""
+        guild_locale = interaction.guild_locale if interaction.guild_id else None
+        if prefer_guild and guild_locale is not None:
+            return self.resolve(guild_locale, interaction.locale)
+        return self.resolve(interaction.locale, guild_locale)
+
+    def close(self) -> None:
+        """Drops the tables and unmaps the catalogs."""
+        self._resolved.clear()
+        self._tables.clear()
+        for reader in self._readers.values():
+            if reader is not None:
+                reader.close()
+        self._readers.clear()
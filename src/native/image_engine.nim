@@ -0,0 +1,136 @@
+## Procedural image rasterizer.
+##
+## Renders straight into a buffer owned by Python (a `bytearray`) laid out
+## as PNG scanlines: every row starts with the filter byte (0, none) followed
+## by `width` RGB pixels. Python hands the same bytes to zlib afterwards, so
+## pixels never cross the FFI boundary one by one and are never reshaped.
+## Nothing here allocates, and no global state is touched, so concurrent
+## calls from several Python threads are safe.
+
+import std/math
+
+const
+  abiVersion = 1.cint ## must match IMAGE_ENGINE in src/infrastructure/native/libraries.py
+  renderOk = 0.cint
+  renderBadSize = -1.cint
+  renderUnknownPattern = -2.cint
+
+  patternGradient = 0.cint
+  patternPlasma = 1.cint
+  patternMandelbrot = 2.cint
+  patternNoise = 3.cint
+
+  maxIterations = 128
+  noiseOctaves = 5
+  mandelbrotCenters = [
+    (-0.743643887, 0.131825904),
+    (-0.101096, 0.956286),
+    (-1.250660, 0.020120),
+    (-0.5, 0.0),
+  ]
+
+type Pixels = ptr UncheckedArray[uint8]
+
+proc mix(value: uint64): uint64 {.inline.} =
+  ## splitmix64 finalizer; turns a seed into well spread bits.
+  result = value + 0x9E3779B97F4A7C15'u64
+  result = (result xor (result shr 30)) * 0xBF58476D1CE4E5B9'u64
+  result = (result xor (result shr 27)) * 0x94D049BB133111EB'u64
+  result = result xor (result shr 31)
+
+proc unit(value: uint64): float {.inline.} =
+  ## Maps 64 random bits to [0, 1).
+  float(value shr 11) / float(1'u64 shl 53)
+
+proc channel(value: float): uint8 {.inline.} =
+  uint8(clamp(value, 0.0, 1.0) * 255.0)
+
+proc lattice(ix, iy: int, seed: uint64): float {.inline.} =
+  unit(mix(seed xor (cast[uint64](ix) * 0x8DA6B343'u64) xor (cast[uint64](iy) * 0xD8163841'u64)))
+
+proc valueNoise(x, y: float, seed: uint64): float =
+  let
+    ix = int(floor(x))
+    iy = int(floor(y))
+    fx = x - floor(x)
+    fy = y - floor(y)
+    sx = fx * fx * (3.0 - 2.0 * fx)
+    sy = fy * fy * (3.0 - 2.0 * fy)
+    top = lattice(ix, iy, seed) + sx * (lattice(ix + 1, iy, seed) - lattice(ix, iy, seed))
+    bottom = lattice(ix, iy + 1, seed) +
+      sx * (lattice(ix + 1, iy + 1, seed) - lattice(ix, iy + 1, seed))
+  top + sy * (bottom - top)
+
+proc mandelbrot(x, y: float, seed: uint64): float =
+  let
+    (centerX, centerY) = mandelbrotCenters[int(seed mod uint64(mandelbrotCenters.len))]
+    scale = 3.0 * pow(0.5, float((seed shr 8) mod 6))
+    cx = centerX + x * scale
+    cy = centerY + y * scale
+  var zx, zy = 0.0
+  for iteration in 0 ..< maxIterations:
+    let
+      zx2 = zx * zx
+      zy2 = zy * zy
+    if zx2 + zy2 > 16.0:
+      let smooth = float(iteration) + 1.0 - ln(ln(sqrt(zx2 + zy2))) / ln(2.0)
+      return smooth / float(maxIterations)
+    zy = 2.0 * zx * zy + cy
+    zx = zx2 - zy2 + cx
+  0.0
+
+proc sample(pattern: cint, x, y: float, seed: uint64): float =
+  ## Palette position of a point; `x` and `y` are centred on the image, in [-0.5, 0.5].
+  case pattern
+  of patternGradient:
+    let angle = unit(seed) * TAU
+    x * cos(angle) + y * sin(angle)
+  of patternPlasma:
+    let
+      f1 = 4.0 + 8.0 * unit(seed)
+      f2 = 4.0 + 8.0 * unit(seed shr 16)
+      f3 = 2.0 + 6.0 * unit(seed shr 32)
+    (sin(x * f1) + sin(y * f2) + sin((x + y) * f3) + sin(sqrt(x * x + y * y) * f1 * 2.0)) / 8.0
+  of patternMandelbrot:
+    mandelbrot(x, y, seed)
+  else:
+    var
+      total = 0.0
+      amplitude = 0.5
+      frequency = 6.0
+    for octave in 0 ..< noiseOctaves:
+      total += amplitude * valueNoise(x * frequency, y * frequency, seed + uint64(octave))
+      amplitude *= 0.5
+      frequency *= 2.0
+    total
+
+proc imageRender(pixels: Pixels, size: csize_t, width, height, pattern: cint,
+                 seed: uint64): cint {.exportc, dynlib, cdecl.} =
+  ## Fills `height` PNG scanlines of `width` RGB pixels into `pixels`.
+  if width <= 0 or height <= 0 or size < csize_t(height) * csize_t(width * 3 + 1):
+    return renderBadSize
+  if pattern < patternGradient or pattern > patternNoise:
+    return renderUnknownPattern
+
+  let
+    stride = width.int * 3 + 1
+    longest = float(max(width, height))
+    bits = mix(seed)
+    phase = unit(mix(bits))
+  for row in 0 ..< height.int:
+    let rowStart = row * stride
+    let y = (float(row) - float(height) / 2.0) / longest
+    pixels[rowStart] = 0
+    for column in 0 ..< width.int:
+      let
+        x = (float(column) - float(width) / 2.0) / longest
+        t = sample(pattern, x, y, bits) + phase
+        offset = rowStart + 1 + column * 3
+      pixels[offset] = channel(0.5 + 0.5 * cos(TAU * t))
+      pixels[offset + 1] = channel(0.5 + 0.5 * cos(TAU * (t + 0.33)))
+      pixels[offset + 2] = channel(0.5 + 0.5 * cos(TAU * (t + 0.67)))
+  renderOk
+
+proc kaonimAbiVersion(): cint {.exportc, dynlib, cdecl.} =
+  ## Checked by the Python bridge before any other symbol is used.
+  abiVersion
@@ -1,11 +1,195 @@
-import random, sequtils
+## Memory-mapped joke corpus engine.
+##
+## The corpus is produced by `src/infrastructure/services/joke_corpus.py`.
+## Lookups return pointers straight into the read-only mapping, so the text
+## is never copied on the native side and the pages are shared between every
+## process that maps the same file.
 
-randomize()
+import std/[memfiles, random, tables, locks]
 
-const jokes = [
-    ""
-]
+const
+  abiVersion = 2.cint ## must match RANDOM_JOKE in src/infrastructure/native/libraries.py
+  corpusMagic = "KJKC"
+  minCorpusVersion = 1'u32
+  corpusVersion = 2'u32 ## version 2 adds a search index after the text, read by Python only
+  headerSize = 40
+  scrambleMultiplier = 0x9E3779B1'u64
+
+  corpusOk = 0.cint
+  corpusIoError = -1.cint
+  corpusBadMagic = -2.cint
+  corpusBadVersion = -3.cint
+  corpusTruncated = -4.cint
+
+type
+  ShuffleBag = object
+    count: uint32
+    mask: uint64
+    shift: uint64
+    state: uint64
+    multiplier: uint64
+    increment: uint64
+    remaining: uint32
+
+  BagKey = tuple[guildId: uint64, channelId: uint64]
+
+var
+  corpusLock: Lock
+  corpus: MemFile
+  corpusOpen = false
+  jokeCount = 0'u32
+  offsets: ptr UncheckedArray[uint32]
+  text: ptr UncheckedArray[char]
+  bags = initTable[BagKey, ShuffleBag]()
+  rng = initRand()
+
+initLock(corpusLock)
+
+proc readAt[T](base: pointer, offset: int): T {.inline.} =
+  copyMem(addr result, cast[pointer](cast[uint](base) + offset.uint), sizeof(T))
+
+proc closeLocked() =
+  if corpusOpen:
+    corpus.close()
+  corpusOpen = false
+  jokeCount = 0
+  offsets = nil
+  text = nil
+  bags.clear()
+
+proc bitsFor(count: uint32): uint64 =
+  result = 1
+  while (1'u64 shl result) < count.uint64:
+    inc result
+
+proc reseed(bag: var ShuffleBag) =
+  bag.state = rng.next() and bag.mask
+  bag.multiplier = ((rng.next() shl 2) or 1) and bag.mask
+  bag.increment = (rng.next() or 1) and bag.mask
+  bag.remaining = bag.count
+
+proc newBag(count: uint32): ShuffleBag =
+  let bits = bitsFor(count)
+  result.count = count
+  result.mask = (1'u64 shl bits) - 1
+  result.shift = (bits + 1) div 2
+  result.reseed()
+
+proc scramble(bag: ShuffleBag, value: uint64): uint64 {.inline.} =
+  result = value xor (value shr bag.shift)
+  result = (result * scrambleMultiplier) and bag.mask
+  result = result xor (result shr bag.shift)
+
+proc draw(bag: var ShuffleBag): uint32 =
+  ## Walks the full-period LCG until it lands inside the corpus. Every index
+  ## comes out exactly once before the bag is reseeded.
+  if bag.remaining == 0:
+    bag.reseed()
+  while true:
+    bag.state = (bag.multiplier * bag.state + bag.increment) and bag.mask
+    let value = bag.scramble(bag.state)
+    if value < bag.count.uint64:
+      dec bag.remaining
+      return value.uint32
+
+proc jokeCorpusOpen*(path: cstring): cint {.exportc, dynlib.} =
+  ## Maps a compiled corpus, replacing the current one. Returns 0 on success.
+  withLock corpusLock:
+    closeLocked()
+    try:
+      corpus = memfiles.open($path, mode = fmRead)
+    except CatchableError:
+      return corpusIoError
+    corpusOpen = true
+
+    if corpus.size < headerSize:
+      closeLocked()
+      return corpusTruncated
+
+    var magic = newString(4)
+    copyMem(addr magic[0], corpus.mem, 4)
+    if magic != corpusMagic:
+      closeLocked()
+      return corpusBadMagic
+    let version = readAt[uint32](corpus.mem, 4)
+    if version < minCorpusVersion or version > corpusVersion:
+      closeLocked()
+      return corpusBadVersion
+
+    let
+      count = readAt[uint32](corpus.mem, 8)
+      indexOffset = readAt[uint64](corpus.mem, 16)
+      textOffset = readAt[uint64](corpus.mem, 24)
+      textSize = readAt[uint64](corpus.mem, 32)
+    if indexOffset + (count.uint64 + 1) * 4 > corpus.size.uint64 or
+        textOffset + textSize > corpus.size.uint64:
+      closeLocked()
+      return corpusTruncated
+
+    jokeCount = count
+    offsets = cast[ptr UncheckedArray[uint32]](cast[uint](corpus.mem) + indexOffset.uint)
+    text = cast[ptr UncheckedArray[char]](cast[uint](corpus.mem) + textOffset.uint)
+    return corpusOk
+
+proc jokeCorpusClose*() {.exportc, dynlib.} =
+  ## Unmaps the corpus and drops every shuffle bag.
+  withLock corpusLock:
+    closeLocked()
+
+proc jokeCorpusCount*(): uint32 {.exportc, dynlib.} =
+  ## Number of jokes in the mapped corpus.
+  withLock corpusLock:
+    result = jokeCount
+
+proc jokeCorpusGet*(index: uint32): cstring {.exportc, dynlib.} =
+  ## NUL-terminated joke pointing into the mapping, or nil when out of range.
+  withLock corpusLock:
+    if index >= jokeCount:
+      return nil
+    result = cast[cstring](addr text[offsets[index]])
+
+proc jokeCorpusNext*(guildId: uint64, channelId: uint64): int64 {.exportc, dynlib.} =
+  ## Next index from the shuffle bag of a guild/channel pair, -1 if empty.
+  withLock corpusLock:
+    if jokeCount == 0:
+      return -1
+    let key: BagKey = (guildId, channelId)
+    if key notin bags or bags[key].count != jokeCount:
+      bags[key] = newBag(jokeCount)
+    result = bags[key].draw().int64
+
+proc jokeCorpusFillBatch*(guildId: uint64, channelId: uint64,
+                          outJokes: ptr UncheckedArray[pointer],
+                          outLengths: ptr UncheckedArray[uint32],
+                          capacity: cint): cint {.exportc, dynlib.} =
+  ## Draws up to `capacity` jokes from a bag under a single lock, writing the
+  ## text pointers and byte lengths into caller-owned arrays. Returns the
+  ## number of jokes written.
+  withLock corpusLock:
+    if jokeCount == 0 or capacity <= 0:
+      return 0
+    let key: BagKey = (guildId, channelId)
+    if key notin bags or bags[key].count != jokeCount:
+      bags[key] = newBag(jokeCount)
+    for slot in 0 ..< capacity.int:
+      let index = bags[key].draw()
+      outJokes[slot] = addr text[offsets[index]]
+      outLengths[slot] = offsets[index + 1] - offsets[index] - 1
+    result = capacity
+
+proc jokeCorpusForget*(guildId: uint64, channelId: uint64) {.exportc, dynlib.} =
+  ## Drops a shuffle bag, e.g. when the bot leaves a guild.
+  withLock corpusLock:
+    bags.del((guildId, channelId))
 
 proc getRandomJoke*(): cstring {.exportc, dynlib.} =
-    let index = rand(jokes.len - 1)
-    return jokes[index]
\ No newline at end of file
+  ## Uniformly random joke, kept for callers that do not track bags.
+  withLock corpusLock:
+    if jokeCount == 0:
+      return ""
+    let index = rng.rand(jokeCount.int - 1)
+    result = cast[cstring](addr text[offsets[index]])
+
+proc kaonimAbiVersion*(): cint {.exportc, dynlib.} =
+  ## Checked by the Python bridge before any other symbol is used.
+  abiVersion
@@ -0,0 +1,52 @@
+## Termo (Wordle) guess scorer.
+##
+## Words arrive bit-packed exactly like `src/infrastructure/termo/word_list.py`
+## stores them: five letters of 5 bits each, position 0 in the low bits. A
+## pattern is the base-3 number whose digit `i` is 0 (absent), 1 (elsewhere)
+## or 2 (right place) for position `i`, so it fits in one byte.
+
+const
+  abiVersion = 1.cint ## must match TERMO_SCORER in src/infrastructure/native/libraries.py
+  wordLength = 5
+  letterBits = 5'u32
+  letterMask = 31'u32
+  powers = [1'u8, 3, 9, 27, 81]
+
+proc scoreOne(secret, guess: uint32): uint8 {.inline.} =
+  var
+    unmatched: array[32, uint8]
+    greens: array[wordLength, bool]
+  for position in 0 ..< wordLength:
+    let
+      shift = letterBits * position.uint32
+      secretLetter = (secret shr shift) and letterMask
+      guessLetter = (guess shr shift) and letterMask
+    if secretLetter == guessLetter:
+      greens[position] = true
+      result += 2'u8 * powers[position]
+    else:
+      inc unmatched[secretLetter]
+  for position in 0 ..< wordLength:
+    if greens[position]:
+      continue
+    let guessLetter = (guess shr (letterBits * position.uint32)) and letterMask
+    if unmatched[guessLetter] > 0:
+      dec unmatched[guessLetter]
+      result += powers[position]
+
+proc termoScore(secret, guess: uint32): cint {.exportc, dynlib, cdecl.} =
+  ## Scores one guess against one secret.
+  scoreOne(secret, guess).cint
+
+proc termoScoreMany(secrets: ptr UncheckedArray[uint32], count: cint, guess: uint32,
+                    patterns: ptr UncheckedArray[uint8]): cint {.exportc, dynlib, cdecl.} =
+  ## Scores one guess against `count` secrets into the caller's `patterns` buffer.
+  if count < 0:
+    return -1
+  for index in 0 ..< count.int:
+    patterns[index] = scoreOne(secrets[index], guess)
+  count
+
+proc kaonimAbiVersion(): cint {.exportc, dynlib, cdecl.} =
+  ## Checked by the Python bridge before any other symbol is used.
+  abiVersion
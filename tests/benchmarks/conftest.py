@@ -0,0 +1,168 @@
+"""Benchmark harness: timing fixture, JSON results and regression checks.
+
+Benchmarks are marked ``benchmark`` and deselected by default; run them with
+``python -m pytest -m benchmark tests/benchmarks``. Results are written to
+``--benchmark-json`` and, when ``--benchmark-compare`` points at an earlier
+results file, a benchmark whose median is more than ``--benchmark-threshold``
+slower than its baseline fails. Memory benchmarks record bytes per object
+and are checked against their baseline the same way.
+"""
+
+import gc
+import json
+import time
+import asyncio
+import platform
+import statistics
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+import pytest
+
+RESULTS_VERSION = 1
+
+@dataclass(frozen=True)
+class BenchmarkResult():
+    """Per-iteration timings of one benchmark, in seconds."""
+    name: str
+    rounds: int
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+    @property
+    def ops_per_second(self) -> float:
+        """Iterations per second at the median."""
+        return 1.0 / self.median if self.median > 0 else float("inf")
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Registers the benchmark options."""
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-json", type=Path, default=Path(".benchmarks/latest.json"),
+                    help="Where to write the benchmark results.")
+    group.addoption("--benchmark-compare", type=Path, default=None,
+                    help="Earlier results file to compare against.")
+    group.addoption("--benchmark-threshold", type=float, default=0.25,
+                    help="Allowed median slowdown before a benchmark fails (0.25 = 25%%).")
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Prepares the shared result store."""
+    config.benchmark_results = {}
+    config.benchmark_memory = {}
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Writes the collected results as JSON."""
+    results: dict[str, BenchmarkResult] = getattr(session.config, "benchmark_results", {})
+    memory: dict[str, float] = getattr(session.config, "benchmark_memory", {})
+    if not results and not memory:
+        return
+    output_path: Path = session.config.getoption("--benchmark-json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps({
+        "version": RESULTS_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor()},
+        "results": {name: {**asdict(result), "ops_per_second": result.ops_per_second}
+                    for name, result in sorted(results.items())},
+        "memory": {name: {"bytes_per_item": value} for name, value in sorted(memory.items())},
+    }, indent=2), encoding="utf-8")
+
+class BenchmarkRunner():
+    """Times a callable over several rounds and checks it against the baseline."""
+
+    def __init__(self, name: str, config: pytest.Config) -> None:
+        self.name = name
+        self.config = config
+        self._baseline: Optional[dict[str, Any]] = None
+        self._memory_baseline: Optional[dict[str, Any]] = None
+        compare_path: Optional[Path] = config.getoption("--benchmark-compare")
+        if compare_path is not None:
+            data = json.loads(compare_path.read_text(encoding="utf-8"))
+            self._baseline = data.get("results", {}).get(name)
+            self._memory_baseline = data.get("memory", {}).get(name)
+
+    def __call__(self, func: Callable[[], Any], *, rounds: int = 5, iterations: int = 1,
+                 setup: Optional[Callable[[], Any]] = None) -> BenchmarkResult:
+        """Times ``func`` called ``iterations`` times per round."""
+        timings = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            gc.collect()
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            timings.append((time.perf_counter() - started_at) / iterations)
+        return self._record(timings, rounds, iterations)
+
+    def run_async(self, func: Callable[[], Awaitable[Any]], *, rounds: int = 5,
+                  iterations: int = 1,
+                  setup: Optional[Callable[[], Any]] = None) -> BenchmarkResult:
+        """Times an async callable on one event loop, excluding loop start-up."""
+        async def measure() -> list[float]:
+            timings = []
+            for _ in range(rounds):
+                if setup is not None:
+                    setup()
+                gc.collect()
+                started_at = time.perf_counter()
+                for _ in range(iterations):
+                    await func()
+                timings.append((time.perf_counter() - started_at) / iterations)
+            return timings
+
+        return self._record(asyncio.run(measure()), rounds, iterations)
+
+    def memory(self, factory: Callable[[], Any], count: int) -> float:
+        """Measures the bytes allocated per object when ``count`` of them are alive at once."""
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            items = [factory() for _ in range(count)]
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        bytes_per_item = (after - before) / count
+        del items
+        self.config.benchmark_memory[self.name] = bytes_per_item
+
+        if self._memory_baseline is not None:
+            threshold: float = self.config.getoption("--benchmark-threshold")
+            allowed = self._memory_baseline["bytes_per_item"] * (1 + threshold)
+            if bytes_per_item > allowed:
+                pytest.fail(f"{self.name} regressed: {bytes_per_item:.0f} bytes per item > "
+                            f"{allowed:.0f} ({threshold:.0%} over baseline)")
+        return bytes_per_item
+
+    def _record(self, timings: list[float], rounds: int, iterations: int) -> BenchmarkResult:
+        result = BenchmarkResult(
+            name=self.name, rounds=rounds, iterations=iterations, min=min(timings),
+            median=statistics.median(timings), mean=statistics.fmean(timings),
+            stdev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        )
+        self.config.benchmark_results[self.name] = result
+
+        if self._baseline is not None:
+            threshold: float = self.config.getoption("--benchmark-threshold")
+            allowed = self._baseline["median"] * (1 + threshold)
+            if result.median > allowed:
+                pytest.fail(f"{self.name} regressed: median {result.median * 1e3:.3f}ms > "
+                            f"{allowed * 1e3:.3f}ms ({threshold:.0%} over baseline)")
+        return result
+
+@pytest.fixture(name="benchmark")
+def fixture_benchmark(request: pytest.FixtureRequest) -> BenchmarkRunner:
+    """A runner recording its results under the test name."""
+    return BenchmarkRunner(request.node.name, request.config)
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Marks everything under this directory as a benchmark."""
+    benchmarks_path = Path(__file__).parent
+    for item in items:
+        if benchmarks_path in Path(item.fspath).parents:
+            item.add_marker(pytest.mark.benchmark)
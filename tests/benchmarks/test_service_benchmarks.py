@@ -0,0 +1,161 @@
+"""Benchmarks of the command hot paths: jokes and /about_bot."""
+
+import random
+from pathlib import Path
+from types import SimpleNamespace
+import discord
+import pytest
+from src.core.constants import DEFAULT_NATIVE_LIB_PATH
+from src.infrastructure.native.libraries import RANDOM_JOKE
+from src.infrastructure.services.bot_stats_service import BotStatsService
+from src.infrastructure.services.image_service import ImageService, RenderParams, encode_png
+from src.infrastructure.services.joke_corpus import (
+    JokeCorpusCompiler,
+    JokeCorpusReader,
+    ShuffleBag,
+)
+from src.infrastructure.services.joke_index import JokeIndex
+from src.infrastructure.services.joke_prefetcher import JokePrefetcher
+from src.infrastructure.services.latency_sampler import LatencySampler
+from src.interface.cogs.about import AboutBotCog, TITLE
+from src.interface.i18n.translator import Translator
+
+NATIVE_LIBRARY = DEFAULT_NATIVE_LIB_PATH / RANDOM_JOKE.filename
+JOKE_COUNT = 10_000
+SEARCH_JOKE_COUNT = 100_000
+SEARCH_CATEGORIES = ("programming", "databases", "networking", "hardware", "puns")
+MEMBER_COUNT = 1_000_000
+GUILD_COUNT = 200
+
+@pytest.fixture(name="corpus_path", scope="module")
+def fixture_corpus_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A compiled corpus of synthetic jokes."""
+    corpus_path = tmp_path_factory.mktemp("corpus") / "jokes.kjc"
+    jokes = [f"joke number {index}: " + "ha" * (index % 40) for index in range(JOKE_COUNT)]
+    corpus_path.write_bytes(JokeCorpusCompiler.build(jokes))
+    return corpus_path
+
+def test_corpus_shuffle_bag_draw(benchmark, corpus_path: Path) -> None:
+    """Draws and decodes a joke from the memory-mapped corpus in Python."""
+    reader = JokeCorpusReader(corpus_path)
+    bag = ShuffleBag(len(reader), random.Random(1))
+
+    benchmark(lambda: reader.get(bag.next()), rounds=10, iterations=10_000)
+    reader.close()
+
+def test_prefetched_joke_get(benchmark, corpus_path: Path) -> None:
+    """Serves jokes from the prefetch rings, refilled by the background thread."""
+    reader = JokeCorpusReader(corpus_path)
+    bags: dict[tuple[int, int], ShuffleBag] = {}
+
+    def fetch_batch(guild_id: int, channel_id: int, count: int) -> list[str]:
+        bag = bags.setdefault((guild_id, channel_id), ShuffleBag(len(reader)))
+        return [reader.get(bag.next()) for _ in range(count)]
+
+    prefetcher = JokePrefetcher(fetch_batch, capacity=64, low_watermark=16)
+    prefetcher.start()
+    try:
+        benchmark.run_async(lambda: prefetcher.get(1, 1), rounds=10, iterations=2_000)
+    finally:
+        prefetcher.close()
+        reader.close()
+
+@pytest.fixture(name="search_corpus_path", scope="module")
+def fixture_search_corpus_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A compiled corpus of jokes drawn from a 20k word vocabulary, in five categories."""
+    rng = random.Random(3)
+    vocabulary = [f"w{rng.getrandbits(40):x}" for _ in range(20_000)]
+    jokes = [" ".join(rng.choices(vocabulary[:2_000] if index % 2 else vocabulary, k=12))
+             for index in range(SEARCH_JOKE_COUNT)]
+    corpus_path = tmp_path_factory.mktemp("search") / "jokes.kjc"
+    corpus_path.write_bytes(JokeCorpusCompiler.build(
+        jokes, [SEARCH_CATEGORIES[index % len(SEARCH_CATEGORIES)]
+                for index in range(SEARCH_JOKE_COUNT)]))
+    return corpus_path
+
+def test_joke_search(benchmark, search_corpus_path: Path) -> None:
+    """Picks a random joke of a category matching a keyword and a partial keyword."""
+    reader = JokeCorpusReader(search_corpus_path)
+    index: JokeIndex = reader.index
+    word = reader.get(1).split()[0]
+    rng = random.Random(1)
+    queries = [("programming", word), ("puns", word[:5]), (None, f"{word} {word[2:6]}")]
+    assert all(index.search(category, keywords, rng) >= 0 for category, keywords in queries)
+
+    benchmark(lambda: [index.search(category, keywords, rng) for category, keywords in queries],
+              rounds=10, iterations=1_000)
+    reader.close()
+
+@pytest.mark.skipif(not NATIVE_LIBRARY.exists(),
+                    reason="native library not built (scripts/build_nim.sh)")
+def test_random_joke_service_throughput(benchmark, corpus_path: Path) -> None:
+    """Draws jokes through the native shuffle bags, one ctypes call per joke."""
+    # pylint: disable=import-outside-toplevel
+    from src.infrastructure.services.random_joke_service import RandomJokeService
+    service = RandomJokeService(corpus_path)
+    try:
+        benchmark(lambda: service.get_random_joke(1, 1), rounds=10, iterations=10_000)
+    finally:
+        service.close()
+
+# pylint: disable=too-few-public-methods
+class _FlatRasterizer():
+    """Stands in for the Nim rasterizer so only encoding and caching are measured."""
+
+    def render_into(self, buffer: bytearray, params: RenderParams) -> None:
+        """Leaves the zeroed scanlines as they are."""
+        del buffer, params
+
+def test_png_encode_512(benchmark) -> None:
+    """Encodes 512x512 RGB scanlines into a PNG."""
+    scanlines = bytearray(RenderParams("plasma", 512, 512, 0).scanline_bytes)
+    benchmark(lambda: encode_png(scanlines, 512, 512), rounds=10, iterations=20)
+
+def test_image_render_cache_hit(benchmark) -> None:
+    """Serves a repeated /image render from the byte-bounded cache."""
+    service = ImageService(_FlatRasterizer())
+    params = RenderParams("plasma", 512, 512, 0)
+    benchmark.run_async(lambda: service.render(params), rounds=10, iterations=10_000)
+    assert service.cache_stats().misses == 1
+
+def test_i18n_message_lookup(benchmark, tmp_path: Path) -> None:
+    """Resolves an interaction's locale and reads one message, as the cogs do."""
+    translator = Translator(tmp_path / "catalogs")
+    interaction = SimpleNamespace(locale="pt-BR", guild_locale="en-US", guild_id=1)
+    benchmark(lambda: translator.for_interaction(interaction)[TITLE],
+              rounds=10, iterations=100_000)
+    translator.close()
+
+@pytest.fixture(name="stats_service", scope="module")
+def fixture_stats_service() -> BotStatsService:
+    """Stats over a million cached members spread across guilds."""
+    rng = random.Random(7)
+    stats_service = BotStatsService()
+    per_guild = MEMBER_COUNT // GUILD_COUNT
+    for guild_id in range(GUILD_COUNT):
+        members = [rng.randrange(1, MEMBER_COUNT) for _ in range(per_guild)]
+        stats_service.sync_guild(guild_id, guild_id % 4, members)
+    return stats_service
+
+async def _noop(*_args, **_kwargs) -> None:
+    return None
+
+def test_about_bot_with_a_million_members(benchmark, stats_service: BotStatsService) -> None:
+    """Renders /about_bot while members keep joining and leaving."""
+    bot = SimpleNamespace(user=SimpleNamespace(name="kaonim"), shard_count=4, shard_id=None)
+    cog = AboutBotCog(bot, stats_service, LatencySampler(bot))
+    interaction = SimpleNamespace(guild=None, guild_id=None, locale="pt-BR", extras={},
+                                  command=None, created_at=discord.utils.utcnow(),
+                                  response=SimpleNamespace(defer=_noop, send_message=_noop,
+                                                           is_done=lambda: False),
+                                  followup=SimpleNamespace(send=_noop))
+    user_ids = iter(range(MEMBER_COUNT, MEMBER_COUNT * 2))
+
+    async def about_after_churn() -> None:
+        user_id = next(user_ids)
+        stats_service.add_member(0, user_id)
+        await AboutBotCog.about_bot.callback(cog, interaction)  # pylint: disable=no-member
+        stats_service.remove_member(0, user_id)
+
+    benchmark.run_async(about_after_churn, rounds=10, iterations=1_000)
+    assert stats_service.snapshot().guilds == GUILD_COUNT
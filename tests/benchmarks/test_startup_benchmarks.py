@@ -0,0 +1,136 @@
+"""Benchmarks of the start-up path: config, extension loading and injection."""
+
+import sys
+import asyncio
+import logging
+from pathlib import Path
+import pytest
+import discord
+from discord.ext import commands
+from src.infrastructure.config.config_constructor import ConfigConstructor
+from src.infrastructure.config.loaders.env_loader import EnvLoader
+from src.infrastructure.config.loaders.toml_loader import TomlLoader
+from src.infrastructure.di.service_container import ServiceContainer
+from src.infrastructure.discord.cog_manifest import CogManifest
+from src.infrastructure.discord.extension_loader import ExtensionLoader
+
+COG_COUNT = 300
+# Discord allows 100 global slash commands, the remaining cogs use prefix commands.
+SLASH_COG_COUNT = 90
+COG_SOURCE = '''
+import discord
+from discord import app_commands
+from discord.ext import commands
+from {package}.services import Greeter
+
+class Cog{index}(commands.Cog):
+    def __init__(self, bot: commands.Bot, greeter: Greeter) -> None:
+        self.bot = bot
+        self.greeter = greeter
+
+    @{decorator}(name="command_{index}", description="synthetic command {index}")
+    async def command(self, context, text: str = "") -> None:
+        pass
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        pass
+'''
+SERVICES_SOURCE = '''
+class Greeter:
+    def greet(self, text: str) -> str:
+        return f"hello {text}"
+'''
+QUIET_LOGGER = logging.getLogger("benchmarks")
+QUIET_LOGGER.setLevel(logging.ERROR)
+
+def new_bot() -> commands.Bot:
+    """A bot that is never connected."""
+    return commands.Bot(command_prefix="!", intents=discord.Intents.none())
+
+@pytest.fixture(name="cogs_package", scope="module")
+def fixture_cogs_package(tmp_path_factory: pytest.TempPathFactory):
+    """An importable package of synthetic cogs with slash commands."""
+    root = tmp_path_factory.mktemp("cogs")
+    package = "benchmark_cogs"
+    (root / package).mkdir()
+    (root / package / "services.py").write_text(SERVICES_SOURCE, encoding="utf-8")
+    (root / package / "commands").mkdir()
+    for index in range(COG_COUNT):
+        decorator = "app_commands.command" if index < SLASH_COG_COUNT else "commands.command"
+        source = COG_SOURCE.format(package=package, index=index, decorator=decorator)
+        (root / package / "commands" / f"cog_{index}.py").write_text(source, encoding="utf-8")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(root)
+        monkeypatch.syspath_prepend(str(root))
+        greeter = __import__(f"{package}.services", fromlist=["Greeter"]).Greeter()
+        yield Path(package) / "commands", greeter
+        for module_name in [name for name in sys.modules if name.startswith(package)]:
+            del sys.modules[module_name]
+
+def purge_modules(prefix: str) -> None:
+    """Forgets imported cog modules so the next load imports them again."""
+    for module_name in [name for name in sys.modules if name.startswith(prefix)]:
+        del sys.modules[module_name]
+
+def test_config_construct_cold(benchmark, tmp_path: Path) -> None:
+    """Loads, merges and maps the TOML and env layers."""
+    toml_path, env_path = tmp_path / "config.toml", tmp_path / ".env"
+    toml_path.write_text('[discord]\nprefix = "!"\n[discord.intents]\nguilds = true\n'
+                         'members = true\n[metrics]\nenabled = false\n', encoding="utf-8")
+    env_path.write_text("TOKEN=token\n", encoding="utf-8")
+    loaders = [TomlLoader(QUIET_LOGGER, toml_path), EnvLoader(QUIET_LOGGER, env_path)]
+
+    benchmark(ConfigConstructor(loaders, QUIET_LOGGER).construct, rounds=10, iterations=50)
+
+def test_config_construct_snapshot(benchmark, tmp_path: Path) -> None:
+    """Reuses the compiled config snapshot."""
+    toml_path, env_path = tmp_path / "config.toml", tmp_path / ".env"
+    toml_path.write_text('[discord]\nprefix = "!"\n', encoding="utf-8")
+    env_path.write_text("TOKEN=token\n", encoding="utf-8")
+    constructor = ConfigConstructor([TomlLoader(QUIET_LOGGER, toml_path),
+                                     EnvLoader(QUIET_LOGGER, env_path)],
+                                    QUIET_LOGGER, snapshot_path=tmp_path / "snapshot.json")
+    constructor.construct()
+
+    benchmark(constructor.construct, rounds=10, iterations=50)
+
+@pytest.mark.parametrize("manifest_state", ["cold", "warm"])
+def test_load_extensions(benchmark, cogs_package, tmp_path: Path, manifest_state: str) -> None:
+    """Imports and adds every synthetic cog, with an empty or a warm cog manifest."""
+    search_path, greeter = cogs_package
+    manifest_path = tmp_path / "manifest.json"
+    state = {}
+
+    def setup() -> None:
+        purge_modules(".".join(search_path.parts))
+        if manifest_state == "cold":
+            manifest_path.unlink(missing_ok=True)
+        container = ServiceContainer.from_instances([greeter], QUIET_LOGGER)
+        state["loader"] = ExtensionLoader(bot=new_bot(), services=container, logger=QUIET_LOGGER,
+                                          search_path=search_path,
+                                          manifest=CogManifest(manifest_path, QUIET_LOGGER))
+
+    async def load() -> None:
+        await state["loader"].load_extensions()
+
+    if manifest_state == "warm":
+        setup()
+        asyncio.run(load())
+
+    result = benchmark.run_async(load, rounds=3, setup=setup)
+
+    assert len(state["loader"].bot.cogs) == COG_COUNT
+    assert result.median > 0
+
+def test_inject_dependencies(benchmark, cogs_package) -> None:
+    """Builds a cog through the cached constructor plan."""
+    search_path, greeter = cogs_package
+    module = __import__(f"{'.'.join(search_path.parts)}.cog_0", fromlist=["Cog0"])
+    services = [greeter, *(type(f"Service{index}", (), {})() for index in range(30))]
+    loader = ExtensionLoader(bot=new_bot(), services=services, logger=QUIET_LOGGER,
+                             search_path=search_path)
+
+    benchmark(lambda: loader._inject_dependencies(module.Cog0),  # pylint: disable=protected-access
+              rounds=10, iterations=500)
@@ -0,0 +1,46 @@
+"""Benchmarks of the state store: cached reads, buffered writes and flush throughput."""
+
+import asyncio
+from pathlib import Path
+from src.infrastructure.storage.state_store import StateStore
+
+KEY_COUNT = 10_000
+
+def test_state_store_cached_get(benchmark, tmp_path: Path) -> None:
+    """Reads a warm key through the read-through cache."""
+    store = StateStore(tmp_path / "state.sqlite3")
+
+    async def warm() -> None:
+        store.set("scores", "1", {"wins": 3})
+        await store.flush()
+        await store.get("scores", "1")
+
+    asyncio.run(warm())
+    benchmark.run_async(lambda: store.get("scores", "1"), rounds=10, iterations=20_000)
+    asyncio.run(store.aclose())
+
+def test_state_store_buffered_set(benchmark, tmp_path: Path) -> None:
+    """Queues writes on the loop; the flushes happen on the database thread."""
+    store = StateStore(tmp_path / "state.sqlite3", batch_size=4096)
+    keys = [str(index) for index in range(KEY_COUNT)]
+    position = [0]
+
+    async def write() -> None:
+        index = position[0] = (position[0] + 1) % KEY_COUNT
+        store.set("scores", keys[index], index)
+
+    benchmark.run_async(write, rounds=10, iterations=KEY_COUNT)
+    asyncio.run(store.aclose())
+
+def test_state_store_flush_throughput(benchmark, tmp_path: Path) -> None:
+    """Writes a batch of distinct keys to SQLite in one transaction."""
+    store = StateStore(tmp_path / "state.sqlite3", batch_size=KEY_COUNT * 2,
+                       flush_interval=3600.0)
+
+    async def fill_and_flush() -> None:
+        for index in range(KEY_COUNT):
+            store.set("scores", str(index), index)
+        await store.flush()
+
+    benchmark.run_async(fill_and_flush, rounds=5)
+    asyncio.run(store.aclose())
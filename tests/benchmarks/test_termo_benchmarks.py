@@ -0,0 +1,58 @@
+"""Benchmarks of the Termo engine: scoring throughput and memory per game."""
+
+import itertools
+import random
+import pytest
+from src.core.constants import DEFAULT_NATIVE_LIB_PATH, DEFAULT_TERMO_WORDS_PATH
+from src.infrastructure.native.bridge import native_bridge
+from src.infrastructure.native.libraries import TERMO_SCORER
+from src.infrastructure.termo.game import MAX_ATTEMPTS, TermoGame, TermoGameStore
+from src.infrastructure.termo.scorer import NativeTermoScorer, PythonTermoScorer
+from src.infrastructure.termo.word_list import WordList
+
+NATIVE_LIBRARY = DEFAULT_NATIVE_LIB_PATH / TERMO_SCORER.filename
+GAME_COUNT = 100_000
+MAX_BYTES_PER_GAME = 512
+
+@pytest.fixture(name="words", scope="module")
+def fixture_words() -> WordList:
+    """The shipped word list."""
+    return WordList.from_file(DEFAULT_TERMO_WORDS_PATH)
+
+def test_python_score_throughput(benchmark, words: WordList) -> None:
+    """Scores random guesses one by one with the Python scorer."""
+    scorer = PythonTermoScorer()
+    rng = random.Random(1)
+    pairs = [(rng.choice(words.codes), rng.choice(words.codes)) for _ in range(1_000)]
+
+    benchmark(lambda: [scorer.score(secret, guess) for secret, guess in pairs],
+              rounds=10, iterations=10)
+
+@pytest.mark.skipif(not NATIVE_LIBRARY.exists(),
+                    reason="native library not built (scripts/build_nim.sh)")
+def test_native_score_many_throughput(benchmark, words: WordList) -> None:
+    """Scores one guess against the whole word list in a single native call."""
+    scorer = NativeTermoScorer(native_bridge().load(TERMO_SCORER))
+    benchmark(lambda: scorer.score_many(words.codes, words.codes[0]), rounds=10, iterations=100)
+
+def test_candidate_filter(benchmark, words: WordList) -> None:
+    """Narrows the word list after three guesses with the letter and position indexes."""
+    scorer = PythonTermoScorer()
+    secret = words.codes[len(words) // 2]
+    history = [(guess, scorer.score(secret, guess)) for guess in words.codes[:3]]
+    benchmark(lambda: words.candidates(history), rounds=10, iterations=1_000)
+
+def test_memory_per_game(benchmark, words: WordList) -> None:
+    """Bytes per running game with a full board, including its store entry."""
+    store = TermoGameStore(max_games=GAME_COUNT)
+    channel_ids = itertools.count(10 ** 17)
+
+    def full_game() -> TermoGame:
+        game = store.create(next(channel_ids), words.codes[0])
+        for attempt in range(MAX_ATTEMPTS):
+            game.record(words.codes[attempt + 1], 121)
+        return game
+
+    bytes_per_game = benchmark.memory(full_game, GAME_COUNT)
+    assert len(store) == GAME_COUNT
+    assert bytes_per_game < MAX_BYTES_PER_GAME
@@ -0,0 +1,150 @@
+"""Unit tests for the cluster supervisor and IPC, using workers without Discord."""
+
+import os
+import json
+import time
+import signal
+import asyncio
+import multiprocessing
+from types import SimpleNamespace
+from multiprocessing.connection import Connection
+from src.infrastructure.cluster.ipc import ClusterClient, ClusterResponse, ClusterRouter
+from src.infrastructure.cluster.supervisor import ClusterSpec, ClusterSupervisor, shard_ranges
+from src.infrastructure.services.bot_stats_service import BotStatsService
+from src.infrastructure.services.latency_sampler import LatencySampler
+from src.interface.cogs.about import AboutBotCog
+
+def stats_worker(spec: ClusterSpec, connection: Connection, results_path: str) -> None:
+    """Worker reporting fake stats; cluster 0 asks for the totals and writes them."""
+    async def serve() -> None:
+        client = ClusterClient(connection, spec.cluster_id, lambda kind: {
+            "guilds": 10 * (spec.cluster_id + 1), "users": 100, "shards": len(spec.shard_ids),
+        })
+        await client.connect()
+        if spec.cluster_id == 0:
+            await asyncio.sleep(0.3)
+            response = await client.request_stats()
+            with open(results_path, "w", encoding="utf-8") as results_file:
+                json.dump({"totals": response.data, "partial": response.partial}, results_file)
+        await asyncio.sleep(1.5)
+
+    asyncio.run(serve())
+
+def crashing_worker(spec: ClusterSpec, connection: Connection, marker_dir: str) -> None:
+    """Worker that crashes on its first run and exits cleanly afterwards."""
+    del connection
+    marker = os.path.join(marker_dir, f"cluster-{spec.cluster_id}")
+    if not os.path.exists(marker):
+        with open(marker, "w", encoding="utf-8"):
+            pass
+        os._exit(3)
+
+def terminated_worker(spec: ClusterSpec, connection: Connection, marker_dir: str) -> None:
+    """Worker that cleans up slowly on SIGTERM, as a bot closing does, then writes a marker."""
+    del connection
+
+    async def serve() -> None:
+        closed = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, closed.set)
+        with open(os.path.join(marker_dir, f"ready-{spec.cluster_id}"), "w", encoding="utf-8"):
+            pass
+        await closed.wait()
+        await asyncio.sleep(0.3)
+        with open(os.path.join(marker_dir, f"closed-{spec.cluster_id}"), "w",
+                  encoding="utf-8"):
+            pass
+
+    asyncio.run(serve())
+
+def run_until_idle(supervisor: ClusterSupervisor, timeout: float = 20.0) -> None:
+    """Runs the supervisor loop until every cluster exited."""
+    supervisor.start()
+    deadline = time.monotonic() + timeout
+    try:
+        while supervisor.alive() and time.monotonic() < deadline:
+            supervisor.poll()
+            time.sleep(0.05)
+    finally:
+        supervisor.stop()
+
+def test_shard_ranges_are_contiguous() -> None:
+    """Test that shards are split into contiguous, balanced ranges."""
+    assert shard_ranges(10, 3) == [(0, 1, 2, 3), (4, 5, 6), (7, 8, 9)]
+    assert shard_ranges(2, 4) == [(0,), (1,)]
+
+def test_stats_are_aggregated_across_clusters(tmp_path) -> None:
+    """Test that a worker request is answered with totals from every cluster."""
+    results_path = tmp_path / "totals.txt"
+    supervisor = ClusterSupervisor(stats_worker, shard_count=5, cluster_count=2,
+                                   args=(str(results_path),))
+
+    run_until_idle(supervisor)
+
+    results = json.loads(results_path.read_text(encoding="utf-8"))
+    assert results == {"totals": {"clusters": 2, "guilds": 30, "users": 200, "shards": 5},
+                       "partial": False}
+
+def test_totals_missing_a_cluster_are_partial() -> None:
+    """Test that the response says so when a cluster did not answer before the timeout."""
+    router = ClusterRouter(timeout=0.2)
+    router_end, worker_end = multiprocessing.Pipe()
+    silent_end, silent_worker_end = multiprocessing.Pipe()
+    router.attach(0, router_end)
+    router.attach(1, silent_end)
+    router.start()
+    client = ClusterClient(worker_end, 0, lambda kind: {"guilds": 3})
+    try:
+        response = asyncio.run(client.request_stats())
+    finally:
+        router.stop()
+        for connection in (router_end, worker_end, silent_end, silent_worker_end):
+            connection.close()
+
+    assert response == ClusterResponse({"clusters": 1, "guilds": 3}, partial=True)
+
+def test_crashed_cluster_is_restarted(tmp_path) -> None:
+    """Test that a cluster exiting with an error is started again."""
+    supervisor = ClusterSupervisor(crashing_worker, shard_count=2, cluster_count=2,
+                                   args=(str(tmp_path),), restart_delay=0.05)
+
+    run_until_idle(supervisor)
+
+    assert [cluster.restarts for cluster in supervisor.clusters] == [1, 1]
+
+def test_stop_lets_clusters_close_before_killing_them(tmp_path) -> None:
+    """Test that stopped clusters get to finish their shutdown after SIGTERM."""
+    supervisor = ClusterSupervisor(terminated_worker, shard_count=2, cluster_count=2,
+                                   args=(str(tmp_path),))
+    supervisor.start()
+    deadline = time.monotonic() + 20.0
+    while len(list(tmp_path.iterdir())) < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    supervisor.stop(timeout=10.0)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "closed-0", "closed-1", "ready-0", "ready-1"]
+
+def test_about_falls_back_to_local_stats_without_a_supervisor() -> None:
+    """Test the labels of local counts when the totals time out, and of partial totals."""
+    supervisor_end, connection = multiprocessing.Pipe()
+    stats_service = BotStatsService()
+    stats_service.sync_guild(1, 0, [10, 11])
+    bot = SimpleNamespace(user=None, shard_count=2, shard_id=None)
+    client = ClusterClient(connection, 0, lambda kind: None, timeout=0.05)
+    cog = AboutBotCog(bot, stats_service, LatencySampler(bot), cluster_client=client)
+    interaction = SimpleNamespace(guild=None, guild_id=None, locale="en-US")
+
+    text = asyncio.run(cog._render(interaction))  # pylint: disable=protected-access
+
+    assert "Servers: 1 (this cluster only)" in text
+    assert "Users: 2 (this cluster only)" in text
+    supervisor_end.close()
+    connection.close()
+
+    async def partial_stats() -> ClusterResponse:
+        return ClusterResponse({"clusters": 1, "guilds": 5, "users": 50}, partial=True)
+
+    cog.cluster_client = SimpleNamespace(request_stats=partial_stats)
+    text = asyncio.run(cog._render(interaction))  # pylint: disable=protected-access
+    assert "Servers: 5 (some clusters did not answer)" in text
@@ -0,0 +1,101 @@
+"""Unit tests for layered config construction and the compiled snapshot."""
+
+from unittest.mock import MagicMock, patch
+from src.infrastructure.config.config_constructor import ConfigConstructor, deep_merge
+from src.infrastructure.config.loaders.env_loader import EnvLoader
+from src.infrastructure.config.loaders.toml_loader import TomlLoader
+
+def write_sources(tmp_path, prefix: str = ";?"):
+    """Writes a TOML and an env file and returns loaders for them."""
+    toml_path = tmp_path / "config.toml"
+    toml_path.write_text(f'[discord]\nprefix = "{prefix}"\n\n[discord.intents]\nguilds = true\n',
+                         encoding="utf-8")
+    env_path = tmp_path / ".env"
+    env_path.write_text("TOKEN=secret\n", encoding="utf-8")
+    logger = MagicMock()
+    return [TomlLoader(logger, toml_path), EnvLoader(logger, env_path)]
+
+def test_deep_merge_keeps_nested_tables() -> None:
+    """Test that nested tables are merged and the inputs are left untouched."""
+    base = {"discord": {"prefix": "!", "intents": {"guilds": True}}}
+    override = {"discord": {"intents": {"members": True}}, "TOKEN": "x"}
+
+    merged = deep_merge(base, override)
+
+    assert merged == {"discord": {"prefix": "!", "intents": {"guilds": True, "members": True}},
+                      "TOKEN": "x"}
+    assert base == {"discord": {"prefix": "!", "intents": {"guilds": True}}}
+
+def test_loaders_merge_by_priority(tmp_path) -> None:
+    """Test that the merge order does not depend on the order the loaders are given."""
+    loaders = write_sources(tmp_path)
+    loaders[1].load_config = lambda: {"TOKEN": "secret", "discord": {"prefix": "env"}}
+
+    forward = ConfigConstructor(loaders, MagicMock()).construct()
+    backward = ConfigConstructor(list(reversed(loaders)), MagicMock()).construct()
+
+    assert forward == backward
+    assert forward.discord.prefix == "env"
+    assert forward.discord.intents.guilds is True
+
+def test_snapshot_is_reused_until_a_source_changes(tmp_path) -> None:
+    """Test that the compiled snapshot skips loading while the sources are unchanged."""
+    snapshot_path = tmp_path / "cache" / "config.json"
+    loaders = write_sources(tmp_path)
+    first = ConfigConstructor(loaders, MagicMock(), snapshot_path=snapshot_path).construct()
+
+    with patch.object(TomlLoader, "load_config", side_effect=AssertionError("not cached")):
+        cached = ConfigConstructor(loaders, MagicMock(), snapshot_path=snapshot_path).construct()
+    assert cached == first
+    assert snapshot_path.stat().st_mode & 0o077 == 0
+
+    write_sources(tmp_path, prefix="$$")
+    rebuilt = ConfigConstructor(loaders, MagicMock(), snapshot_path=snapshot_path).construct()
+    assert rebuilt.discord.prefix == "$$"
+
+def test_flat_tables_ignore_unknown_keys(tmp_path) -> None:
+    """Test that [rate_limits] is mapped and unknown keys are only warned about."""
+    loaders = write_sources(tmp_path)
+    loaders[1].load_config = lambda: {"TOKEN": "secret",
+                                      "rate_limits": {"user_burst": 2, "bogus": 1}}
+    logger = MagicMock()
+
+    config = ConfigConstructor(loaders, logger).construct()
+
+    assert config.rate_limits.user_burst == 2
+    assert config.rate_limits.guild_burst == 40
+    logger.warning.assert_called_once()
+
+def test_cache_table_is_mapped_and_snapshotted(tmp_path) -> None:
+    """Test that [discord.cache] reaches the model and survives the snapshot."""
+    snapshot_path = tmp_path / "config.json"
+    loaders = write_sources(tmp_path)
+    loaders[1].load_config = lambda: {"TOKEN": "secret", "discord": {"cache": {
+        "max_messages": 100, "member_cache": {"voice": True, "online": True}}}}
+    logger = MagicMock()
+
+    config = ConfigConstructor(loaders, logger, snapshot_path=snapshot_path).construct()
+    cached = ConfigConstructor(loaders, logger, snapshot_path=snapshot_path).construct()
+
+    assert config.discord.cache.max_messages == 100
+    assert config.discord.cache.chunk_guilds_at_startup is False
+    assert config.discord.cache.member_cache.voice is True
+    assert config.discord.cache.member_cache.joined is False
+    assert cached == config
+    logger.warning.assert_called_once()
+
+def test_logging_table_is_mapped_and_snapshotted(tmp_path) -> None:
+    """Test that [logging] and its sample rates reach the model and survive the snapshot."""
+    snapshot_path = tmp_path / "config.json"
+    loaders = write_sources(tmp_path)
+    loaders[1].load_config = lambda: {"TOKEN": "secret", "logging": {
+        "ring_buffer_size": 10, "sample_rates": {"discord.state": 0.1}}}
+    logger = MagicMock()
+
+    config = ConfigConstructor(loaders, logger, snapshot_path=snapshot_path).construct()
+    cached = ConfigConstructor(loaders, logger, snapshot_path=snapshot_path).construct()
+
+    assert config.logging.ring_buffer_size == 10
+    assert config.logging.ring_buffer_level == "DEBUG"
+    assert config.logging.sample_rates == {"discord.state": 0.1}
+    assert cached == config
@@ -0,0 +1,37 @@
+"""Unit tests for the live config reloader."""
+
+import asyncio
+from unittest.mock import MagicMock
+from discord import Intents
+from src.infrastructure.config.config_model import ConfigModel, DiscordConfiguration
+from src.infrastructure.config.config_reloader import ConfigReloader
+
+def make_config(prefix: str = "!", token: str = "token") -> ConfigModel:
+    """Builds a config model."""
+    return ConfigModel(discord=DiscordConfiguration(token=token, intents=Intents.default(),
+                                                    prefix=prefix))
+
+def test_reload_applies_only_runtime_safe_keys() -> None:
+    """Test that registered keys are applied and the others wait for a restart."""
+    constructor = MagicMock()
+    constructor.construct.return_value = make_config(prefix="?", token="rotated")
+    logger = MagicMock()
+    reloader = ConfigReloader(constructor, make_config(), logger)
+    prefixes = []
+    reloader.on_change("discord.prefix", prefixes.append)
+
+    applied = asyncio.run(reloader.reload())
+
+    assert applied == ["discord.prefix"]
+    assert prefixes == ["?"]
+    assert reloader.current == make_config(prefix="?")
+    logger.warning.assert_called_once()
+
+def test_failed_reload_keeps_running_config() -> None:
+    """Test that a broken source leaves the running config untouched."""
+    constructor = MagicMock()
+    constructor.construct.side_effect = ValueError("bad toml")
+    reloader = ConfigReloader(constructor, make_config(), MagicMock())
+
+    assert not asyncio.run(reloader.reload())
+    assert reloader.current == make_config()
@@ -0,0 +1,95 @@
+"""Unit tests for the service container."""
+
+# pylint: disable=too-few-public-methods
+
+import asyncio
+from typing import Protocol, runtime_checkable
+import pytest
+from src.infrastructure.di.service_container import ServiceContainer, ServiceNotFoundError
+
+@runtime_checkable
+class Greeter(Protocol):
+    """Protocol satisfied structurally by GreetingService."""
+
+    def greet(self) -> str:
+        """Returns a greeting."""
+
+class BaseService():
+    """Base class used to check MRO indexing."""
+
+class GreetingService(BaseService):
+    """Service with async lifecycle hooks."""
+
+    built = 0
+
+    def __init__(self) -> None:
+        GreetingService.built += 1
+        self.events: list[str] = []
+
+    def greet(self) -> str:
+        """Returns a greeting."""
+        return "hello"
+
+    async def async_init(self) -> None:
+        """Records initialization."""
+        self.events.append("init")
+
+    async def aclose(self) -> None:
+        """Records shutdown."""
+        self.events.append("close")
+
+class Consumer():
+    """Consumer depending on a protocol and an optional missing service."""
+
+    def __init__(self, bot: object, greeter: Greeter, missing: int = 7) -> None:
+        self.bot = bot
+        self.greeter = greeter
+        self.missing = missing
+
+def test_resolves_by_base_class_and_protocol() -> None:
+    """Test lookups by the concrete type, a base class and a protocol."""
+    container = ServiceContainer()
+    service = GreetingService()
+    container.register_instance(service)
+
+    assert container.resolve(GreetingService) is service
+    assert container.resolve(BaseService) is service
+    assert container.resolve(Greeter) is service
+
+def test_lazy_service_is_built_once_on_first_injection() -> None:
+    """Test that lazy services are only built when something needs them."""
+    GreetingService.built = 0
+    container = ServiceContainer()
+    container.register_lazy(GreetingService)
+
+    assert GreetingService.built == 0
+
+    first = container.instantiate(Consumer, "bot")
+    second = container.instantiate(Consumer, "bot")
+
+    assert GreetingService.built == 1
+    assert first.greeter is second.greeter
+    assert first.bot == "bot"
+    assert first.missing == 7
+
+def test_missing_required_service_raises() -> None:
+    """Test that an unsatisfied required dependency raises."""
+    container = ServiceContainer()
+
+    with pytest.raises(ServiceNotFoundError):
+        container.instantiate(Consumer, "bot")
+
+def test_async_hooks_run_once() -> None:
+    """Test that async_init runs once per built service and aclose on shutdown."""
+    container = ServiceContainer()
+    container.register_lazy(GreetingService)
+    service = container.resolve(GreetingService)
+
+    async def lifecycle() -> None:
+        await container.initialize()
+        await container.initialize()
+        await container.aclose()
+
+    asyncio.run(lifecycle())
+
+    assert service.events == ["init", "close"]
@@ -0,0 +1,108 @@
+"""Unit tests for the token buckets, the admission controller and load shedding."""
+
+import time
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+import discord
+from discord import app_commands
+from src.infrastructure.config.config_model import RateLimitConfiguration
+from src.infrastructure.discord.admission import (
+    AdmissionController,
+    RateLimit,
+    TokenBuckets,
+    rate_limit,
+)
+from src.interface.i18n.translator import Translator
+
+# pylint: disable=too-few-public-methods
+
+class FakeResponse():
+    """Records ephemeral replies."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, bool]] = []
+
+    async def send_message(self, message: str, ephemeral: bool = False) -> None:
+        """Keeps the message."""
+        self.sent.append((message, ephemeral))
+
+def make_interaction(user_id: int = 1, guild_id: int = 10, command=None) -> SimpleNamespace:
+    """An application command interaction with the fields the controller reads."""
+    return SimpleNamespace(type=discord.InteractionType.application_command,
+                           user=SimpleNamespace(id=user_id), guild_id=guild_id,
+                           command=command, locale="en-US", guild_locale=None,
+                           response=FakeResponse())
+
+def make_controller(tmp_path: Path, now: list[float], **limits) -> AdmissionController:
+    """A controller with a fake clock and a translator over the shipped catalogs."""
+    config = RateLimitConfiguration(**{"user_burst": 100, "guild_burst": 100,
+                                       "command_burst": 100, **limits})
+    return AdmissionController(config, translator=Translator(tmp_path / "catalogs"),
+                               clock=lambda: now[0])
+
+def test_token_bucket_bursts_refills_and_sweeps() -> None:
+    """Test the burst size, the lazy refill and the eviction of full buckets."""
+    buckets = TokenBuckets(RateLimit(rate=2.0, burst=3))
+    for _ in range(3):
+        assert buckets.delay("key", 0.0) == 0
+        buckets.take("key", 0.0)
+
+    assert buckets.delay("key", 0.0) == 0.5
+    assert buckets.delay("key", 0.5) == 0
+    assert buckets.sweep(1.0) == 0 and len(buckets) == 1
+    assert buckets.sweep(1.5) == 1 and len(buckets) == 0
+
+def test_refusals_do_not_spend_other_buckets(tmp_path: Path) -> None:
+    """Test that a user over the limit leaves the guild bucket untouched."""
+    now = [0.0]
+    controller = make_controller(tmp_path, now, user_burst=2, guild_burst=3)
+
+    assert controller.check(make_interaction(user_id=1))[0] is None
+    assert controller.check(make_interaction(user_id=1))[0] is None
+    assert controller.check(make_interaction(user_id=1)) == ("user", 1.0)
+    assert controller.check(make_interaction(user_id=2))[0] is None
+    assert controller.check(make_interaction(user_id=3))[0] == "guild"
+
+def test_commands_can_override_their_limit(tmp_path: Path) -> None:
+    """Test the per-user, per-command bucket set by ``rate_limit``."""
+    @rate_limit(rate=0.1, burst=1)
+    @app_commands.command(name="slow", description="slow")
+    async def slow(_interaction: discord.Interaction) -> None:
+        return None
+
+    now = [0.0]
+    controller = make_controller(tmp_path, now)
+    assert controller.check(make_interaction(command=slow))[0] is None
+    assert controller.check(make_interaction(command=slow)) == ("command", 10.0)
+    assert controller.check(make_interaction(user_id=2, command=slow))[0] is None
+
+def test_admit_answers_refusals_ephemerally(tmp_path: Path) -> None:
+    """Test the localized ephemeral reply and load shedding above the lag threshold."""
+    now = [0.0]
+    controller = make_controller(tmp_path, now, user_burst=1, shed_lag=0.2)
+    interaction = make_interaction()
+
+    assert asyncio.run(controller.admit(interaction))
+    assert not asyncio.run(controller.admit(interaction))
+    assert interaction.response.sent == [("Slow down! Try again in 1s.", True)]
+
+    controller.loop_lag = 0.5
+    now[0] = 100.0
+    assert not asyncio.run(controller.admit(interaction))
+    assert "overloaded" in interaction.response.sent[-1][0]
+
+def test_lag_probe_detects_a_blocked_loop(tmp_path: Path) -> None:
+    """Test that blocking the loop shows up in ``loop_lag``."""
+    controller = make_controller(tmp_path, [0.0], lag_interval=0.01)
+
+    async def scenario() -> float:
+        await controller.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)
+        await asyncio.sleep(0.001)
+        lag = controller.loop_lag
+        await controller.close()
+        return lag
+
+    assert asyncio.run(scenario()) >= 0.03
@@ -0,0 +1,141 @@
+"""Unit tests for the cache settings and start-up of the bot and the cache memory estimates."""
+
+import os
+import signal
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import discord
+import pytest
+from src.infrastructure.config.config_model import CacheConfiguration
+from src.infrastructure.discord import basebot
+from src.infrastructure.discord.basebot import BaseBot
+from src.infrastructure.discord.cache_report import deep_size, estimate_caches, format_estimates
+
+# pylint: disable=too-few-public-methods
+class FakeGuild():
+    """A guild that counts its chunk requests."""
+
+    def __init__(self, guild_id: int, members: list) -> None:
+        self.id = guild_id
+        self.members = members
+        self.channels: list = []
+        self.roles: list = []
+        self.chunked = False
+        self.chunks = 0
+
+    async def chunk(self, cache: bool = True) -> None:
+        """Marks the guild as chunked."""
+        await asyncio.sleep(0)
+        self.chunks += 1
+        self.chunked = cache
+
+def make_bot(**cache) -> BaseBot:
+    """A bot with the members intent and the given cache settings."""
+    intents = discord.Intents.none()
+    intents.guilds = intents.members = True
+    return BaseBot("token", "!", intents, MagicMock(), cache=CacheConfiguration(**cache))
+
+def test_cache_settings_reach_discord() -> None:
+    """Test that chunking, the message cache and member flags are configured."""
+    flags = discord.MemberCacheFlags.none()
+    flags.joined = True
+    bot = make_bot(max_messages=0, member_cache=flags)
+
+    state = bot._connection  # pylint: disable=protected-access
+    assert state.max_messages is None
+    assert state._chunk_guilds is False  # pylint: disable=protected-access
+    assert state.member_cache_flags.joined is True
+
+def test_guilds_are_chunked_once_on_demand() -> None:
+    """Test that repeated interactions from a guild request its members once."""
+    async def scenario(bot: BaseBot) -> FakeGuild:
+        guild = FakeGuild(1, [])
+        for _ in range(3):
+            await bot.on_interaction(SimpleNamespace(guild=guild))
+        await asyncio.gather(*bot._chunking.values())  # pylint: disable=protected-access
+        await bot.on_interaction(SimpleNamespace(guild=guild))
+        return guild
+
+    assert asyncio.run(scenario(make_bot())).chunks == 1
+    assert asyncio.run(scenario(make_bot(chunk_on_demand=False))).chunks == 0
+
+def test_identifies_are_paced_per_rate_limit_bucket(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that shards of different buckets identify together and a bucket waits its turn."""
+    monkeypatch.setattr(basebot, "IDENTIFY_INTERVAL", 0.2)
+    bot = make_bot()
+    bot.identify_concurrency = 2
+
+    async def identify_at(shard_id: int, initial: bool = False) -> float:
+        await bot.before_identify_hook(shard_id, initial=initial)
+        return asyncio.get_running_loop().time()
+
+    async def scenario() -> list[float]:
+        start = asyncio.get_running_loop().time()
+        # Shard 2 re-identifies (not initial) in bucket 0 while shards 0 and 1 launch.
+        times = await asyncio.gather(identify_at(0, initial=True), identify_at(1),
+                                     identify_at(2), identify_at(3))
+        return [time - start for time in times]
+
+    first, second, third, fourth = asyncio.run(scenario())
+    assert max(first, second) < 0.1
+    assert min(third, fourth) >= 0.2 and max(third, fourth) < 0.35
+
+def test_sigterm_closes_the_bot() -> None:
+    """Test that SIGTERM runs the shutdown hooks instead of killing the process."""
+    bot = make_bot()
+    closed: list[str] = []
+
+    async def hook() -> None:
+        closed.append("hook")
+
+    async def scenario() -> None:
+        bot.shutdown_hooks.append(hook)
+        await bot.close_on_sigterm()
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.1)
+        assert bot.is_closed()
+
+    asyncio.run(scenario())
+    assert closed == ["hook"]
+
+def test_cache_estimates_extrapolate_a_sample() -> None:
+    """Test that estimates scale with the cache sizes and skip shared models."""
+    member = SimpleNamespace(name="member" * 4, roles=[1, 2, 3])
+    client = SimpleNamespace(guilds=[FakeGuild(1, [member] * 10), FakeGuild(2, [member] * 30)],
+                             users=[], emojis=[], cached_messages=[])
+
+    estimates = {item.name: item for item in estimate_caches(client)}
+    assert estimates["members"].count == 40
+    assert estimates["members"].bytes == 40 * deep_size(member)
+    assert estimates["messages"].bytes == 0
+    assert "members=40" in format_estimates(estimates.values())
+    assert deep_size(SimpleNamespace(guild=SimpleNamespace(_state=None))) < deep_size(member)
+
+def test_serve_overlaps_login_with_steps_and_prefetches_the_gateway() -> None:
+    """Test that the steps and setup hooks run with the login, before connecting."""
+    bot = make_bot()
+    events: list[str] = []
+
+    async def login(_token: str) -> None:
+        await bot.setup_hook()
+        events.append("login")
+
+    async def step() -> None:
+        await asyncio.sleep(0)
+        events.append("step")
+
+    async def hook() -> None:
+        events.append(f"hook with {bot.shard_count} shards")
+
+    async def connect(reconnect: bool) -> None:
+        events.append(f"connect {reconnect}")
+
+    bot.http.get_bot_gateway = MagicMock(side_effect=lambda: asyncio.sleep(0, (3, "wss://", {})))
+    bot.setup_hooks.append(hook)
+    bot.login, bot.connect = login, connect
+    asyncio.run(bot.serve(step))
+
+    assert sorted(events[:3]) == ["hook with None shards", "login", "step"]
+    assert events[3:] == ["connect True"]
+    assert bot.shard_count == 3
@@ -0,0 +1,58 @@
+"""Unit tests for the hash-gated command sync manager."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import discord
+from discord import app_commands
+from discord.ext import commands
+from src.infrastructure.discord.command_sync import CommandSyncManager
+
+def make_command(name: str, description: str) -> app_commands.Command:
+    """Builds a standalone slash command."""
+    async def callback(interaction: discord.Interaction) -> None:
+        del interaction
+    return app_commands.Command(name=name, description=description, callback=callback)
+
+def make_manager(state_path: Path) -> CommandSyncManager:
+    """Builds a manager around a real tree whose REST sync is mocked."""
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    bot.tree.sync = AsyncMock()
+    bot.tree.add_command(make_command("joke", "get a random joke"))
+    return CommandSyncManager(bot.tree, state_path=state_path, logger=MagicMock())
+
+def test_unchanged_tree_is_synced_once(tmp_path: Path) -> None:
+    """Test that a second sync with the same tree, even after a restart, is skipped."""
+    state_path = tmp_path / "sync.json"
+
+    first = make_manager(state_path)
+    assert asyncio.run(first.sync()) == ["global"]
+
+    second = make_manager(state_path)
+    assert not asyncio.run(second.sync())
+    second.tree.sync.assert_not_awaited()
+
+def test_changed_command_is_synced_and_logged(tmp_path: Path) -> None:
+    """Test that a modified command triggers a sync and is reported as changed."""
+    manager = make_manager(tmp_path / "sync.json")
+    asyncio.run(manager.sync())
+
+    manager.tree.remove_command("joke")
+    manager.tree.add_command(make_command("joke", "a better joke"))
+    assert asyncio.run(manager.sync()) == ["global"]
+    manager.logger.info.assert_any_call(
+        "Syncing %s commands: added=%s removed=%s changed=%s",
+        "global", [], [], ["1:joke"],
+    )
+
+def test_force_and_guild_scopes(tmp_path: Path) -> None:
+    """Test that force syncs everything and guild commands get their own scope."""
+    manager = make_manager(tmp_path / "sync.json")
+    manager.tree.add_command(make_command("termo", "play termo"), guild=discord.Object(id=42))
+
+    assert sorted(asyncio.run(manager.sync())) == ["42", "global"]
+    assert not asyncio.run(manager.sync())
+    assert sorted(asyncio.run(manager.sync(force=True))) == ["42", "global"]
+
+    manager.tree.clear_commands(guild=discord.Object(id=42))
+    assert asyncio.run(manager.sync()) == ["42"]
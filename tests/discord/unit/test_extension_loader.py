@@ -0,0 +1,89 @@
+"""Unit tests for the extension loader and its cog manifest."""
+
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.infrastructure.discord.cog_manifest import CogManifest
+from src.infrastructure.discord.extension_loader import ExtensionLoader, preimport_extensions
+
+COG_SOURCE = '''
+from discord.ext import commands
+
+class {name}(commands.Cog):
+    def __init__(self, bot, greeting: str) -> None:
+        self.bot = bot
+        self.greeting = greeting
+'''
+
+@pytest.fixture(name="cogs_path")
+def fixture_cogs_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, request) -> Path:
+    """Creates an importable package of synthetic cogs with a unique name."""
+    package = f"synthetic_cogs_{request.node.name}"
+    cogs_path = tmp_path / package
+    cogs_path.mkdir()
+    for index in range(3):
+        (cogs_path / f"cog_{index}.py").write_text(COG_SOURCE.format(name=f"Cog{index}"))
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield Path(package)
+    for module_name in [name for name in sys.modules if name.startswith(package)]:
+        del sys.modules[module_name]
+
+def make_loader(cogs_path: Path, manifest_path: Path) -> tuple[ExtensionLoader, MagicMock]:
+    """Builds a loader around a fake bot."""
+    bot = MagicMock()
+    bot.add_cog = AsyncMock()
+    loader = ExtensionLoader(bot=bot, services=["hello"], logger=MagicMock(),
+                             search_path=cogs_path, manifest=CogManifest(manifest_path))
+    return loader, bot
+
+def test_load_extensions_injects_services_and_writes_manifest(cogs_path: Path) -> None:
+    """Test that every cog is loaded with its dependency and recorded in the manifest."""
+    manifest_path = Path(".cache/manifest.json")
+    loader, bot = make_loader(cogs_path, manifest_path)
+
+    asyncio.run(loader.load_extensions())
+
+    assert bot.add_cog.await_count == 3
+    assert {call.args[0].greeting for call in bot.add_cog.await_args_list} == {"hello"}
+    assert manifest_path.exists()
+    assert [timing.cogs for timing in loader.load_report] == [["Cog0"], ["Cog1"], ["Cog2"]]
+    assert not any(timing.cached for timing in loader.load_report)
+
+def test_second_load_uses_manifest(cogs_path: Path) -> None:
+    """Test that an unchanged module is resolved from the manifest."""
+    manifest_path = Path(".cache/manifest.json")
+    asyncio.run(make_loader(cogs_path, manifest_path)[0].load_extensions())
+
+    loader, bot = make_loader(cogs_path, manifest_path)
+    asyncio.run(loader.load_extensions())
+
+    assert bot.add_cog.await_count == 3
+    assert all(timing.cached for timing in loader.load_report)
+
+def test_preimported_modules_are_loaded_later(cogs_path: Path) -> None:
+    """Test that modules imported before the bot exists are then added as cogs."""
+    (cogs_path / "broken.py").write_text("raise RuntimeError('boom')\n")
+
+    assert asyncio.run(preimport_extensions(cogs_path)) == 3
+    assert f"{cogs_path}.cog_0" in sys.modules
+
+    loader, bot = make_loader(cogs_path, Path(".cache/manifest.json"))
+    asyncio.run(loader.load_extensions())
+    assert bot.add_cog.await_count == 3
+
+def test_manifest_detects_content_changes(tmp_path: Path) -> None:
+    """Test that a manifest entry is dropped when the file content changes."""
+    module_path = tmp_path / "module.py"
+    module_path.write_text("A = 1\n")
+    manifest = CogManifest(tmp_path / "manifest.json")
+    manifest.store("module", module_path, ["SomeCog"])
+    manifest.save()
+
+    assert CogManifest(tmp_path / "manifest.json").lookup("module", module_path) == ["SomeCog"]
+
+    module_path.write_text("A = 22\n")
+    assert CogManifest(tmp_path / "manifest.json").lookup("module", module_path) is None
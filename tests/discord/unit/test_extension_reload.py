@@ -0,0 +1,110 @@
+"""Unit tests for hot reloading extension modules."""
+
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+import discord
+from discord.ext import commands
+from src.infrastructure.discord.cog_manifest import CogManifest
+from src.infrastructure.discord.extension_loader import ExtensionLoader
+
+COG_SOURCE = '''
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+VERSION = {version}
+
+class PingCog(commands.Cog):
+    def __init__(self, bot, greeting: str) -> None:
+        self.bot = bot
+        self.greeting = greeting
+
+    @app_commands.command(name="ping", description="{description}")
+    async def ping(self, interaction: discord.Interaction) -> None:
+        pass
+'''
+
+@pytest.fixture(name="cog_file")
+def fixture_cog_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, request) -> Path:
+    """Creates an importable package with one cog module."""
+    package = f"reload_cogs_{request.node.name}"
+    (tmp_path / package).mkdir()
+    cog_file = tmp_path / package / "ping.py"
+    cog_file.write_text(COG_SOURCE.format(version=1, description="pong"))
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield cog_file
+    for module_name in [name for name in sys.modules if name.startswith(package)]:
+        del sys.modules[module_name]
+
+def make_loader(cog_file: Path) -> tuple[ExtensionLoader, commands.Bot]:
+    """Builds a loader around a real bot whose tree sync is mocked."""
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+    bot.tree.sync = AsyncMock()
+    loader = ExtensionLoader(bot=bot, services=["hello"], logger=MagicMock(),
+                             search_path=Path(cog_file.parent.name),
+                             manifest=CogManifest(Path(".cache/manifest.json")))
+    return loader, bot
+
+def test_unchanged_modules_are_not_reloaded(cog_file: Path) -> None:
+    """Test that touching nothing reloads nothing."""
+    loader, _ = make_loader(cog_file)
+
+    async def scenario() -> list[str]:
+        await loader.load_extensions()
+        return await loader.reload_changed()
+
+    assert not asyncio.run(scenario())
+
+def test_code_change_swaps_cog_without_sync(cog_file: Path) -> None:
+    """Test that a change outside command definitions swaps the cog but skips the sync."""
+    loader, bot = make_loader(cog_file)
+
+    async def scenario() -> tuple[list[str], commands.Cog, commands.Cog]:
+        await loader.load_extensions()
+        old_cog = bot.get_cog("PingCog")
+        cog_file.write_text(COG_SOURCE.format(version=22, description="pong"))
+        reloaded = await loader.reload_changed()
+        return reloaded, old_cog, bot.get_cog("PingCog")
+
+    reloaded, old_cog, new_cog = asyncio.run(scenario())
+
+    assert reloaded == [f"{cog_file.parent.name}.ping"]
+    assert new_cog is not old_cog
+    assert new_cog.greeting == "hello"
+    assert sys.modules[f"{cog_file.parent.name}.ping"].VERSION == 22
+    bot.tree.sync.assert_not_awaited()
+
+def test_command_change_triggers_sync(cog_file: Path) -> None:
+    """Test that changing a command definition syncs the tree."""
+    loader, bot = make_loader(cog_file)
+
+    async def scenario() -> None:
+        await loader.load_extensions()
+        cog_file.write_text(COG_SOURCE.format(version=1, description="a new description"))
+        await loader.reload_changed()
+
+    asyncio.run(scenario())
+
+    bot.tree.sync.assert_awaited_once()
+    assert bot.tree.get_command("ping").description == "a new description"
+
+def test_broken_edit_keeps_previous_version(cog_file: Path) -> None:
+    """Test that a module failing to import leaves the running cog in place."""
+    loader, bot = make_loader(cog_file)
+
+    async def scenario() -> tuple[list[str], commands.Cog, commands.Cog]:
+        await loader.load_extensions()
+        old_cog = bot.get_cog("PingCog")
+        cog_file.write_text("this is not python (")
+        reloaded = await loader.reload_changed()
+        return reloaded, old_cog, bot.get_cog("PingCog")
+
+    reloaded, old_cog, current_cog = asyncio.run(scenario())
+
+    assert not reloaded
+    assert current_cog is old_cog
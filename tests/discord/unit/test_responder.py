@@ -0,0 +1,119 @@
+"""Unit tests for the adaptive response helper."""
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+import discord
+from src.infrastructure.discord.responder import (
+    LATENCY_GAIN,
+    AdaptiveResponder,
+    LatencyEstimate,
+)
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.metrics.registry import MetricsRegistry
+
+class FakeResponse():
+    """Records the initial response of an interaction."""
+
+    def __init__(self, calls: list[str]) -> None:
+        self.calls = calls
+        self.done = False
+
+    def is_done(self) -> bool:
+        """Whether the interaction was answered or deferred."""
+        return self.done
+
+    async def defer(self, thinking: bool = False, ephemeral: bool = False) -> None:
+        """Records a deferral."""
+        self.done = True
+        self.calls.append(f"defer:{thinking}:{ephemeral}")
+
+    async def send_message(self, content: str, ephemeral: bool = False) -> None:
+        """Records a direct answer."""
+        self.done = True
+        self.calls.append(f"respond:{content}:{ephemeral}")
+
+def make_interaction(age: float = 0.0, name: str = "joke") -> SimpleNamespace:
+    """An interaction created ``age`` seconds ago, recording its REST calls."""
+    calls: list[str] = []
+
+    async def followup_send(content: str) -> None:
+        calls.append(f"followup:{content}")
+
+    created_at = discord.utils.utcnow() - datetime.timedelta(seconds=age)
+    return SimpleNamespace(calls=calls, extras={}, created_at=created_at,
+                           command=SimpleNamespace(qualified_name=name),
+                           response=FakeResponse(calls),
+                           followup=SimpleNamespace(send=followup_send))
+
+def make_responder(**kwargs) -> tuple[AdaptiveResponder, MetricsRegistry]:
+    """A responder counting paths into a fresh registry."""
+    registry = MetricsRegistry()
+    return AdaptiveResponder(CommandMetrics(registry), **kwargs), registry
+
+async def answer(responder: AdaptiveResponder, interaction, delay: float = 0.0) -> None:
+    """A handler taking ``delay`` seconds before sending its answer."""
+    async with responder.respond(interaction, ephemeral=True) as reply:
+        await asyncio.sleep(delay)
+        await reply.send("hi")
+
+def test_fast_commands_answer_directly() -> None:
+    """Test that a fresh, fast command skips the defer round-trip."""
+    responder, registry = make_responder()
+    interaction = make_interaction()
+
+    asyncio.run(answer(responder, interaction))
+    assert interaction.calls == ["respond:hi:True"]
+    assert 'path="direct"} 1' in registry.render()
+    assert "respond" in interaction.extras["metrics.phases"]
+
+def test_slow_or_old_commands_defer_first() -> None:
+    """Test that a slow latency estimate or an old interaction defers up front."""
+    responder, registry = make_responder()
+    responder.estimates["joke"] = LatencyEstimate(2.0)
+    slow = make_interaction()
+    asyncio.run(answer(responder, slow))
+    assert slow.calls == ["defer:True:True", "followup:hi"]
+
+    old = make_interaction(age=1.5, name="about_bot")
+    asyncio.run(answer(responder, old))
+    assert old.calls[0] == "defer:True:True"
+    assert registry.render().count('path="deferred"} 1') == 2
+
+def test_deferral_round_trips_are_not_handler_latency() -> None:
+    """Test that a slow deferral does not make a fast command look slow."""
+    responder, _ = make_responder()
+    responder.estimates["joke"] = LatencyEstimate(2.0)
+    interaction = make_interaction()
+    fast_defer = interaction.response.defer
+
+    async def slow_defer(**kwargs) -> None:
+        await asyncio.sleep(0.2)
+        await fast_defer(**kwargs)
+
+    interaction.response.defer = slow_defer
+    asyncio.run(answer(responder, interaction))
+
+    assert interaction.calls == ["defer:True:True", "followup:hi"]
+    # The estimate moved from 2.0 towards the handler time, without the 0.2s deferral.
+    handler_time = (responder.estimates["joke"].mean - 2.0) / LATENCY_GAIN + 2.0
+    assert handler_time < 0.1
+
+def test_mispredicted_commands_are_deferred_late() -> None:
+    """Test that the timer defers a predicted-fast command that ran too long."""
+    responder, registry = make_responder(direct_budget=0.05, defer_at=0.02)
+    interaction = make_interaction()
+
+    asyncio.run(answer(responder, interaction, delay=0.05))
+    assert interaction.calls == ["defer:True:True", "followup:hi"]
+    assert 'path="late"} 1' in registry.render()
+    assert responder.expected("joke") >= 0.05
+
+def test_latency_estimate_tracks_the_mean_and_deviation() -> None:
+    """Test that the estimate converges and stays pessimistic while it varies."""
+    estimate = LatencyEstimate(0.1)
+    for _ in range(50):
+        estimate.observe(0.01)
+    assert 0.01 <= estimate.expected < 0.02
+    estimate.observe(0.5)
+    assert estimate.expected > 0.3
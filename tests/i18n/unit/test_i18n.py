@@ -0,0 +1,86 @@
+"""Unit tests for the i18n catalog compiler, reader and translator."""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+import discord
+import pytest
+from src.infrastructure.i18n.catalog import (
+    CatalogCompiler,
+    CatalogError,
+    CatalogReader,
+    flatten_messages,
+)
+from src.interface.i18n.translator import Translator, key_name, message_key
+
+GREETING = message_key("test.greeting")
+FAREWELL = message_key("test.farewell")
+
+@pytest.fixture(name="source_dir")
+def fixture_source_dir(tmp_path: Path) -> Path:
+    """Two locales, the second one missing a message."""
+    source_dir = tmp_path / "locates"
+    source_dir.mkdir()
+    (source_dir / "en-US.toml").write_text(
+        '[test]\ngreeting = "Hello"\nfarewell = "Bye"\n', encoding="utf-8")
+    (source_dir / "pt-BR.toml").write_text('[test]\ngreeting = "Olá"\n', encoding="utf-8")
+    return source_dir
+
+def test_compile_and_read_round_trip(tmp_path: Path) -> None:
+    """Test that nested tables become sorted dotted keys readable from the mapping."""
+    messages = flatten_messages({"b": {"c": "ç", "a": "first"}, "a": "top"})
+    catalog_path = tmp_path / "x.kcat"
+    catalog_path.write_bytes(CatalogCompiler.build(messages))
+
+    reader = CatalogReader(catalog_path)
+    assert list(reader.items()) == [("a", "top"), ("b.a", "first"), ("b.c", "ç")]
+    assert reader.get("b.c") == "ç" and reader.get("missing") is None
+    reader.close()
+
+def test_invalid_sources_and_files_are_rejected(tmp_path: Path) -> None:
+    """Test non-string messages and files with the wrong magic."""
+    with pytest.raises(CatalogError):
+        flatten_messages({"count": 3})
+    broken_path = tmp_path / "broken.kcat"
+    broken_path.write_bytes(b"NOPE" + bytes(64))
+    with pytest.raises(CatalogError):
+        CatalogReader(broken_path)
+
+def test_translator_resolves_and_falls_back(tmp_path: Path, source_dir: Path) -> None:
+    """Test locale matching, default-locale fallback and key-name fallback."""
+    translator = Translator(tmp_path / "catalogs", source_dir)
+
+    portuguese = translator.resolve(discord.Locale.brazil_portuguese)
+    assert portuguese[GREETING] == "Olá"
+    assert portuguese[FAREWELL] == "Bye"
+    assert translator.resolve("pt-PT")[GREETING] == "Olá"
+    assert translator.resolve("ja", guild_locale="pt-BR") is portuguese
+    assert translator.resolve(None)[GREETING] == "Hello"
+
+    late_key = message_key("test.late")
+    assert translator.resolve("pt-BR")[late_key] == key_name(late_key) == "test.late"
+    translator.close()
+
+def test_interaction_locale_prefers_user_then_guild(tmp_path: Path, source_dir: Path) -> None:
+    """Test the user/guild order and the cached resolution."""
+    translator = Translator(tmp_path / "catalogs", source_dir)
+    interaction = SimpleNamespace(locale=discord.Locale.american_english,
+                                  guild_locale=discord.Locale.brazil_portuguese, guild_id=1)
+
+    assert translator.for_interaction(interaction)[GREETING] == "Hello"
+    assert translator.for_interaction(interaction, prefer_guild=True)[GREETING] == "Olá"
+    assert translator.for_interaction(interaction) is translator.for_interaction(interaction)
+    translator.close()
+
+def test_stale_catalogs_are_recompiled(tmp_path: Path, source_dir: Path) -> None:
+    """Test that a source newer than its catalog is compiled again on load."""
+    catalog_dir = tmp_path / "catalogs"
+    CatalogCompiler().compile(source_dir, catalog_dir)
+    source_path = source_dir / "pt-BR.toml"
+    source_path.write_text('[test]\ngreeting = "Oi"\n', encoding="utf-8")
+    catalog_mtime = (catalog_dir / "pt-BR.kcat").stat().st_mtime_ns
+    os.utime(source_path, ns=(catalog_mtime + 10**9, catalog_mtime + 10**9))
+
+    translator = Translator(catalog_dir, source_dir)
+    assert translator.resolve("pt-BR")[GREETING] == "Oi"
+    translator.close()
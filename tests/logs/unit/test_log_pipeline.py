@@ -0,0 +1,135 @@
+"""Unit tests for the logging pipeline, its debug sampler and its crash ring buffer."""
+
+import io
+import logging
+import threading
+from logging import LogRecord
+import pytest
+from src.infrastructure.config.config_model import LoggingConfiguration
+from src.infrastructure.logs.log_pipeline import (
+    MAX_BUFFERED_MESSAGE,
+    DebugSampler,
+    LogPipeline,
+    is_written,
+)
+
+LOGGER = logging.getLogger("tests.pipeline")
+
+@pytest.fixture(name="output")
+def fixture_output():
+    """Runs a pipeline at INFO over a string stream and yields the stream."""
+    stream = io.StringIO()
+    pipeline = LogPipeline(logging.INFO, LoggingConfiguration(ring_buffer_size=3), stream=stream,
+                           log_format="%(levelname)s %(message)s").install()
+    try:
+        yield stream
+    finally:
+        pipeline.stop()
+
+def lines(output: io.StringIO) -> list[str]:
+    """Stops the installed pipeline so the writer has flushed, then splits the output."""
+    LogPipeline.installed().stop()
+    return output.getvalue().splitlines()
+
+def test_records_are_written_by_the_writer_thread(output: io.StringIO) -> None:
+    """Test the output, and that messages are interpolated when they are logged."""
+    names = ["a"]
+    LOGGER.info("names: %s", names)
+    names.append("b")
+    LOGGER.debug("not written")
+
+    assert lines(output) == ["INFO names: ['a']"]
+
+def test_errors_come_with_the_buffered_debug_records(output: io.StringIO) -> None:
+    """Test that the latest records below the output level are written before an error."""
+    for index in range(5):
+        LOGGER.debug("step %s", index)
+    LOGGER.error("failed")
+    LOGGER.error("failed again")
+
+    assert lines(output) == ["INFO --- 3 earlier records kept by the crash buffer ---",
+                             "DEBUG step 2", "DEBUG step 3", "DEBUG step 4",
+                             "ERROR failed", "ERROR failed again"]
+
+def test_buffered_records_are_interpolated_and_cut(output: io.StringIO) -> None:
+    """Test that the buffer keeps messages, not their arguments, and caps their length."""
+    names = ["a"]
+    LOGGER.debug("names: %s", names)
+    names.append("b")
+    LOGGER.debug("payload %s", "x" * (MAX_BUFFERED_MESSAGE * 2))
+    LOGGER.error("failed")
+
+    written = lines(output)
+    assert written[1] == "DEBUG names: ['a']"
+    assert written[2].endswith(f"x... ({MAX_BUFFERED_MESSAGE + len('payload ')} more characters)")
+    assert len(written[2]) < MAX_BUFFERED_MESSAGE + 50
+
+def test_thread_crashes_are_logged_with_the_buffer(output: io.StringIO) -> None:
+    """Test the hook of exceptions escaping a thread."""
+    def crash() -> None:
+        LOGGER.debug("about to crash")
+        raise RuntimeError("boom")
+
+    thread = threading.Thread(target=crash, name="crasher")
+    thread.start()
+    thread.join()
+
+    written = lines(output)
+    assert written[1:3] == ["DEBUG about to crash",
+                            "CRITICAL Unhandled exception in thread crasher"]
+    assert "RuntimeError: boom" in written
+
+def test_reload_resizes_the_buffer_and_the_root_level(output: io.StringIO) -> None:
+    """Test that a ring buffer of 0 stops creating debug records at all."""
+    pipeline = LogPipeline.installed()
+    assert logging.getLogger().level == logging.DEBUG
+
+    pipeline.update("ring_buffer_size", 0)
+
+    assert logging.getLogger().level == logging.INFO
+    assert not is_written(LOGGER, logging.DEBUG) and is_written(LOGGER, logging.INFO)
+    assert lines(output) == []
+
+def test_default_configuration_keeps_the_root_at_the_output_level() -> None:
+    """Test that debug records are not created at all unless a buffer asks for them."""
+    pipeline = LogPipeline(logging.INFO, stream=io.StringIO()).install()
+    try:
+        assert logging.getLogger().level == logging.INFO
+        assert not pipeline.ring.maxlen
+    finally:
+        pipeline.stop()
+
+def make_record(name: str, level: int = logging.DEBUG, line: int = 1) -> LogRecord:
+    """A record from a given call site."""
+    return LogRecord(name, level, "module.py", line, "message", None, None)
+
+def test_sampler_keeps_one_record_in_n_per_call_site() -> None:
+    """Test the rates of a logger, of its children and of a rate of 0."""
+    sampler = DebugSampler({"discord": 0.25, "discord.http": 0.0})
+
+    kept = [sampler.keep(make_record("discord.state")) for _ in range(8)]
+    other_site = sampler.keep(make_record("discord.state", line=2))
+
+    assert kept == [True, False, False, False, True, False, False, False]
+    assert other_site
+    assert not sampler.keep(make_record("discord.http"))
+    assert sampler.keep(make_record("discord.http", logging.INFO))
+    assert sampler.keep(make_record("bot"))
+    with pytest.raises(ValueError):
+        sampler.update({"discord": 2.0})
+
+def test_full_queue_drops_and_reports() -> None:
+    """Test that a full queue drops records instead of blocking, then says so."""
+    pipeline = LogPipeline(logging.INFO, queue_size=2)
+    for index in range(3):
+        pipeline.handle(make_record("bot", logging.INFO, index))
+    assert pipeline.dropped == 1
+
+    while not pipeline.records.empty():
+        pipeline.records.get_nowait()
+    pipeline.handle(make_record("bot", logging.INFO))
+
+    notice = pipeline.records.get_nowait()
+    assert "1 log records were dropped" in notice.getMessage()
+    assert pipeline.records.get_nowait().getMessage() == "message"
+    assert pipeline.dropped == 0
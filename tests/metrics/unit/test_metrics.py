@@ -0,0 +1,93 @@
+"""Unit tests for the metrics registry, command instrumentation and endpoint."""
+
+import socket
+import asyncio
+from types import SimpleNamespace
+import aiohttp
+from src.infrastructure.metrics.command_metrics import CommandMetrics
+from src.infrastructure.metrics.metrics_server import MetricsServer
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.infrastructure.metrics.runtime_metrics import RuntimeMetrics
+
+def make_interaction(name: str = "joke") -> SimpleNamespace:
+    """Builds the parts of an interaction the metrics use."""
+    return SimpleNamespace(extras={}, command=SimpleNamespace(qualified_name=name))
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Test the Prometheus text output of a labeled histogram."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("command",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.labels('say "hi"').observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{command="say \\"hi\\"",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{command="say \\"hi\\"",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{command="say \\"hi\\"",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{command="say \\"hi\\""} 3' in lines
+
+def test_command_phases_and_errors_are_recorded() -> None:
+    """Test that explicit phases, the handler remainder and errors are recorded."""
+    registry = MetricsRegistry()
+    metrics = CommandMetrics(registry)
+    interaction = make_interaction()
+
+    async def invoke() -> None:
+        metrics.command_started(interaction)
+        async with metrics.phase(interaction, "defer"):
+            await asyncio.sleep(0)
+        metrics.command_completed(interaction, interaction.command)
+        metrics.command_failed(make_interaction("about_bot"),
+                               SimpleNamespace(original=ValueError("boom")))
+
+    asyncio.run(invoke())
+    output = registry.render()
+
+    for phase in ("defer", "handler", "total"):
+        assert f'kaonim_command_phase_seconds_count{{command="joke",phase="{phase}"}} 1' in output
+    assert 'kaonim_commands_total{command="joke"} 1' in output
+    assert 'kaonim_command_errors_total{command="about_bot",error="ValueError"} 1' in output
+
+def test_disabled_metrics_record_nothing() -> None:
+    """Test that disabled metrics share a no-op phase and leave the interaction alone."""
+    metrics = CommandMetrics()
+    interaction = make_interaction()
+
+    metrics.command_started(interaction)
+    assert metrics.phase(interaction, "defer") is metrics.phase(interaction, "followup")
+    assert not interaction.extras
+
+def test_gateway_events_follow_shard_sequences() -> None:
+    """Test that each scrape adds the sequence advance, including after a new session."""
+    websocket = SimpleNamespace(sequence=10)
+    bot = SimpleNamespace(shards={0: SimpleNamespace(_parent=SimpleNamespace(ws=websocket))})
+    registry = MetricsRegistry()
+    RuntimeMetrics(bot, registry)
+
+    registry.render()
+    websocket.sequence = 4
+    output = registry.render()
+
+    assert 'kaonim_gateway_events_total{shard="0"} 14' in output
+
+def test_server_serves_metrics() -> None:
+    """Test that the endpoint serves the registry over HTTP."""
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits.").labels().inc()
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    async def scrape() -> str:
+        server = MetricsServer(registry, port=port)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    return await response.text()
+        finally:
+            await server.close()
+
+    assert "hits_total 1" in asyncio.run(scrape())
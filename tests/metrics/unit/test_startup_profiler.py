@@ -0,0 +1,67 @@
+"""Unit tests for the start-up profiler and its import timer."""
+
+import sys
+import asyncio
+import importlib
+from pathlib import Path
+import pytest
+from src.infrastructure.metrics.startup_profiler import ImportTimer, StartupProfiler
+
+def test_concurrent_phases_overlap_on_the_timeline() -> None:
+    """Test that steps awaited together are recorded as overlapping phases."""
+    profiler = StartupProfiler()
+
+    async def start() -> None:
+        await asyncio.gather(profiler.measure("login", asyncio.sleep(0.02)),
+                             profiler.measure("extensions", asyncio.sleep(0.01)))
+        with profiler.phase("connect"):
+            await asyncio.sleep(0.001)
+        profiler.mark("ready")
+
+    asyncio.run(start())
+    phases = {phase.name: phase for phase in profiler.phases}
+
+    assert phases["extensions"].started < phases["login"].finished
+    assert phases["login"].seconds >= phases["extensions"].seconds
+    assert phases["connect"].started >= phases["login"].finished
+    assert phases["ready"].seconds == 0
+    assert profiler.finish() is None
+
+def test_import_timer_separates_own_and_cumulative_time(tmp_path: Path,
+                                                        monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the timings of a module that imports another one."""
+    (tmp_path / "profiled_outer.py").write_text("import time\nimport profiled_inner\n"
+                                                "time.sleep(0.01)\n", encoding="utf-8")
+    (tmp_path / "profiled_inner.py").write_text("import time\ntime.sleep(0.02)\n",
+                                                encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    timer = ImportTimer()
+    timer.install()
+    try:
+        module = importlib.import_module("profiled_outer")
+    finally:
+        timer.uninstall()
+        sys.modules.pop("profiled_outer", None)
+        sys.modules.pop("profiled_inner", None)
+
+    timings = {timing.module: timing for timing in timer.timings()}
+    outer, inner = timings["profiled_outer"], timings["profiled_inner"]
+
+    assert module.profiled_inner.__name__ == "profiled_inner"
+    assert inner.own_seconds >= 0.02 and outer.own_seconds >= 0.01
+    assert outer.cumulative_seconds >= outer.own_seconds + inner.own_seconds
+    assert outer.own_seconds < 0.02
+    assert timer not in sys.meta_path
+
+def test_report_is_returned_once() -> None:
+    """Test the report of an enabled profiler and that finishing removes the hook."""
+    profiler = StartupProfiler(enabled=True)
+    with profiler.phase("config"):
+        pass
+    profiler.since("imports")
+
+    report = profiler.finish()
+
+    assert report is not None and "config" in report and "Imports:" in report
+    assert profiler.imports not in sys.meta_path
+    assert profiler.finish() is None
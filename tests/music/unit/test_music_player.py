@@ -0,0 +1,145 @@
+"""Unit tests for the music player pipeline against local files and a fake sink."""
+
+# pylint: disable=no-member
+
+import wave
+import asyncio
+import threading
+from array import array
+from pathlib import Path
+from src.infrastructure.metrics.registry import MetricsRegistry
+from src.infrastructure.music.audio import FRAME_SAMPLES, FRAME_SIZE, WavDecoder
+from src.infrastructure.music.guild_player import Track
+from src.infrastructure.music.music_service import MusicService
+from src.infrastructure.music.voice_sink import RecordingVoiceSink
+from src.infrastructure.music.worker_pool import AudioWorkerPool
+
+def write_wav(path: Path, frames: int, value: int = 1000, extra_samples: int = 0) -> Path:
+    """Writes a 48 kHz 16-bit mono WAV of ``frames`` 20 ms frames of a constant sample."""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(48000)
+        wav_file.writeframes(array("h", [value] * (FRAME_SAMPLES * frames + extra_samples))
+                             .tobytes())
+    return path
+
+async def settle(service: MusicService, ticks: int) -> None:
+    """Runs clock ticks without real-time waits, letting worker jobs land in between."""
+    for _ in range(ticks):
+        await asyncio.sleep(0.001)
+        service.tick()
+
+def test_mono_wav_is_decoded_to_stereo_frames(tmp_path: Path) -> None:
+    """Test that a mono file becomes full stereo frames, the last one padded."""
+    decoder = WavDecoder(write_wav(tmp_path / "mono.wav", frames=1, value=7, extra_samples=10))
+    frames = decoder.read_frames(5)
+    decoder.close()
+
+    assert [len(frame) for frame in frames] == [FRAME_SIZE, FRAME_SIZE]
+    assert array("h", frames[0])[:4].tolist() == [7, 7, 7, 7]
+    assert array("h", frames[1])[19:22].tolist() == [7, 0, 0]
+
+def test_tracks_play_back_to_back_on_the_fake_sink(tmp_path: Path) -> None:
+    """Test that queued tracks are rendered off the loop and sent in order."""
+    first = write_wav(tmp_path / "first.wav", frames=30, value=1)
+    second = write_wav(tmp_path / "second.wav", frames=20, value=2)
+    render_threads = set()
+
+    async def play() -> RecordingVoiceSink:
+        service = MusicService(AudioWorkerPool(max_workers=2), low_watermark=5, batch_frames=8,
+                               buffer_frames=16, prebuffer_frames=4)
+        sink = RecordingVoiceSink()
+        player = service.connect(1, sink)
+        original_submit = service.pool.submit
+
+        def tracked(func, *args):
+            render_threads.add(threading.current_thread().name)
+            return func(*args)
+
+        service.pool.submit = lambda func, *args: original_submit(tracked, func, *args)
+        assert service.enqueue(1, Track(first, "first")) == 0
+        assert service.enqueue(1, Track(second, "second")) == 1
+        await settle(service, 200)
+        assert not player.active
+        await service.aclose()
+        return sink
+
+    sink = asyncio.run(play())
+
+    assert [array("h", frame)[0] for frame in sink.frames] == [1] * 30 + [2] * 20
+    assert threading.main_thread().name not in render_threads
+
+def test_skip_moves_to_the_next_track(tmp_path: Path) -> None:
+    """Test that skipping drops the buffered rest of the playing track."""
+    first = write_wav(tmp_path / "first.wav", frames=200, value=1)
+    second = write_wav(tmp_path / "second.wav", frames=5, value=2)
+
+    async def play() -> RecordingVoiceSink:
+        service = MusicService(AudioWorkerPool(max_workers=1), prebuffer_frames=1)
+        sink = RecordingVoiceSink()
+        player = service.connect(1, sink)
+        service.enqueue(1, Track(first, "first"))
+        service.enqueue(1, Track(second, "second"))
+        await settle(service, 10)
+        assert player.skip().title == "first"
+        await settle(service, 30)
+        await service.aclose()
+        return sink
+
+    values = [array("h", frame)[0] for frame in asyncio.run(play()).frames]
+
+    assert values.count(2) == 5
+    assert values[-5:] == [2] * 5
+    assert 1 <= values.count(1) < 200
+
+def test_underruns_are_counted(tmp_path: Path) -> None:
+    """Test that a starved ring counts underruns instead of blocking the loop."""
+    path = write_wav(tmp_path / "slow.wav", frames=10)
+    release = threading.Event()
+    registry = MetricsRegistry()
+
+    async def play() -> MusicService:
+        pool = AudioWorkerPool(max_workers=1)
+        original_submit = pool.submit
+        jobs = []
+
+        def gated(func, *args):
+            jobs.append(func)
+            if len(jobs) > 1:
+                release.wait(2)
+            return func(*args)
+
+        pool.submit = lambda func, *args: original_submit(gated, func, *args)
+        service = MusicService(pool, prebuffer_frames=1, batch_frames=2, registry=registry)
+        service.connect(1, RecordingVoiceSink())
+        service.enqueue(1, Track(path, "slow"))
+        await settle(service, 5)
+        release.set()
+        await settle(service, 40)
+        await service.aclose()
+        return service
+
+    service = asyncio.run(play())
+
+    assert service.underruns > 0
+    assert f"kaonim_music_buffer_underruns_total {service.underruns}" in registry.render()
+    assert "kaonim_music_frames_sent_total 10" in registry.render()
+
+def test_clock_sends_frames_in_real_time(tmp_path: Path) -> None:
+    """Test that the shared clock plays a track and stops once the queue is done."""
+    path = write_wav(tmp_path / "short.wav", frames=10)
+
+    async def play() -> RecordingVoiceSink:
+        service = MusicService(prebuffer_frames=2)
+        sink = RecordingVoiceSink()
+        service.connect(1, sink)
+        service.enqueue(1, Track(path, "short"))
+        await asyncio.wait_for(service._task, timeout=5)  # pylint: disable=protected-access
+        await service.aclose()
+        return sink
+
+    sink = asyncio.run(play())
+
+    assert len(sink.frames) == 10
+    assert sink.playing is False
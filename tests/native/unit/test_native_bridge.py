@@ -0,0 +1,131 @@
+"""Unit tests for the native bridge, the Python fallbacks and the parity harness."""
+
+import ctypes
+from pathlib import Path
+import pytest
+from src.infrastructure.native.bridge import (
+    NativeBridge,
+    NativeFunction,
+    NativeLibrary,
+    NativeLibraryError,
+    load_or_fallback,
+)
+from src.infrastructure.native.harness import (
+    compare_pixels,
+    default_cases,
+    format_result,
+    run_case,
+)
+from src.infrastructure.native.libraries import LIBRARIES
+from src.infrastructure.services.image_service import PythonRasterizer, RenderParams
+from src.infrastructure.services.joke_corpus import JokeCorpusCompiler
+from src.infrastructure.services.joke_engine import PythonJokeEngine
+from src.infrastructure.services.random_joke_service import RandomJokeService
+
+SPEC = NativeLibrary("fake", abi_version=2, functions=(
+    NativeFunction("add", (ctypes.c_int, ctypes.c_int), ctypes.c_int),
+))
+
+# pylint: disable=too-few-public-methods
+class FakeFunction():
+    """Callable with settable ctypes attributes."""
+
+    def __init__(self, result: int = 0) -> None:
+        self.result = result
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args: int) -> int:
+        return self.result
+
+class FakeLibrary():
+    """Library exporting an ABI version and the given symbols."""
+
+    def __init__(self, abi_version: int, *names: str) -> None:
+        self.kaonimAbiVersion = FakeFunction(abi_version)  # pylint: disable=invalid-name
+        for name in names:
+            setattr(self, name, FakeFunction(3))
+
+def make_bridge(tmp_path: Path, library: FakeLibrary, opened: list[str]) -> NativeBridge:
+    """A bridge over ``tmp_path`` whose loader returns ``library``."""
+    (tmp_path / SPEC.filename).write_bytes(b"")
+
+    def loader(path: str) -> FakeLibrary:
+        opened.append(path)
+        return library
+
+    return NativeBridge([tmp_path / "missing", tmp_path], loader=loader)
+
+def test_libraries_are_loaded_once_with_their_signatures(tmp_path: Path) -> None:
+    """Test lookup order, the applied signatures and the per-process cache."""
+    opened: list[str] = []
+    bridge = make_bridge(tmp_path, FakeLibrary(2, "add"), opened)
+
+    library = bridge.load(SPEC)
+    assert bridge.load(SPEC) is library
+    assert opened == [str((tmp_path / SPEC.filename).absolute())]
+    assert library.add.argtypes == [ctypes.c_int, ctypes.c_int]
+    assert library.add.restype is ctypes.c_int
+    assert bridge.status() == {"fake": "loaded"}
+
+@pytest.mark.parametrize("library, message", [
+    (FakeLibrary(1, "add"), "ABI version 1, expected 2"),
+    (FakeLibrary(2), "does not export add"),
+])
+def test_unusable_libraries_fall_back(tmp_path: Path, library: FakeLibrary,
+                                      message: str) -> None:
+    """Test that a stale or incomplete library is refused, once, with a reason."""
+    opened: list[str] = []
+    bridge = make_bridge(tmp_path, library, opened)
+
+    with pytest.raises(NativeLibraryError, match=message):
+        bridge.load(SPEC)
+    assert load_or_fallback(SPEC, lambda _: "native", lambda: "python",
+                            bridge=bridge) == "python"
+    assert len(opened) == 1
+    assert message in bridge.status()["fake"]
+
+def test_missing_libraries_name_the_build_script(tmp_path: Path) -> None:
+    """Test the error of a library that was never built."""
+    with pytest.raises(NativeLibraryError, match="build_nim.sh"):
+        NativeBridge([tmp_path]).load(SPEC)
+    assert all(spec.filename.startswith("lib") for spec in LIBRARIES)
+
+def test_python_fallbacks_serve_the_bot(tmp_path: Path) -> None:
+    """Test the Python joke engine bags and a deterministic Python render."""
+    corpus_path = tmp_path / "jokes.kjc"
+    corpus_path.write_bytes(JokeCorpusCompiler.build([f"joke {index}" for index in range(5)]))
+    service = RandomJokeService(corpus_path, engine=PythonJokeEngine())
+    try:
+        cycle = {service.get_random_joke(1, 2) for _ in range(5)}
+        assert cycle == {f"joke {index}" for index in range(5)}
+        assert len(service.fetch_batch(3, 4, 5)) == 5
+    finally:
+        service.close()
+
+    params = RenderParams("noise", 20, 16, 5)
+    first, second = bytearray(params.scanline_bytes), bytearray(params.scanline_bytes)
+    PythonRasterizer().render_into(first, params)
+    PythonRasterizer().render_into(second, params)
+    assert first == second and len(set(first)) > 2
+    assert all(first[row * (20 * 3 + 1)] == 0 for row in range(16))
+
+def test_harness_times_python_without_the_libraries(tmp_path: Path) -> None:
+    """Test that every case runs its Python side when nothing is built."""
+    bridge = NativeBridge([tmp_path / "empty"])
+    results = [run_case(case, bridge, repeat=1) for case in default_cases(tmp_path)]
+
+    assert {result.name for result in results} >= {"termo.score_many", "jokes.fill_batch",
+                                                   "image.mandelbrot"}
+    assert all(result.unavailable and result.python_seconds > 0 for result in results)
+    assert "native unavailable" in format_result(results[0])
+    assert compare_pixels(b"\x00\x10", b"\x01\x10") is None
+    assert compare_pixels(b"\x00\x10", b"\x09\x10") is not None
+
+def test_native_libraries_match_python(tmp_path: Path) -> None:
+    """Test parity of every library that is built; skipped when none is."""
+    results = [run_case(case, repeat=1) for case in default_cases(tmp_path)]
+    built = [result for result in results if result.unavailable is None]
+    if not built:
+        pytest.skip("native libraries not built (scripts/build_nim.sh)")
+    assert [result.name for result in built if result.mismatch is not None] == []
@@ -0,0 +1,63 @@
+"""Unit tests for the incremental bot stats service."""
+
+from src.infrastructure.services.bot_stats_service import BotStatsService
+
+def test_unique_users_are_counted_once_across_guilds() -> None:
+    """Test that a user shared by two guilds counts as one unique user."""
+    stats = BotStatsService()
+    stats.sync_guild(1, shard_id=0, member_ids=[10, 11, 12])
+    stats.sync_guild(2, shard_id=1, member_ids=[12, 13])
+
+    snapshot = stats.snapshot()
+
+    assert snapshot.guilds == 2
+    assert snapshot.unique_users == 4
+    assert snapshot.shards[0].guilds == 1
+    assert snapshot.shards[0].members == 3
+    assert snapshot.shards[1].members == 2
+
+def test_member_join_and_leave_update_counts() -> None:
+    """Test that joins and leaves are applied incrementally."""
+    stats = BotStatsService()
+    stats.sync_guild(1, shard_id=0, member_ids=[10])
+    stats.sync_guild(2, shard_id=0, member_ids=[10])
+
+    stats.add_member(1, 20)
+    stats.add_member(1, 20)
+    assert stats.snapshot().unique_users == 2
+    assert stats.snapshot().shards[0].members == 3
+
+    stats.remove_member(1, 10)
+    assert stats.snapshot().unique_users == 2
+
+    stats.remove_member(2, 10)
+    stats.remove_member(2, 999)
+    assert stats.snapshot().unique_users == 1
+    assert stats.snapshot().shards[0].members == 1
+
+def test_resync_and_guild_removal_release_members() -> None:
+    """Test that resyncing replaces members and removing a guild releases them."""
+    stats = BotStatsService()
+    stats.sync_guild(1, shard_id=3, member_ids=[10, 11])
+    stats.sync_guild(1, shard_id=3, member_ids=[11, 12, 13])
+
+    assert stats.snapshot().unique_users == 3
+    assert stats.tracked_member_count(1) == 3
+
+    stats.remove_guild(1)
+    snapshot = stats.snapshot()
+
+    assert snapshot.guilds == 0
+    assert snapshot.unique_users == 0
+    assert 3 not in snapshot.shards
+
+def test_snapshot_is_cached_until_a_change() -> None:
+    """Test that reading the snapshot twice without changes reuses it."""
+    stats = BotStatsService()
+    stats.sync_guild(1, shard_id=0, member_ids=[10])
+
+    first = stats.snapshot()
+    assert stats.snapshot() is first
+
+    stats.add_member(1, 11)
+    assert stats.snapshot() is not first
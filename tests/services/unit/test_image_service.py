@@ -0,0 +1,132 @@
+"""Unit tests for the image service, its PNG encoder and the render cache."""
+
+import asyncio
+import struct
+import threading
+import zlib
+from typing import Optional
+import pytest
+from src.core.constants import DEFAULT_NATIVE_LIB_PATH
+from src.infrastructure.native.bridge import native_bridge
+from src.infrastructure.native.libraries import IMAGE_ENGINE
+from src.infrastructure.services.image_service import (
+    MAX_PYTHON_SIZE,
+    ImageService,
+    NativeRasterizer,
+    PythonRasterizer,
+    RenderParams,
+    encode_png,
+)
+from src.infrastructure.services.render_cache import RenderCache
+
+NATIVE_LIBRARY = DEFAULT_NATIVE_LIB_PATH / IMAGE_ENGINE.filename
+
+# pylint: disable=too-few-public-methods
+class StripeRasterizer():
+    """Fills each row with its index and counts the renders."""
+
+    def __init__(self, gate: Optional[threading.Event] = None) -> None:
+        self.renders = 0
+        self.gate = gate
+
+    def render_into(self, buffer: bytearray, params: RenderParams) -> None:
+        """Writes the scanlines in place."""
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.renders += 1
+        stride = params.width * 3 + 1
+        for row in range(params.height):
+            buffer[row * stride] = 0
+            buffer[row * stride + 1:(row + 1) * stride] = bytes([row % 256]) * (stride - 1)
+
+def read_png(png: bytes) -> tuple[int, int, bytes]:
+    """Checks the chunk CRCs and returns the size and the raw scanlines."""
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    offset, chunks = 8, {}
+    while offset < len(png):
+        (length,) = struct.unpack(">I", png[offset:offset + 4])
+        kind, data = png[offset + 4:offset + 8], png[offset + 8:offset + 8 + length]
+        (crc,) = struct.unpack(">I", png[offset + 8 + length:offset + 12 + length])
+        assert crc == zlib.crc32(kind + data)
+        chunks[kind] = data
+        offset += 12 + length
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    return width, height, zlib.decompress(chunks[b"IDAT"])
+
+def test_render_cache_evicts_least_recently_used_by_size() -> None:
+    """Test that eviction follows recency and the byte budget, not the entry count."""
+    cache = RenderCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.put("c", b"1234")
+    cache.put("huge", b"x" * 11)
+
+    assert "b" not in cache and "huge" not in cache
+    assert cache.get("a") and cache.get("c")
+    stats = cache.stats()
+    assert (stats.entries, stats.size_bytes, stats.evictions) == (2, 8, 1)
+
+def test_encode_png_wraps_scanlines() -> None:
+    """Test that the encoder produces a valid PNG holding the scanlines unchanged."""
+    params = RenderParams("plasma", 20, 16, 1)
+    scanlines = bytearray(params.scanline_bytes)
+    StripeRasterizer().render_into(scanlines, params)
+
+    width, height, raw = read_png(encode_png(scanlines, 20, 16))
+
+    assert (width, height) == (20, 16)
+    assert raw == bytes(scanlines)
+
+def test_render_params_are_validated() -> None:
+    """Test that unknown patterns and out-of-range sizes are rejected."""
+    with pytest.raises(ValueError):
+        RenderParams("spiral", 64, 64, 0)
+    with pytest.raises(ValueError):
+        RenderParams("plasma", 4096, 64, 0)
+
+def test_python_renders_are_scaled_down() -> None:
+    """Test that without the native library the longest side is capped, keeping the ratio."""
+    service = ImageService(PythonRasterizer())
+    small = RenderParams("plasma", 64, 32, 1)
+
+    assert service.fit(RenderParams("plasma", 1024, 512, 1)) == RenderParams(
+        "plasma", MAX_PYTHON_SIZE, MAX_PYTHON_SIZE // 2, 1)
+    assert service.fit(RenderParams("plasma", 1024, 16, 1)).height == 16
+    assert service.fit(small) is small
+    assert ImageService(StripeRasterizer()).fit(RenderParams("plasma", 1024, 512, 1)).width == 1024
+
+def test_repeated_and_concurrent_renders_share_one_render() -> None:
+    """Test that identical requests are served by one render, then from the cache."""
+    gate = threading.Event()
+    rasterizer = StripeRasterizer(gate)
+    service = ImageService(rasterizer)
+    params = RenderParams("noise", 32, 32, 7)
+
+    async def scenario() -> list[bytes]:
+        pending = [asyncio.create_task(service.render(params)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        results = await asyncio.gather(*pending)
+        return results + [await service.render(params)]
+
+    results = asyncio.run(scenario())
+
+    assert rasterizer.renders == 1
+    assert len(set(results)) == 1
+    assert service.cache_stats().hits == 1
+
+@pytest.mark.skipif(not NATIVE_LIBRARY.exists(), reason="native library not built")
+def test_native_rasterizer_renders_in_place() -> None:
+    """Test that the Nim rasterizer fills valid, deterministic scanlines."""
+    rasterizer = NativeRasterizer(native_bridge().load(IMAGE_ENGINE))
+    params = RenderParams("mandelbrot", 48, 32, 3)
+    first, second = bytearray(params.scanline_bytes), bytearray(params.scanline_bytes)
+
+    rasterizer.render_into(first, params)
+    rasterizer.render_into(second, params)
+
+    assert first == second
+    assert all(first[row * (48 * 3 + 1)] == 0 for row in range(32))
+    assert len(set(first)) > 2
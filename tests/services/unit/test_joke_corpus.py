@@ -0,0 +1,52 @@
+"""Unit tests for the joke corpus compiler, reader and shuffle bag."""
+
+import random
+import pytest
+from src.infrastructure.services.joke_corpus import (
+    JokeCorpusCompiler,
+    JokeCorpusError,
+    JokeCorpusReader,
+    ShuffleBag,
+    parse_source,
+)
+
+def test_parse_source_splits_on_percent_lines() -> None:
+    """Test that jokes are split on '%' lines and empty entries are dropped."""
+    source = "first joke\n%\n\n%\nsecond\nline two\n%\n"
+
+    assert parse_source(source) == ["first joke", "second\nline two"]
+
+def test_compile_and_read_round_trip(tmp_path) -> None:
+    """Test that a compiled corpus can be read back by index."""
+    source_path = tmp_path / "jokes.txt"
+    corpus_path = tmp_path / "jokes.kjc"
+    source_path.write_text("olá mundo\n%\nsecond joke\n%\nthird", encoding="utf-8")
+
+    count = JokeCorpusCompiler().compile(source_path, corpus_path)
+    reader = JokeCorpusReader(corpus_path)
+
+    assert count == 3
+    assert len(reader) == 3
+    assert [reader.get(index) for index in range(3)] == ["olá mundo", "second joke", "third"]
+    with pytest.raises(IndexError):
+        reader.get(3)
+    reader.close()
+
+def test_reader_rejects_invalid_file(tmp_path) -> None:
+    """Test that a file with the wrong magic is rejected."""
+    corpus_path = tmp_path / "broken.kjc"
+    corpus_path.write_bytes(b"NOPE" + bytes(64))
+
+    with pytest.raises(JokeCorpusError):
+        JokeCorpusReader(corpus_path)
+
+def test_shuffle_bag_does_not_repeat_within_a_cycle() -> None:
+    """Test that every index is drawn exactly once before the bag refills."""
+    rng = random.Random(42)
+    for count in (1, 2, 3, 7, 64, 1000):
+        bag = ShuffleBag(count, rng)
+        first_cycle = [bag.next(rng) for _ in range(count)]
+        second_cycle = [bag.next(rng) for _ in range(count)]
+
+        assert sorted(first_cycle) == list(range(count))
+        assert sorted(second_cycle) == list(range(count))
@@ -0,0 +1,111 @@
+"""Unit tests for the joke search index and the service queries it backs."""
+
+import random
+import asyncio
+import collections
+from pathlib import Path
+import pytest
+from src.infrastructure.services.joke_corpus import (
+    JokeCorpusCompiler,
+    JokeCorpusError,
+    JokeCorpusReader,
+    parse_entries,
+)
+from src.infrastructure.services.joke_engine import PythonJokeEngine
+from src.infrastructure.services.joke_index import JokeIndex, tokenize
+from src.infrastructure.services.random_joke_service import RandomJokeService
+
+SOURCE = """% programming
+Why do programmers prefer dark mode? Because light attracts bugs.
+%
+Why was the function sad after the party? It didn't get called.
+%
+A programmer's favourite snack? Microchips.
+% Databases
+A SQL query walks into a bar and asks two tables: can I join you?
+%
+
+%
+Why did the database administrator leave? Too many relationships.
+"""
+
+@pytest.fixture(name="corpus_path")
+def fixture_corpus_path(tmp_path: Path) -> Path:
+    """The sample source compiled into a corpus."""
+    source_path = tmp_path / "jokes.txt"
+    source_path.write_text(SOURCE, encoding="utf-8")
+    JokeCorpusCompiler().compile(source_path, tmp_path / "jokes.kjc")
+    return tmp_path / "jokes.kjc"
+
+@pytest.fixture(name="index")
+def fixture_index(corpus_path: Path):
+    """The index of the sample corpus."""
+    reader = JokeCorpusReader(corpus_path)
+    yield reader.index
+    reader.close()
+
+def test_separators_name_the_categories() -> None:
+    """Test that a named separator applies to the jokes after it, casefolded."""
+    entries = parse_entries("untagged\n% Puns\nfirst\n%\nsecond\n%not-a-category\n")
+
+    assert entries == [("", "untagged"), ("puns", "first"),
+                       ("puns", "second\n%not-a-category")]
+    assert tokenize("Don't C# me, SQL!") == ["don", "me", "sql"]
+
+def test_categories_and_keywords_are_intersected(index: JokeIndex) -> None:
+    """Test exact words, partial words, short prefixes and categories together."""
+    assert index.categories() == ["databases", "programming"]
+    assert index.find_all("programming") == [0, 1, 2]
+    assert index.find_all(keywords="why") == [0, 1, 4]
+    assert index.find_all(keywords="program") == [0, 2]
+    assert index.find_all(keywords="relation") == [4]
+    assert index.find_all(keywords="ta") == [3]
+    assert index.find_all("Databases", "why") == [4]
+    assert index.find_all("programming", "why called") == [1]
+    assert index.find_all("databases", "bugs") == []
+    assert index.find_all("unknown") == [] and index.find_all(keywords="zzz") == []
+    assert index.search("programming", "why called") == 1
+    assert index.search("unknown") == -1
+
+def test_search_picks_every_match_uniformly(index: JokeIndex) -> None:
+    """Test the draws of a keyword matching several words of the same joke."""
+    rng = random.Random(7)
+    # "pr" matches "prefer" and "programmers" in joke 0, only "programmer" in joke 2.
+    counts = collections.Counter(index.search(keywords="pr", rng=rng) for _ in range(3000))
+
+    assert set(counts) == {0, 2}
+    assert all(1350 < count < 1650 for count in counts.values())
+
+def test_service_searches_the_mapped_corpus(corpus_path: Path) -> None:
+    """Test the service queries, and the fallback to a random joke without filters."""
+    service = RandomJokeService(corpus_path, engine=PythonJokeEngine())
+
+    async def scenario() -> None:
+        assert (await service.search_joke("databases", "join")).startswith("A SQL query")
+        assert (await service.search_joke(keywords="microchip")).endswith("Microchips.")
+        assert await service.search_joke("programming", "sql") == ""
+        # Unfiltered, the joke comes from the guild's bag through the prefetch buffer.
+        assert await service.search_joke(keywords="a", guild_id=1, channel_id=2) != ""
+        assert service.prefetch_stats().misses + service.prefetch_stats().hits == 1
+
+    try:
+        assert service.categories() == ["databases", "programming"]
+        asyncio.run(scenario())
+    finally:
+        service.close()
+    assert service.search_reader is None
+
+def test_version_1_corpora_open_without_an_index(tmp_path: Path) -> None:
+    """Test that a corpus compiled before the index still reads, and a cut index does not."""
+    image = bytearray(JokeCorpusCompiler.build(["only joke"]))
+    image[4] = 1
+    old_path = tmp_path / "old.kjc"
+    old_path.write_bytes(bytes(image))
+    reader = JokeCorpusReader(old_path)
+    assert reader.get(0) == "only joke" and reader.index is None
+    reader.close()
+
+    cut_path = tmp_path / "cut.kjc"
+    cut_path.write_bytes(JokeCorpusCompiler.build(["only joke"])[:-8])
+    with pytest.raises(JokeCorpusError):
+        JokeCorpusReader(cut_path)
@@ -0,0 +1,67 @@
+"""Unit tests for the joke prefetch buffer."""
+
+import time
+import asyncio
+from src.infrastructure.services.joke_prefetcher import JokePrefetcher
+
+# pylint: disable=too-few-public-methods
+class FakeBatchFetcher():
+    """Batch fetcher returning numbered jokes and recording its calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int, int]] = []
+        self.next_joke = 0
+
+    def __call__(self, guild_id: int, channel_id: int, count: int) -> list[str]:
+        self.calls.append((guild_id, channel_id, count))
+        jokes = [f"joke {self.next_joke + offset}" for offset in range(count)]
+        self.next_joke += count
+        return jokes
+
+def wait_until(condition, timeout: float = 2.0) -> None:
+    """Polls a condition set by the refill thread."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+def test_get_is_served_from_prefilled_buffer() -> None:
+    """Test that a prefilled ring answers without another fetch on the loop."""
+    fetcher = FakeBatchFetcher()
+    prefetcher = JokePrefetcher(fetcher, capacity=4, low_watermark=1)
+    prefetcher.start(prefill=((1, 2),))
+    wait_until(lambda: prefetcher.stats().buffered_jokes == 4)
+
+    jokes = asyncio.run(_get_many(prefetcher, 2))
+    prefetcher.close()
+
+    assert jokes == ["joke 0", "joke 1"]
+    assert fetcher.calls[0] == (1, 2, 4)
+    assert prefetcher.stats().hits == 2
+    assert prefetcher.stats().misses == 0
+
+def test_cold_get_fetches_off_loop_and_schedules_refill() -> None:
+    """Test that an empty ring fetches a batch and triggers a background refill."""
+    fetcher = FakeBatchFetcher()
+    prefetcher = JokePrefetcher(fetcher, capacity=8, low_watermark=2)
+    prefetcher.start(prefill=())
+
+    joke = asyncio.run(prefetcher.get(5, 6))
+    wait_until(lambda: prefetcher.stats().refills >= 2)
+    stats = prefetcher.stats()
+    prefetcher.close()
+
+    assert joke == "joke 0"
+    assert stats.misses == 1
+    assert (5, 6, 3) in fetcher.calls
+
+def test_empty_corpus_returns_empty_string() -> None:
+    """Test that an empty batch results in an empty joke."""
+    prefetcher = JokePrefetcher(lambda guild_id, channel_id, count: [], capacity=4)
+
+    joke = asyncio.run(prefetcher.get())
+    prefetcher.close()
+
+    assert joke == ""
+
+async def _get_many(prefetcher: JokePrefetcher, count: int) -> list[str]:
+    return [await prefetcher.get(1, 2) for _ in range(count)]
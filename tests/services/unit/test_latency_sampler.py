@@ -0,0 +1,54 @@
+"""Unit tests for the background latency sampler."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from src.infrastructure.services.latency_sampler import LatencySampler, RollingHistogram
+
+def test_rolling_histogram_percentiles() -> None:
+    """Test percentiles over a full window."""
+    histogram = RollingHistogram(size=100)
+    for value in range(1, 101):
+        histogram.add(value / 1000)
+
+    summary = histogram.summary()
+
+    assert summary.count == 100
+    assert summary.last == 0.1
+    assert summary.p50 == 0.05
+    assert summary.p95 == 0.095
+    assert summary.p99 == 0.099
+
+def test_rolling_histogram_drops_oldest_samples() -> None:
+    """Test that the window only keeps the most recent samples."""
+    histogram = RollingHistogram(size=3)
+    for value in (10.0, 20.0, 30.0, 1.0, 2.0, 3.0):
+        histogram.add(value)
+
+    assert histogram.summary().p99 == 3.0
+
+def test_sample_gateway_tracks_each_shard_once_per_heartbeat() -> None:
+    """Test that repeated heartbeat values are not sampled twice."""
+    bot = MagicMock()
+    bot.latencies = [(0, 0.040), (1, float("inf"))]
+    sampler = LatencySampler(bot)
+
+    sampler.sample_gateway()
+    sampler.sample_gateway()
+    bot.latencies = [(0, 0.060), (1, 0.080)]
+    sampler.sample_gateway()
+    snapshot = sampler.snapshot()
+
+    assert snapshot.gateway[0].count == 2
+    assert snapshot.gateway[0].last == 0.060
+    assert snapshot.gateway[1].count == 1
+
+def test_sample_rest_records_round_trip() -> None:
+    """Test that a REST probe is recorded in the REST histogram."""
+    bot = MagicMock()
+    bot.http.request = AsyncMock(return_value={"url": "wss://gateway"})
+    sampler = LatencySampler(bot)
+
+    asyncio.run(sampler.sample_rest())
+
+    assert sampler.snapshot().rest.count == 1
+    bot.http.request.assert_awaited_once()
@@ -0,0 +1,92 @@
+"""Unit tests for the local Discord simulator, driven by a real sharded bot."""
+
+import asyncio
+import logging
+import contextlib
+from pathlib import Path
+import discord
+import pytest
+from discord import app_commands, http
+from discord.ext import commands
+from discord.gateway import DiscordWebSocket
+from src.infrastructure.discord.bot_factory import BotFactory
+from src.infrastructure.simulator.discord_simulator import (
+    DiscordSimulator,
+    LagHistogram,
+    LatencyStats,
+    LoadProfile,
+    SimulationReport,
+)
+from src.infrastructure.simulator.endpoints import use_simulator
+
+class LoadCog(commands.Cog):
+    """Answers ``joke`` directly and ``about_bot`` after deferring."""
+
+    @app_commands.command(name="joke", description="answers directly")
+    async def joke(self, interaction: discord.Interaction) -> None:
+        """Sends the answer as the interaction response."""
+        await interaction.response.send_message("a joke")
+
+    @app_commands.command(name="about_bot", description="answers after a deferral")
+    async def about_bot(self, interaction: discord.Interaction) -> None:
+        """Defers, then sends the answer as a followup."""
+        await interaction.response.defer(thinking=True)
+        await asyncio.sleep(0.01)
+        await interaction.followup.send("about")
+
+def test_bot_answers_the_replayed_interactions(tmp_path: Path,
+                                              monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a replay against a two-shard bot, end to end over HTTP and websockets."""
+    monkeypatch.setattr(http.Route, "BASE", http.Route.BASE)
+    monkeypatch.setattr(DiscordWebSocket, "DEFAULT_GATEWAY", DiscordWebSocket.DEFAULT_GATEWAY)
+    profile = LoadProfile(shards=2, rate=200.0, duration=0.5, guilds=20, users=100,
+                          max_concurrency=2, warmup=0.0, timeout=4.0)
+    logger = logging.getLogger("tests.simulator")
+
+    async def scenario() -> tuple[SimulationReport, int, list[int]]:
+        async with DiscordSimulator(profile, port=0, logger=logger) as simulator:
+            use_simulator(simulator.base_url)
+            bot = BotFactory().create_bot(token="token", commands_prefix="!",
+                                          intents=discord.Intents.default(), logger=logger)
+            bot.command_sync.state_path = tmp_path / "command_sync.json"
+            await bot.add_cog(LoadCog())
+            serving = asyncio.create_task(bot.serve())
+            try:
+                report = await simulator.replay()
+            finally:
+                await bot.close()
+                with contextlib.suppress(Exception):
+                    await serving
+            return report, bot.identify_concurrency, sorted(bot.shards)
+
+    report, identify_concurrency, shards = asyncio.run(scenario())
+
+    assert shards == [0, 1] and identify_concurrency == 2
+    assert report.sent == 100 and report.completed == 100 and report.lost == 0
+    assert set(report.commands) == {"joke", "about_bot"}
+    assert report.deferred == report.commands["about_bot"].count
+    assert 0 < report.latency.p50 <= report.latency.p99 <= report.latency.max
+    assert report.commands["about_bot"].p50 >= 0.01
+    assert report.unexpected == {}
+    assert "lost 0" in report.format()
+
+def test_bot_loop_lag_is_the_difference_of_two_scrapes() -> None:
+    """Test the histogram parsing, the delta over the run and the bucket of the p99."""
+    def scrape(small: int, large: int, total: float) -> str:
+        return "\n".join([
+            "# TYPE kaonim_event_loop_lag_seconds histogram",
+            f'kaonim_event_loop_lag_seconds_bucket{{le="0.001"}} {small}',
+            f'kaonim_event_loop_lag_seconds_bucket{{le="0.1"}} {small + large}',
+            f'kaonim_event_loop_lag_seconds_bucket{{le="+Inf"}} {small + large}',
+            f"kaonim_event_loop_lag_seconds_sum {total}",
+            f"kaonim_event_loop_lag_seconds_count {small + large}",
+        ])
+
+    before = LagHistogram.parse(scrape(10, 0, 0.001))
+    after = LagHistogram.parse(scrape(108, 2, 0.101))
+    lag = after.since(before)
+
+    assert lag.count == 100 and lag.mean == pytest.approx(0.001)
+    assert lag.upper_bound(0.5) == 0.001 and lag.upper_bound(0.99) == 0.1
+    assert LagHistogram.parse("other_metric 1") is None
+    assert LatencyStats.of([0.3, 0.1, 0.2]) == LatencyStats(3, 0.2, 0.3, 0.3, 0.3)
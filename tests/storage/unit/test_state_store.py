@@ -0,0 +1,128 @@
+"""Unit tests for the SQLite state store."""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from typing import Any
+import pytest
+from src.infrastructure.storage.state_store import StateStore, StateStoreError
+
+def test_values_survive_a_restart(tmp_path: Path) -> None:
+    """Test that flushed writes and deletes are read back by a new store."""
+    path = tmp_path / "state.sqlite3"
+
+    async def write() -> None:
+        store = StateStore(path)
+        scores = store.table("scores")
+        scores.set("1", {"wins": 2})
+        scores.set("2", [1, 2])
+        scores.set("3", "gone")
+        scores.delete("3")
+        assert await scores.get("1") == {"wins": 2}
+        await store.aclose()
+
+    async def read() -> list:
+        store = StateStore(path)
+        scores = store.table("scores")
+        assert await scores.get("3", "default") == "default"
+        items = await scores.items()
+        await store.aclose()
+        return items
+
+    asyncio.run(write())
+    assert asyncio.run(read()) == [("1", {"wins": 2}), ("2", [1, 2])]
+    journal_mode = sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+async def flushed(store: StateStore, flushes: int, timeout: float = 5.0) -> None:
+    """Waits until the store has flushed ``flushes`` batches, however slow the disk."""
+    async with asyncio.timeout(timeout):
+        while store.stats().flushes < flushes:
+            await asyncio.sleep(0.005)
+
+def test_writes_are_batched_by_size_and_time(tmp_path: Path) -> None:
+    """Test that a full batch flushes right away and a partial one after the interval."""
+    async def scenario() -> StateStore:
+        store = StateStore(tmp_path / "state.sqlite3", batch_size=10, flush_interval=0.3)
+        for index in range(20):
+            store.set("counts", "hot", index)
+        await asyncio.sleep(0.01)
+        assert (store.stats().flushes, store.stats().pending) == (0, 1)
+        for index in range(9):
+            store.set("counts", str(index), index)
+        await flushed(store, 1)
+        assert (store.stats().flushes, store.stats().rows_written) == (1, 10)
+        store.set("counts", "hot", -1)
+        assert store.stats().pending == 1
+        await flushed(store, 2)
+        await store.aclose()
+        return store
+
+    stats = asyncio.run(scenario()).stats()
+    assert (stats.flushes, stats.rows_written, stats.pending) == (2, 11, 0)
+
+def test_reads_go_through_the_cache(tmp_path: Path) -> None:
+    """Test hits, misses, cached absence and the LRU bound."""
+    async def scenario() -> StateStore:
+        store = StateStore(tmp_path / "state.sqlite3", cache_entries=2)
+        assert await store.get("t", "missing") is None
+        assert await store.get("t", "missing") is None
+        for key in ("a", "b", "c"):
+            store.set("t", key, key)
+        await store.flush()
+        assert await store.get("t", "c") == "c"
+        assert await store.get("t", "a") == "a"
+        await store.aclose()
+        return store
+
+    stats = asyncio.run(scenario()).stats()
+    assert (stats.hits, stats.misses, stats.cached) == (2, 2, 2)
+
+def test_reads_racing_a_write_do_not_cache_the_old_value(tmp_path: Path) -> None:
+    """Test that a read started before a set, and finished after its flush, is not cached."""
+    path = tmp_path / "state.sqlite3"
+
+    async def scenario() -> tuple[Any, Any, Any]:
+        store = StateStore(path)
+        store.set("t", "k", "old")
+        await store.aclose()
+
+        store = StateStore(path, batch_size=1)
+        reading = asyncio.create_task(store.get("t", "k"))
+        await asyncio.sleep(0)
+        store.set("t", "k", "new")
+        raced = await reading
+        await store.flush()
+        latest = await store.get("t", "k")
+        await store.aclose()
+
+        store = StateStore(path)
+        stored = await store.get("t", "k")
+        await store.aclose()
+        return raced, latest, stored
+
+    raced, latest, stored = asyncio.run(scenario())
+    assert raced in ("old", "new")
+    assert (latest, stored) == ("new", "new")
+
+def test_bad_values_are_refused_and_failed_batches_are_kept(tmp_path: Path) -> None:
+    """Test that set() rejects what JSON cannot encode, and that a failed write is retried."""
+    async def scenario() -> StateStore:
+        # A directory cannot be opened as a database, so every write fails.
+        store = StateStore(tmp_path, cache_entries=1)
+        with pytest.raises(TypeError):
+            store.set("t", "bad", object())
+        with pytest.raises(ValueError):
+            store.set("t", "nan", float("nan"))
+        store.set("t", "good", {"a": 1})
+        store.set("t", "other", 2)
+        assert store.stats().pending == 2
+        assert await store.flush() == 0
+        assert store.stats().pending == 2
+        assert await store.get("t", "good") == {"a": 1}
+        await store.aclose()
+        return store
+
+    store = asyncio.run(scenario())
+    with pytest.raises(StateStoreError):
+        store.set("t", "late", 1)
@@ -0,0 +1,115 @@
+"""Unit tests for the Termo word list, scorers, game store and service."""
+
+import random
+from collections import Counter
+import pytest
+from src.core.constants import DEFAULT_NATIVE_LIB_PATH, DEFAULT_TERMO_WORDS_PATH
+from src.infrastructure.native.bridge import native_bridge
+from src.infrastructure.native.libraries import TERMO_SCORER
+from src.infrastructure.termo.game import TermoGameStore
+from src.infrastructure.termo.scorer import (
+    PATTERN_WIN,
+    NativeTermoScorer,
+    PythonTermoScorer,
+    pattern_digits,
+)
+from src.infrastructure.termo.termo_service import TermoError, TermoService
+from src.infrastructure.termo.word_list import WordList, decode, encode, normalize
+
+NATIVE_LIBRARY = DEFAULT_NATIVE_LIB_PATH / TERMO_SCORER.filename
+
+def reference_score(secret: str, guess: str) -> tuple[int, ...]:
+    """Straightforward two-pass scoring to check the packed scorers against."""
+    digits = [2 if s == g else 0 for s, g in zip(secret, guess)]
+    unmatched = Counter(s for s, digit in zip(secret, digits) if digit != 2)
+    for position, letter in enumerate(guess):
+        if digits[position] != 2 and unmatched[letter] > 0:
+            unmatched[letter] -= 1
+            digits[position] = 1
+    return tuple(digits)
+
+@pytest.fixture(name="words", scope="module")
+def fixture_words() -> WordList:
+    """The shipped word list."""
+    return WordList.from_file(DEFAULT_TERMO_WORDS_PATH)
+
+def test_words_are_packed_and_normalized() -> None:
+    """Test that accents are stripped and words round-trip through 25 bits."""
+    assert normalize(" Ação ") == "acao"
+    assert decode(encode("termo")) == "termo"
+    assert encode("termo") < 1 << 25
+    with pytest.raises(ValueError):
+        encode("ter")
+
+    words = WordList(["Órgão", "termo", "TERMO"])
+    assert len(words) == 2
+    assert "orgao" in words and "ÓRGÃO" in words and "xxxxx" not in words
+
+def test_python_scorer_matches_reference(words: WordList) -> None:
+    """Test repeated letters and random pairs against the reference scorer."""
+    scorer = PythonTermoScorer()
+    assert pattern_digits(scorer.score(encode("abide"), encode("speed"))) == (0, 0, 1, 0, 1)
+    assert scorer.score(encode("carro"), encode("carro")) == PATTERN_WIN
+
+    rng = random.Random(3)
+    for _ in range(2_000):
+        secret, guess = rng.choice(words.codes), rng.choice(words.codes)
+        expected = reference_score(decode(secret), decode(guess))
+        assert pattern_digits(scorer.score(secret, guess)) == expected
+
+@pytest.mark.skipif(not NATIVE_LIBRARY.exists(), reason="native library not built")
+def test_native_scorer_matches_python(words: WordList) -> None:
+    """Test that the Nim scorer agrees with the Python one on the whole list."""
+    native, python = NativeTermoScorer(native_bridge().load(TERMO_SCORER)), PythonTermoScorer()
+    for guess in words.codes[:50]:
+        assert native.score_many(words.codes, guess) == python.score_many(words.codes, guess)
+
+def test_candidates_keep_every_consistent_word(words: WordList) -> None:
+    """Test that the index filter never drops a word giving the same feedback."""
+    scorer = PythonTermoScorer()
+    rng = random.Random(5)
+    for _ in range(50):
+        secret = rng.choice(words.codes)
+        history = [(guess, scorer.score(secret, guess))
+                   for guess in (rng.choice(words.codes) for _ in range(2))]
+        remaining = words.candidates(history)
+        consistent = [word_id for word_id, code in enumerate(words.codes)
+                      if all(scorer.score(code, guess) == pattern for guess, pattern in history)]
+        assert all(remaining >> word_id & 1 for word_id in consistent)
+        assert remaining.bit_count() <= len(words)
+
+def test_store_evicts_idle_games_and_caps_size() -> None:
+    """Test TTL eviction on access and least-recently-used eviction at capacity."""
+    now = [0.0]
+    store = TermoGameStore(ttl=10, max_games=3, clock=lambda: now[0])
+    for channel_id in range(3):
+        store.create(channel_id, secret=channel_id)
+    now[0] = 5
+    assert store.get(0) is not None
+
+    store.create(3, secret=3)
+    assert store.get(1) is None and len(store) == 3
+
+    now[0] = 14
+    assert store.get(3) is not None
+    assert store.get(2) is None and store.get(0) is not None
+    assert len(store) == 2 and store.evicted == 2
+
+def test_service_plays_a_game(words: WordList) -> None:
+    """Test guesses, invalid words and the end of a won game."""
+    service = TermoService(words, PythonTermoScorer(), rng=random.Random(1))
+    service.start(42)
+    secret = decode(service.games.get(42).secret)
+    other = next(word for word in map(decode, words.codes) if word != secret)
+
+    with pytest.raises(TermoError):
+        service.guess(42, "zzzzz")
+    board = service.guess(42, other)
+    assert not board.finished and board.attempts_left == 5
+    assert board.candidates >= 1
+
+    board = service.guess(42, secret.upper())
+    assert board.won and board.finished and board.secret == secret
+    assert service.board(42) is None
+    with pytest.raises(TermoError):
+        service.guess(42, secret)